@@ -1,17 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc, or_, case
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, defer
 from database.database import get_db, async_session_maker
-from database.models import Employee, Project, Task, Activity, Financial, BusinessMetric, Email, ChatMessage, BusinessSettings, Decision, EmployeeReview, Notification, CustomerReview, Meeting, Product, ProductTeamMember, SharedDriveFile, SharedDriveFileVersion, TrainingSession, TrainingMaterial, HomeSettings, FamilyMember, HomePet
-from business.financial_manager import FinancialManager
+from database.models import Employee, Project, Task, Activity, Financial, BusinessMetric, Email, ChatMessage, EmployeeReview, Notification, CustomerReview, Meeting, Product, ProductTeamMember, SharedDriveFile, SharedDriveFileVersion, TrainingSession, TrainingMaterial, HomeSettings, FamilyMember, HomePet
 from business.project_manager import ProjectManager
-from business.goal_system import GoalSystem
+from business.meeting_scheduler import meeting_scheduler
 from database.query_cache import cached_query, clear_cache
 from typing import List, Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel
-from config import now as local_now, TIMEZONE_NAME, is_work_hours
+from config import now as local_now, utcnow, TIMEZONE_NAME, is_work_hours
 import logging
 
 # Set up logger for this module
@@ -59,71 +58,28 @@ async def get_employees(db: AsyncSession = Depends(get_db)):
 @cached_query(cache_duration=15)  # Cache for 15 seconds
 async def _fetch_employees_data(db: AsyncSession):
     """Internal function to fetch employees data."""
-    from database.models import Activity, EmployeeReview
+    from database.models import EmployeeSummary
     
-    result = await db.execute(select(Employee).order_by(Employee.hierarchy_level, Employee.name))
-    employees = result.scalars().all()
-    
-    # Get all firing activities to map termination reasons
-    firing_result = await db.execute(
-        select(Activity)
-        .where(Activity.activity_type == "firing")
-        .order_by(Activity.timestamp.desc())
-    )
-    firing_activities = firing_result.scalars().all()
-    
-    # Create a map of employee_id -> termination_reason
-    termination_reasons = {}
-    for activity in firing_activities:
-        if activity.activity_metadata and isinstance(activity.activity_metadata, dict):
-            emp_id = activity.activity_metadata.get("employee_id")
-            if emp_id and emp_id not in termination_reasons:
-                termination_reasons[emp_id] = activity.activity_metadata.get("termination_reason")
-    
-    # Get review counts for all employees
-    review_count_result = await db.execute(
-        select(
-            EmployeeReview.employee_id,
-            func.count(EmployeeReview.id).label('review_count')
-        )
-        .group_by(EmployeeReview.employee_id)
+    # Termination reasons and review stats come from the employee_summaries projection,
+    # maintained when employees are fired and reviews are written - one indexed join.
+    result = await db.execute(
+        select(Employee, EmployeeSummary)
+        .outerjoin(EmployeeSummary, EmployeeSummary.employee_id == Employee.id)
+        .order_by(Employee.hierarchy_level, Employee.name)
     )
-    review_counts = {row.employee_id: row.review_count for row in review_count_result.all()}
-    
-    # Optimized: Get latest review info using window function (PostgreSQL-specific)
-    # This is much more efficient than loading all reviews and processing in Python
-    from sqlalchemy import text
-    
-    # Use window function with ROW_NUMBER to get latest review per employee
-    # This is a PostgreSQL-optimized query that's much faster than Python processing
-    latest_reviews_result = await db.execute(text("""
-        SELECT DISTINCT ON (employee_id)
-            employee_id,
-            COALESCE(review_date, created_at) as review_date,
-            overall_rating
-        FROM employee_reviews
-        ORDER BY employee_id, COALESCE(review_date, created_at) DESC
-    """))
-    latest_reviews = latest_reviews_result.all()
-    
-    # Create maps for latest review information
-    latest_review_dates = {}
-    latest_ratings = {}
-    for row in latest_reviews:
-        latest_review_dates[row.employee_id] = row.review_date
-        latest_ratings[row.employee_id] = row.overall_rating
+    rows = result.all()
     
     employee_list = []
-    for emp in employees:
+    for emp, summary in rows:
         termination_reason = None
-        # Get termination reason from map if employee is fired
-        if (emp.status == "fired" or emp.fired_at) and emp.id in termination_reasons:
-            termination_reason = termination_reasons[emp.id]
+        # Only fired employees report a termination reason
+        if (emp.status == "fired" or emp.fired_at) and summary:
+            termination_reason = summary.termination_reason
         
         # Get review information
-        review_count = review_counts.get(emp.id, 0)
-        latest_review_date = latest_review_dates.get(emp.id)
-        latest_rating = latest_ratings.get(emp.id)
+        review_count = summary.review_count if summary and summary.review_count else 0
+        latest_review_date = summary.latest_review_date if summary else None
+        latest_rating = summary.latest_rating if summary else None
         
         employee_list.append({
             "id": emp.id,
@@ -336,20 +292,8 @@ async def get_employee(employee_id: int, db: AsyncSession = Depends(get_db)):
     # Get termination reason if employee is terminated
     termination_reason = None
     if emp.status == "fired" or emp.fired_at:
-        # Find the firing activity for this employee
-        firing_result = await db.execute(
-            select(Activity)
-            .where(Activity.activity_type == "firing")
-            .order_by(desc(Activity.timestamp))
-        )
-        firing_activities = firing_result.scalars().all()
-        # Find the activity for this specific employee
-        for activity in firing_activities:
-            if activity.activity_metadata and isinstance(activity.activity_metadata, dict):
-                emp_id = activity.activity_metadata.get("employee_id")
-                if emp_id == employee_id:
-                    termination_reason = activity.activity_metadata.get("termination_reason")
-                    break
+        from database.employee_summaries import get_termination_reason
+        termination_reason = await get_termination_reason(db, employee_id)
     
     # Calculate next review information
     next_review_info = await _calculate_next_review_info(emp, db)
@@ -508,11 +452,9 @@ async def get_employee_reviews(employee_id: int, db: AsyncSession = Depends(get_
 
 @router.get("/employees/{employee_id}/thoughts")
 async def get_employee_thoughts(employee_id: int, db: AsyncSession = Depends(get_db)):
-    """Get AI-generated thoughts from the employee's perspective."""
-    from llm.ollama_client import OllamaClient
-    from engine.office_simulator import get_business_context
+    """Get AI-generated thoughts from the employee's perspective (cached per employee, refreshed in the background)."""
+    from business.employee_view_cache import employee_view_cache
     
-    # Get employee
     result = await db.execute(select(Employee).where(Employee.id == employee_id))
     emp = result.scalar_one_or_none()
     
@@ -523,154 +465,17 @@ async def get_employee_thoughts(employee_id: int, db: AsyncSession = Depends(get
     if emp.status == "fired" or emp.fired_at:
         raise HTTPException(status_code=403, detail="Terminated employees are not eligible for thoughts generation")
     
-    # Get recent activities
-    result = await db.execute(
-        select(Activity)
-        .where(Activity.employee_id == employee_id)
-        .order_by(desc(Activity.timestamp))
-        .limit(5)
-    )
-    activities = result.scalars().all()
-    
-    # Get recent decisions
-    result = await db.execute(
-        select(Decision)
-        .where(Decision.employee_id == employee_id)
-        .order_by(desc(Decision.timestamp))
-        .limit(3)
-    )
-    decisions = result.scalars().all()
-    
-    # Get recent emails
-    try:
-        result = await db.execute(
-            select(Email)
-            .where((Email.sender_id == employee_id) | (Email.recipient_id == employee_id))
-            .order_by(desc(Email.timestamp))
-            .limit(3)
-        )
-        emails = result.scalars().all()
-    except Exception:
-        emails = []
-    
-    # Get recent chats
-    try:
-        result = await db.execute(
-            select(ChatMessage)
-            .where((ChatMessage.sender_id == employee_id) | (ChatMessage.recipient_id == employee_id))
-            .order_by(desc(ChatMessage.timestamp))
-            .limit(3)
-        )
-        chats = result.scalars().all()
-    except Exception:
-        chats = []
-    
-    # Get recent reviews
-    result = await db.execute(
-        select(EmployeeReview)
-        .where(EmployeeReview.employee_id == employee_id)
-        .order_by(desc(EmployeeReview.created_at))
-        .limit(2)
-    )
-    reviews = result.scalars().all()
-    
-    # Get current task if available
-    current_task = None
-    if emp.current_task_id:
-        result = await db.execute(
-            select(Task).where(Task.id == emp.current_task_id)
-        )
-        task = result.scalar_one_or_none()
-        if task:
-            current_task = task.description
-    
-    # Get business context
-    business_context = await get_business_context(db)
-    
-    # Prepare data for LLM
-    activities_data = [
-        {
-            "description": act.description,
-            "activity_type": act.activity_type,
-            "timestamp": act.timestamp.isoformat() if act.timestamp else None
-        }
-        for act in activities
-    ]
-    
-    decisions_data = [
-        {
-            "description": dec.description,
-            "reasoning": dec.reasoning,
-            "decision_type": dec.decision_type,
-            "timestamp": dec.timestamp.isoformat() if dec.timestamp else None
-        }
-        for dec in decisions
-    ]
-    
-    emails_data = [
-        {
-            "subject": email.subject,
-            "body": email.body[:100] if email.body else "",
-            "timestamp": email.timestamp.isoformat() if email.timestamp else None
-        }
-        for email in emails
-    ]
-    
-    chats_data = [
-        {
-            "message": chat.message,
-            "timestamp": chat.timestamp.isoformat() if chat.timestamp else None
-        }
-        for chat in chats
-    ]
-    
-    reviews_data = [
-        {
-            "overall_rating": rev.overall_rating,
-            "comments": rev.comments or "",
-            "review_date": rev.review_date.isoformat() if rev.review_date else None
-        }
-        for rev in reviews
-    ]
-    
-    # Generate thoughts using LLM
-    llm_client = OllamaClient()
-    try:
-        thoughts = await llm_client.generate_employee_thoughts(
-            employee_name=emp.name,
-            employee_title=emp.title,
-            employee_role=emp.role,
-            personality_traits=emp.personality_traits or [],
-            backstory=emp.backstory,
-            recent_activities=activities_data,
-            recent_decisions=decisions_data,
-            recent_emails=emails_data,
-            recent_chats=chats_data,
-            recent_reviews=reviews_data,
-            current_status=emp.status or "active",
-            current_task=current_task,
-            business_context=business_context
-        )
-    except Exception as e:
-        print(f"Error generating employee thoughts: {e}")
-        thoughts = "I'm focused on my current work and thinking about how to contribute effectively to the team."
-    finally:
-        await llm_client.close()
-    
-    return {
-        "thoughts": thoughts,
-        "generated_at": datetime.now().isoformat()
-    }
+    thoughts = await employee_view_cache.thoughts(emp)
+    if thoughts is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return thoughts
 
 @router.get("/employees/{employee_id}/screen-view")
 async def get_employee_screen_view(employee_id: int, db: AsyncSession = Depends(get_db)):
-    """Get real-time screen view of employee's computer when they are in working state."""
+    """Get real-time screen view of employee's computer when they are in working state (cached per employee, refreshed in the background)."""
     try:
-        from llm.ollama_client import OllamaClient
-        from engine.office_simulator import get_business_context
-        from sqlalchemy.orm import selectinload
+        from business.employee_view_cache import employee_view_cache
         
-        # Get employee
         result = await db.execute(
             select(Employee)
             .where(Employee.id == employee_id)
@@ -687,215 +492,10 @@ async def get_employee_screen_view(employee_id: int, db: AsyncSession = Depends(
                 detail=f"Employee is not in working state. Current state: {emp.activity_state}, status: {emp.status}"
             )
         
-        # Get current task if exists
-        current_task = None
-        project_name = None
-        project_description = None
-        if emp.current_task_id:
-            result = await db.execute(
-                select(Task)
-                .where(Task.id == emp.current_task_id)
-                .options(selectinload(Task.project))
-            )
-            task = result.scalar_one_or_none()
-            if task:
-                current_task = task.description
-                if task.project:
-                    project_name = task.project.name
-                    project_description = task.project.description
-        
-        # Get all employees for name lookup
-        all_employees_result = await db.execute(select(Employee))
-        all_employees = {e.id: e.name for e in all_employees_result.scalars().all()}
-        
-        # Get recent emails (last 5)
-        result = await db.execute(
-            select(Email)
-            .where(
-                (Email.sender_id == employee_id) | (Email.recipient_id == employee_id)
-            )
-            .order_by(desc(Email.timestamp))
-            .limit(5)
-        )
-        recent_emails = result.scalars().all()
-        emails_data = [
-            {
-                "id": email.id,
-                "subject": email.subject,
-                "body": email.body or "",
-                "sender_id": email.sender_id,
-                "sender_name": all_employees.get(email.sender_id, "Unknown"),
-                "recipient_id": email.recipient_id,
-                "recipient_name": all_employees.get(email.recipient_id, "Unknown"),
-                "timestamp": email.timestamp.isoformat() if email.timestamp else None
-            }
-            for email in recent_emails
-        ]
-        
-        # Get recent chats (last 5)
-        result = await db.execute(
-            select(ChatMessage)
-            .where(
-                (ChatMessage.sender_id == employee_id) | (ChatMessage.recipient_id == employee_id)
-            )
-            .order_by(desc(ChatMessage.timestamp))
-            .limit(5)
-        )
-        recent_chats = result.scalars().all()
-        chats_data = [
-            {
-                "id": chat.id,
-                "message": chat.message,
-                "sender_id": chat.sender_id,
-                "sender_name": all_employees.get(chat.sender_id, "Unknown"),
-                "recipient_id": chat.recipient_id,
-                "recipient_name": all_employees.get(chat.recipient_id, "Unknown"),
-                "timestamp": chat.timestamp.isoformat() if chat.timestamp else None
-            }
-            for chat in recent_chats
-        ]
-        
-        # Get shared drive files related to employee's project
-        shared_drive_files = []
-        if project_name or emp.department:
-            if project_name:
-                # Try to find files for this project (use first() to avoid multiple rows error)
-                result = await db.execute(
-                    select(Project).where(Project.name == project_name).limit(1)
-                )
-                project = result.scalars().first()
-                if project:
-                    result = await db.execute(
-                        select(SharedDriveFile)
-                        .where(SharedDriveFile.project_id == project.id)
-                        .order_by(desc(SharedDriveFile.updated_at))
-                        .limit(5)
-                    )
-                    shared_drive_files = result.scalars().all()
-            elif emp.department:
-                # Fallback to department files
-                result = await db.execute(
-                    select(SharedDriveFile)
-                    .where(SharedDriveFile.department == emp.department)
-                    .order_by(desc(SharedDriveFile.updated_at))
-                    .limit(5)
-                )
-                shared_drive_files = result.scalars().all()
-        
-        # Get file content for shared drive files
-        files_data = []
-        for f in shared_drive_files:
-            file_data = {
-                "id": f.id,
-                "file_name": f.file_name,
-                "file_type": f.file_type,
-                "department": f.department,
-                "project_id": f.project_id,
-                "updated_at": f.updated_at.isoformat() if f.updated_at else None
-            }
-            # Get the latest version content if available
-            if f.id:
-                try:
-                    result = await db.execute(
-                        select(SharedDriveFileVersion)
-                        .where(SharedDriveFileVersion.file_id == f.id)
-                        .order_by(desc(SharedDriveFileVersion.version_number))
-                        .limit(1)
-                    )
-                    latest_version = result.scalar_one_or_none()
-                    if latest_version:
-                        # Ensure we access content_html, not content
-                        if hasattr(latest_version, 'content_html') and latest_version.content_html:
-                            file_data["content"] = latest_version.content_html[:5000]  # Limit to 5000 chars
-                        else:
-                            print(f"Warning: SharedDriveFileVersion {latest_version.id} has no content_html")
-                except AttributeError as ae:
-                    print(f"AttributeError accessing content for file {f.id}: {ae}")
-                    # Continue without content
-                except Exception as e:
-                    print(f"Error fetching version content for file {f.id}: {e}")
-                    # Continue without content
-            files_data.append(file_data)
-    
-        # Get business context
-        business_context = await get_business_context(db)
-        
-        # Generate screen activity using Ollama with timeout
-        # Send comprehensive data for realistic AI-driven screen view
-        import asyncio
-        import time
-        llm_client = OllamaClient()
-        try:
-            print(f"[SCREEN-VIEW] Generating comprehensive screen activity for employee {emp.name} (ID: {employee_id})")
-            start_time = time.time()
-            
-            # Increase timeout to 60 seconds to allow for processing comprehensive data
-            # This matches the httpx client timeout in OllamaClient
-            screen_activity = await asyncio.wait_for(
-                llm_client.generate_screen_activity(
-                    employee_name=emp.name,
-                    employee_title=emp.title,
-                    employee_role=emp.role,
-                    personality_traits=emp.personality_traits or [],
-                    current_task=current_task,
-                    project_name=project_name,
-                    project_description=project_description,
-                    recent_emails=emails_data,  # Full email data
-                    recent_chats=chats_data,    # Full chat data
-                    shared_drive_files=files_data,  # Full file data with content
-                    business_context=business_context
-                ),
-                timeout=60.0  # 60 second timeout to allow comprehensive AI generation
-            )
-            
-            elapsed = time.time() - start_time
-            print(f"[SCREEN-VIEW] Screen activity generated in {elapsed:.2f}s")
-            
-        except asyncio.TimeoutError:
-            print(f"[SCREEN-VIEW] LLM timeout after 60s for employee {emp.name}")
-            # Return fallback activity on timeout
-            screen_activity = {
-                "application": "outlook",
-                "action": "viewing",
-                "content": {
-                    "subject": "Work Update",
-                    "recipient": "Team",
-                    "body": f"{emp.name} is reviewing emails and working on {current_task or 'current tasks'}."
-                },
-                "mouse_position": {"x": 50, "y": 50},
-                "window_state": "active"
-            }
-        except Exception as e:
-            print(f"[SCREEN-VIEW] Error generating screen activity: {e}")
-            import traceback
-            traceback.print_exc()
-            # Return fallback activity
-            screen_activity = {
-                "application": "outlook",
-                "action": "viewing",
-                "content": {
-                    "subject": "Work Update",
-                    "recipient": "Team",
-                    "body": f"{emp.name} is reviewing emails related to their current work."
-                },
-                "mouse_position": {"x": 50, "y": 50},
-                "window_state": "active"
-            }
-        finally:
-            await llm_client.close()
-        
-        return {
-            "employee_id": employee_id,
-            "employee_name": emp.name,
-            "employee_title": emp.title,
-            "screen_activity": screen_activity,
-            "actual_data": {
-                "emails": emails_data,
-                "chats": chats_data,
-                "files": files_data
-            },
-            "timestamp": datetime.now().isoformat()
-        }
+        screen_view = await employee_view_cache.screen_view(emp)
+        if screen_view is None:
+            raise HTTPException(status_code=404, detail="Employee not found")
+        return screen_view
     except HTTPException:
         # Re-raise HTTP exceptions (404, 403, etc.)
         raise
@@ -1002,6 +602,8 @@ async def create_employee_review(employee_id: int, review_data: CreateReviewRequ
     )
     
     db.add(review)
+    from database.employee_summaries import record_review
+    await record_review(db, employee_id, review_data.overall_rating, local_now())
     await db.commit()
     await db.refresh(review)
     
@@ -1013,7 +615,8 @@ async def create_employee_review(employee_id: int, review_data: CreateReviewRequ
     
     # Invalidate caches after data is committed
     await invalidate_cache("_fetch_employees_data")
-    await invalidate_cache("_fetch_dashboard_data")
+    from business.dashboard_read_model import dashboard_read_model
+    dashboard_read_model.request_refresh()
     
     return {
         "id": review.id,
@@ -1270,7 +873,7 @@ Write the message in a natural, conversational tone that matches your personalit
 
     try:
         llm_client = OllamaClient()
-        message = await llm_client.generate_response(prompt)
+        message = await llm_client.generate_response(prompt, kind="employee_message")
         
         # Clean up the message (remove any JSON formatting if present)
         message = message.strip()
@@ -1676,8 +1279,8 @@ async def sync_products_from_reviews(db: AsyncSession):
                     status="active" if project.status == "completed" else "development",
                     price=0.0,
                     launch_date=project.completed_at if project.completed_at else project.created_at,
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
+                    created_at=utcnow(),
+                    updated_at=utcnow()
                 )
                 db.add(new_product)
                 await db.flush()  # Get the ID
@@ -1990,805 +1593,96 @@ async def get_activities(limit: int = 50, db: AsyncSession = Depends(get_db)):
     """Get recent activities."""
     result = await db.execute(
         select(Activity)
-        .order_by(desc(Activity.timestamp))
-        .limit(limit)
-    )
-    activities = result.scalars().all()
-    
-    return [
-        {
-            "id": act.id,
-            "employee_id": act.employee_id,
-            "activity_type": act.activity_type,
-            "description": act.description,
-            "metadata": act.activity_metadata,
-            "timestamp": (act.timestamp or local_now()).isoformat()
-        }
-        for act in activities
-    ]
-
-@router.get("/metrics")
-async def get_metrics(db: AsyncSession = Depends(get_db)):
-    """Get business metrics."""
-    result = await db.execute(
-        select(BusinessMetric)
-        .order_by(desc(BusinessMetric.timestamp))
-        .limit(100)
-    )
-    metrics = result.scalars().all()
-    
-    # Group by metric name and get latest
-    metric_dict = {}
-    for metric in metrics:
-        if metric.metric_name not in metric_dict:
-            metric_dict[metric.metric_name] = metric.value
-    
-    return metric_dict
-
-@router.get("/dashboard")
-async def get_dashboard(db: AsyncSession = Depends(get_db)):
-    """Get dashboard data with caching."""
-    try:
-        # Test database connection first
-        try:
-            await db.execute(select(Employee).limit(1))
-        except Exception as db_error:
-            logger.error(f"Database connection error in dashboard: {db_error}", exc_info=True)
-            # Return default values if DB is not accessible
-            return {
-                "revenue": 0.0,
-                "profit": 0.0,
-                "expenses": 0.0,
-                "active_projects": 0,
-                "employee_count": 0,
-                "recent_activities": [],
-                "goals": [],
-                "goal_progress": {},
-                "company_overview": {
-                    "business_name": "TechFlow Solutions",
-                    "mission": "To deliver innovative technology solutions that empower businesses to achieve their goals through cutting-edge software development and consulting services.",
-                    "industry": "Technology & Software Development",
-                    "founded": "2024",
-                    "location": "New York",
-                    "ceo": "Not Assigned",
-                    "total_projects": 0,
-                    "completed_projects": 0,
-                    "active_projects_count": 0,
-                    "total_project_revenue": 0.0,
-                    "average_project_budget": 0.0,
-                    "departments": {},
-                    "role_distribution": {},
-                    "products_services": []
-                },
-                "leadership_insights": {
-                    "leadership_team": [],
-                    "recent_decisions": [],
-                    "recent_activities": [],
-                    "metrics": {
-                        "total_leadership_count": 0,
-                        "ceo_count": 0,
-                        "manager_count": 0,
-                        "strategic_decisions_count": 0,
-                        "projects_led_by_leadership": 0
-                    }
-                }
-            }
-        
-        return await _fetch_dashboard_data(db)
-    except Exception as e:
-        logger.error(f"Error in dashboard endpoint: {e}", exc_info=True)
-        # Return default values instead of crashing
-        return {
-            "revenue": 0.0,
-            "profit": 0.0,
-            "expenses": 0.0,
-            "active_projects": 0,
-            "employee_count": 0,
-            "recent_activities": [],
-            "goals": [],
-            "goal_progress": {},
-            "company_overview": {
-                "business_name": "TechFlow Solutions",
-                "mission": "To deliver innovative technology solutions that empower businesses to achieve their goals through cutting-edge software development and consulting services.",
-                "industry": "Technology & Software Development",
-                "founded": "2024",
-                "location": "San Francisco, CA",
-                "ceo": "Not Assigned",
-                "total_projects": 0,
-                "completed_projects": 0,
-                "active_projects_count": 0,
-                "total_project_revenue": 0.0,
-                "average_project_budget": 0.0,
-                "departments": {},
-                "role_distribution": {},
-                "products_services": []
-            },
-            "leadership_insights": {
-                "leadership_team": [],
-                "recent_decisions": [],
-                "recent_activities": [],
-                "metrics": {
-                    "total_leadership_count": 0,
-                    "ceo_count": 0,
-                    "manager_count": 0,
-                    "strategic_decisions_count": 0,
-                    "projects_led_by_leadership": 0
-                }
-            }
-        }
-
-@cached_query(cache_duration=10)  # Cache for 10 seconds (dashboard updates frequently)
-async def _fetch_dashboard_data(db: AsyncSession):
-    """Get dashboard data."""
-    try:
-        # Safely import and initialize managers
-        try:
-            financial_manager = FinancialManager(db)
-        except Exception as e:
-            print(f"Error creating FinancialManager: {e}")
-            financial_manager = None
-        
-        try:
-            project_manager = ProjectManager(db)
-        except Exception as e:
-            print(f"Error creating ProjectManager: {e}")
-            project_manager = None
-        
-        try:
-            goal_system = GoalSystem(db)
-        except Exception as e:
-            print(f"Error creating GoalSystem: {e}")
-            goal_system = None
-        
-        try:
-            revenue = await financial_manager.get_total_revenue() if financial_manager else 0.0
-        except:
-            revenue = 0.0
-        
-        try:
-            profit = await financial_manager.get_profit() if financial_manager else 0.0
-        except:
-            profit = 0.0
-        
-        try:
-            expenses = await financial_manager.get_total_expenses() if financial_manager else 0.0
-        except:
-            expenses = 0.0
-        
-        try:
-            active_projects = await project_manager.get_active_projects() if project_manager else []
-            # Ensure it's a list
-            if not isinstance(active_projects, list):
-                active_projects = []
-        except Exception as e:
-            logger.error(f"Error getting active projects: {e}", exc_info=True)
-            active_projects = []
-        
-        # Get only active employees (not terminated)
-        try:
-            result = await db.execute(
-                select(Employee).where(Employee.status == "active")
-            )
-            active_employees = result.scalars().all()
-        except:
-            active_employees = []
-        
-        # Get recent activities
-        try:
-            result = await db.execute(
-                select(Activity)
-                .order_by(desc(Activity.timestamp))
-                .limit(20)
-            )
-            recent_activities = result.scalars().all()
-        except:
-            recent_activities = []
-        
-        try:
-            if goal_system:
-                goals = await goal_system.get_business_goals()
-                goals_with_keys = await goal_system.get_business_goals_with_keys()
-                goal_progress_raw = await goal_system.evaluate_goals()
-            else:
-                goals = []
-                goals_with_keys = []
-                goal_progress_raw = {}
-        except Exception as e:
-            logger.error(f"Error getting goals: {e}", exc_info=True)
-            goals = []
-            goals_with_keys = []
-            goal_progress_raw = {}
-        
-        # Map goal_progress to match goals order (for frontend compatibility)
-        goal_progress = {}
-        for idx, goal_info in enumerate(goals_with_keys):
-            goal_key = goal_info["key"]
-            goal_progress[goal_key] = goal_progress_raw.get(goal_key, False)
-        
-        # Get business settings
-        try:
-            result = await db.execute(select(BusinessSettings))
-            business_settings = result.scalars().all()
-            settings_dict = {setting.setting_key: setting.setting_value for setting in business_settings}
-        except:
-            settings_dict = {}
-        
-        business_name = settings_dict.get("business_name", "TechFlow Solutions")
-        business_mission = settings_dict.get("business_mission", "To deliver innovative technology solutions that empower businesses to achieve their goals through cutting-edge software development and consulting services.")
-        business_industry = settings_dict.get("business_industry", "Technology & Software Development")
-        business_founded = settings_dict.get("business_founded", "2024")
-        business_location = settings_dict.get("business_location", "New York")
-        
-        # Get all projects for company overview
-        try:
-            result = await db.execute(select(Project).order_by(desc(Project.created_at)))
-            all_projects = result.scalars().all()
-        except:
-            all_projects = []
-        
-        # Calculate project statistics
-        completed_projects = [p for p in all_projects if p.status == "completed"]
-        total_projects = len(all_projects)
-        total_project_revenue = sum(p.revenue or 0.0 for p in all_projects)
-        
-        # Get employee statistics by department
-        departments = {}
-        role_distribution = {}
-        for emp in active_employees:
-            dept = emp.department or "Unassigned"
-            departments[dept] = departments.get(dept, 0) + 1
-            role = emp.role or "Employee"
-            role_distribution[role] = role_distribution.get(role, 0) + 1
-        
-        # Get CEO for company leadership info
-        try:
-            result = await db.execute(
-                select(Employee).where(Employee.role == "CEO", Employee.status == "active")
-            )
-            ceo = result.scalar_one_or_none()
-            ceo_name = ceo.name if ceo else "Not Assigned"
-        except:
-            ceo_name = "Not Assigned"
-        
-        # Calculate average project budget
-        projects_with_budget = [p for p in all_projects if p.budget and p.budget > 0]
-        avg_project_budget = sum(p.budget for p in projects_with_budget) / len(projects_with_budget) if projects_with_budget else 0.0
-        
-        # Get leadership team (CEO, C-level executives, and Managers)
-        leadership_roles = ["CEO", "CTO", "COO", "CFO", "Manager"]
-        leadership_employees = [emp for emp in active_employees if emp.role in leadership_roles or (hasattr(emp, 'hierarchy_level') and emp.hierarchy_level <= 2)]
-        
-        # Get recent leadership decisions
-        leadership_employee_ids = [emp.id for emp in leadership_employees]
-        leadership_decisions = []
-        if leadership_employee_ids:
-            try:
-                # Get decisions from Decision table
-                result = await db.execute(
-                    select(Decision)
-                    .where(Decision.employee_id.in_(leadership_employee_ids))
-                    .order_by(desc(Decision.timestamp))
-                    .limit(10)
-                )
-                decisions = result.scalars().all()
-            except:
-                decisions = []
-            leadership_decisions = [
-                {
-                    "id": d.id,
-                    "employee_id": d.employee_id,
-                    "employee_name": next((emp.name for emp in leadership_employees if emp.id == d.employee_id), "Unknown"),
-                    "employee_role": next((emp.role for emp in leadership_employees if emp.id == d.employee_id), "Unknown"),
-                    "decision_type": d.decision_type,
-                    "description": d.description,
-                    "reasoning": d.reasoning,
-                    "timestamp": (d.timestamp or local_now()).isoformat()
-                }
-                for d in decisions
-            ]
-            
-            # Also get strategic decisions from Activities table
-            try:
-                result = await db.execute(
-                    select(Activity)
-                    .where(
-                        Activity.employee_id.in_(leadership_employee_ids),
-                        Activity.activity_type.in_(["strategic_decision", "strategic_operational_decision"])
-                    )
-                    .order_by(desc(Activity.timestamp))
-                    .limit(10)
-                )
-                strategic_activities = result.scalars().all()
-            except:
-                strategic_activities = []
-            for act in strategic_activities:
-                # Extract decision type from activity metadata or activity_type
-                decision_type = "strategic"
-                if act.activity_metadata and isinstance(act.activity_metadata, dict):
-                    decision_type = act.activity_metadata.get("decision_type", "strategic")
-                elif act.activity_type == "strategic_operational_decision":
-                    decision_type = "strategic_operational"
-                
-                leadership_decisions.append({
-                    "id": act.id,
-                    "employee_id": act.employee_id,
-                    "employee_name": next((emp.name for emp in leadership_employees if emp.id == act.employee_id), "Unknown"),
-                    "employee_role": next((emp.role for emp in leadership_employees if emp.id == act.employee_id), "Unknown"),
-                    "decision_type": decision_type,
-                    "description": act.description,
-                    "reasoning": act.activity_metadata.get("reasoning", "") if act.activity_metadata and isinstance(act.activity_metadata, dict) else "",
-                    "timestamp": (act.timestamp or local_now()).isoformat()
-                })
-            
-            # Sort by timestamp descending and limit to 10
-            leadership_decisions.sort(key=lambda x: x["timestamp"], reverse=True)
-            leadership_decisions = leadership_decisions[:10]
-        
-        # Get recent leadership activities
-        leadership_activities = []
-        if leadership_employee_ids:
-            try:
-                result = await db.execute(
-                    select(Activity)
-                    .where(Activity.employee_id.in_(leadership_employee_ids))
-                    .order_by(desc(Activity.timestamp))
-                    .limit(15)
-                )
-                activities = result.scalars().all()
-            except:
-                activities = []
-            leadership_activities = [
-                {
-                    "id": act.id,
-                    "employee_id": act.employee_id,
-                    "employee_name": next((emp.name for emp in leadership_employees if emp.id == act.employee_id), "Unknown"),
-                    "employee_role": next((emp.role for emp in leadership_employees if emp.id == act.employee_id), "Unknown"),
-                    "activity_type": act.activity_type,
-                    "description": act.description,
-                    "timestamp": (act.timestamp or local_now()).isoformat()
-                }
-                for act in activities
-            ]
-        
-        # Calculate leadership metrics
-        # Get projects with leadership involvement
-        leadership_employee_ids_set = set(leadership_employee_ids)
-        try:
-            result = await db.execute(
-                select(Task).where(Task.employee_id.in_(leadership_employee_ids_set))
-            )
-            leadership_tasks = result.scalars().all()
-            projects_with_leadership = set(task.project_id for task in leadership_tasks if task.project_id)
-        except:
-            projects_with_leadership = set()
-        
-        # Count strategic decisions (from both Decision table and Activity table)
-        strategic_count = 0
-        try:
-            # Count from Decision table
-            result = await db.execute(
-                select(Decision)
-                .where(
-                    Decision.employee_id.in_(leadership_employee_ids),
-                    Decision.decision_type == "strategic"
-                )
-            )
-            strategic_decisions_from_table = result.scalars().all()
-            
-            # Count from Activity table
-            result = await db.execute(
-                select(Activity)
-                .where(
-                    Activity.employee_id.in_(leadership_employee_ids),
-                    Activity.activity_type.in_(["strategic_decision", "strategic_operational_decision"])
-                )
-            )
-            strategic_activities = result.scalars().all()
-            
-            strategic_count = len(strategic_decisions_from_table) + len(strategic_activities)
-        except:
-            pass
-        
-        # Get employee review statistics
-        completed_reviews_count = 0
-        in_progress_reviews_count = 0
-        try:
-            # Completed reviews: reviews with all fields filled (comments, strengths, areas_for_improvement)
-            # Check for both not None and not empty strings
-            from sqlalchemy import and_, or_
-            result = await db.execute(
-                select(EmployeeReview)
-                .where(
-                    and_(
-                        EmployeeReview.comments.isnot(None),
-                        EmployeeReview.comments != '',
-                        EmployeeReview.strengths.isnot(None),
-                        EmployeeReview.strengths != '',
-                        EmployeeReview.areas_for_improvement.isnot(None),
-                        EmployeeReview.areas_for_improvement != ''
-                    )
-                )
-            )
-            completed_reviews = result.scalars().all()
-            completed_reviews_count = len(completed_reviews)
-            
-            # In progress reviews: reviews that exist but are missing some optional fields
-            # Or reviews that have empty strings
-            result = await db.execute(
-                select(EmployeeReview)
-                .where(
-                    or_(
-                        EmployeeReview.comments.is_(None),
-                        EmployeeReview.comments == '',
-                        EmployeeReview.strengths.is_(None),
-                        EmployeeReview.strengths == '',
-                        EmployeeReview.areas_for_improvement.is_(None),
-                        EmployeeReview.areas_for_improvement == ''
-                    )
-                )
-            )
-            in_progress_reviews = result.scalars().all()
-            in_progress_reviews_count = len(in_progress_reviews)
-        except:
-            pass
-        
-        leadership_metrics = {
-            "total_leadership_count": len(leadership_employees),
-            "ceo_count": len([emp for emp in leadership_employees if emp.role == "CEO"]),
-            "manager_count": len([emp for emp in leadership_employees if emp.role == "Manager"]),
-            "cto_count": len([emp for emp in leadership_employees if emp.role == "CTO"]),
-            "coo_count": len([emp for emp in leadership_employees if emp.role == "COO"]),
-            "cfo_count": len([emp for emp in leadership_employees if emp.role == "CFO"]),
-            "strategic_decisions_count": strategic_count,
-            "projects_led_by_leadership": len(projects_with_leadership),
-            "reviews_completed": completed_reviews_count,
-            "reviews_in_progress": in_progress_reviews_count
-        }
-        
-        # Get break tracking data
-        now = local_now()
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        # Cache for employee lookups to avoid duplicate queries
-        employee_cache = {emp.id: emp for emp in active_employees}
-        
-        # Helper function to get employee, querying database if needed
-        async def get_employee(employee_id: int) -> Optional[Employee]:
-            if not employee_id:
-                return None
-            if employee_id in employee_cache:
-                return employee_cache[employee_id]
-            # Query database if not in cache
-            try:
-                result = await db.execute(select(Employee).where(Employee.id == employee_id))
-                emp = result.scalar_one_or_none()
-                if emp:
-                    employee_cache[employee_id] = emp
-                    return emp
-            except:
-                pass
-            return None
-        
-        # Helper function to get employee name
-        async def get_employee_name(employee_id: int) -> str:
-            emp = await get_employee(employee_id)
-            if emp:
-                return emp.name
-            return f"Employee #{employee_id}" if employee_id else "System"
-        
-        # Helper function to get default breakroom based on floor
-        def get_default_breakroom(floor: int) -> str:
-            if floor == 2:
-                return "breakroom_floor2"
-            elif floor >= 3:
-                return "breakroom_floor2"  # Default to floor 2 breakroom
-            return "breakroom"
-        
-        # Get employees currently on break
-        employees_on_break = []
-        for emp in active_employees:
-            if emp.activity_state == "break" or (emp.current_room and "breakroom" in emp.current_room.lower()):
-                # Determine if they're actually on break or just passing through
-                is_actually_on_break = emp.activity_state == "break"
-                
-                # Find when they entered the breakroom
-                # First, try to find the most recent activity where they entered a breakroom
-                breakroom_entry_time = None
-                
-                # Query for most recent activity that shows them entering breakroom
-                # First, try to find activities with breakroom as target_room in metadata
-                entry_result = await db.execute(
-                    select(Activity)
-                    .where(
-                        Activity.employee_id == emp.id,
-                        or_(
-                            Activity.activity_type == "coffee_break",
-                            Activity.activity_type == "break"
-                        )
-                    )
-                    .order_by(desc(Activity.timestamp))
-                    .limit(10)  # Get recent break activities to check metadata
-                )
-                entry_activities = entry_result.scalars().all()
-                
-                # Check each activity to see if it's for a breakroom entry
-                for entry_activity in entry_activities:
-                    metadata = entry_activity.activity_metadata or {}
-                    target_room = metadata.get("target_room", "")
-                    description = entry_activity.description or ""
-                    
-                    # Check if this activity is for entering a breakroom
-                    if ("breakroom" in target_room.lower() or 
-                        "breakroom" in description.lower() or
-                        entry_activity.activity_type in ["coffee_break", "break"]):
-                        breakroom_entry_time = entry_activity.timestamp
-                        break
-                
-                # If no entry activity found, use last_coffee_break if available
-                if not breakroom_entry_time and emp.last_coffee_break:
-                    breakroom_entry_time = emp.last_coffee_break
-                
-                # If still no time found, query for most recent activity in general (as fallback)
-                if not breakroom_entry_time:
-                    recent_result = await db.execute(
-                        select(Activity)
-                        .where(Activity.employee_id == emp.id)
-                        .order_by(desc(Activity.timestamp))
-                        .limit(1)
-                    )
-                    recent_activity = recent_result.scalar_one_or_none()
-                    if recent_activity:
-                        breakroom_entry_time = recent_activity.timestamp
-                
-                employees_on_break.append({
-                    "id": emp.id,
-                    "name": emp.name,
-                    "title": emp.title,
-                    "department": emp.department,
-                    "current_room": emp.current_room or emp.home_room or get_default_breakroom(emp.floor or 1),
-                    "floor": emp.floor,
-                    "activity_state": emp.activity_state,
-                    "last_coffee_break": emp.last_coffee_break.isoformat() if emp.last_coffee_break else None,
-                    "breakroom_entry_time": breakroom_entry_time.isoformat() if breakroom_entry_time else None,
-                    "is_actually_on_break": is_actually_on_break
-                })
-        
-        # Get break activities for today (including break returns)
-        result = await db.execute(
-            select(Activity)
-            .where(
-                Activity.activity_type.in_(["coffee_break", "break", "break_returned"]),
-                Activity.timestamp >= today_start
-            )
-            .order_by(desc(Activity.timestamp))
-        )
-        today_breaks = result.scalars().all()
-        
-        # Get break returns and break denials (including manager abuse tracking)
-        break_returns = []
-        manager_abuse_incidents = []
-        break_denials = []
-        
-        # Also query for break_denied activities
-        denied_result = await db.execute(
-            select(Activity)
-            .where(
-                Activity.activity_type == "break_denied",
-                Activity.timestamp >= today_start
-            )
-            .order_by(desc(Activity.timestamp))
-        )
-        denied_breaks = denied_result.scalars().all()
-        
-        for act in today_breaks:
-            if act.activity_type == "break_returned":
-                metadata = act.activity_metadata if act.activity_metadata and isinstance(act.activity_metadata, dict) else {}
-                is_manager_abuse = metadata.get("is_manager", False) or metadata.get("enforcement_type") == "manager_break_enforcement"
-                
-                employee_name = await get_employee_name(act.employee_id)
-                
-                return_data = {
-                    "id": act.id,
-                    "employee_id": act.employee_id,
-                    "employee_name": employee_name,
-                    "manager_name": metadata.get("manager_name", "System") if not is_manager_abuse else "System (Manager Abuse)",
-                    "manager_id": metadata.get("manager_id") if not is_manager_abuse else None,
-                    "description": act.description,
-                    "break_duration_minutes": metadata.get("break_duration_minutes", 0),
-                    "timestamp": act.timestamp.isoformat() if act.timestamp else None,
-                    "is_manager_abuse": is_manager_abuse,
-                    "enforcement_type": metadata.get("enforcement_type", "manager_return")
-                }
-                break_returns.append(return_data)
-                
-                if is_manager_abuse:
-                    manager_abuse_incidents.append(return_data)
-        
-        for act in denied_breaks:
-            metadata = act.activity_metadata if act.activity_metadata and isinstance(act.activity_metadata, dict) else {}
-            if metadata.get("is_manager", False):
-                employee_name = await get_employee_name(act.employee_id)
-                break_denials.append({
-                    "id": act.id,
-                    "employee_id": act.employee_id,
-                    "employee_name": employee_name,
-                    "reason": metadata.get("reason", "Break abuse detected"),
-                    "timestamp": act.timestamp.isoformat() if act.timestamp else None
-                })
-        
-        # Group breaks by employee for daily time visibility
-        employee_break_history = {}
-        for break_activity in today_breaks:
-            emp_id = break_activity.employee_id
-            if not emp_id:
-                continue
-            
-            if emp_id not in employee_break_history:
-                employee_name = await get_employee_name(emp_id)
-                employee_break_history[emp_id] = {
-                    "employee_id": emp_id,
-                    "employee_name": employee_name,
-                    "breaks": [],
-                    "total_break_count": 0,
-                    "total_break_time_minutes": 0
-                }
-            
-            # Get break room from metadata, or derive from employee data
-            break_room = None
-            if break_activity.activity_metadata and isinstance(break_activity.activity_metadata, dict):
-                break_room = break_activity.activity_metadata.get("target_room")
-            
-            # If no room in metadata, try to get from employee's current room or use default
-            if not break_room:
-                emp = employee_cache.get(emp_id)
-                if not emp:
-                    emp = await get_employee(emp_id)
-                if emp:
-                    break_room = emp.current_room or emp.home_room or get_default_breakroom(emp.floor or 1)
-                else:
-                    break_room = get_default_breakroom(1)
-            
-            employee_break_history[emp_id]["breaks"].append({
-                "id": break_activity.id,
-                "timestamp": break_activity.timestamp.isoformat() if break_activity.timestamp else None,
-                "description": break_activity.description,
-                "room": break_room,
-                "break_type": break_activity.activity_metadata.get("break_type", "coffee") if break_activity.activity_metadata and isinstance(break_activity.activity_metadata, dict) else "coffee"
-            })
-            employee_break_history[emp_id]["total_break_count"] += 1
-        
-        # Sort breaks by timestamp (most recent first) for each employee
-        for emp_id in employee_break_history:
-            employee_break_history[emp_id]["breaks"].sort(key=lambda x: x["timestamp"] or "", reverse=True)
-        
-        # Convert to list for frontend
-        break_history_list = list(employee_break_history.values())
-        
-        return {
-            "business_name": business_name,
-            "revenue": revenue or 0.0,
-            "profit": profit or 0.0,
-            "expenses": expenses or 0.0,
-            "active_projects": len(active_projects) if isinstance(active_projects, list) else (active_projects if isinstance(active_projects, int) else 0),
-            "employee_count": len(active_employees),
-            "recent_activities": [
-                {
-                    "id": act.id,
-                    "employee_id": act.employee_id,
-                    "activity_type": act.activity_type,
-                    "description": act.description,
-                    "timestamp": (act.timestamp or local_now()).isoformat()
-                }
-                for act in recent_activities
-            ],
-            "goals": goals,
-            "goal_progress": goal_progress,
-            # Company overview data
-            "company_overview": {
-                "business_name": business_name,
-                "mission": business_mission,
-                "industry": business_industry,
-                "founded": business_founded,
-                "location": business_location,
-                "ceo": ceo_name,
-                "total_projects": total_projects,
-                "completed_projects": len(completed_projects),
-                "active_projects_count": len(active_projects) if isinstance(active_projects, list) else (active_projects if isinstance(active_projects, int) else 0),
-                "total_project_revenue": total_project_revenue,
-                "average_project_budget": avg_project_budget,
-                "departments": departments,
-                "role_distribution": role_distribution,
-                "products_services": [
-                    {
-                        "id": p.id,
-                        "name": p.name,
-                        "description": p.description or "No description available",
-                        "status": p.status,
-                        "revenue": p.revenue or 0.0,
-                        "budget": p.budget or 0.0,
-                        "created_at": p.created_at.isoformat() if p.created_at else None,
-                        "completed_at": p.completed_at.isoformat() if p.completed_at else None
-                    }
-                    for p in all_projects[:20]  # Limit to 20 most recent projects
-                ]
-            },
-            # Leadership insights
-            "leadership_insights": {
-                "leadership_team": [
-                    {
-                        "id": emp.id,
-                        "name": emp.name,
-                        "title": emp.title,
-                        "role": emp.role,
-                        "department": emp.department,
-                        "hierarchy_level": emp.hierarchy_level,
-                        "status": emp.status,
-                        "hired_at": emp.hired_at.isoformat() if emp.hired_at else None
-                    }
-                    for emp in sorted(leadership_employees, key=lambda x: (x.hierarchy_level, x.name))
-                ],
-                "recent_decisions": leadership_decisions,
-                "recent_activities": leadership_activities,
-                "metrics": leadership_metrics
-            },
-            # Break tracking data
-            "break_tracking": {
-                "employees_on_break": employees_on_break,
-                "break_history": break_history_list,
-                "break_returns": break_returns,
-                "manager_abuse_incidents": manager_abuse_incidents,
-                "break_denials": break_denials,
-                "total_on_break": len(employees_on_break),
-                "total_breaks_today": len([b for b in today_breaks if b.activity_type in ["coffee_break", "break"]]),
-                "total_returns_today": len(break_returns),
-                "total_manager_abuse_today": len(manager_abuse_incidents),
-                "total_break_denials_today": len(break_denials)
-            }
+        .order_by(desc(Activity.timestamp))
+        .limit(limit)
+    )
+    activities = result.scalars().all()
+    
+    return [
+        {
+            "id": act.id,
+            "employee_id": act.employee_id,
+            "activity_type": act.activity_type,
+            "description": act.description,
+            "metadata": act.activity_metadata,
+            "timestamp": (act.timestamp or local_now()).isoformat()
         }
-    except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"Error in _fetch_dashboard_data: {e}")
-        print(error_details)
-        # Return default values on any error
-        return {
-            "revenue": 0.0,
-            "profit": 0.0,
-            "expenses": 0.0,
-            "active_projects": 0,
-            "employee_count": 0,
-            "recent_activities": [],
-            "goals": [],
-            "goal_progress": {},
-            "company_overview": {
-                "business_name": "TechFlow Solutions",
-                "mission": "To deliver innovative technology solutions that empower businesses to achieve their goals through cutting-edge software development and consulting services.",
-                "industry": "Technology & Software Development",
-                "founded": "2024",
-                "location": "San Francisco, CA",
-                "ceo": "Not Assigned",
-                "total_projects": 0,
-                "completed_projects": 0,
-                "active_projects_count": 0,
-                "total_project_revenue": 0.0,
-                "average_project_budget": 0.0,
-                "departments": {},
-                "role_distribution": {},
-                "products_services": []
-            },
-            "leadership_insights": {
-                "leadership_team": [],
-                "recent_decisions": [],
-                "recent_activities": [],
-                "metrics": {
-                    "total_leadership_count": 0,
-                    "ceo_count": 0,
-                    "manager_count": 0,
-                    "strategic_decisions_count": 0,
-                    "projects_led_by_leadership": 0
-                }
-            }
+        for act in activities
+    ]
+
+@router.get("/metrics")
+async def get_metrics(db: AsyncSession = Depends(get_db)):
+    """Get business metrics."""
+    result = await db.execute(
+        select(BusinessMetric)
+        .order_by(desc(BusinessMetric.timestamp))
+        .limit(100)
+    )
+    metrics = result.scalars().all()
+    
+    # Group by metric name and get latest
+    metric_dict = {}
+    for metric in metrics:
+        if metric.metric_name not in metric_dict:
+            metric_dict[metric.metric_name] = metric.value
+    
+    return metric_dict
+
+EMPTY_DASHBOARD = {
+    "revenue": 0.0,
+    "profit": 0.0,
+    "expenses": 0.0,
+    "active_projects": 0,
+    "employee_count": 0,
+    "recent_activities": [],
+    "goals": [],
+    "goal_progress": {},
+    "company_overview": {
+        "business_name": "TechFlow Solutions",
+        "mission": "To deliver innovative technology solutions that empower businesses to achieve their goals through cutting-edge software development and consulting services.",
+        "industry": "Technology & Software Development",
+        "founded": "2024",
+        "location": "New York",
+        "ceo": "Not Assigned",
+        "total_projects": 0,
+        "completed_projects": 0,
+        "active_projects_count": 0,
+        "total_project_revenue": 0.0,
+        "average_project_budget": 0.0,
+        "departments": {},
+        "role_distribution": {},
+        "products_services": []
+    },
+    "leadership_insights": {
+        "leadership_team": [],
+        "recent_decisions": [],
+        "recent_activities": [],
+        "metrics": {
+            "total_leadership_count": 0,
+            "ceo_count": 0,
+            "manager_count": 0,
+            "strategic_decisions_count": 0,
+            "projects_led_by_leadership": 0
         }
+    }
+}
+
+@router.get("/dashboard")
+async def get_dashboard(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Get dashboard data from the precomputed read model (one row; 304 when If-None-Match matches its ETag).
+    """
+    from business.dashboard_read_model import dashboard_read_model
+    try:
+        body, etag = await dashboard_read_model.serve(db, request.headers.get("if-none-match"))
+    except Exception as e:
+        logger.error(f"Error in dashboard endpoint: {e}", exc_info=True)
+        # Return default values instead of crashing
+        return EMPTY_DASHBOARD
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if body is None:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @router.get("/financials")
 async def get_financials(days: int = 30, db: AsyncSession = Depends(get_db)):
@@ -2817,167 +1711,8 @@ async def get_financials(days: int = 30, db: AsyncSession = Depends(get_db)):
 @router.get("/financials/analytics")
 async def get_financial_analytics(days: int = 90, db: AsyncSession = Depends(get_db)):
     """Get detailed financial analytics including payroll, trends, and breakdowns."""
-    cutoff = local_now() - timedelta(days=days)
-    
-    # Get all financial transactions
-    result = await db.execute(
-        select(Financial)
-        .where(Financial.timestamp >= cutoff)
-        .order_by(Financial.timestamp)
-    )
-    financials = result.scalars().all()
-    
-    # Get all active employees for payroll calculation
-    result = await db.execute(
-        select(Employee).where(Employee.status == "active")
-    )
-    employees = result.scalars().all()
-    
-    # Calculate payroll based on hierarchy level and role
-    # CEO: $150k/year, CTO/COO/CFO: $120k/year, Manager: $100k/year, Employee: $60k/year
-    payroll_by_role = {}
-    total_payroll = 0.0
-    payroll_by_department = {}
-    
-    for emp in employees:
-        # Calculate annual salary based on role
-        if emp.role == "CEO" or emp.hierarchy_level == 1:
-            annual_salary = 150000
-        elif emp.role in ["CTO", "COO", "CFO"]:
-            annual_salary = 120000  # C-level executives get higher salary than managers
-        elif emp.role == "Manager" or emp.hierarchy_level == 2:
-            annual_salary = 100000
-        else:
-            annual_salary = 60000
-        
-        # Calculate monthly salary
-        monthly_salary = annual_salary / 12
-        # Calculate for the period (days / 30.44 average days per month)
-        period_salary = monthly_salary * (days / 30.44)
-        
-        total_payroll += period_salary
-        
-        # Group by role
-        role = emp.role or "Employee"
-        if role not in payroll_by_role:
-            payroll_by_role[role] = 0.0
-        payroll_by_role[role] += period_salary
-        
-        # Group by department
-        dept = emp.department or "Unassigned"
-        if dept not in payroll_by_department:
-            payroll_by_department[dept] = 0.0
-        payroll_by_department[dept] += period_salary
-    
-    # Categorize expenses
-    expense_categories = {}
-    income_sources = {}
-    
-    for fin in financials:
-        desc = (fin.description or "").lower()
-        amount = fin.amount
-        
-        if fin.type == "expense":
-            # Categorize expenses
-            if "salary" in desc or "payroll" in desc or "wage" in desc:
-                category = "Payroll"
-            elif "rent" in desc or "office" in desc or "facility" in desc:
-                category = "Facilities"
-            elif "equipment" in desc or "hardware" in desc or "software" in desc or "license" in desc:
-                category = "Equipment & Software"
-            elif "marketing" in desc or "advertising" in desc or "promotion" in desc:
-                category = "Marketing"
-            elif "travel" in desc or "transport" in desc:
-                category = "Travel"
-            elif "utilities" in desc or "electric" in desc or "water" in desc or "internet" in desc:
-                category = "Utilities"
-            elif "project" in desc:
-                category = "Project Costs"
-            else:
-                category = "Other Expenses"
-            
-            if category not in expense_categories:
-                expense_categories[category] = 0.0
-            expense_categories[category] += amount
-        else:
-            # Categorize income
-            if "project" in desc:
-                category = "Project Revenue"
-            elif "sale" in desc or "product" in desc:
-                category = "Product Sales"
-            elif "service" in desc or "consulting" in desc:
-                category = "Services"
-            else:
-                category = "Other Income"
-            
-            if category not in income_sources:
-                income_sources[category] = 0.0
-            income_sources[category] += amount
-    
-    # Add payroll to expenses if not already there
-    if total_payroll > 0:
-        if "Payroll" not in expense_categories:
-            expense_categories["Payroll"] = 0.0
-        expense_categories["Payroll"] += total_payroll
-    
-    # Calculate daily trends
-    daily_data = {}
-    for fin in financials:
-        date_key = fin.timestamp.date().isoformat() if fin.timestamp else local_now().date().isoformat()
-        if date_key not in daily_data:
-            daily_data[date_key] = {"income": 0.0, "expenses": 0.0}
-        
-        if fin.type == "income":
-            daily_data[date_key]["income"] += fin.amount
-        else:
-            daily_data[date_key]["expenses"] += fin.amount
-    
-    # Convert to sorted list
-    daily_trends = [
-        {
-            "date": date,
-            "income": data["income"],
-            "expenses": data["expenses"],
-            "profit": data["income"] - data["expenses"]
-        }
-        for date, data in sorted(daily_data.items())
-    ]
-    
-    # Calculate totals
-    total_income = sum(f.amount for f in financials if f.type == "income")
-    total_expenses = sum(f.amount for f in financials if f.type == "expense") + total_payroll
-    net_profit = total_income - total_expenses
-    
-    return {
-        "summary": {
-            "total_income": total_income,
-            "total_expenses": total_expenses,
-            "net_profit": net_profit,
-            "payroll": total_payroll,
-            "period_days": days
-        },
-        "payroll": {
-            "total": total_payroll,
-            "by_role": payroll_by_role,
-            "by_department": payroll_by_department,
-            "employee_count": len(employees)
-        },
-        "expense_categories": expense_categories,
-        "income_sources": income_sources,
-        "daily_trends": daily_trends,
-        "employee_details": [
-            {
-                "id": emp.id,
-                "name": emp.name,
-                "role": emp.role,
-                "department": emp.department,
-                "hierarchy_level": emp.hierarchy_level,
-                "estimated_annual_salary": 150000 if (emp.role == "CEO" or emp.hierarchy_level == 1) else (120000 if emp.role in ["CTO", "COO", "CFO"] else (100000 if (emp.role == "Manager" or emp.hierarchy_level == 2) else 60000)),
-                "period_salary": (150000 if (emp.role == "CEO" or emp.hierarchy_level == 1) else (120000 if emp.role in ["CTO", "COO", "CFO"] else (100000 if (emp.role == "Manager" or emp.hierarchy_level == 2) else 60000))) / 12 * (days / 30.44)
-            }
-            for emp in employees
-        ]
-    }
+    from business.financial_manager import FinancialManager
+    return await FinancialManager(db).get_analytics(days)
 
 @router.get("/employees/{employee_id}/emails")
 async def get_employee_emails(employee_id: int, db: AsyncSession = Depends(get_db)):
@@ -4607,70 +3342,10 @@ async def generate_room_conversations(
     request: RoomConversationRequest,
     db: AsyncSession = Depends(get_db)
 ):
-    """Generate casual conversations between employees in a room."""
+    """Get casual conversations between employees in a room (served from the pre-generated pool when possible)."""
     try:
-        # Get employees
-        result = await db.execute(
-            select(Employee).where(Employee.id.in_(request.employee_ids))
-        )
-        employees = result.scalars().all()
-        
-        if len(employees) < 2:
-            return {"conversations": []}
-        
-        # Get business context
-        from engine.office_simulator import get_business_context
-        business_context = await get_business_context(db)
-        
-        # Select 1-2 pairs randomly (not everyone talking at once)
-        import random
-        num_pairs = min(2, len(employees) // 2)
-        selected_pairs = []
-        available_employees = employees.copy()
-        
-        for _ in range(num_pairs):
-            if len(available_employees) < 2:
-                break
-            pair = random.sample(available_employees, 2)
-            selected_pairs.append(pair)
-            # Remove selected employees from available pool
-            for emp in pair:
-                available_employees.remove(emp)
-        
-        # Generate conversations for each pair
-        from llm.ollama_client import OllamaClient
-        llm_client = OllamaClient()
-        conversations = []
-        
-        for pair in selected_pairs:
-            emp1, emp2 = pair
-            
-            # Randomly choose conversation type
-            conversation_type = random.choice(["work", "personal", "mixed"])
-            
-            # Generate conversation
-            conversation_data = await llm_client.generate_casual_conversation(
-                employee1_name=emp1.name,
-                employee1_title=emp1.title,
-                employee1_role=emp1.role,
-                employee1_personality=emp1.personality_traits or [],
-                employee2_name=emp2.name,
-                employee2_title=emp2.title,
-                employee2_role=emp2.role,
-                employee2_personality=emp2.personality_traits or [],
-                business_context=business_context,
-                conversation_type=conversation_type
-            )
-            
-            conversations.append({
-                "employee1_id": emp1.id,
-                "employee1_name": emp1.name,
-                "employee2_id": emp2.id,
-                "employee2_name": emp2.name,
-                "messages": conversation_data.get("messages", [])
-            })
-        
-        return {"conversations": conversations}
+        from business.conversation_pool import conversation_pool
+        return await conversation_pool.room_conversations(db, request.room_id, request.employee_ids)
     except Exception as e:
         print(f"Error generating room conversations: {e}")
         import traceback
@@ -4876,14 +3551,14 @@ Write a brief, direct boardroom discussion message (1-2 sentences) to {recipient
 Write only the message, nothing else. Make it feel like you're talking directly to them in person."""
 
             try:
-                client = await llm_client._get_client()
-                response = await client.post(
-                    f"{llm_client.base_url}/api/generate",
-                    json={
+                response = await llm_client._make_request_with_fallback(
+                    "/api/generate",
+                    {
                         "model": llm_client.model,
                         "prompt": prompt,
                         "stream": False
-                    }
+                    },
+                    kind="boardroom"
                 )
                 
                 if response.status_code == 200:
@@ -5323,8 +3998,9 @@ async def generate_meetings(db: AsyncSession = Depends(get_db)):
         manager = MeetingManager(db)
         meetings_created = await manager.generate_meetings()
         await db.commit()
-        # Invalidate dashboard cache since meetings affect dashboard
-        await invalidate_cache("_fetch_dashboard_data")
+        # Meetings show up in the dashboard's activity lists
+        from business.dashboard_read_model import dashboard_read_model
+        dashboard_read_model.request_refresh()
         return {
             "success": True,
             "message": f"Generated {meetings_created} meetings",
@@ -5551,6 +4227,7 @@ async def schedule_meeting_in_15min(db: AsyncSession = Depends(get_db)):
         db.add(meeting)
         await db.commit()
         await db.refresh(meeting)
+        meeting_scheduler.add_meeting(meeting)
         
         return {
             "success": True,
@@ -5659,6 +4336,7 @@ async def schedule_meeting_in_1min(db: AsyncSession = Depends(get_db)):
         db.add(meeting)
         await db.commit()
         await db.refresh(meeting)
+        meeting_scheduler.add_meeting(meeting)
         
         return {
             "success": True,
@@ -5694,10 +4372,12 @@ async def delete_meeting(meeting_id: int, db: AsyncSession = Depends(get_db)):
             raise HTTPException(status_code=404, detail="Meeting not found")
         
         await db.delete(meeting)
+        meeting_scheduler.forget(meeting.id)
         await db.commit()
         
-        # Invalidate dashboard cache since meetings affect dashboard
-        await invalidate_cache("_fetch_dashboard_data")
+        # Meetings show up in the dashboard's activity lists
+        from business.dashboard_read_model import dashboard_read_model
+        dashboard_read_model.request_refresh()
         
         return {
             "success": True,
@@ -5755,6 +4435,7 @@ async def cleanup_missed_meetings(db: AsyncSession = Depends(get_db)):
         deleted_count = 0
         for meeting in missed_meetings:
             await db.delete(meeting)
+            meeting_scheduler.forget(meeting.id)
             deleted_count += 1
         
         await db.commit()
@@ -5959,133 +4640,29 @@ async def generate_birthday_meetings(days_ahead: int = 90, db: AsyncSession = De
     
     # Delete existing birthday meetings with wrong attendee counts (less than 15)
     from database.models import Meeting
-    existing_result = await db.execute(select(Meeting))
-    all_meetings = existing_result.scalars().all()
+    from database.calendar_events import EVENT_BIRTHDAY_PARTY
+    existing_result = await db.execute(select(Meeting).where(Meeting.event_kind == EVENT_BIRTHDAY_PARTY))
     deleted = 0
-    for m in all_meetings:
-        meta = m.meeting_metadata or {}
-        if isinstance(meta, dict) and meta.get('is_birthday_party'):
-            attendee_count = len(m.attendee_ids or [])
-            if attendee_count != 15:
-                await db.delete(m)
-                deleted += 1
+    for m in existing_result.scalars().all():
+        attendee_count = len(m.attendee_ids or [])
+        if attendee_count != 15:
+            await db.delete(m)
+            meeting_scheduler.forget(m.id)
+            deleted += 1
     if deleted > 0:
         await db.commit()
         print(f"🗑️ Deleted {deleted} birthday meetings with incorrect attendee counts")
     
-    # Now generate the meetings properly
-    from database.models import Meeting
-    from employees.room_assigner import ROOM_BREAKROOM
-    from datetime import datetime, timedelta
-    from config import now as local_now
-    import random
-    
-    today = local_now()
-    today_start = today.replace(hour=0, minute=0, second=0, microsecond=0)
-    end_date = today_start + timedelta(days=min(days_ahead, 365))
-    
-    # Get employees with birthdays
-    result = await db.execute(
-        select(Employee)
-        .where(Employee.status == "active")
-        .where(Employee.fired_at.is_(None))
-        .where(Employee.birthday_month.isnot(None))
-        .where(Employee.birthday_day.isnot(None))
-    )
-    employees = result.scalars().all()
-    
-    force_created = 0
-    for emp in employees:
-        try:
-            bday = datetime(today.year, emp.birthday_month, emp.birthday_day, tzinfo=today.tzinfo)
-            if bday < today_start:
-                bday = datetime(today.year + 1, emp.birthday_month, emp.birthday_day, tzinfo=today.tzinfo)
-            
-            if bday.date() > end_date.date():
-                continue
-            
-            # Check if exists - simple check
-            start = bday.replace(hour=14, minute=0, second=0, microsecond=0)
-            check_start = start - timedelta(hours=12)
-            check_end = start + timedelta(hours=12)
-            existing_result = await db.execute(
-                select(Meeting)
-                .where(Meeting.start_time >= check_start)
-                .where(Meeting.start_time <= check_end)
-            )
-            existing_meetings = existing_result.scalars().all()
-            exists = False
-            for m in existing_meetings:
-                meta = m.meeting_metadata or {}
-                if isinstance(meta, dict) and meta.get('is_birthday_party') and meta.get('birthday_employee_id') == emp.id:
-                    exists = True
-                    break
-            if exists:
-                continue
-            
-            # Create meeting  
-            end = start + timedelta(hours=1)
-            
-            all_emps_result = await db.execute(
-                select(Employee).where(Employee.status == "active").where(Employee.id != emp.id)
-            )
-            all_emps = all_emps_result.scalars().all()
-            # Get exactly 14 other employees (or as many as available)
-            num_attendees = min(14, len(all_emps))
-            if num_attendees > 0:
-                attendees = random.sample(all_emps, num_attendees)
-            else:
-                attendees = []
-            # Create attendee_ids: 14 colleagues + birthday person = 15 total
-            attendee_ids = [e.id for e in attendees] + [emp.id]
-            
-            # Ensure we have exactly 15 (or as many as possible)
-            if len(attendee_ids) < 15 and len(all_emps) < 14:
-                attendee_ids = [e.id for e in all_emps] + [emp.id]
-            
-            room, floor = random.choice([(f"{ROOM_BREAKROOM}_floor2", 2), (ROOM_BREAKROOM, 1)])
-            room_name = room.replace("_floor2", "").replace("_", " ").title()
-            
-            meeting = Meeting(
-                title=f"🎂 {emp.name}'s Birthday Party",
-                description=f"Birthday party for {emp.name}",
-                organizer_id=emp.id,
-                attendee_ids=attendee_ids,
-                start_time=start,
-                end_time=end,
-                status="scheduled",
-                agenda=f"Birthday celebration for {emp.name}",
-                outline="1. Welcome\n2. Cake\n3. Song\n4. Gifts",
-                meeting_metadata={
-                    "is_birthday_party": True,
-                    "birthday_employee_id": emp.id,
-                    "room_name": room_name,
-                    "party_floor": floor
-                }
-            )
-            db.add(meeting)
-            force_created += 1
-        except Exception as e:
-            print(f"Error creating for {emp.name}: {e}")
-            continue
-    
-    await db.commit()
-    
-    # Also run the manager function
+    # Generate the parties through the manager: one INSERT ... ON CONFLICT DO NOTHING on the
+    # event key, so re-runs (or the startup birthday job running concurrently) skip existing ones
     manager = BirthdayManager(db)
-    manager_created = await manager.generate_birthday_party_meetings(days_ahead=days_ahead)
-    
-    meetings_created = force_created + manager_created
+    meetings_created = await manager.generate_birthday_party_meetings(days_ahead=days_ahead)
     
     # Verify meetings were created
-    from database.models import Meeting
-    verify_result = await db.execute(select(Meeting))
-    all_meetings = verify_result.scalars().all()
-    verified_count = 0
-    for meeting in all_meetings:
-        metadata = meeting.meeting_metadata or {}
-        if isinstance(metadata, dict) and metadata.get('is_birthday_party'):
-            verified_count += 1
+    from sqlalchemy import func
+    verified_count = (await db.execute(
+        select(func.count(Meeting.id)).where(Meeting.event_kind == EVENT_BIRTHDAY_PARTY)
+    )).scalar() or 0
     
     return {
         "message": f"Generated {meetings_created} birthday party meetings",
@@ -6178,6 +4755,7 @@ async def force_create_birthday_test(db: AsyncSession = Depends(get_db)):
     db.add(meeting)
     await db.commit()
     await db.refresh(meeting)
+    meeting_scheduler.add_meeting(meeting)
     
     return {
         "success": True,
@@ -6980,25 +5558,42 @@ async def db_health_check(db: AsyncSession = Depends(get_db)):
             "error": str(e)
         }
 
-# Shared Drive API Endpoints
-@cached_query(cache_duration=30)  # Cache for 30 seconds (shared drive changes less frequently)
-async def _fetch_shared_drive_structure(db: AsyncSession):
-    """Internal function to fetch shared drive structure."""
-    from business.shared_drive_manager import SharedDriveManager
-    manager = SharedDriveManager(db)
-    structure = await manager.get_file_structure()
-    # Ensure we always return a dict, never None
-    return structure if structure is not None else {}
+# Startup readiness endpoints (see engine/startup.py)
+@router.get("/health/ready")
+async def readiness_check():
+    """Readiness probe: 200 once the schema and seed data are in place, 503 before that."""
+    from fastapi.responses import JSONResponse
+    from engine.startup import startup_progress
+    snapshot = startup_progress.snapshot()
+    body = {
+        "ready": snapshot["ready"],
+        "startup_complete": snapshot["complete"],
+        "progress": snapshot["progress"],
+    }
+    return JSONResponse(status_code=200 if snapshot["ready"] else 503, content=body)
 
+
+@router.get("/health/startup")
+async def startup_status():
+    """Progress of every startup stage, including the background backfill jobs."""
+    from engine.startup import startup_progress
+    return startup_progress.snapshot()
+
+# Shared Drive API Endpoints
 @router.get("/shared-drive/structure")
-async def get_shared_drive_structure(db: AsyncSession = Depends(get_db)):
-    """Get hierarchical file structure."""
+async def get_shared_drive_structure(request: Request, db: AsyncSession = Depends(get_db)):
+    """Get hierarchical file structure (served from the tree index, supports If-None-Match)."""
+    from business.shared_drive_index import shared_drive_index
     try:
-        return await _fetch_shared_drive_structure(db)
+        etag, body = await shared_drive_index.get_tree(db)
     except Exception as e:
         logger.error(f"Error in get_shared_drive_structure: {e}", exc_info=True)
         # Return empty structure - frontend will use cache if available
         return {}
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @cached_query(cache_duration=30)  # Cache for 30 seconds
 async def _fetch_shared_drive_files(
@@ -7011,6 +5606,7 @@ async def _fetch_shared_drive_files(
 ):
     """Internal function to fetch shared drive files."""
     query = select(SharedDriveFile).options(
+        defer(SharedDriveFile.content_html),  # listing never returns the body
         selectinload(SharedDriveFile.employee),
         selectinload(SharedDriveFile.project),
         selectinload(SharedDriveFile.last_updated_by)
@@ -7158,7 +5754,8 @@ async def get_file_version_content(
     version_number: int,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get specific version content."""
+    """Get specific version content (rebuilt from the delta-compressed history)."""
+    from business.shared_drive_versions import get_version_content
     result = await db.execute(
         select(SharedDriveFileVersion)
         .options(selectinload(SharedDriveFileVersion.created_by))
@@ -7166,17 +5763,23 @@ async def get_file_version_content(
             SharedDriveFileVersion.file_id == file_id,
             SharedDriveFileVersion.version_number == version_number
         )
+        .order_by(SharedDriveFileVersion.id)
+        .limit(1)
     )
     version = result.scalar_one_or_none()
     
     if not version:
         raise HTTPException(status_code=404, detail="Version not found")
     
+    content_html = await get_version_content(db, file_id, version_number)
+    if content_html is None:
+        raise HTTPException(status_code=404, detail="Version not found")
+    
     return {
         "id": version.id,
         "file_id": version.file_id,
         "version_number": version.version_number,
-        "content_html": version.content_html,
+        "content_html": content_html,
         "file_size": version.file_size,
         "created_by_id": version.created_by_id,
         "created_by_name": version.created_by.name if version.created_by else None,
@@ -7757,176 +6360,13 @@ async def generate_home_conversations(
     request: HomeConversationRequest,
     db: AsyncSession = Depends(get_db)
 ):
-    """Generate home conversations between employee and family members, or between family members if employee is at work."""
+    """Get home conversations between employee and family members, or between family members if employee is at work."""
     try:
-        # Get employee
-        result = await db.execute(
-            select(Employee).where(Employee.id == request.employee_id, Employee.status == "active")
-        )
-        employee = result.scalar_one_or_none()
-
-        if not employee:
+        from business.conversation_pool import conversation_pool
+        result = await conversation_pool.home_conversations(db, request.employee_id)
+        if result is None:
             raise HTTPException(status_code=404, detail="Employee not found")
-
-        # Get family members
-        family_result = await db.execute(
-            select(FamilyMember).where(FamilyMember.employee_id == request.employee_id)
-        )
-        family_members = family_result.scalars().all()
-
-        if len(family_members) == 0:
-            return {"conversations": []}
-
-        # Get home pets for context
-        pet_result = await db.execute(
-            select(HomePet).where(HomePet.employee_id == request.employee_id)
-        )
-        home_pets = pet_result.scalars().all()
-
-        # Get home settings for context
-        home_result = await db.execute(
-            select(HomeSettings).where(HomeSettings.employee_id == request.employee_id)
-        )
-        home_settings = home_result.scalar_one_or_none()
-
-        # Check if it's work hours
-        from config import is_work_hours
-        is_work_time = is_work_hours()
-
-        # Generate conversations
-        from llm.ollama_client import OllamaClient
-        llm_client = OllamaClient()
-        conversations = []
-
-        # Get current time for context
-        from config import now
-        current_time = now()
-        time_of_day = "evening" if 18 <= current_time.hour < 22 else "night" if 22 <= current_time.hour or current_time.hour < 6 else "morning" if 6 <= current_time.hour < 12 else "afternoon"
-
-        import random
-
-        if is_work_time:
-            # Employee is at work - generate conversations between family members
-            if len(family_members) >= 2:
-                # Generate 1-2 conversations between family members
-                num_conversations = min(2, len(family_members) // 2)
-                available_family = family_members.copy()
-                
-                for _ in range(num_conversations):
-                    if len(available_family) < 2:
-                        break
-                    
-                    # Pick two different family members
-                    pair = random.sample(available_family, 2)
-                    fm1, fm2 = pair
-                    
-                    # Remove them from available pool
-                    available_family.remove(fm1)
-                    available_family.remove(fm2)
-                    
-                    # Generate conversation between family members
-                    conversation_data = await llm_client.generate_family_conversation(
-                        family_member1_name=fm1.name,
-                        family_member1_relationship=fm1.relationship_type,
-                        family_member1_age=fm1.age,
-                        family_member1_personality=fm1.personality_traits or [],
-                        family_member1_interests=fm1.interests or [],
-                        family_member1_occupation=fm1.occupation,
-                        family_member2_name=fm2.name,
-                        family_member2_relationship=fm2.relationship_type,
-                        family_member2_age=fm2.age,
-                        family_member2_personality=fm2.personality_traits or [],
-                        family_member2_interests=fm2.interests or [],
-                        family_member2_occupation=fm2.occupation,
-                        employee_name=employee.name,
-                        time_of_day=time_of_day,
-                        has_pets=len(home_pets) > 0,
-                        home_type=home_settings.home_type if home_settings else "city"
-                    )
-                    
-                    conversations.append({
-                        "family_member1_id": fm1.id,
-                        "family_member1_name": fm1.name,
-                        "family_member2_id": fm2.id,
-                        "family_member2_name": fm2.name,
-                        "employee_id": None,  # Employee not involved
-                        "employee_name": None,
-                        "messages": conversation_data.get("messages", [])
-                    })
-        else:
-            # Employee is home - generate conversations between employee and family members
-            # Select 1-2 family members to have conversations with
-            num_conversations = min(2, len(family_members))
-            selected_family = random.sample(family_members, num_conversations)
-
-            for family_member in selected_family:
-                # Generate conversation between employee and family member
-                conversation_data = await llm_client.generate_home_conversation(
-                    employee_name=employee.name,
-                    employee_title=employee.title,
-                    employee_personality=employee.personality_traits or [],
-                    employee_hobbies=employee.hobbies or [],
-                    family_member_name=family_member.name,
-                    family_member_relationship=family_member.relationship_type,
-                    family_member_age=family_member.age,
-                    family_member_personality=family_member.personality_traits or [],
-                    family_member_interests=family_member.interests or [],
-                    family_member_occupation=family_member.occupation,
-                    time_of_day=time_of_day,
-                    has_pets=len(home_pets) > 0,
-                    home_type=home_settings.home_type if home_settings else "city"
-                )
-
-                conversations.append({
-                    "employee_id": employee.id,
-                    "employee_name": employee.name,
-                    "family_member_id": family_member.id,
-                    "family_member_name": family_member.name,
-                    "family_member1_id": None,
-                    "family_member1_name": None,
-                    "family_member2_id": None,
-                    "family_member2_name": None,
-                    "messages": conversation_data.get("messages", [])
-                })
-            
-            # Also generate conversations between family members if there are 2+ family members
-            if len(family_members) >= 2:
-                # Generate 1 conversation between family members
-                available_family = [fm for fm in family_members if fm.id not in [f.id for f in selected_family]]
-                if len(available_family) >= 2:
-                    pair = random.sample(available_family, 2)
-                    fm1, fm2 = pair
-                    
-                    conversation_data = await llm_client.generate_family_conversation(
-                        family_member1_name=fm1.name,
-                        family_member1_relationship=fm1.relationship_type,
-                        family_member1_age=fm1.age,
-                        family_member1_personality=fm1.personality_traits or [],
-                        family_member1_interests=fm1.interests or [],
-                        family_member1_occupation=fm1.occupation,
-                        family_member2_name=fm2.name,
-                        family_member2_relationship=fm2.relationship_type,
-                        family_member2_age=fm2.age,
-                        family_member2_personality=fm2.personality_traits or [],
-                        family_member2_interests=fm2.interests or [],
-                        family_member2_occupation=fm2.occupation,
-                        employee_name=employee.name,
-                        time_of_day=time_of_day,
-                        has_pets=len(home_pets) > 0,
-                        home_type=home_settings.home_type if home_settings else "city"
-                    )
-                    
-                    conversations.append({
-                        "family_member1_id": fm1.id,
-                        "family_member1_name": fm1.name,
-                        "family_member2_id": fm2.id,
-                        "family_member2_name": fm2.name,
-                        "employee_id": None,
-                        "employee_name": None,
-                        "messages": conversation_data.get("messages", [])
-                    })
-
-        return {"conversations": conversations}
+        return result
     except Exception as e:
         print(f"Error generating home conversations: {e}")
         import traceback
@@ -8323,3 +6763,150 @@ async def return_from_sick(employee_id: int, db: AsyncSession = Depends(get_db))
 
     return return_result
 
+
+
+@router.get("/debug/queries")
+async def get_query_stats(top: int = 25, explain: bool = True):
+    """
+    Query instrumentation report: statement fingerprints with p50/p99, per-request and
+    per-simulator-phase query counts, likely N+1 patterns and the slowest statements
+    with EXPLAIN plans. Requires QUERY_STATS=1.
+    """
+    from database.query_stats import get_report
+    from database.database import engine
+    return await get_report(engine, top=top, explain=explain)
+
+
+@router.delete("/debug/queries")
+async def reset_query_stats():
+    """Clear the recorded query statistics."""
+    from database.query_stats import reset, is_enabled
+    reset()
+    return {"success": True, "enabled": is_enabled()}
+
+
+@router.get("/debug/statement-cache")
+async def get_statement_cache_stats():
+    """
+    SQLAlchemy compiled-statement cache usage: overall hit rate and the hit rate of each
+    prebuilt hot query (database/hot_queries.py).
+    """
+    from database.hot_queries import get_report
+    return get_report()
+
+
+@router.delete("/debug/statement-cache")
+async def reset_statement_cache_stats():
+    """Clear the compiled-cache hit/miss counters."""
+    from database.hot_queries import reset
+    reset()
+    return {"success": True}
+
+
+@router.get("/debug/llm-metrics")
+async def get_llm_metrics():
+    """
+    Token counts and timings reported by Ollama, overall and per call type: prompt tokens
+    evaluated (tokens served from the prompt cache are not counted), generated tokens,
+    prompt/generation time, and how often the model had to be loaded.
+    """
+    from llm.metrics import get_report
+    from llm.ollama_client import OLLAMA_KEEP_ALIVE
+    report = get_report()
+    report["keep_alive"] = OLLAMA_KEEP_ALIVE
+    return report
+
+
+@router.delete("/debug/llm-metrics")
+async def reset_llm_metrics():
+    """Clear the LLM token and timing counters."""
+    from llm.metrics import reset
+    reset()
+    return {"success": True}
+
+
+@router.get("/debug/llm-endpoints")
+async def get_llm_endpoints():
+    """
+    Ollama server pool: routing mode, requests waiting for a free slot, and per server its
+    cap, in-flight requests, successes, failures, retries, latency and last health probe.
+    """
+    from llm.ollama_client import get_endpoint_pool
+    return get_endpoint_pool().snapshot()
+
+
+@router.get("/debug/llm-circuits")
+async def get_llm_circuits():
+    """
+    LLM circuit breakers: per Ollama server and per call type, the state (closed, open,
+    half_open), consecutive failures, how often it opened, calls answered with the
+    fallback while open, and when the next trial call is allowed.
+    """
+    from llm.circuit_breaker import FAILURE_THRESHOLD, RESET_SECONDS, SLOW_CALL_SECONDS, method_report
+    from llm.ollama_client import get_endpoint_pool
+    return {
+        "failure_threshold": FAILURE_THRESHOLD,
+        "reset_seconds": RESET_SECONDS,
+        "slow_call_seconds": SLOW_CALL_SECONDS or None,
+        "servers": {e.url: e.breaker.to_dict() for e in get_endpoint_pool().endpoints},
+        "methods": method_report(),
+    }
+
+
+@router.delete("/debug/llm-circuits")
+async def reset_llm_circuits():
+    """Close every call-type circuit (server circuits follow their health probes)."""
+    from llm.circuit_breaker import reset_methods
+    reset_methods()
+    return {"success": True}
+
+
+@router.get("/debug/employee-view-cache")
+async def get_employee_view_cache_stats():
+    """Screen view / thoughts cache: entries, fresh and stale hits, misses, coalesced requests, background refreshes."""
+    from business.employee_view_cache import employee_view_cache
+    return employee_view_cache.stats()
+
+
+@router.get("/debug/meeting-scheduler")
+async def get_meeting_scheduler_stats():
+    """Meeting transition scheduler: tracked meetings, pending entries, next due time, fired starts/ends."""
+    return meeting_scheduler.stats()
+
+
+@router.get("/debug/jobs")
+async def get_job_scheduler_stats():
+    """Periodic simulator jobs: interval, runs, failures, skipped slots, overruns, start lag and durations."""
+    from engine.job_scheduler import job_scheduler
+    return job_scheduler.stats()
+
+
+@router.get("/debug/dashboard")
+async def get_dashboard_read_model_stats():
+    """Dashboard read model: served version, rebuilds and 304 responses."""
+    from business.dashboard_read_model import dashboard_read_model
+    return dashboard_read_model.stats()
+
+
+@router.get("/debug/db-admission")
+async def get_db_admission_stats():
+    """
+    Connection admission report: per-subsystem (api, simulator, background) reserved share,
+    limit, slots in use, queue length and wait times, plus the SQLAlchemy pool status.
+    """
+    from database.admission import get_controller
+    from database.database import engine
+    controller = get_controller()
+    report = controller.snapshot() if controller else {"enabled": False}
+    report["pool"] = engine.pool.status()
+    return report
+
+
+@router.delete("/debug/db-admission")
+async def reset_db_admission_stats():
+    """Clear the admission wait statistics."""
+    from database.admission import get_controller
+    controller = get_controller()
+    if controller:
+        controller.reset_stats()
+    return {"success": True, "enabled": controller is not None}
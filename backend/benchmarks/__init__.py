@@ -0,0 +1 @@
+"""Performance benchmarks for the simulator hot paths (see run_benchmarks.py)."""
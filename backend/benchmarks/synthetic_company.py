@@ -0,0 +1,264 @@
+"""
+Synthetic company generator for benchmarks.
+
+Builds a company of any size in the same shape seed.py produces (executives,
+managers, employees, projects, products, financials) plus a few days of
+activity history - tasks, activities, emails, chats, reviews, meetings and
+shared drive files - so the hot paths have realistic amounts of data to scan.
+
+Rows are written with bulk INSERTs, so even the 5000-employee company only
+takes a few seconds to generate. Output is fully determined by the seed.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from business.financial_manager import categorize
+from config import utcnow
+from database.employee_summaries import rebuild_employee_summaries
+from database.models import (
+    Employee, Project, Task, Activity, Email, ChatMessage, EmployeeReview,
+    Financial, Meeting, SharedDriveFile, BusinessSettings, Product, ProductTeamMember
+)
+from employees.room_assigner import (
+    ROOM_OPEN_OFFICE, ROOM_CUBICLES, ROOM_HOTDESK, ROOM_EXECUTIVE_SUITE, ROOM_MANAGER_OFFICE
+)
+from seed import EMPLOYEES_DATA
+
+
+FIRST_NAMES = [
+    "Aisha", "Ben", "Carla", "Dev", "Elif", "Farid", "Gina", "Hugo", "Ines", "Jonas",
+    "Kira", "Liam", "Mina", "Noah", "Omar", "Paula", "Quinn", "Ravi", "Sofia", "Tomas",
+    "Uma", "Victor", "Wen", "Xavier", "Yara", "Zane",
+]
+LAST_NAMES = [
+    "Adler", "Brooks", "Castillo", "Dubois", "Eriksen", "Fong", "Garcia", "Hughes",
+    "Ibrahim", "Jensen", "Kowalski", "Lopez", "Mori", "Nakamura", "O'Brien", "Petrov",
+    "Quinlan", "Reyes", "Singh", "Tran", "Ueda", "Vargas", "Weber", "Young", "Zhou",
+]
+DEPARTMENTS = ["Engineering", "Product", "Marketing", "Sales", "Operations", "Finance", "HR", "Design"]
+TRAITS = ["analytical", "creative", "collaborative", "organized", "curious", "reliable",
+          "energetic", "methodical", "adaptable", "detail-oriented"]
+HOBBIES = [["reading", "hiking"], ["cooking", "yoga"], ["gaming", "music"], ["cycling", "fitness"],
+           ["art", "writing"], ["chess", "puzzles"]]
+ACTIVITY_TYPES = ["task_progress", "decision", "email_sent", "chat_sent", "meeting", "coffee_break",
+                  "task_completed", "movement"]
+# (room id, floor) pairs used as desks, spread over the floors like room_assigner does
+DESK_ROOMS = [
+    (ROOM_OPEN_OFFICE, 1), (ROOM_CUBICLES, 1), (f"{ROOM_CUBICLES}_floor2", 2),
+    (f"{ROOM_HOTDESK}_floor3", 3), (f"{ROOM_CUBICLES}_floor4", 4),
+]
+CHUNK_SIZE = 2000
+
+
+async def _bulk_insert(db: AsyncSession, model, rows: List[Dict]):
+    """Insert rows in chunks to stay below the bind parameter limit."""
+    for start in range(0, len(rows), CHUNK_SIZE):
+        chunk = rows[start:start + CHUNK_SIZE]
+        if chunk:
+            await db.execute(insert(model), chunk)
+
+
+def _employee_rows(employee_count: int, rng: random.Random, now: datetime) -> List[Dict]:
+    """Executives from seed.py, then one manager per eight employees."""
+    rows = []
+    for data in EMPLOYEES_DATA[:min(len(EMPLOYEES_DATA), employee_count)]:
+        row = {k: v for k, v in data.items() if k in ("name", "title", "role", "hierarchy_level",
+                                                    "department", "personality_traits", "backstory")}
+        rows.append(row)
+
+    index = 0
+    while len(rows) < employee_count:
+        index += 1
+        department = DEPARTMENTS[index % len(DEPARTMENTS)]
+        is_manager = index % 9 == 0
+        rows.append({
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index}",
+            "title": f"{department} Manager" if is_manager else f"{department} Specialist",
+            "role": "Manager" if is_manager else "Employee",
+            "hierarchy_level": 2 if is_manager else 3,
+            "department": department,
+            "personality_traits": rng.sample(TRAITS, 3),
+            "backstory": f"Joined the {department} team after several years in the industry.",
+        })
+
+    for i, row in enumerate(rows):
+        if row["role"] in ("CEO", "CTO", "COO", "CFO"):
+            room, floor = ROOM_EXECUTIVE_SUITE + "_floor2", 2
+        elif row["role"] == "Manager":
+            room, floor = ROOM_MANAGER_OFFICE, 1
+        else:
+            room, floor = DESK_ROOMS[i % len(DESK_ROOMS)]
+        row.update({
+            "status": "active",
+            "activity_state": rng.choice(["working", "working", "idle", "meeting"]),
+            "home_room": room,
+            "current_room": room,
+            "floor": floor,
+            "hired_at": now - timedelta(days=rng.randint(10, 400)),
+            "birthday_month": rng.randint(1, 12),
+            "birthday_day": rng.randint(1, 28),
+            "hobbies": rng.choice(HOBBIES),
+            "online_status": "online",
+        })
+    return rows
+
+
+async def generate_company(db: AsyncSession, employee_count: int, seed: int = 0, history_days: int = 3) -> Dict[str, int]:
+    """
+    Populate an empty database with a synthetic company.
+
+    Args:
+        db: Database session (committed by this function)
+        employee_count: Number of employees, including the seed.py executives
+        seed: Seed for all generated values
+        history_days: Days of activity history to generate
+
+    Returns:
+        Row counts per table
+    """
+    rng = random.Random(seed)
+    now = utcnow()
+    counts: Dict[str, int] = {}
+
+    employee_rows = _employee_rows(employee_count, rng, now)
+    await _bulk_insert(db, Employee, employee_rows)
+    result = await db.execute(select(Employee.id, Employee.role, Employee.department).order_by(Employee.id))
+    employees = result.all()
+    employee_ids = [e.id for e in employees]
+    manager_ids = [e.id for e in employees if e.role in ("CEO", "CTO", "COO", "CFO", "Manager")] or employee_ids[:1]
+    counts["employees"] = len(employee_ids)
+
+    await db.execute(insert(BusinessSettings).values(setting_key="business_name", setting_value="Benchmark Corp"))
+    product_id = (await db.execute(
+        insert(Product).values(name="Business Platform", description="Benchmark product", category="SaaS",
+                               status="active", price=0.0, launch_date=now).returning(Product.id)
+    )).scalar_one()
+    await _bulk_insert(db, ProductTeamMember, [
+        {"product_id": product_id, "employee_id": eid, "role": "Executive Sponsor",
+         "responsibility": "Product strategy and oversight"}
+        for eid in manager_ids[:10]
+    ])
+
+    project_count = max(3, employee_count // 10)
+    await _bulk_insert(db, Project, [
+        {"name": f"Project {i + 1}", "description": "Synthetic benchmark project",
+         "status": rng.choice(["active", "active", "planning", "completed"]),
+         "priority": rng.choice(["high", "medium", "low"]), "budget": float(rng.randint(20, 200) * 1000),
+         "revenue": float(rng.randint(0, 300) * 1000), "product_id": product_id,
+         "last_activity_at": now - timedelta(hours=rng.randint(0, 48))}
+        for i in range(project_count)
+    ])
+    project_ids = list((await db.execute(select(Project.id))).scalars())
+    counts["projects"] = len(project_ids)
+
+    task_rows = []
+    for eid in employee_ids:
+        for _ in range(2):
+            status = rng.choice(["pending", "in_progress", "in_progress", "completed"])
+            task_rows.append({
+                "employee_id": eid, "project_id": rng.choice(project_ids),
+                "description": "Synthetic benchmark task", "status": status,
+                "priority": rng.choice(["high", "medium", "low"]),
+                "progress": 100.0 if status == "completed" else float(rng.randint(0, 95)),
+                "completed_at": now - timedelta(hours=rng.randint(1, 72)) if status == "completed" else None,
+            })
+    await _bulk_insert(db, Task, task_rows)
+    counts["tasks"] = len(task_rows)
+
+    history_seconds = history_days * 86400
+
+    def past() -> datetime:
+        return now - timedelta(seconds=rng.randint(0, history_seconds))
+
+    activity_rows = [
+        {"employee_id": rng.choice(employee_ids), "activity_type": rng.choice(ACTIVITY_TYPES),
+         "description": "Synthetic benchmark activity", "activity_metadata": {"synthetic": True},
+         "timestamp": past()}
+        for _ in range(employee_count * 20)
+    ]
+    await _bulk_insert(db, Activity, activity_rows)
+    counts["activities"] = len(activity_rows)
+
+    email_rows, chat_rows = [], []
+    for _ in range(employee_count * 5):
+        sender, recipient = rng.sample(employee_ids, 2) if len(employee_ids) > 1 else (employee_ids[0], employee_ids[0])
+        thread_id = f"{min(sender, recipient)}_{max(sender, recipient)}"
+        email_rows.append({"sender_id": sender, "recipient_id": recipient, "subject": "Status update",
+                           "body": "Here is a quick update on my current work.", "read": rng.random() < 0.8,
+                           "thread_id": thread_id, "timestamp": past()})
+        chat_rows.append({"sender_id": sender, "recipient_id": recipient,
+                          "message": "Do you have a minute to sync?", "thread_id": thread_id,
+                          "timestamp": past()})
+    await _bulk_insert(db, Email, email_rows)
+    await _bulk_insert(db, ChatMessage, chat_rows)
+    counts["emails"] = len(email_rows)
+    counts["chat_messages"] = len(chat_rows)
+
+    # Reviews older than the 6 hour review cycle so conduct_periodic_reviews has work to do
+    review_rows = []
+    for eid in employee_ids:
+        for _ in range(2):
+            review_date = now - timedelta(hours=rng.randint(7, 24 * max(history_days, 1)))
+            review_rows.append({
+                "employee_id": eid, "manager_id": rng.choice(manager_ids),
+                "review_date": review_date, "overall_rating": round(rng.uniform(2.5, 5.0), 1),
+                "performance_rating": round(rng.uniform(2.5, 5.0), 1),
+                "teamwork_rating": round(rng.uniform(2.5, 5.0), 1),
+                "communication_rating": round(rng.uniform(2.5, 5.0), 1),
+                "productivity_rating": round(rng.uniform(2.5, 5.0), 1),
+                "comments": "Solid contributor.", "review_period_start": review_date - timedelta(hours=6),
+                "review_period_end": review_date,
+            })
+    await _bulk_insert(db, EmployeeReview, review_rows)
+    counts["employee_reviews"] = len(review_rows)
+    # Bulk inserts skip the review paths that maintain the projection the employees list reads
+    counts["employee_summaries"] = await rebuild_employee_summaries(db)
+
+    meeting_rows = []
+    for _ in range(max(2, employee_count // 20)):
+        start = now + timedelta(minutes=rng.randint(-48 * 60, 48 * 60))
+        attendees = rng.sample(employee_ids, min(len(employee_ids), rng.randint(3, 8)))
+        meeting_rows.append({
+            "title": "Team sync", "description": "Synthetic benchmark meeting", "organizer_id": attendees[0],
+            "attendee_ids": attendees, "start_time": start, "end_time": start + timedelta(minutes=30),
+            "status": "completed" if start < now - timedelta(minutes=30) else "scheduled",
+            "agenda": "Updates and blockers",
+        })
+    await _bulk_insert(db, Meeting, meeting_rows)
+    counts["meetings"] = len(meeting_rows)
+
+    file_rows = []
+    for e in employees:
+        department = e.department or "General"
+        file_rows.append({
+            "file_name": f"notes_{e.id}.html", "file_type": "document", "department": department,
+            "employee_id": e.id, "project_id": rng.choice(project_ids),
+            "file_path": f"{department}/employee_{e.id}/notes_{e.id}.html",
+            "content_html": "<h1>Notes</h1>" + "<p>Synthetic benchmark content.</p>" * 40,
+            "file_size": 1400, "file_metadata": {"synthetic": True}, "last_updated_by_id": e.id,
+        })
+    await _bulk_insert(db, SharedDriveFile, file_rows)
+    counts["shared_drive_files"] = len(file_rows)
+
+    financial_rows = [{"type": "income", "amount": 500000.0, "description": "Initial seed funding", "category": categorize("income", "Initial seed funding"), "project_id": None, "timestamp": now - timedelta(seconds=history_seconds)}]
+    for _ in range(employee_count * 2):
+        is_income = rng.random() < 0.4
+        entry_type = "income" if is_income else "expense"
+        description = "Product sales" if is_income else rng.choice(["Payroll", "Software licenses", "Office supplies"])
+        financial_rows.append({
+            "type": entry_type,
+            "amount": float(rng.randint(100, 20000)),
+            "description": description,
+            "category": categorize(entry_type, description),
+            "project_id": rng.choice(project_ids) if rng.random() < 0.3 else None,
+            "timestamp": past(),
+        })
+    await _bulk_insert(db, Financial, financial_rows)
+    counts["financials"] = len(financial_rows)
+
+    await db.commit()
+    return counts
@@ -1,8 +1,8 @@
 """Helper module to broadcast activities via WebSocket."""
 from typing import Optional
 from database.models import Activity, Employee
+from database.hot_queries import EMPLOYEE_BY_ID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from config import now as local_now
 
 # Global reference to simulator instance (set by main.py)
@@ -31,9 +31,7 @@ async def broadcast_activity(activity: Activity, db: AsyncSession, employee: Opt
         # Get employee info if not provided
         if not employee and activity.employee_id:
             try:
-                result = await db.execute(
-                    select(Employee).where(Employee.id == activity.employee_id)
-                )
+                result = await db.execute(EMPLOYEE_BY_ID, {"employee_id": activity.employee_id})
                 employee = result.scalar_one_or_none()
             except:
                 employee = None
@@ -1,6 +1,8 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.models import Employee, BirthdayCelebration, Activity, Notification
+from database.calendar_events import EVENT_BIRTHDAY_PARTY, get_calendar_event, insert_calendar_event
+from business.meeting_scheduler import meeting_scheduler
 from sqlalchemy import select, func
 from datetime import datetime, timedelta
 from config import now as local_now, get_timezone
@@ -14,6 +16,11 @@ def ensure_timezone_aware(dt: datetime) -> datetime:
         return get_timezone().localize(dt)
     return dt
 
+def sample_colleagues(employees: List[Employee], employee_id: int, count: int) -> List[Employee]:
+    """Pick up to count employees other than employee_id without copying the whole list."""
+    picked = random.sample(employees, min(count + 1, len(employees)))
+    return [e for e in picked if e.id != employee_id][:count]
+
 class BirthdayManager:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -37,7 +44,6 @@ class BirthdayManager:
     async def celebrate_birthday(self, employee: Employee) -> Optional[BirthdayCelebration]:
         """Create a birthday celebration for an employee. Party will happen at scheduled meeting time."""
         from employees.room_assigner import ROOM_BREAKROOM
-        from database.models import Meeting
         today = ensure_timezone_aware(local_now())
         
         # Check if we already celebrated today
@@ -50,20 +56,8 @@ class BirthdayManager:
         if existing:
             return None  # Already celebrated today
         
-        # Find the scheduled birthday party meeting for today
-        today_start = today.replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = today_start + timedelta(days=1)
-        meeting_result = await self.db.execute(
-            select(Meeting)
-            .where(Meeting.start_time >= today_start)
-            .where(Meeting.start_time < today_end)
-        )
-        birthday_meeting = None
-        for meeting in meeting_result.scalars().all():
-            metadata = meeting.meeting_metadata or {}
-            if metadata.get('is_birthday_party') and metadata.get('birthday_employee_id') == employee.id:
-                birthday_meeting = meeting
-                break
+        # Find the scheduled birthday party meeting for today by its event key
+        birthday_meeting = await get_calendar_event(self.db, EVENT_BIRTHDAY_PARTY, employee.id, today.date())
         
         # If no meeting found, create one for 2 PM today
         if not birthday_meeting:
@@ -98,38 +92,39 @@ class BirthdayManager:
             party_time = today.replace(hour=14, minute=0, second=0, microsecond=0)
             party_end = party_time + timedelta(hours=1)
             
-            # Create the meeting
+            # Create the meeting (a party created concurrently under the same key wins)
             room_name = party_breakroom.replace("_floor2", "").replace("_", " ").title()
-            birthday_meeting = Meeting(
-                title=f"🎂 {employee.name}'s Birthday Party",
-                description=f"Birthday party for {employee.name}",
-                organizer_id=employee.id,
-                attendee_ids=attendee_ids + [employee.id],
-                start_time=party_time,
-                end_time=party_end,
-                status="scheduled",
-                meeting_metadata={
+            birthday_meeting, created = await insert_calendar_event(self.db, {
+                "title": f"🎂 {employee.name}'s Birthday Party",
+                "description": f"Birthday party for {employee.name}",
+                "organizer_id": employee.id,
+                "attendee_ids": attendee_ids + [employee.id],
+                "start_time": party_time,
+                "end_time": party_end,
+                "status": "scheduled",
+                "meeting_metadata": {
                     "is_birthday_party": True,
                     "birthday_employee_id": employee.id,
                     "age": age,
                     "party_room": party_breakroom,
                     "party_floor": party_floor,
                     "room_name": room_name
-                }
-            )
-            self.db.add(birthday_meeting)
-            await self.db.flush()
-        else:
-            # Use meeting details
-            metadata = birthday_meeting.meeting_metadata or {}
-            party_time = birthday_meeting.start_time
-            party_breakroom = metadata.get('party_room', ROOM_BREAKROOM)
-            party_floor = metadata.get('party_floor', 1)
-            age = metadata.get('age', 25)
-            attendee_ids = [aid for aid in birthday_meeting.attendee_ids if aid != employee.id] if birthday_meeting.attendee_ids else []
-        
-        # Calculate age if not from meeting
-        if not birthday_meeting or 'age' not in (birthday_meeting.meeting_metadata or {}):
+                },
+                "event_kind": EVENT_BIRTHDAY_PARTY,
+                "event_subject_id": employee.id,
+                "event_date": party_time.date(),
+            })
+            if created:
+                meeting_scheduler.add_meeting(birthday_meeting)
+        
+        # Use meeting details
+        metadata = birthday_meeting.meeting_metadata or {}
+        party_time = birthday_meeting.start_time
+        party_breakroom = metadata.get('party_room', ROOM_BREAKROOM)
+        party_floor = metadata.get('party_floor', 1)
+        attendee_ids = [aid for aid in birthday_meeting.attendee_ids if aid != employee.id] if birthday_meeting.attendee_ids else []
+        age = metadata.get('age')
+        if age is None:
             age = 25
             if employee.hired_at:
                 hired_at_aware = ensure_timezone_aware(employee.hired_at)
@@ -412,7 +407,6 @@ class BirthdayManager:
         
         Returns the meeting if created, None if not needed or already exists.
         """
-        from database.models import Meeting
         from employees.room_assigner import ROOM_BREAKROOM
         
         if not employee.birthday_month or not employee.birthday_day:
@@ -439,30 +433,8 @@ class BirthdayManager:
             birthday_start = birthday_this_year.replace(hour=14, minute=0, second=0, microsecond=0)  # 2 PM party
             birthday_end = birthday_start + timedelta(hours=1)  # 1 hour party
             
-            # Check for existing birthday meeting - use more precise matching
-            # First check by title and date
-            existing_result = await self.db.execute(
-                select(Meeting)
-                .where(Meeting.title.like(f"%{employee.name}%Birthday%"))
-                .where(Meeting.start_time >= birthday_start - timedelta(days=1))
-                .where(Meeting.start_time <= birthday_start + timedelta(days=1))
-            )
-            existing = existing_result.scalar_one_or_none()
-            
-            # Also check by metadata if no title match
-            if not existing:
-                all_meetings_result = await self.db.execute(
-                    select(Meeting)
-                    .where(Meeting.start_time >= birthday_start - timedelta(days=1))
-                    .where(Meeting.start_time <= birthday_start + timedelta(days=1))
-                )
-                all_meetings = all_meetings_result.scalars().all()
-                for meeting in all_meetings:
-                    metadata = meeting.meeting_metadata or {}
-                    if (metadata.get('is_birthday_party') and 
-                        metadata.get('birthday_employee_id') == employee.id):
-                        existing = meeting
-                        break
+            # Check for an existing party under this birthday's event key
+            existing = await get_calendar_event(self.db, EVENT_BIRTHDAY_PARTY, employee.id, birthday_start.date())
             
             if existing:
                 return None  # Meeting already exists
@@ -519,18 +491,18 @@ class BirthdayManager:
                 for note in special_notes:
                     description += f"  • {note}\n"
             
-            # Create the meeting
-            meeting = Meeting(
-                title=f"🎂 {employee.name}'s Birthday Party",
-                description=description,
-                organizer_id=employee.id,  # Birthday person is the organizer
-                attendee_ids=attendee_ids,
-                start_time=birthday_start,
-                end_time=birthday_end,
-                status="scheduled",
-                agenda=f"Birthday celebration for {employee.name}",
-                outline=f"1. Welcome and birthday wishes\n2. Cake and refreshments\n3. Birthday song\n4. Gifts and cards",
-                meeting_metadata={
+            # Create the meeting (skipped by the database if the key was taken meanwhile)
+            meeting, created = await insert_calendar_event(self.db, {
+                "title": f"🎂 {employee.name}'s Birthday Party",
+                "description": description,
+                "organizer_id": employee.id,  # Birthday person is the organizer
+                "attendee_ids": attendee_ids,
+                "start_time": birthday_start,
+                "end_time": birthday_end,
+                "status": "scheduled",
+                "agenda": f"Birthday celebration for {employee.name}",
+                "outline": f"1. Welcome and birthday wishes\n2. Cake and refreshments\n3. Birthday song\n4. Gifts and cards",
+                "meeting_metadata": {
                     "is_birthday_party": True,
                     "birthday_employee_id": employee.id,
                     "age": age,
@@ -538,12 +510,15 @@ class BirthdayManager:
                     "party_floor": party_floor,
                     "room_name": room_name,
                     "special_notes": special_notes
-                }
-            )
-            
-            self.db.add(meeting)
+                },
+                "event_kind": EVENT_BIRTHDAY_PARTY,
+                "event_subject_id": employee.id,
+                "event_date": birthday_start.date(),
+            })
             await self.db.commit()
-            await self.db.refresh(meeting)
+            if not created:
+                return None
+            meeting_scheduler.add_meeting(meeting)
             
             return {
                 "meeting": meeting,
@@ -564,234 +539,128 @@ class BirthdayManager:
         
         This creates Meeting records for birthday parties so they appear on the calendar.
         Only creates meetings for active employees (excludes terminated employees).
-        This function ensures ALL birthdays within the date range have scheduled parties.
+        All parties in the range are built in memory and written with a single
+        INSERT ... ON CONFLICT DO NOTHING on the (event_kind, event_subject_id, event_date)
+        key, so birthdays that are already scheduled are skipped by the database.
         """
-        from database.models import Meeting
         from employees.room_assigner import ROOM_BREAKROOM
+        from database.calendar_events import insert_calendar_events
         
         today = ensure_timezone_aware(local_now())
         today_start = today.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_date = today_start + timedelta(days=days_ahead)
-        tz = today.tzinfo if today.tzinfo else get_timezone()
+        end_date_only = (today_start + timedelta(days=days_ahead)).date()
+        tz = get_timezone()
         
-        # Get all active employees with birthdays (exclude terminated employees)
-        # Use simpler query - just check status and birthday fields
+        # Get all active employees once (exclude terminated employees); attendees are sampled from this list
         result = await self.db.execute(
             select(Employee)
             .where(Employee.status == "active")
             .where(Employee.fired_at.is_(None))
-            .where(Employee.birthday_month.isnot(None))
-            .where(Employee.birthday_day.isnot(None))
         )
-        employees = result.scalars().all()
-        
-        # Debug: Check total employees
-        total_result = await self.db.execute(
-            select(Employee)
-            .where(Employee.status == "active")
-            .where(Employee.status != "fired")
-            .where(Employee.fired_at.is_(None))
-        )
-        total_employees = total_result.scalars().all()
-        
-        print(f"🔍 Total active employees: {len(total_employees)}")
-        print(f"🔍 Employees with birthday data: {len(employees)}")
-        print(f"📅 Today: {today_start}, End date: {end_date}")
+        active_employees = result.scalars().all()
+        employees = [e for e in active_employees if e.birthday_month is not None and e.birthday_day is not None]
         
         if len(employees) == 0:
             print("⚠️ WARNING: No employees found with birthday data! Birthday parties cannot be generated.")
             return 0
         
-        print(f"📋 Processing {len(employees)} employees...")
-        meetings_created = 0
-        skipped_existing = 0
+        breakrooms = [
+            (f"{ROOM_BREAKROOM}_floor2", 2),  # Floor 2 breakroom
+            (ROOM_BREAKROOM, 1),  # Floor 1 breakroom
+        ]
+        rows = []
         skipped_out_of_range = 0
-        processed = 0
         errors = 0
-        in_range_count = 0
         
         for emp in employees:
-            processed += 1
-            if processed % 50 == 0:
-                print(f"  📊 Processed {processed}/{len(employees)} employees...")
+            # Calculate birthday date for this year with proper timezone
             try:
-                # Calculate birthday date for this year with proper timezone
-                try:
-                    birthday_this_year = tz.localize(datetime(today.year, emp.birthday_month, emp.birthday_day))
-                except ValueError:
-                    errors += 1
-                    continue
-                
+                birthday_this_year = tz.localize(datetime(today.year, emp.birthday_month, emp.birthday_day))
                 # If birthday already passed this year, use next year
                 if birthday_this_year < today_start:
                     birthday_this_year = tz.localize(datetime(today.year + 1, emp.birthday_month, emp.birthday_day))
-                
-                # Only create meetings for birthdays within the date range
-                birthday_date = birthday_this_year.date()
-                end_date_only = end_date.date()
-                days_until = (birthday_date - today_start.date()).days
-                
-                if birthday_date > end_date_only:
-                    skipped_out_of_range += 1
-                    continue
-                
-                in_range_count += 1
-                if in_range_count <= 5:
-                    print(f"  ✓ {emp.name}: birthday in {days_until} days (within range)")
-                
-                # Check if a meeting already exists - SIMPLIFIED: just check by employee ID in metadata
-                birthday_start = birthday_this_year.replace(hour=14, minute=0, second=0, microsecond=0)
-                birthday_end = birthday_start + timedelta(hours=1)
-                
-                # Quick check: look for any meeting with this employee's ID in metadata on this date
-                check_start = birthday_start - timedelta(hours=12)
-                check_end = birthday_start + timedelta(hours=12)
-                existing_result = await self.db.execute(
-                    select(Meeting)
-                    .where(Meeting.start_time >= check_start)
-                    .where(Meeting.start_time <= check_end)
-                )
-                existing_meetings = existing_result.scalars().all()
-                existing = None
-                for meeting in existing_meetings:
-                    meta = meeting.meeting_metadata
-                    if meta and isinstance(meta, dict):
-                        if meta.get('is_birthday_party') and meta.get('birthday_employee_id') == emp.id:
-                            existing = meeting
-                            break
-                
-                if existing:
-                    skipped_existing += 1
-                    continue
-                
-                # Calculate age
-                age = 25  # Default age
-                if emp.hired_at:
-                    years_employed = (birthday_this_year - emp.hired_at).days / 365.25
-                    age = int(25 + years_employed)
-                
-                # Get attendees (14 employees + birthday person = 15 total)
-                all_employees_result = await self.db.execute(
-                    select(Employee)
-                    .where(Employee.status == "active")
-                    .where(Employee.status != "fired")
-                    .where(Employee.fired_at.is_(None))
-                    .where(Employee.id != emp.id)
-                )
-                all_employees = all_employees_result.scalars().all()
-                # Always get exactly 14 other employees (or as many as available if less than 14)
-                num_attendees = min(14, len(all_employees))
-                if num_attendees > 0:
-                    attendees = random.sample(all_employees, num_attendees)
-                else:
-                    attendees = []
-                # Create attendee_ids list: 14 colleagues + birthday person = 15 total
-                # IMPORTANT: Create as a new list to ensure it's properly stored
-                attendee_ids = [int(e.id) for e in attendees]  # Convert to int list
-                attendee_ids.append(int(emp.id))  # Include birthday person (total = 15)
-                
-                # Ensure we have exactly 15 (or as many as possible)
-                if len(attendee_ids) < 15 and len(all_employees) < 14:
-                    # If we have fewer than 14 other employees, just use all of them + birthday person
-                    attendee_ids = [int(e.id) for e in all_employees] + [int(emp.id)]
-                
-                # Verify we have the right count
-                if len(attendee_ids) != 15 and len(all_employees) >= 14:
-                    print(f"⚠️ Warning: {emp.name}'s party has {len(attendee_ids)} attendees, expected 15")
-                    # Fix it
-                    if len(attendee_ids) < 15:
-                        # Add more if we can
-                        remaining = [e.id for e in all_employees if e.id not in attendee_ids]
-                        needed = 15 - len(attendee_ids)
-                        if len(remaining) >= needed:
-                            attendee_ids.extend([int(e.id) for e in random.sample(remaining, needed)])
-                
-                # Final verification
-                if len(attendee_ids) != 15:
-                    print(f"❌ ERROR: {emp.name}'s party still has {len(attendee_ids)} attendees after fix!")
-                
-                # Choose a breakroom for the party
-                breakrooms = [
-                    (f"{ROOM_BREAKROOM}_floor2", 2),  # Floor 2 breakroom
-                    (ROOM_BREAKROOM, 1),  # Floor 1 breakroom
-                ]
-                party_breakroom, party_floor = random.choice(breakrooms)
-                room_name = party_breakroom.replace("_floor2", "").replace("_", " ").title()
-                
-                # Determine if it's a milestone birthday
-                is_milestone = age % 10 == 0 or age in [18, 21, 25, 30, 40, 50, 60]
-                special_notes = []
-                if is_milestone:
-                    special_notes.append(f"🎉 Milestone birthday - {age} years old!")
-                if age >= 50:
-                    special_notes.append("🎂 Special cake ordered")
-                if emp.has_performance_award:
-                    special_notes.append("⭐ Performance award winner - extra celebration!")
-                
-                # Create meeting description with all details
-                attendee_names = [e.name for e in attendees]
-                description = f"🎂 Birthday Party for {emp.name}!\n\n"
-                description += f"🎂 Turning {age} years old!\n"
-                description += f"📍 Location: {room_name} on Floor {party_floor}\n"
-                description += f"👥 Attendees: {emp.name}, {', '.join(attendee_names[:5])}"
-                if len(attendee_names) > 5:
-                    description += f", and {len(attendee_names) - 5} more"
-                description += f"\n\n"
-                if special_notes:
-                    description += "✨ Special Notes:\n"
-                    for note in special_notes:
-                        description += f"  • {note}\n"
-                
-                # Create the meeting
-                meeting = Meeting(
-                    title=f"🎂 {emp.name}'s Birthday Party",
-                    description=description,
-                    organizer_id=emp.id,  # Birthday person is the organizer
-                    attendee_ids=attendee_ids,
-                    start_time=birthday_start,
-                    end_time=birthday_end,
-                    status="scheduled",
-                    agenda=f"Birthday celebration for {emp.name}",
-                    outline=f"1. Welcome and birthday wishes\n2. Cake and refreshments\n3. Birthday song\n4. Gifts and cards",
-                    meeting_metadata={
-                        "is_birthday_party": True,
-                        "birthday_employee_id": emp.id,
-                        "age": age,
-                        "party_room": party_breakroom,
-                        "party_floor": party_floor,
-                        "room_name": room_name,
-                        "special_notes": special_notes
-                    }
-                )
-                
-                self.db.add(meeting)
-                meetings_created += 1
-                if meetings_created <= 20:
-                    print(f"  ✅ Created birthday party for {emp.name} on {birthday_start.strftime('%Y-%m-%d')} at {birthday_start.strftime('%H:%M')}")
-                
             except ValueError as ve:
                 # Invalid date (e.g., Feb 30)
                 errors += 1
-                if errors <= 5:  # Only print first 5 errors
+                if errors <= 5:
                     print(f"⚠️ Invalid birthday date for {emp.name}: {emp.birthday_month}/{emp.birthday_day} - {ve}")
                 continue
-            except Exception as e:
-                errors += 1
-                if errors <= 5:  # Only print first 5 errors
-                    print(f"❌ Error generating birthday party for {emp.name}: {e}")
-                    import traceback
-                    traceback.print_exc()
+            
+            # Only create meetings for birthdays within the date range
+            birthday_date = birthday_this_year.date()
+            if birthday_date > end_date_only:
+                skipped_out_of_range += 1
                 continue
+            
+            birthday_start = birthday_this_year.replace(hour=14, minute=0, second=0, microsecond=0)
+            birthday_end = birthday_start + timedelta(hours=1)
+            
+            # Calculate age
+            age = 25  # Default age
+            if emp.hired_at:
+                years_employed = (birthday_this_year - emp.hired_at).days / 365.25
+                age = int(25 + years_employed)
+            
+            # Attendees: 14 colleagues + birthday person = 15 total (or everyone if fewer)
+            attendees = sample_colleagues(active_employees, emp.id, 14)
+            attendee_ids = [int(e.id) for e in attendees]
+            attendee_ids.append(int(emp.id))
+            
+            # Choose a breakroom for the party
+            party_breakroom, party_floor = random.choice(breakrooms)
+            room_name = party_breakroom.replace("_floor2", "").replace("_", " ").title()
+            
+            # Determine if it's a milestone birthday
+            is_milestone = age % 10 == 0 or age in [18, 21, 25, 30, 40, 50, 60]
+            special_notes = []
+            if is_milestone:
+                special_notes.append(f"🎉 Milestone birthday - {age} years old!")
+            if age >= 50:
+                special_notes.append("🎂 Special cake ordered")
+            if emp.has_performance_award:
+                special_notes.append("⭐ Performance award winner - extra celebration!")
+            
+            # Create meeting description with all details
+            attendee_names = [e.name for e in attendees]
+            description = f"🎂 Birthday Party for {emp.name}!\n\n"
+            description += f"🎂 Turning {age} years old!\n"
+            description += f"📍 Location: {room_name} on Floor {party_floor}\n"
+            description += f"👥 Attendees: {emp.name}, {', '.join(attendee_names[:5])}"
+            if len(attendee_names) > 5:
+                description += f", and {len(attendee_names) - 5} more"
+            description += f"\n\n"
+            if special_notes:
+                description += "✨ Special Notes:\n"
+                for note in special_notes:
+                    description += f"  • {note}\n"
+            
+            rows.append({
+                "title": f"🎂 {emp.name}'s Birthday Party",
+                "description": description,
+                "organizer_id": emp.id,  # Birthday person is the organizer
+                "attendee_ids": attendee_ids,
+                "start_time": birthday_start,
+                "end_time": birthday_end,
+                "status": "scheduled",
+                "agenda": f"Birthday celebration for {emp.name}",
+                "outline": f"1. Welcome and birthday wishes\n2. Cake and refreshments\n3. Birthday song\n4. Gifts and cards",
+                "meeting_metadata": {
+                    "is_birthday_party": True,
+                    "birthday_employee_id": emp.id,
+                    "age": age,
+                    "party_room": party_breakroom,
+                    "party_floor": party_floor,
+                    "room_name": room_name,
+                    "special_notes": special_notes
+                },
+                "event_kind": EVENT_BIRTHDAY_PARTY,
+                "event_subject_id": emp.id,
+                "event_date": birthday_date,
+            })
         
-        # Commit the transaction
         try:
-            if meetings_created > 0:
-                await self.db.commit()
-                print(f"✅ Committed {meetings_created} new birthday party meetings to database")
-            else:
-                # Still commit to ensure transaction completes
-                await self.db.commit()
-                print(f"ℹ️ No new meetings to commit (all may already exist or be out of range)")
+            meetings_created = await insert_calendar_events(self.db, rows)
+            await self.db.commit()
         except Exception as commit_error:
             print(f"❌ Error committing meetings: {commit_error}")
             await self.db.rollback()
@@ -799,15 +668,9 @@ class BirthdayManager:
             traceback.print_exc()
             return 0
         
-        if skipped_existing > 0:
-            print(f"ℹ️ Skipped {skipped_existing} birthdays (meetings already exist)")
-        if skipped_out_of_range > 0:
-            print(f"ℹ️ Skipped {skipped_out_of_range} birthdays (outside {days_ahead} day range)")
-        
-        print(f"📊 Summary: Processed {processed} employees")
+        print(f"📊 Summary: Processed {len(employees)} employees")
         print(f"   ✅ Created: {meetings_created}")
-        print(f"   ⏭️ Skipped (existing): {skipped_existing}")
+        print(f"   ⏭️ Skipped (existing): {len(rows) - meetings_created}")
         print(f"   📅 Skipped (out of range): {skipped_out_of_range}")
         print(f"   ❌ Errors: {errors}")
         return meetings_created
-
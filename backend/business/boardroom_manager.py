@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from database.models import Employee, ChatMessage
 from datetime import datetime, timedelta
+from config import utcnow
 import random
 from typing import List, Optional
 from llm.ollama_client import OllamaClient
@@ -37,7 +38,7 @@ class BoardroomManager:
             return []
         
         # Calculate rotation based on time
-        now = datetime.utcnow()
+        now = utcnow()
         ROTATION_INTERVAL = timedelta(minutes=30)
         
         # Initialize or check if rotation is needed
@@ -242,14 +243,14 @@ Write a brief, direct boardroom discussion message (1-2 sentences) to {recipient
 Write only the message, nothing else. Make it feel like you're talking directly to them in person."""
 
             try:
-                client = await llm_client._get_client()
-                response = await client.post(
-                    f"{llm_client.base_url}/api/generate",
-                    json={
+                response = await llm_client._make_request_with_fallback(
+                    "/api/generate",
+                    {
                         "model": llm_client.model,
                         "prompt": prompt,
                         "stream": False
-                    }
+                    },
+                    kind="boardroom"
                 )
                 
                 if response.status_code == 200:
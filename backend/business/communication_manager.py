@@ -1,9 +1,9 @@
 import asyncio
 import random
-from datetime import datetime, time
 from sqlalchemy import select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.models import Employee, Email, ChatMessage
+from database.hot_queries import ACTIVE_EMPLOYEES
 from database.database import async_session_maker
 from llm.ollama_client import OllamaClient
 from config import now as local_now
@@ -37,7 +37,7 @@ class CommunicationManager:
 
     async def get_random_employees(self, db: AsyncSession, count: int = 2):
         """Get random active employees for conversation."""
-        result = await db.execute(select(Employee).where(Employee.status == "active"))
+        result = await db.execute(ACTIVE_EMPLOYEES)
         employees = result.scalars().all()
         if len(employees) < count:
             return None
@@ -73,7 +73,7 @@ class CommunicationManager:
                     subject=message_data.get("subject", "No Subject"),
                     body=message_data.get("body", ""),
                     read=False,
-                    thread_id=f"email_{sender.id}_{recipient.id}_{int(datetime.now().timestamp())}"
+                    thread_id=f"email_{sender.id}_{recipient.id}_{int(local_now().timestamp())}"
                 )
                 db.add(new_email)
                 logger.info(f"Generated new Email from {sender.name} to {recipient.name}")
@@ -83,7 +83,7 @@ class CommunicationManager:
                     sender_id=sender.id,
                     recipient_id=recipient.id,
                     message=message_data.get("body", ""),
-                    thread_id=f"chat_{sender.id}_{recipient.id}_{int(datetime.now().timestamp())}"
+                    thread_id=f"chat_{sender.id}_{recipient.id}_{int(local_now().timestamp())}"
                 )
                 db.add(new_chat)
                 logger.info(f"Generated new Chat from {sender.name} to {recipient.name}")
@@ -0,0 +1,398 @@
+"""
+Pre-generated ambient conversations for office rooms and employee homes.
+
+POST /api/room/conversations and POST /api/home/conversations used to call the
+LLM on every request (the room modal re-polls every 15 s). ConversationPool keeps
+a small rolling buffer of ready responses per room and per household:
+
+- A request whose context matches the buffer is answered from it instantly.
+  The context is the room's occupants, or for a household the family members,
+  everyone's sleep state, work hours and time of day; when it changes, the
+  buffered conversations are discarded.
+- On a miss the response is generated inline (as before) and the key starts
+  being tracked.
+- A background task refills tracked buffers, one conversation set at a time,
+  while the LLM is idle (fewer than CONVERSATION_POOL_IDLE_THRESHOLD requests in
+  flight). Keys nobody asked for in CONVERSATION_POOL_ACTIVE_SECONDS stop being
+  refilled, and buffered entries expire after CONVERSATION_POOL_TTL seconds.
+"""
+import asyncio
+import os
+import random
+import time
+import traceback
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import is_work_hours, now as local_now, sleep as clock_sleep
+from database.models import Employee, FamilyMember, HomePet, HomeSettings
+from llm.ollama_client import OllamaClient, llm_requests_in_flight
+
+POOL_SIZE = int(os.getenv("CONVERSATION_POOL_SIZE", "2"))
+ENTRY_TTL_SECONDS = float(os.getenv("CONVERSATION_POOL_TTL", "600"))
+ACTIVE_SECONDS = float(os.getenv("CONVERSATION_POOL_ACTIVE_SECONDS", "600"))
+IDLE_THRESHOLD = int(os.getenv("CONVERSATION_POOL_IDLE_THRESHOLD", "2"))
+REFILL_INTERVAL_SECONDS = 2.0
+
+# (context, payload) or None when the subject no longer exists
+Generated = Optional[Tuple[tuple, Dict]]
+
+
+def _time_of_day(hour: int) -> str:
+    if 18 <= hour < 22:
+        return "evening"
+    if 22 <= hour or hour < 6:
+        return "night"
+    if 6 <= hour < 12:
+        return "morning"
+    return "afternoon"
+
+
+async def _load_room(db: AsyncSession, employee_ids: List[int]):
+    result = await db.execute(select(Employee).where(Employee.id.in_(employee_ids)))
+    employees = result.scalars().all()
+    context = tuple(sorted((e.id, e.sleep_state or "awake") for e in employees))
+    return employees, context
+
+
+async def room_context(db: AsyncSession, employee_ids: List[int]) -> tuple:
+    """Context key for a room: its occupants and their sleep state."""
+    _, context = await _load_room(db, employee_ids)
+    return context
+
+
+async def generate_room_conversations(db: AsyncSession, llm_client: OllamaClient, employee_ids: List[int]) -> Generated:
+    """Generate casual conversations between 1-2 random pairs of the room's occupants."""
+    employees, context = await _load_room(db, employee_ids)
+    if len(employees) < 2:
+        return context, {"conversations": []}
+
+    from engine.office_simulator import get_business_context
+    business_context = await get_business_context(db)
+
+    # Select 1-2 pairs randomly (not everyone talking at once)
+    num_pairs = min(2, len(employees) // 2)
+    available_employees = list(employees)
+    selected_pairs = []
+    for _ in range(num_pairs):
+        if len(available_employees) < 2:
+            break
+        pair = random.sample(available_employees, 2)
+        selected_pairs.append(pair)
+        for emp in pair:
+            available_employees.remove(emp)
+
+    conversations = []
+    for emp1, emp2 in selected_pairs:
+        conversation_data = await llm_client.generate_casual_conversation(
+            employee1_name=emp1.name,
+            employee1_title=emp1.title,
+            employee1_role=emp1.role,
+            employee1_personality=emp1.personality_traits or [],
+            employee2_name=emp2.name,
+            employee2_title=emp2.title,
+            employee2_role=emp2.role,
+            employee2_personality=emp2.personality_traits or [],
+            business_context=business_context,
+            conversation_type=random.choice(["work", "personal", "mixed"])
+        )
+        conversations.append({
+            "employee1_id": emp1.id,
+            "employee1_name": emp1.name,
+            "employee2_id": emp2.id,
+            "employee2_name": emp2.name,
+            "messages": conversation_data.get("messages", [])
+        })
+    return context, {"conversations": conversations}
+
+
+async def _load_household(db: AsyncSession, employee_id: int):
+    result = await db.execute(
+        select(Employee).where(Employee.id == employee_id, Employee.status == "active")
+    )
+    employee = result.scalar_one_or_none()
+    if not employee:
+        return None
+    family_members = (await db.execute(
+        select(FamilyMember).where(FamilyMember.employee_id == employee_id)
+    )).scalars().all()
+    home_pets = (await db.execute(
+        select(HomePet).where(HomePet.employee_id == employee_id)
+    )).scalars().all()
+    home_settings = (await db.execute(
+        select(HomeSettings).where(HomeSettings.employee_id == employee_id)
+    )).scalar_one_or_none()
+
+    is_work_time = is_work_hours()
+    time_of_day = _time_of_day(local_now().hour)
+    context = (
+        employee.sleep_state or "awake",
+        tuple(sorted((fm.id, fm.sleep_state or "awake") for fm in family_members)),
+        len(home_pets) > 0,
+        is_work_time,
+        time_of_day,
+    )
+    return employee, family_members, home_pets, home_settings, is_work_time, time_of_day, context
+
+
+async def home_context(db: AsyncSession, employee_id: int) -> Optional[tuple]:
+    """Context key for a household, or None if the employee isn't active."""
+    household = await _load_household(db, employee_id)
+    return household[-1] if household else None
+
+
+async def generate_home_conversations(db: AsyncSession, llm_client: OllamaClient, employee_id: int) -> Generated:
+    """
+    Generate conversations at an employee's home: between family members while the
+    employee is at work, otherwise between the employee and family (plus one between
+    family members when there are enough of them).
+    """
+    household = await _load_household(db, employee_id)
+    if household is None:
+        return None
+    employee, family_members, home_pets, home_settings, is_work_time, time_of_day, context = household
+    if len(family_members) == 0:
+        return context, {"conversations": []}
+
+    has_pets = len(home_pets) > 0
+    home_type = home_settings.home_type if home_settings else "city"
+
+    async def family_conversation(fm1, fm2) -> Dict:
+        conversation_data = await llm_client.generate_family_conversation(
+            family_member1_name=fm1.name,
+            family_member1_relationship=fm1.relationship_type,
+            family_member1_age=fm1.age,
+            family_member1_personality=fm1.personality_traits or [],
+            family_member1_interests=fm1.interests or [],
+            family_member1_occupation=fm1.occupation,
+            family_member2_name=fm2.name,
+            family_member2_relationship=fm2.relationship_type,
+            family_member2_age=fm2.age,
+            family_member2_personality=fm2.personality_traits or [],
+            family_member2_interests=fm2.interests or [],
+            family_member2_occupation=fm2.occupation,
+            employee_name=employee.name,
+            time_of_day=time_of_day,
+            has_pets=has_pets,
+            home_type=home_type
+        )
+        return {
+            "family_member1_id": fm1.id,
+            "family_member1_name": fm1.name,
+            "family_member2_id": fm2.id,
+            "family_member2_name": fm2.name,
+            "employee_id": None,  # Employee not involved
+            "employee_name": None,
+            "messages": conversation_data.get("messages", [])
+        }
+
+    conversations = []
+    if is_work_time:
+        # Employee is at work - 1-2 conversations between family members
+        available_family = list(family_members)
+        for _ in range(min(2, len(family_members) // 2)):
+            if len(available_family) < 2:
+                break
+            fm1, fm2 = random.sample(available_family, 2)
+            available_family.remove(fm1)
+            available_family.remove(fm2)
+            conversations.append(await family_conversation(fm1, fm2))
+    else:
+        # Employee is home - talk with 1-2 family members
+        selected_family = random.sample(list(family_members), min(2, len(family_members)))
+        for family_member in selected_family:
+            conversation_data = await llm_client.generate_home_conversation(
+                employee_name=employee.name,
+                employee_title=employee.title,
+                employee_personality=employee.personality_traits or [],
+                employee_hobbies=employee.hobbies or [],
+                family_member_name=family_member.name,
+                family_member_relationship=family_member.relationship_type,
+                family_member_age=family_member.age,
+                family_member_personality=family_member.personality_traits or [],
+                family_member_interests=family_member.interests or [],
+                family_member_occupation=family_member.occupation,
+                time_of_day=time_of_day,
+                has_pets=has_pets,
+                home_type=home_type
+            )
+            conversations.append({
+                "employee_id": employee.id,
+                "employee_name": employee.name,
+                "family_member_id": family_member.id,
+                "family_member_name": family_member.name,
+                "family_member1_id": None,
+                "family_member1_name": None,
+                "family_member2_id": None,
+                "family_member2_name": None,
+                "messages": conversation_data.get("messages", [])
+            })
+
+        # Plus one conversation between the family members not already talking
+        selected_ids = {f.id for f in selected_family}
+        available_family = [fm for fm in family_members if fm.id not in selected_ids]
+        if len(available_family) >= 2:
+            fm1, fm2 = random.sample(available_family, 2)
+            conversations.append(await family_conversation(fm1, fm2))
+
+    return context, {"conversations": conversations}
+
+
+class _Buffer:
+    """Ready responses for one room or household."""
+
+    __slots__ = ("context", "entries", "generate", "last_requested")
+
+    def __init__(self, context: tuple, generate: Callable[[AsyncSession], Awaitable[Generated]]):
+        self.context = context
+        self.entries: deque = deque()  # (created_at, payload)
+        self.generate = generate
+        self.last_requested = time.monotonic()
+
+
+class ConversationPool:
+    """Rolling per-room / per-household buffers of pre-generated conversations."""
+
+    def __init__(self, size: int = POOL_SIZE):
+        self.size = size
+        self.llm_client = OllamaClient()
+        self._buffers: Dict[tuple, _Buffer] = {}
+        self._refill_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    def take(self, key: tuple, context: tuple) -> Optional[Dict]:
+        """
+        Pop a ready response for key if one exists for the current context.
+        A changed context discards everything buffered for the key.
+        """
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            self.misses += 1
+            return None
+        buffer.last_requested = time.monotonic()
+        if buffer.context != context:
+            buffer.context = context
+            buffer.entries.clear()
+        cutoff = time.monotonic() - ENTRY_TTL_SECONDS
+        while buffer.entries and buffer.entries[0][0] < cutoff:
+            buffer.entries.popleft()
+        if not buffer.entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return buffer.entries.popleft()[1]
+
+    def track(self, key: tuple, context: tuple, generate: Callable[[AsyncSession], Awaitable[Generated]]):
+        """Keep key's buffer filled in the background from now on."""
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            self._buffers[key] = _Buffer(context, generate)
+        else:
+            buffer.generate = generate
+            buffer.last_requested = time.monotonic()
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._refill_loop())
+
+    def _next_to_refill(self) -> Optional[Tuple[tuple, _Buffer]]:
+        now = time.monotonic()
+        for key, buffer in list(self._buffers.items()):
+            if now - buffer.last_requested > ACTIVE_SECONDS:
+                del self._buffers[key]
+        candidates = [(key, b) for key, b in self._buffers.items() if len(b.entries) < self.size]
+        # Emptiest, most recently viewed first
+        candidates.sort(key=lambda item: (len(item[1].entries), -item[1].last_requested))
+        return candidates[0] if candidates else None
+
+    async def _refill_loop(self):
+        from database.admission import set_db_subsystem
+        from database.database import async_session_maker
+        set_db_subsystem("background")
+        while self._buffers:
+            await clock_sleep(REFILL_INTERVAL_SECONDS)
+            if llm_requests_in_flight() >= IDLE_THRESHOLD:
+                continue
+            item = self._next_to_refill()
+            if item is None:
+                continue
+            key, buffer = item
+            try:
+                async with async_session_maker() as db:
+                    generated = await buffer.generate(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error pre-generating conversations for {key}: {e}")
+                traceback.print_exc()
+                await clock_sleep(30)  # Don't hammer a failing LLM
+                continue
+            if generated is None or not generated[1].get("conversations"):
+                # Subject gone or nobody left to talk - stop tracking until requested again
+                self._buffers.pop(key, None)
+                continue
+            context, payload = generated
+            if self._buffers.get(key) is not buffer:
+                continue
+            if buffer.context != context:
+                # The room/household changed: what's buffered is stale, the new generation isn't
+                buffer.entries.clear()
+                buffer.context = context
+            buffer.entries.append((time.monotonic(), payload))
+
+    async def _serve(self, db: AsyncSession, key: tuple, context: tuple,
+                     generate: Callable[[AsyncSession], Awaitable[Generated]]) -> Optional[Dict]:
+        payload = self.take(key, context)
+        if payload is not None:
+            return payload
+        generated = await generate(db)
+        if generated is None:
+            return None
+        context, payload = generated
+        if payload.get("conversations"):
+            self.track(key, context, generate)
+        return payload
+
+    async def room_conversations(self, db: AsyncSession, room_id: str, employee_ids: List[int]) -> Dict:
+        """
+        Conversations for a room, from the buffer when its occupants haven't changed.
+
+        Args:
+            db: Database session
+            room_id: Room identifier (buffer key)
+            employee_ids: Employees currently in the room
+        """
+        ids = sorted(set(employee_ids))
+        context = await room_context(db, ids)
+        return await self._serve(
+            db, ("room", room_id), context,
+            lambda session: generate_room_conversations(session, self.llm_client, ids),
+        )
+
+    async def home_conversations(self, db: AsyncSession, employee_id: int) -> Optional[Dict]:
+        """
+        Conversations at an employee's home, from the buffer when the household context hasn't changed.
+
+        Returns:
+            {"conversations": [...]}, or None if the employee doesn't exist or isn't active
+        """
+        context = await home_context(db, employee_id)
+        if context is None:
+            return None
+        return await self._serve(
+            db, ("home", employee_id), context,
+            lambda session: generate_home_conversations(session, self.llm_client, employee_id),
+        )
+
+    def stats(self) -> Dict:
+        return {
+            "tracked": len(self._buffers),
+            "buffered": sum(len(b.entries) for b in self._buffers.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+conversation_pool = ConversationPool()
@@ -4,7 +4,9 @@ Customer Review Manager - Handles AI-generated customer reviews for completed pr
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc
 from database.models import Project, CustomerReview
-from datetime import datetime, timedelta
+from database.hot_queries import COMPLETED_PROJECTS
+from datetime import timedelta
+from config import utcnow
 import random
 from typing import Optional, List
 from llm.ollama_client import OllamaClient
@@ -19,13 +21,11 @@ class CustomerReviewManager:
         Generate customer reviews for completed projects that don't have reviews yet.
         Reviews are generated 24 hours after project completion by default.
         """
-        now = datetime.utcnow()
+        now = utcnow()
         cutoff_date = now - timedelta(hours=hours_since_completion)
         
         # Get all completed projects
-        result = await self.db.execute(
-            select(Project).where(Project.status == "completed")
-        )
+        result = await self.db.execute(COMPLETED_PROJECTS)
         completed_projects = result.scalars().all()
         
         if not completed_projects:
@@ -197,8 +197,8 @@ class CustomerReviewManager:
                         status="active" if project.status == "completed" else "development",
                         price=0.0,
                         launch_date=project.completed_at if project.completed_at else project.created_at,
-                        created_at=datetime.utcnow(),
-                        updated_at=datetime.utcnow()
+                        created_at=utcnow(),
+                        updated_at=utcnow()
                     )
                     self.db.add(new_product)
                     await self.db.flush()  # Get the ID
@@ -354,7 +354,7 @@ Write only the review text, nothing else. Make it feel like a real customer revi
 
         try:
             llm_client = OllamaClient()
-            response_text = await llm_client.generate_response(prompt)
+            response_text = await llm_client.generate_response(prompt, kind="customer_review")
             
             # Clean up the response
             review_text = response_text.strip()
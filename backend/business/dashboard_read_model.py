@@ -0,0 +1,602 @@
+"""
+Dashboard read model.
+
+GET /api/dashboard, the landing page of every user, used to assemble its
+document on request: about 15 sequential queries (financial totals, projects,
+employees, activities, goals, settings, leadership decisions and activities,
+per-employee break lookups) plus O(n*m) name lookups, behind a 10 second
+result cache. The document is now built ahead of time and stored in the
+single dashboard_snapshots row:
+
+- The simulator rebuilds it at most every DASHBOARD_REFRESH_SECONDS. The
+  review-create and meeting generate/delete handlers request a rebuild right
+  away; other changes (settings included) show up on the next periodic one.
+  All scalar figures come from one statement of scalar subqueries, the lists
+  from one query each, and names are resolved through dicts.
+- The row's version only moves when the serialised document changes
+  (compared by SHA-1), so the version doubles as the dashboard's ETag.
+- GET /api/dashboard reads the version of that one row and serves the
+  document serialised once per version, or 304 Not Modified when the
+  client's If-None-Match matches.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+import traceback
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, desc, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import now as local_now
+from database.models import (
+    Activity, BusinessSettings, DashboardSnapshot, Decision, Employee, EmployeeReview, Financial, Project, Task,
+)
+
+REFRESH_SECONDS = float(os.getenv("DASHBOARD_REFRESH_SECONDS", "10"))
+# A snapshot older than this is rebuilt in the background when it is served (e.g. while the simulation is paused)
+MAX_AGE_SECONDS = float(os.getenv("DASHBOARD_MAX_AGE_SECONDS", "60"))
+
+SNAPSHOT_ID = 1
+
+LEADERSHIP_ROLES = ("CEO", "CTO", "COO", "CFO", "Manager")
+STRATEGIC_ACTIVITY_TYPES = ("strategic_decision", "strategic_operational_decision")
+BREAK_ACTIVITY_TYPES = ("coffee_break", "break")
+
+DEFAULT_SETTINGS = {
+    "business_name": "TechFlow Solutions",
+    "business_mission": "To deliver innovative technology solutions that empower businesses to achieve their goals through cutting-edge software development and consulting services.",
+    "business_industry": "Technology & Software Development",
+    "business_founded": "2024",
+    "business_location": "New York",
+}
+
+SNAPSHOT_VERSION = select(DashboardSnapshot.version, DashboardSnapshot.built_at).where(DashboardSnapshot.id == SNAPSHOT_ID)
+SNAPSHOT_DOCUMENT = select(DashboardSnapshot.version, DashboardSnapshot.document).where(DashboardSnapshot.id == SNAPSHOT_ID)
+
+
+def _is_leader():
+    return and_(
+        Employee.status == "active",
+        or_(Employee.role.in_(LEADERSHIP_ROLES), Employee.hierarchy_level <= 2),
+    )
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _metadata(activity: Activity) -> Dict:
+    metadata = activity.activity_metadata
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def _default_breakroom(floor: int) -> str:
+    return "breakroom_floor2" if floor >= 2 else "breakroom"
+
+
+def _has_text(column):
+    return and_(column.isnot(None), column != "")
+
+
+def _figures_statement():
+    """Every scalar figure of the dashboard in one statement."""
+    leaders = select(Employee.id).where(_is_leader())
+    review_complete = and_(
+        _has_text(EmployeeReview.comments),
+        _has_text(EmployeeReview.strengths),
+        _has_text(EmployeeReview.areas_for_improvement),
+    )
+    return select(
+        select(func.coalesce(func.sum(Financial.amount), 0.0)).where(Financial.type == "income").scalar_subquery().label("revenue"),
+        select(func.coalesce(func.sum(Financial.amount), 0.0)).where(Financial.type == "expense").scalar_subquery().label("expenses"),
+        select(func.count(Project.id)).where(Project.status.in_(["planning", "active"])).scalar_subquery().label("open_projects"),
+        select(func.count(Project.id)).scalar_subquery().label("total_projects"),
+        select(func.count(Project.id)).where(Project.status == "completed").scalar_subquery().label("completed_projects"),
+        select(func.coalesce(func.sum(Project.revenue), 0.0)).scalar_subquery().label("total_project_revenue"),
+        select(func.coalesce(func.avg(Project.budget), 0.0)).where(Project.budget > 0).scalar_subquery().label("average_project_budget"),
+        select(func.count(Decision.id)).where(
+            Decision.employee_id.in_(leaders), Decision.decision_type == "strategic"
+        ).scalar_subquery().label("strategic_decisions"),
+        select(func.count(Activity.id)).where(
+            Activity.employee_id.in_(leaders), Activity.activity_type.in_(STRATEGIC_ACTIVITY_TYPES)
+        ).scalar_subquery().label("strategic_activities"),
+        select(func.count(func.distinct(Task.project_id))).where(
+            Task.employee_id.in_(leaders), Task.project_id.isnot(None)
+        ).scalar_subquery().label("projects_led_by_leadership"),
+        select(func.count(EmployeeReview.id)).where(review_complete).scalar_subquery().label("reviews_completed"),
+        select(func.count(EmployeeReview.id)).where(~review_complete).scalar_subquery().label("reviews_in_progress"),
+    )
+
+
+DASHBOARD_FIGURES = _figures_statement()
+
+
+async def _goals(db: AsyncSession) -> Tuple[List[str], Dict[str, bool]]:
+    from business.goal_system import GoalSystem
+    try:
+        goal_system = GoalSystem(db)
+        goals_with_keys = await goal_system.get_business_goals_with_keys()
+        progress = await goal_system.evaluate_goals()
+    except Exception as e:
+        print(f"Error getting goals for the dashboard: {e}")
+        return [], {}
+    return (
+        [goal["text"] for goal in goals_with_keys],
+        {goal["key"]: progress.get(goal["key"], False) for goal in goals_with_keys},
+    )
+
+
+async def build_dashboard(db: AsyncSession) -> Dict:
+    """
+    Build the dashboard document from the current database state.
+
+    Returns:
+        The GET /api/dashboard document
+    """
+    figures = (await db.execute(DASHBOARD_FIGURES)).one()
+    active_employees = (await db.execute(select(Employee).where(Employee.status == "active"))).scalars().all()
+    employees = {emp.id: emp for emp in active_employees}
+
+    recent_activities = (await db.execute(
+        select(Activity).order_by(desc(Activity.timestamp)).limit(20)
+    )).scalars().all()
+
+    goals, goal_progress = await _goals(db)
+
+    settings = dict(DEFAULT_SETTINGS)
+    result = await db.execute(select(BusinessSettings.setting_key, BusinessSettings.setting_value))
+    settings.update({row.setting_key: row.setting_value for row in result.all()})
+
+    recent_projects = (await db.execute(
+        select(
+            Project.id, Project.name, Project.description, Project.status, Project.revenue,
+            Project.budget, Project.created_at, Project.completed_at,
+        ).order_by(desc(Project.created_at)).limit(20)
+    )).all()
+
+    # Departments and roles of the active staff
+    departments: Dict[str, int] = {}
+    role_distribution: Dict[str, int] = {}
+    for emp in active_employees:
+        dept = emp.department or "Unassigned"
+        departments[dept] = departments.get(dept, 0) + 1
+        role = emp.role or "Employee"
+        role_distribution[role] = role_distribution.get(role, 0) + 1
+
+    ceo = next((emp for emp in active_employees if emp.role == "CEO"), None)
+    leaders = {
+        emp.id: emp for emp in active_employees
+        if emp.role in LEADERSHIP_ROLES or (emp.hierarchy_level is not None and emp.hierarchy_level <= 2)
+    }
+
+    leadership_decisions = []
+    leadership_activities = []
+    if leaders:
+        decisions = (await db.execute(
+            select(Decision)
+            .where(Decision.employee_id.in_(leaders))
+            .order_by(desc(Decision.timestamp))
+            .limit(10)
+        )).scalars().all()
+        for d in decisions:
+            leader = leaders.get(d.employee_id)
+            leadership_decisions.append({
+                "id": d.id,
+                "employee_id": d.employee_id,
+                "employee_name": leader.name if leader else "Unknown",
+                "employee_role": leader.role if leader else "Unknown",
+                "decision_type": d.decision_type,
+                "description": d.description,
+                "reasoning": d.reasoning,
+                "timestamp": (d.timestamp or local_now()).isoformat()
+            })
+
+        strategic_activities = (await db.execute(
+            select(Activity)
+            .where(Activity.employee_id.in_(leaders), Activity.activity_type.in_(STRATEGIC_ACTIVITY_TYPES))
+            .order_by(desc(Activity.timestamp))
+            .limit(10)
+        )).scalars().all()
+        for act in strategic_activities:
+            metadata = _metadata(act)
+            if metadata:
+                decision_type = metadata.get("decision_type", "strategic")
+            elif act.activity_type == "strategic_operational_decision":
+                decision_type = "strategic_operational"
+            else:
+                decision_type = "strategic"
+            leader = leaders.get(act.employee_id)
+            leadership_decisions.append({
+                "id": act.id,
+                "employee_id": act.employee_id,
+                "employee_name": leader.name if leader else "Unknown",
+                "employee_role": leader.role if leader else "Unknown",
+                "decision_type": decision_type,
+                "description": act.description,
+                "reasoning": metadata.get("reasoning", ""),
+                "timestamp": (act.timestamp or local_now()).isoformat()
+            })
+        leadership_decisions.sort(key=lambda x: x["timestamp"], reverse=True)
+        leadership_decisions = leadership_decisions[:10]
+
+        activities = (await db.execute(
+            select(Activity)
+            .where(Activity.employee_id.in_(leaders))
+            .order_by(desc(Activity.timestamp))
+            .limit(15)
+        )).scalars().all()
+        for act in activities:
+            leader = leaders.get(act.employee_id)
+            leadership_activities.append({
+                "id": act.id,
+                "employee_id": act.employee_id,
+                "employee_name": leader.name if leader else "Unknown",
+                "employee_role": leader.role if leader else "Unknown",
+                "activity_type": act.activity_type,
+                "description": act.description,
+                "timestamp": (act.timestamp or local_now()).isoformat()
+            })
+
+    leader_list = list(leaders.values())
+    leadership_metrics = {
+        "total_leadership_count": len(leader_list),
+        "ceo_count": sum(1 for emp in leader_list if emp.role == "CEO"),
+        "manager_count": sum(1 for emp in leader_list if emp.role == "Manager"),
+        "cto_count": sum(1 for emp in leader_list if emp.role == "CTO"),
+        "coo_count": sum(1 for emp in leader_list if emp.role == "COO"),
+        "cfo_count": sum(1 for emp in leader_list if emp.role == "CFO"),
+        "strategic_decisions_count": figures.strategic_decisions + figures.strategic_activities,
+        "projects_led_by_leadership": figures.projects_led_by_leadership,
+        "reviews_completed": figures.reviews_completed,
+        "reviews_in_progress": figures.reviews_in_progress
+    }
+
+    break_tracking = await _break_tracking(db, active_employees, employees)
+
+    business_name = settings["business_name"]
+    return {
+        "business_name": business_name,
+        "revenue": float(figures.revenue),
+        "profit": float(figures.revenue) - float(figures.expenses),
+        "expenses": float(figures.expenses),
+        "active_projects": figures.open_projects,
+        "employee_count": len(active_employees),
+        "recent_activities": [
+            {
+                "id": act.id,
+                "employee_id": act.employee_id,
+                "activity_type": act.activity_type,
+                "description": act.description,
+                "timestamp": (act.timestamp or local_now()).isoformat()
+            }
+            for act in recent_activities
+        ],
+        "goals": goals,
+        "goal_progress": goal_progress,
+        "company_overview": {
+            "business_name": business_name,
+            "mission": settings["business_mission"],
+            "industry": settings["business_industry"],
+            "founded": settings["business_founded"],
+            "location": settings["business_location"],
+            "ceo": ceo.name if ceo else "Not Assigned",
+            "total_projects": figures.total_projects,
+            "completed_projects": figures.completed_projects,
+            "active_projects_count": figures.open_projects,
+            "total_project_revenue": float(figures.total_project_revenue),
+            "average_project_budget": float(figures.average_project_budget),
+            "departments": departments,
+            "role_distribution": role_distribution,
+            "products_services": [
+                {
+                    "id": p.id,
+                    "name": p.name,
+                    "description": p.description or "No description available",
+                    "status": p.status,
+                    "revenue": p.revenue or 0.0,
+                    "budget": p.budget or 0.0,
+                    "created_at": _iso(p.created_at),
+                    "completed_at": _iso(p.completed_at)
+                }
+                for p in recent_projects
+            ]
+        },
+        "leadership_insights": {
+            "leadership_team": [
+                {
+                    "id": emp.id,
+                    "name": emp.name,
+                    "title": emp.title,
+                    "role": emp.role,
+                    "department": emp.department,
+                    "hierarchy_level": emp.hierarchy_level,
+                    "status": emp.status,
+                    "hired_at": _iso(emp.hired_at)
+                }
+                for emp in sorted(leader_list, key=lambda x: (x.hierarchy_level, x.name))
+            ],
+            "recent_decisions": leadership_decisions,
+            "recent_activities": leadership_activities,
+            "metrics": leadership_metrics
+        },
+        "break_tracking": break_tracking
+    }
+
+
+async def _break_tracking(db: AsyncSession, active_employees, employees: Dict[int, Employee]) -> Dict:
+    """Who is on break, today's breaks per employee, break returns and denials."""
+    today_start = local_now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    on_break = [
+        emp for emp in active_employees
+        if emp.activity_state == "break" or (emp.current_room and "breakroom" in emp.current_room.lower())
+    ]
+    # When each of them went on break: their latest break activity, else their last
+    # coffee break, else their latest activity of any kind
+    entry_times: Dict[int, datetime] = {}
+    if on_break:
+        ids = [emp.id for emp in on_break]
+        result = await db.execute(
+            select(Activity.employee_id, func.max(Activity.timestamp))
+            .where(Activity.employee_id.in_(ids), Activity.activity_type.in_(BREAK_ACTIVITY_TYPES))
+            .group_by(Activity.employee_id)
+        )
+        entry_times = {employee_id: ts for employee_id, ts in result.all() if ts}
+        missing = [emp.id for emp in on_break if emp.id not in entry_times and not emp.last_coffee_break]
+        if missing:
+            result = await db.execute(
+                select(Activity.employee_id, func.max(Activity.timestamp))
+                .where(Activity.employee_id.in_(missing))
+                .group_by(Activity.employee_id)
+            )
+            entry_times.update({employee_id: ts for employee_id, ts in result.all() if ts})
+
+    employees_on_break = [
+        {
+            "id": emp.id,
+            "name": emp.name,
+            "title": emp.title,
+            "department": emp.department,
+            "current_room": emp.current_room or emp.home_room or _default_breakroom(emp.floor or 1),
+            "floor": emp.floor,
+            "activity_state": emp.activity_state,
+            "last_coffee_break": _iso(emp.last_coffee_break),
+            "breakroom_entry_time": _iso(entry_times.get(emp.id) or emp.last_coffee_break),
+            "is_actually_on_break": emp.activity_state == "break"
+        }
+        for emp in on_break
+    ]
+
+    today = (await db.execute(
+        select(Activity)
+        .where(
+            Activity.activity_type.in_(BREAK_ACTIVITY_TYPES + ("break_returned", "break_denied")),
+            Activity.timestamp >= today_start
+        )
+        .order_by(desc(Activity.timestamp))
+    )).scalars().all()
+
+    # Names of people no longer active (one query for all of them)
+    names = {emp_id: emp.name for emp_id, emp in employees.items()}
+    floors: Dict[int, Employee] = dict(employees)
+    unknown = {act.employee_id for act in today if act.employee_id and act.employee_id not in names}
+    if unknown:
+        result = await db.execute(select(Employee).where(Employee.id.in_(unknown)))
+        for emp in result.scalars().all():
+            names[emp.id] = emp.name
+            floors[emp.id] = emp
+
+    def name_of(employee_id: Optional[int]) -> str:
+        if employee_id in names:
+            return names[employee_id]
+        return f"Employee #{employee_id}" if employee_id else "System"
+
+    break_returns = []
+    manager_abuse_incidents = []
+    break_denials = []
+    history: Dict[int, Dict] = {}
+    breaks_today = 0
+    for act in today:
+        metadata = _metadata(act)
+        if act.activity_type == "break_denied":
+            if metadata.get("is_manager", False):
+                break_denials.append({
+                    "id": act.id,
+                    "employee_id": act.employee_id,
+                    "employee_name": name_of(act.employee_id),
+                    "reason": metadata.get("reason", "Break abuse detected"),
+                    "timestamp": _iso(act.timestamp)
+                })
+            continue
+
+        if act.activity_type == "break_returned":
+            is_manager_abuse = metadata.get("is_manager", False) or metadata.get("enforcement_type") == "manager_break_enforcement"
+            return_data = {
+                "id": act.id,
+                "employee_id": act.employee_id,
+                "employee_name": name_of(act.employee_id),
+                "manager_name": metadata.get("manager_name", "System") if not is_manager_abuse else "System (Manager Abuse)",
+                "manager_id": metadata.get("manager_id") if not is_manager_abuse else None,
+                "description": act.description,
+                "break_duration_minutes": metadata.get("break_duration_minutes", 0),
+                "timestamp": _iso(act.timestamp),
+                "is_manager_abuse": is_manager_abuse,
+                "enforcement_type": metadata.get("enforcement_type", "manager_return")
+            }
+            break_returns.append(return_data)
+            if is_manager_abuse:
+                manager_abuse_incidents.append(return_data)
+        else:
+            breaks_today += 1
+
+        emp_id = act.employee_id
+        if not emp_id:
+            continue
+        entry = history.get(emp_id)
+        if entry is None:
+            entry = history[emp_id] = {
+                "employee_id": emp_id,
+                "employee_name": name_of(emp_id),
+                "breaks": [],
+                "total_break_count": 0,
+                "total_break_time_minutes": 0
+            }
+        room = metadata.get("target_room")
+        if not room:
+            emp = floors.get(emp_id)
+            room = (emp.current_room or emp.home_room or _default_breakroom(emp.floor or 1)) if emp else _default_breakroom(1)
+        entry["breaks"].append({
+            "id": act.id,
+            "timestamp": _iso(act.timestamp),
+            "description": act.description,
+            "room": room,
+            "break_type": metadata.get("break_type", "coffee")
+        })
+        entry["total_break_count"] += 1
+
+    return {
+        "employees_on_break": employees_on_break,
+        "break_history": list(history.values()),
+        "break_returns": break_returns,
+        "manager_abuse_incidents": manager_abuse_incidents,
+        "break_denials": break_denials,
+        "total_on_break": len(employees_on_break),
+        "total_breaks_today": breaks_today,
+        "total_returns_today": len(break_returns),
+        "total_manager_abuse_today": len(manager_abuse_incidents),
+        "total_break_denials_today": len(break_denials)
+    }
+
+
+def etag_for(version: int) -> str:
+    return f'"dashboard-{version}"'
+
+
+class DashboardReadModel:
+    """Keeps the dashboard_snapshots row up to date and serves it."""
+
+    def __init__(self, refresh_seconds: float = REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._last_refresh = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._rerun = False
+        # Document serialised once per version
+        self._served_version: Optional[int] = None
+        self._served_body: Optional[bytes] = None
+        self.rebuilds = 0
+        self.not_modified = 0
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """
+        Rebuild the document and store it if its content changed.
+
+        Args:
+            db: Database session (committed here)
+
+        Returns:
+            The current version
+        """
+        document = await build_dashboard(db)
+        body = json.dumps(document, sort_keys=True, default=str)
+        content_hash = hashlib.sha1(body.encode()).hexdigest()
+        built_at = local_now().astimezone(timezone.utc)
+        stmt = insert(DashboardSnapshot).values(
+            id=SNAPSHOT_ID, version=1, content_hash=content_hash, document=json.loads(body), built_at=built_at,
+        )
+        changed = DashboardSnapshot.content_hash != stmt.excluded.content_hash
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DashboardSnapshot.id],
+            set_={
+                "version": case((changed, DashboardSnapshot.version + 1), else_=DashboardSnapshot.version),
+                "document": case((changed, stmt.excluded.document), else_=DashboardSnapshot.document),
+                "content_hash": stmt.excluded.content_hash,
+                "built_at": stmt.excluded.built_at,
+            },
+        ).returning(DashboardSnapshot.version)
+        version = (await db.execute(stmt)).scalar_one()
+        await db.commit()
+        self._last_refresh = time.monotonic()
+        self.rebuilds += 1
+        return version
+
+    async def _refresh_in_background(self):
+        from database.admission import set_db_subsystem
+        from database.database import async_session_maker
+        set_db_subsystem("background")
+        while True:
+            self._rerun = False
+            try:
+                async with async_session_maker() as db:
+                    await self.refresh(db)
+            except Exception as e:
+                print(f"Error rebuilding the dashboard: {e}")
+                traceback.print_exc()
+                return
+            if not self._rerun:
+                return
+
+    def request_refresh(self):
+        """Rebuild soon (after a change the dashboard shows); coalesces with a rebuild already running."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._rerun = True
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_in_background())
+
+    async def refresh_if_due(self):
+        """Rebuild if the last rebuild is older than DASHBOARD_REFRESH_SECONDS (run by the simulator's dashboard_read_model job)."""
+        if time.monotonic() - self._last_refresh < self.refresh_seconds:
+            return
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._last_refresh = time.monotonic()
+        self.request_refresh()
+
+    async def serve(self, db: AsyncSession, if_none_match: Optional[str] = None) -> Tuple[Optional[bytes], str]:
+        """
+        The current document, reading only the snapshot row.
+
+        Args:
+            db: Database session
+            if_none_match: The request's If-None-Match header
+
+        Returns:
+            (serialised document, or None if the client's copy is current; ETag)
+        """
+        row = (await db.execute(SNAPSHOT_VERSION)).first()
+        if row is None:
+            # First request on a fresh database
+            await self.refresh(db)
+            row = (await db.execute(SNAPSHOT_VERSION)).first()
+        version, built_at = row
+        if built_at is not None:
+            if built_at.tzinfo is None:
+                built_at = built_at.replace(tzinfo=timezone.utc)
+            if (local_now().astimezone(timezone.utc) - built_at).total_seconds() > MAX_AGE_SECONDS:
+                self.request_refresh()
+
+        etag = etag_for(version)
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            self.not_modified += 1
+            return None, etag
+        if version != self._served_version:
+            version, document = (await db.execute(SNAPSHOT_DOCUMENT)).one()
+            self._served_body = json.dumps(document).encode()
+            self._served_version = version
+            etag = etag_for(version)
+        return self._served_body, etag
+
+    def stats(self) -> Dict:
+        return {
+            "served_version": self._served_version,
+            "rebuilds": self.rebuilds,
+            "not_modified_responses": self.not_modified,
+            "refresh_seconds": self.refresh_seconds,
+        }
+
+
+dashboard_read_model = DashboardReadModel()
@@ -0,0 +1,245 @@
+"""
+Near-duplicate detection for shared drive documents.
+
+Each document is normalised (tags stripped, dates/amounts masked, short words
+dropped), split into overlapping 3-word shingles and summarised as a 64-value
+MinHash signature, stored in shared_drive_files.content_signature. Signatures
+are bucketed with LSH (16 bands of 4 rows), so documents sharing a bucket are
+likely to have Jaccard similarity above ~0.5. Only those candidates are
+compared exactly with the original SequenceMatcher check.
+
+DuplicateIndex keeps the buckets per employee in memory, built on first use
+from the stored signatures (files written before signatures existed are
+signed once and backfilled). All hashing and exact comparison runs in a worker
+thread so large documents don't stall the event loop.
+"""
+import asyncio
+import hashlib
+import random
+import re
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import SharedDriveFile
+
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_WORDS = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# Fixed seed: signatures are persisted, so the permutations must never change
+_rng = random.Random(0x5D0C)
+_PERMUTATIONS = [
+    (_rng.randint(1, _MERSENNE_PRIME - 1), _rng.randint(0, _MERSENNE_PRIME - 1))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+_DATE_RE = re.compile(r'\b\d{4}-\d{2}-\d{2}\b')
+_AMOUNT_RE = re.compile(r'\$\d+[.,]?\d*')
+
+
+def normalize_document(text: str) -> str:
+    """Strip HTML and mask values that differ between otherwise identical documents."""
+    text = _TAG_RE.sub('', text or '')
+    text = _WHITESPACE_RE.sub(' ', text).strip().lower()
+    text = _DATE_RE.sub('[DATE]', text)
+    text = _AMOUNT_RE.sub('[AMOUNT]', text)
+    # Drop very short words (mostly stop words) for better comparison
+    return ' '.join(w for w in text.split() if len(w) > 3)
+
+
+def is_similar(content1: str, content2: str, threshold: float = 0.80) -> bool:
+    """
+    Exact similarity check between two documents.
+
+    Args:
+        content1: HTML of the first document
+        content2: HTML of the second document
+        threshold: Minimum similarity ratio / word overlap to count as a duplicate
+    """
+    norm1 = normalize_document(content1)
+    norm2 = normalize_document(content2)
+    if not norm1 or not norm2:
+        return False
+
+    # Check if one is a substantial substring of the other, or the vocabulary mostly overlaps
+    if len(norm1) > 200 and len(norm2) > 200:
+        if norm1 in norm2 or norm2 in norm1:
+            return True
+        words1 = set(norm1.split())
+        words2 = set(norm2.split())
+        if words1 and words2 and len(words1 & words2) / max(len(words1), len(words2)) > threshold:
+            return True
+
+    return SequenceMatcher(None, norm1, norm2).ratio() >= threshold
+
+
+def minhash_signature(content: str) -> List[int]:
+    """
+    MinHash signature of a document's word shingles.
+
+    Returns:
+        NUM_PERMUTATIONS integers (empty list for documents with no text)
+    """
+    words = normalize_document(content).split()
+    if not words:
+        return []
+    if len(words) < SHINGLE_WORDS:
+        shingles = {' '.join(words)}
+    else:
+        shingles = {' '.join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in shingles]
+    return [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def _band_keys(signature: List[int]) -> List[Tuple[int, tuple]]:
+    return [
+        (band, tuple(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]))
+        for band in range(BANDS)
+    ]
+
+
+class _EmployeeBuckets:
+    """LSH buckets over one employee's documents."""
+
+    def __init__(self):
+        self.buckets: Dict[Tuple[int, tuple], Set[int]] = {}
+        self.files: Dict[int, Tuple[str, List[int]]] = {}  # file_id -> (file_type, signature)
+
+    def add(self, file_id: int, file_type: str, signature: List[int]):
+        self.remove(file_id)
+        if len(signature) != NUM_PERMUTATIONS:
+            return
+        self.files[file_id] = (file_type, signature)
+        for key in _band_keys(signature):
+            self.buckets.setdefault(key, set()).add(file_id)
+
+    def remove(self, file_id: int):
+        previous = self.files.pop(file_id, None)
+        if previous is None:
+            return
+        for key in _band_keys(previous[1]):
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.discard(file_id)
+                if not bucket:
+                    del self.buckets[key]
+
+    def candidates(self, signature: List[int]) -> Set[int]:
+        found: Set[int] = set()
+        for key in _band_keys(signature):
+            found |= self.buckets.get(key, set())
+        return found
+
+
+class DuplicateIndex:
+    """Per-employee LSH index over stored document signatures."""
+
+    def __init__(self):
+        self._employees: Dict[int, _EmployeeBuckets] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+    async def _buckets_for(self, db: AsyncSession, employee_id: int) -> _EmployeeBuckets:
+        buckets = self._employees.get(employee_id)
+        if buckets is not None:
+            return buckets
+        lock = self._locks.setdefault(employee_id, asyncio.Lock())
+        async with lock:
+            buckets = self._employees.get(employee_id)
+            if buckets is None:
+                buckets = await self._load(db, employee_id)
+                self._employees[employee_id] = buckets
+        return buckets
+
+    async def _load(self, db: AsyncSession, employee_id: int) -> _EmployeeBuckets:
+        buckets = _EmployeeBuckets()
+        result = await db.execute(
+            select(SharedDriveFile.id, SharedDriveFile.file_type, SharedDriveFile.content_signature)
+            .where(SharedDriveFile.employee_id == employee_id)
+        )
+        unsigned = []
+        for file_id, file_type, signature in result:
+            if signature:
+                buckets.add(file_id, file_type, signature)
+            else:
+                unsigned.append(file_id)
+
+        # Files written before signatures were stored: sign them once and persist
+        for file_id in unsigned:
+            content = (await db.execute(
+                select(SharedDriveFile.content_html, SharedDriveFile.file_type).where(SharedDriveFile.id == file_id)
+            )).one_or_none()
+            if content is None:
+                continue
+            signature = await asyncio.to_thread(minhash_signature, content.content_html)
+            await db.execute(
+                update(SharedDriveFile).where(SharedDriveFile.id == file_id).values(content_signature=signature)
+            )
+            buckets.add(file_id, content.file_type, signature)
+        return buckets
+
+    async def find_duplicate(
+        self,
+        db: AsyncSession,
+        employee_id: int,
+        content: str,
+        file_type: str,
+        signature: Optional[List[int]] = None,
+    ) -> Tuple[Optional[Tuple[int, str, str]], List[int]]:
+        """
+        Look for an existing document by the same employee that is nearly identical.
+
+        Args:
+            db: Database session
+            employee_id: Author whose documents are checked
+            content: New document HTML
+            file_type: Type of the new document (same-type matches use a lower threshold)
+            signature: Precomputed signature of content, if available
+
+        Returns:
+            ((file_id, file_name, file_type) of the duplicate or None, signature of content)
+        """
+        if signature is None:
+            signature = await asyncio.to_thread(minhash_signature, content)
+        if not signature:
+            return None, signature
+
+        buckets = await self._buckets_for(db, employee_id)
+        candidate_ids = buckets.candidates(signature)
+        if not candidate_ids:
+            return None, signature
+
+        result = await db.execute(
+            select(SharedDriveFile.id, SharedDriveFile.file_name, SharedDriveFile.file_type, SharedDriveFile.content_html)
+            .where(SharedDriveFile.id.in_(candidate_ids), SharedDriveFile.employee_id == employee_id)
+        )
+        # Same-type documents first (most likely duplicates)
+        candidates = sorted(result.all(), key=lambda row: row.file_type != file_type)
+
+        def compare():
+            for row in candidates:
+                threshold = 0.80 if row.file_type == file_type else 0.85
+                if is_similar(content, row.content_html, threshold):
+                    return row.id, row.file_name, row.file_type
+            return None
+
+        return await asyncio.to_thread(compare), signature
+
+    def add(self, employee_id: int, file_id: int, file_type: str, signature: List[int]):
+        """Register a new or updated document (ignored until the employee's index is loaded)."""
+        buckets = self._employees.get(employee_id)
+        if buckets is not None and signature:
+            buckets.add(file_id, file_type, signature)
+
+
+duplicate_index = DuplicateIndex()
@@ -0,0 +1,445 @@
+"""
+Stale-while-revalidate cache for the employee screen view and thoughts.
+
+GET /api/employees/{id}/screen-view (re-polled every 10 s by the screen view
+modal) and GET /api/employees/{id}/thoughts used to run their queries and one
+LLM call on every request, with a fresh OllamaClient each time, so every extra
+viewer of the same employee multiplied the LLM load. EmployeeViewCache keeps
+the last generated result per (view, employee):
+
+- The entry is keyed by the employee's current task and activity state. While
+  those are unchanged, requests get the cached result at once; when it is
+  older than EMPLOYEE_VIEW_REFRESH_SECONDS one background refresh is started
+  and the stale result is served until it finishes.
+- When there is no entry or the task/activity state changed, the result is
+  generated inline. Concurrent requests for the same employee and context
+  share one generation (single flight).
+- Entries nobody requested for EMPLOYEE_VIEW_TTL seconds are dropped.
+"""
+import asyncio
+import os
+import time
+import traceback
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from config import now as local_now
+from database.models import (
+    Activity, ChatMessage, Decision, Email, Employee, EmployeeReview, SharedDriveFile, Task,
+)
+from llm.ollama_client import OllamaClient
+
+REFRESH_SECONDS = float(os.getenv("EMPLOYEE_VIEW_REFRESH_SECONDS", "30"))
+ENTRY_TTL_SECONDS = float(os.getenv("EMPLOYEE_VIEW_TTL", "600"))
+
+DEFAULT_THOUGHTS = "I'm focused on my current work and thinking about how to contribute effectively to the team."
+
+Generate = Callable[[AsyncSession], Awaitable[Optional[Dict]]]
+
+
+def view_context(employee: Employee) -> tuple:
+    """Cache key part that invalidates an entry: the employee's task and activity state."""
+    return (employee.current_task_id, employee.activity_state)
+
+
+def _fallback_screen_activity(body: str) -> Dict:
+    return {
+        "application": "outlook",
+        "action": "viewing",
+        "content": {
+            "subject": "Work Update",
+            "recipient": "Team",
+            "body": body,
+        },
+        "mouse_position": {"x": 50, "y": 50},
+        "window_state": "active",
+    }
+
+
+async def generate_thoughts(db: AsyncSession, llm_client: OllamaClient, employee_id: int) -> Optional[Dict]:
+    """
+    Generate an employee's thoughts from their recent activity.
+
+    Returns:
+        {"thoughts": ..., "generated_at": ...}, or None if the employee no longer exists
+    """
+    from engine.office_simulator import get_business_context
+
+    emp = (await db.execute(select(Employee).where(Employee.id == employee_id))).scalar_one_or_none()
+    if not emp:
+        return None
+
+    activities = (await db.execute(
+        select(Activity)
+        .where(Activity.employee_id == employee_id)
+        .order_by(desc(Activity.timestamp))
+        .limit(5)
+    )).scalars().all()
+
+    decisions = (await db.execute(
+        select(Decision)
+        .where(Decision.employee_id == employee_id)
+        .order_by(desc(Decision.timestamp))
+        .limit(3)
+    )).scalars().all()
+
+    emails = (await db.execute(
+        select(Email)
+        .where((Email.sender_id == employee_id) | (Email.recipient_id == employee_id))
+        .order_by(desc(Email.timestamp))
+        .limit(3)
+    )).scalars().all()
+
+    chats = (await db.execute(
+        select(ChatMessage)
+        .where((ChatMessage.sender_id == employee_id) | (ChatMessage.recipient_id == employee_id))
+        .order_by(desc(ChatMessage.timestamp))
+        .limit(3)
+    )).scalars().all()
+
+    reviews = (await db.execute(
+        select(EmployeeReview)
+        .where(EmployeeReview.employee_id == employee_id)
+        .order_by(desc(EmployeeReview.created_at))
+        .limit(2)
+    )).scalars().all()
+
+    current_task = None
+    if emp.current_task_id:
+        task = (await db.execute(select(Task).where(Task.id == emp.current_task_id))).scalar_one_or_none()
+        if task:
+            current_task = task.description
+
+    business_context = await get_business_context(db)
+
+    try:
+        thoughts = await llm_client.generate_employee_thoughts(
+            employee_name=emp.name,
+            employee_title=emp.title,
+            employee_role=emp.role,
+            personality_traits=emp.personality_traits or [],
+            backstory=emp.backstory,
+            recent_activities=[
+                {
+                    "description": act.description,
+                    "activity_type": act.activity_type,
+                    "timestamp": act.timestamp.isoformat() if act.timestamp else None
+                }
+                for act in activities
+            ],
+            recent_decisions=[
+                {
+                    "description": dec.description,
+                    "reasoning": dec.reasoning,
+                    "decision_type": dec.decision_type,
+                    "timestamp": dec.timestamp.isoformat() if dec.timestamp else None
+                }
+                for dec in decisions
+            ],
+            recent_emails=[
+                {
+                    "subject": email.subject,
+                    "body": email.body[:100] if email.body else "",
+                    "timestamp": email.timestamp.isoformat() if email.timestamp else None
+                }
+                for email in emails
+            ],
+            recent_chats=[
+                {
+                    "message": chat.message,
+                    "timestamp": chat.timestamp.isoformat() if chat.timestamp else None
+                }
+                for chat in chats
+            ],
+            recent_reviews=[
+                {
+                    "overall_rating": rev.overall_rating,
+                    "comments": rev.comments or "",
+                    "review_date": rev.review_date.isoformat() if rev.review_date else None
+                }
+                for rev in reviews
+            ],
+            current_status=emp.status or "active",
+            current_task=current_task,
+            business_context=business_context
+        )
+    except Exception as e:
+        print(f"Error generating employee thoughts: {e}")
+        thoughts = DEFAULT_THOUGHTS
+
+    return {
+        "thoughts": thoughts,
+        "generated_at": local_now().isoformat()
+    }
+
+
+async def generate_screen_view(db: AsyncSession, llm_client: OllamaClient, employee_id: int) -> Optional[Dict]:
+    """
+    Generate what a working employee's screen shows, from their task, mail, chats and files.
+
+    Returns:
+        The screen view response, or None if the employee no longer exists
+    """
+    from engine.office_simulator import get_business_context
+
+    emp = (await db.execute(select(Employee).where(Employee.id == employee_id))).scalar_one_or_none()
+    if not emp:
+        return None
+
+    current_task = None
+    project = None
+    if emp.current_task_id:
+        task = (await db.execute(
+            select(Task)
+            .where(Task.id == emp.current_task_id)
+            .options(selectinload(Task.project))
+        )).scalar_one_or_none()
+        if task:
+            current_task = task.description
+            project = task.project
+
+    recent_emails = (await db.execute(
+        select(Email)
+        .where((Email.sender_id == employee_id) | (Email.recipient_id == employee_id))
+        .order_by(desc(Email.timestamp))
+        .limit(5)
+    )).scalars().all()
+
+    recent_chats = (await db.execute(
+        select(ChatMessage)
+        .where((ChatMessage.sender_id == employee_id) | (ChatMessage.recipient_id == employee_id))
+        .order_by(desc(ChatMessage.timestamp))
+        .limit(5)
+    )).scalars().all()
+
+    # Names of the people in those emails and chats only
+    people_ids = {emp.id}
+    for message in list(recent_emails) + list(recent_chats):
+        people_ids.update(i for i in (message.sender_id, message.recipient_id) if i is not None)
+    result = await db.execute(select(Employee.id, Employee.name).where(Employee.id.in_(people_ids)))
+    names = {row.id: row.name for row in result.all()}
+
+    emails_data = [
+        {
+            "id": email.id,
+            "subject": email.subject,
+            "body": email.body or "",
+            "sender_id": email.sender_id,
+            "sender_name": names.get(email.sender_id, "Unknown"),
+            "recipient_id": email.recipient_id,
+            "recipient_name": names.get(email.recipient_id, "Unknown"),
+            "timestamp": email.timestamp.isoformat() if email.timestamp else None
+        }
+        for email in recent_emails
+    ]
+    chats_data = [
+        {
+            "id": chat.id,
+            "message": chat.message,
+            "sender_id": chat.sender_id,
+            "sender_name": names.get(chat.sender_id, "Unknown"),
+            "recipient_id": chat.recipient_id,
+            "recipient_name": names.get(chat.recipient_id, "Unknown"),
+            "timestamp": chat.timestamp.isoformat() if chat.timestamp else None
+        }
+        for chat in recent_chats
+    ]
+
+    # Shared drive files of the employee's project, otherwise of their department
+    shared_drive_files = []
+    if project is not None:
+        shared_drive_files = (await db.execute(
+            select(SharedDriveFile)
+            .where(SharedDriveFile.project_id == project.id)
+            .order_by(desc(SharedDriveFile.updated_at))
+            .limit(5)
+        )).scalars().all()
+    elif emp.department:
+        shared_drive_files = (await db.execute(
+            select(SharedDriveFile)
+            .where(SharedDriveFile.department == emp.department)
+            .order_by(desc(SharedDriveFile.updated_at))
+            .limit(5)
+        )).scalars().all()
+
+    files_data = []
+    for f in shared_drive_files:
+        file_data = {
+            "id": f.id,
+            "file_name": f.file_name,
+            "file_type": f.file_type,
+            "department": f.department,
+            "project_id": f.project_id,
+            "updated_at": f.updated_at.isoformat() if f.updated_at else None
+        }
+        # The file row holds the latest content in full (version rows are deltas)
+        if f.content_html:
+            file_data["content"] = f.content_html[:5000]  # Limit to 5000 chars
+        files_data.append(file_data)
+
+    business_context = await get_business_context(db)
+
+    started = time.perf_counter()
+    try:
+        screen_activity = await asyncio.wait_for(
+            llm_client.generate_screen_activity(
+                employee_name=emp.name,
+                employee_title=emp.title,
+                employee_role=emp.role,
+                personality_traits=emp.personality_traits or [],
+                current_task=current_task,
+                project_name=project.name if project else None,
+                project_description=project.description if project else None,
+                recent_emails=emails_data,
+                recent_chats=chats_data,
+                shared_drive_files=files_data,
+                business_context=business_context
+            ),
+            timeout=60.0
+        )
+        print(f"[SCREEN-VIEW] Screen activity for {emp.name} generated in {time.perf_counter() - started:.2f}s")
+    except asyncio.TimeoutError:
+        print(f"[SCREEN-VIEW] LLM timeout after 60s for employee {emp.name}")
+        screen_activity = _fallback_screen_activity(
+            f"{emp.name} is reviewing emails and working on {current_task or 'current tasks'}."
+        )
+    except Exception as e:
+        print(f"[SCREEN-VIEW] Error generating screen activity: {e}")
+        screen_activity = _fallback_screen_activity(
+            f"{emp.name} is reviewing emails related to their current work."
+        )
+
+    return {
+        "employee_id": employee_id,
+        "employee_name": emp.name,
+        "employee_title": emp.title,
+        "screen_activity": screen_activity,
+        "actual_data": {
+            "emails": emails_data,
+            "chats": chats_data,
+            "files": files_data
+        },
+        "timestamp": local_now().isoformat()
+    }
+
+
+class _Entry:
+    """Last result of one view of one employee."""
+
+    __slots__ = ("context", "payload", "generated_at", "last_requested", "pending", "refresh")
+
+    def __init__(self, context: tuple):
+        self.context = context
+        self.payload: Optional[Dict] = None
+        self.generated_at = 0.0
+        self.last_requested = time.monotonic()
+        self.pending: Optional[asyncio.Task] = None  # Inline generation shared by concurrent requests
+        self.refresh: Optional[asyncio.Task] = None  # Background refresh of a stale payload
+
+
+class EmployeeViewCache:
+    """Per-employee screen view / thoughts results, served stale while a refresh runs."""
+
+    def __init__(self, refresh_seconds: float = REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.llm_client = OllamaClient()
+        self._entries: Dict[tuple, _Entry] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+
+    async def get(self, key: tuple, context: tuple, generate: Generate) -> Optional[Dict]:
+        """
+        Cached result for key, generating it if there is none for the current context.
+
+        Args:
+            key: (view name, employee id)
+            context: view_context() of the employee right now
+            generate: Builds the result with a database session (None if the employee is gone)
+
+        Returns:
+            The result, or None if generate found no employee
+        """
+        self._evict()
+        entry = self._entries.get(key)
+        if entry is None or entry.context != context:
+            entry = self._entries[key] = _Entry(context)
+        entry.last_requested = time.monotonic()
+
+        if entry.payload is not None:
+            if time.monotonic() - entry.generated_at < self.refresh_seconds:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                if entry.refresh is None or entry.refresh.done():
+                    entry.refresh = asyncio.create_task(self._refresh(key, entry, generate))
+            return entry.payload
+
+        if entry.pending is not None and not entry.pending.done():
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            entry.pending = asyncio.create_task(self._generate(entry, generate))
+        # Shielded so a viewer disconnecting doesn't cancel the generation the others wait for
+        return await asyncio.shield(entry.pending)
+
+    async def _generate(self, entry: _Entry, generate: Generate) -> Optional[Dict]:
+        from database.database import async_session_maker
+        async with async_session_maker() as db:
+            payload = await generate(db)
+        if payload is not None:
+            entry.payload = payload
+            entry.generated_at = time.monotonic()
+        return payload
+
+    async def _refresh(self, key: tuple, entry: _Entry, generate: Generate):
+        from database.admission import set_db_subsystem
+        set_db_subsystem("background")
+        self.refreshes += 1
+        try:
+            payload = await self._generate(entry, generate)
+        except Exception as e:
+            print(f"Error refreshing {key[0]} for employee {key[1]}: {e}")
+            traceback.print_exc()
+            entry.generated_at = time.monotonic()  # Keep serving the old result; retry after the interval
+            return
+        if payload is None and self._entries.get(key) is entry:
+            del self._entries[key]  # Employee gone
+
+    def _evict(self):
+        cutoff = time.monotonic() - ENTRY_TTL_SECONDS
+        for key, entry in list(self._entries.items()):
+            if entry.last_requested < cutoff:
+                del self._entries[key]
+
+    async def thoughts(self, employee: Employee) -> Optional[Dict]:
+        """Thoughts of an employee (from the cache while their task and activity state are unchanged)."""
+        return await self.get(
+            ("thoughts", employee.id), view_context(employee),
+            lambda session: generate_thoughts(session, self.llm_client, employee.id),
+        )
+
+    async def screen_view(self, employee: Employee) -> Optional[Dict]:
+        """Screen view of a working employee (from the cache while their task and activity state are unchanged)."""
+        return await self.get(
+            ("screen_view", employee.id), view_context(employee),
+            lambda session: generate_screen_view(session, self.llm_client, employee.id),
+        )
+
+    def stats(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+        }
+
+
+employee_view_cache = EmployeeViewCache()
@@ -1,7 +1,144 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from database.models import Financial, Project
-from sqlalchemy import select, func
-from datetime import datetime, timedelta
+from database.models import Employee, Financial, Project
+from database.hot_queries import FINANCIAL_TOTAL, FINANCIAL_TOTAL_SINCE
+from sqlalchemy import String, bindparam, case, select, func
+from datetime import timedelta
+from typing import Dict, Optional
+from config import utcnow, now as local_now, get_timezone
+
+# Category codes are assigned once when an entry is recorded; the first rule whose
+# keywords appear in the (lower-cased) description wins.
+EXPENSE_CATEGORY_RULES = [
+    ("payroll", ("salary", "payroll", "wage")),
+    ("facilities", ("rent", "office", "facility")),
+    ("equipment_software", ("equipment", "hardware", "software", "license")),
+    ("marketing", ("marketing", "advertising", "promotion")),
+    ("travel", ("travel", "transport")),
+    ("utilities", ("utilities", "electric", "water", "internet")),
+    ("project_costs", ("project",)),
+]
+INCOME_CATEGORY_RULES = [
+    ("project_revenue", ("project",)),
+    ("product_sales", ("sale", "product")),
+    ("services", ("service", "consulting")),
+]
+OTHER_EXPENSE = "other_expense"
+OTHER_INCOME = "other_income"
+
+CATEGORY_LABELS = {
+    "payroll": "Payroll",
+    "facilities": "Facilities",
+    "equipment_software": "Equipment & Software",
+    "marketing": "Marketing",
+    "travel": "Travel",
+    "utilities": "Utilities",
+    "project_costs": "Project Costs",
+    OTHER_EXPENSE: "Other Expenses",
+    "project_revenue": "Project Revenue",
+    "product_sales": "Product Sales",
+    "services": "Services",
+    OTHER_INCOME: "Other Income",
+}
+
+# Estimated annual salaries used for payroll analytics
+CEO_SALARY = 150000
+C_LEVEL_SALARY = 120000
+MANAGER_SALARY = 100000
+EMPLOYEE_SALARY = 60000
+AVERAGE_DAYS_PER_MONTH = 30.44
+
+
+def categorize(entry_type: str, description: Optional[str]) -> str:
+    """
+    Category code for a financial entry.
+
+    Args:
+        entry_type: "income" or "expense"
+        description: Free-text description of the entry
+
+    Returns:
+        One of the CATEGORY_LABELS keys
+    """
+    desc = (description or "").lower()
+    if entry_type == "income":
+        rules, fallback = INCOME_CATEGORY_RULES, OTHER_INCOME
+    else:
+        rules, fallback = EXPENSE_CATEGORY_RULES, OTHER_EXPENSE
+    for code, keywords in rules:
+        if any(keyword in desc for keyword in keywords):
+            return code
+    return fallback
+
+
+def category_expression():
+    """SQL equivalent of categorize() over the financials table (used to backfill old rows)."""
+    desc = func.lower(func.coalesce(Financial.description, ""))
+
+    def rules_case(rules, fallback):
+        return case(
+            *[
+                (desc.contains(keyword, autoescape=True), code)
+                for code, keywords in rules
+                for keyword in keywords
+            ],
+            else_=fallback,
+        )
+
+    return case(
+        (Financial.type == "income", rules_case(INCOME_CATEGORY_RULES, OTHER_INCOME)),
+        else_=rules_case(EXPENSE_CATEGORY_RULES, OTHER_EXPENSE),
+    )
+
+
+def annual_salary(role: Optional[str], hierarchy_level: Optional[int]) -> int:
+    """Estimated annual salary for a role (CEO > CTO/COO/CFO > Manager > Employee)."""
+    if role == "CEO" or hierarchy_level == 1:
+        return CEO_SALARY
+    if role in ("CTO", "COO", "CFO"):
+        return C_LEVEL_SALARY
+    if role == "Manager" or hierarchy_level == 2:
+        return MANAGER_SALARY
+    return EMPLOYEE_SALARY
+
+
+def period_salary(role: Optional[str], hierarchy_level: Optional[int], days: int) -> float:
+    """Estimated salary cost of one employee over the last `days` days."""
+    return annual_salary(role, hierarchy_level) / 12 * (days / AVERAGE_DAYS_PER_MONTH)
+
+
+# Transaction totals per local calendar day, type and category
+# tz is bound to the zone config resolved (get_timezone().zone), which falls back when TIMEZONE is invalid
+_local_day = func.date_trunc("day", func.timezone(bindparam("tz", type_=String), Financial.timestamp))
+FINANCIAL_DAILY_ROLLUP = (
+    select(
+        _local_day.label("day"),
+        Financial.type,
+        Financial.category,
+        func.sum(Financial.amount).label("total"),
+    )
+    .where(Financial.timestamp >= bindparam("since"))
+    .group_by(_local_day, Financial.type, Financial.category)
+    .order_by(_local_day)
+)
+
+# Active headcount per role, level and department (salary depends only on role and level)
+ACTIVE_HEADCOUNT = (
+    select(
+        Employee.role,
+        Employee.hierarchy_level,
+        Employee.department,
+        func.count(Employee.id).label("headcount"),
+    )
+    .where(Employee.status == "active")
+    .group_by(Employee.role, Employee.hierarchy_level, Employee.department)
+)
+
+ACTIVE_PAYROLL_ROSTER = (
+    select(Employee.id, Employee.name, Employee.role, Employee.department, Employee.hierarchy_level)
+    .where(Employee.status == "active")
+    .order_by(Employee.id)
+)
+
 
 class FinancialManager:
     def __init__(self, db: AsyncSession):
@@ -13,6 +150,7 @@ class FinancialManager:
             type="income",
             amount=amount,
             description=description,
+            category=categorize("income", description),
             project_id=project_id
         )
         self.db.add(financial)
@@ -30,6 +168,7 @@ class FinancialManager:
             type="expense",
             amount=amount,
             description=description,
+            category=categorize("expense", description),
             project_id=project_id
         )
         self.db.add(financial)
@@ -37,16 +176,12 @@ class FinancialManager:
     
     async def get_total_revenue(self) -> float:
         """Get total revenue."""
-        result = await self.db.execute(
-            select(func.sum(Financial.amount)).where(Financial.type == "income")
-        )
+        result = await self.db.execute(FINANCIAL_TOTAL, {"type": "income"})
         return result.scalar() or 0.0
     
     async def get_total_expenses(self) -> float:
         """Get total expenses."""
-        result = await self.db.execute(
-            select(func.sum(Financial.amount)).where(Financial.type == "expense")
-        )
+        result = await self.db.execute(FINANCIAL_TOTAL, {"type": "expense"})
         return result.scalar() or 0.0
     
     async def get_profit(self) -> float:
@@ -57,28 +192,115 @@ class FinancialManager:
     
     async def get_revenue_for_period(self, days: int = 30) -> float:
         """Get revenue for the last N days."""
-        cutoff = datetime.utcnow() - timedelta(days=days)
+        cutoff = utcnow() - timedelta(days=days)
         result = await self.db.execute(
-            select(func.sum(Financial.amount)).where(
-                Financial.type == "income",
-                Financial.timestamp >= cutoff
-            )
+            FINANCIAL_TOTAL_SINCE, {"type": "income", "since": cutoff}
         )
         return result.scalar() or 0.0
     
     async def get_expenses_for_period(self, days: int = 30) -> float:
         """Get expenses for the last N days."""
-        cutoff = datetime.utcnow() - timedelta(days=days)
+        cutoff = utcnow() - timedelta(days=days)
         result = await self.db.execute(
-            select(func.sum(Financial.amount)).where(
-                Financial.type == "expense",
-                Financial.timestamp >= cutoff
-            )
+            FINANCIAL_TOTAL_SINCE, {"type": "expense", "since": cutoff}
         )
         return result.scalar() or 0.0
 
+    async def get_analytics(self, days: int = 90) -> Dict:
+        """
+        Payroll, category breakdowns and daily trends for the last `days` days.
+
+        Transactions are aggregated in the database by local day, type and category,
+        and payroll comes from the active headcount per role, so the cost does not
+        grow with the number of transactions in the window.
+
+        Args:
+            days: Length of the window
 
+        Returns:
+            The GET /api/financials/analytics document
+        """
+        cutoff = local_now() - timedelta(days=days)
 
+        payroll_by_role = {}
+        payroll_by_department = {}
+        total_payroll = 0.0
+        employee_count = 0
+        result = await self.db.execute(ACTIVE_HEADCOUNT)
+        for role, hierarchy_level, department, headcount in result.all():
+            cost = period_salary(role, hierarchy_level, days) * headcount
+            total_payroll += cost
+            employee_count += headcount
+            role_key = role or "Employee"
+            payroll_by_role[role_key] = payroll_by_role.get(role_key, 0.0) + cost
+            dept_key = department or "Unassigned"
+            payroll_by_department[dept_key] = payroll_by_department.get(dept_key, 0.0) + cost
+
+        expense_categories = {}
+        income_sources = {}
+        daily_data = {}
+        total_income = 0.0
+        total_expenses = 0.0
+        result = await self.db.execute(
+            FINANCIAL_DAILY_ROLLUP, {"tz": get_timezone().zone, "since": cutoff}
+        )
+        for day, entry_type, category, total in result.all():
+            total = total or 0.0
+            if entry_type == "income":
+                label = CATEGORY_LABELS.get(category, CATEGORY_LABELS[OTHER_INCOME])
+                income_sources[label] = income_sources.get(label, 0.0) + total
+                total_income += total
+            else:
+                label = CATEGORY_LABELS.get(category, CATEGORY_LABELS[OTHER_EXPENSE])
+                expense_categories[label] = expense_categories.get(label, 0.0) + total
+                total_expenses += total
+            date_key = day.date().isoformat() if day else local_now().date().isoformat()
+            bucket = daily_data.setdefault(date_key, {"income": 0.0, "expenses": 0.0})
+            bucket["income" if entry_type == "income" else "expenses"] += total
 
+        if total_payroll > 0:
+            label = CATEGORY_LABELS["payroll"]
+            expense_categories[label] = expense_categories.get(label, 0.0) + total_payroll
+        total_expenses += total_payroll
 
+        result = await self.db.execute(ACTIVE_PAYROLL_ROSTER)
+        employee_details = [
+            {
+                "id": emp_id,
+                "name": name,
+                "role": role,
+                "department": department,
+                "hierarchy_level": hierarchy_level,
+                "estimated_annual_salary": annual_salary(role, hierarchy_level),
+                "period_salary": period_salary(role, hierarchy_level, days),
+            }
+            for emp_id, name, role, department, hierarchy_level in result.all()
+        ]
 
+        return {
+            "summary": {
+                "total_income": total_income,
+                "total_expenses": total_expenses,
+                "net_profit": total_income - total_expenses,
+                "payroll": total_payroll,
+                "period_days": days
+            },
+            "payroll": {
+                "total": total_payroll,
+                "by_role": payroll_by_role,
+                "by_department": payroll_by_department,
+                "employee_count": employee_count
+            },
+            "expense_categories": expense_categories,
+            "income_sources": income_sources,
+            "daily_trends": [
+                {
+                    "date": date,
+                    "income": data["income"],
+                    "expenses": data["expenses"],
+                    "profit": data["income"] - data["expenses"]
+                }
+                for date, data in sorted(daily_data.items())
+            ],
+            "employee_details": employee_details,
+        }
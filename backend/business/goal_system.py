@@ -1,6 +1,7 @@
 from typing import List, Dict
 from sqlalchemy.ext.asyncio import AsyncSession
-from database.models import BusinessMetric, BusinessGoal, Employee, Project, CustomerReview
+from database.models import BusinessMetric, BusinessGoal, Project, CustomerReview
+from database.hot_queries import ACTIVE_EMPLOYEES, COMPLETED_PROJECTS
 from business.financial_manager import FinancialManager
 from business.project_manager import ProjectManager
 from sqlalchemy import select, func
@@ -159,9 +160,7 @@ class GoalSystem:
         active_projects_count = len(active_projects)
         
         # Get employee count
-        result = await self.db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await self.db.execute(ACTIVE_EMPLOYEES)
         active_employees = result.scalars().all()
         employee_count = len(active_employees)
         
@@ -321,9 +320,7 @@ class GoalSystem:
         avg_rating = result.scalar() or 0.0
         
         # Get employee count
-        result = await self.db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await self.db.execute(ACTIVE_EMPLOYEES)
         employee_count = len(list(result.scalars().all()))
         
         # Evaluate each goal based on its goal_key
@@ -376,15 +373,12 @@ class GoalSystem:
     
     async def _get_completed_projects_count(self) -> int:
         """Get count of completed projects."""
-        from database.models import Project
-        result = await self.db.execute(
-            select(Project).where(Project.status == "completed")
-        )
+        result = await self.db.execute(COMPLETED_PROJECTS)
         return len(list(result.scalars().all()))
     
     async def update_metrics(self):
         """Update business metrics including workload statistics."""
-        from database.models import Employee, Task
+        from database.models import Task
         
         revenue = await self.financial_manager.get_total_revenue()
         profit = await self.financial_manager.get_profit()
@@ -392,9 +386,7 @@ class GoalSystem:
         active_projects_count = len(active_projects)
         
         # Get employee statistics
-        result = await self.db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await self.db.execute(ACTIVE_EMPLOYEES)
         active_employees = result.scalars().all()
         employee_count = len(active_employees)
         
@@ -404,13 +396,12 @@ class GoalSystem:
         
         # Count unassigned tasks
         result = await self.db.execute(
-            select(Task).where(
+            select(func.count(Task.id)).where(
                 Task.employee_id.is_(None),
                 Task.status.in_(["pending", "in_progress"])
             )
         )
-        unassigned_tasks = result.scalars().all()
-        unassigned_count = len(unassigned_tasks)
+        unassigned_count = result.scalar() or 0
         
         # Calculate workload metrics
         workload_ratio = employees_with_tasks / max(1, employee_count)  # % of employees working
@@ -443,116 +434,3 @@ class GoalSystem:
             print(f"⚠️  CAPACITY WARNING: Only {capacity_utilization:.1%} capacity utilized ({active_projects_count}/{max_projects} projects)")
         if unassigned_count > employee_count * 2:  # Too many unassigned tasks
             print(f"⚠️  TASK OVERLOAD: {unassigned_count} unassigned tasks for {employee_count} employees")
-        
-        # Emergency task assignment if severe overload detected
-        if tasks_per_employee > 3.0 or (workload_ratio < 0.5 and unassigned_count > 0):
-            await self._emergency_task_assignment(unassigned_tasks, active_employees)
-    
-    async def _emergency_task_assignment(self, unassigned_tasks: list, active_employees: list):
-        """Emergency task assignment when there's severe overload."""
-        from database.models import Task, Project
-        from datetime import datetime, timedelta
-        from employees.room_assigner import ROOM_TRAINING_ROOM
-        import random
-        
-        unassigned_list = list(unassigned_tasks)
-        assigned_count = 0
-        
-        # Get all idle employees (not in training)
-        idle_employees = []
-        for employee in active_employees:
-            if employee.current_task_id is None:
-                # Check if in training
-                is_in_training = False
-                
-                if hasattr(employee, 'activity_state') and employee.activity_state == "training":
-                    is_in_training = True
-                
-                current_room = getattr(employee, 'current_room', None)
-                if (current_room == ROOM_TRAINING_ROOM or 
-                    current_room == f"{ROOM_TRAINING_ROOM}_floor2" or
-                    current_room == f"{ROOM_TRAINING_ROOM}_floor4" or
-                    current_room == f"{ROOM_TRAINING_ROOM}_floor4_2" or
-                    current_room == f"{ROOM_TRAINING_ROOM}_floor4_3" or
-                    current_room == f"{ROOM_TRAINING_ROOM}_floor4_4" or
-                    current_room == f"{ROOM_TRAINING_ROOM}_floor4_5"):
-                    is_in_training = True
-                
-                hired_at = getattr(employee, 'hired_at', None)
-                if hired_at:
-                    try:
-                        if hasattr(hired_at, 'replace'):
-                            if hired_at.tzinfo is not None:
-                                hired_at_naive = hired_at.replace(tzinfo=None)
-                            else:
-                                hired_at_naive = hired_at
-                        else:
-                            hired_at_naive = hired_at
-                        
-                        time_since_hire = local_now() - hired_at_naive
-                        if time_since_hire <= timedelta(hours=1):
-                            is_in_training = True
-                    except Exception:
-                        pass
-                
-                if not is_in_training:
-                    idle_employees.append(employee)
-        
-        # PRIORITY: Sort tasks by: 1) Project priority (high > medium > low), 2) Revenue, 3) Progress
-        # This ensures we focus on high-priority, high-revenue projects first
-        from sqlalchemy import select
-        from database.models import Project
-        
-        task_priorities = []
-        priority_weights = {"high": 3, "medium": 2, "low": 1}
-        
-        for task in unassigned_list:
-            if task.project_id:
-                result = await self.db.execute(
-                    select(Project).where(Project.id == task.project_id)
-                )
-                project = result.scalar_one_or_none()
-                
-                if project:
-                    project_progress = await self.project_manager.calculate_project_progress(task.project_id)
-                    priority_weight = priority_weights.get(project.priority, 1)
-                    revenue = project.revenue or 0.0
-                    
-                    # Calculate priority score: priority (0-3) * 1000 + revenue + progress
-                    # This ensures high-priority projects always come first, then by revenue, then by progress
-                    priority_score = (priority_weight * 1000) + (revenue / 1000) + project_progress
-                    task_priorities.append((task, priority_score, project.priority, revenue, project_progress))
-                else:
-                    task_priorities.append((task, 0.0, "low", 0.0, 0.0))
-            else:
-                task_priorities.append((task, 0.0, "low", 0.0, 0.0))
-        
-        # Sort by priority score (descending) - high-priority, high-revenue projects get priority
-        task_priorities.sort(key=lambda x: x[1], reverse=True)
-        prioritized_tasks = [task for task, _, _, _, _ in task_priorities]
-        
-        # Assign tasks to idle employees (prioritizing high-priority, high-revenue projects)
-        for employee in idle_employees:
-            if prioritized_tasks:
-                # Take highest priority task (from highest priority, highest revenue project)
-                task = prioritized_tasks[0]
-                task.employee_id = employee.id
-                task.status = "in_progress"
-                employee.current_task_id = task.id
-                prioritized_tasks.remove(task)
-                assigned_count += 1
-                
-                # Update project activity
-                if task.project_id:
-                    await self.project_manager.update_project_activity(task.project_id)
-                    result = await self.db.execute(
-                        select(Project).where(Project.id == task.project_id)
-                    )
-                    project = result.scalar_one_or_none()
-                    if project and project.status == "planning":
-                        project.status = "active"
-        
-        if assigned_count > 0:
-            print(f"🚨 EMERGENCY: Assigned {assigned_count} tasks to idle employees")
-
-
@@ -219,13 +219,17 @@ class HolidayManager:
         
         This creates Meeting records for holiday parties so they appear on the calendar.
         Only creates meetings for active employees (excludes terminated employees).
+        All parties in the range are built in memory and written with a single
+        INSERT ... ON CONFLICT DO NOTHING on the (event_kind, event_subject_id, event_date)
+        key, so holidays that are already scheduled are skipped by the database.
         """
-        from database.models import Meeting
         from employees.room_assigner import ROOM_BREAKROOM
+        from config import get_timezone
+        from database.calendar_events import insert_calendar_events, EVENT_HOLIDAY_PARTY, HOLIDAY_SUBJECT_ID
         
+        tz = get_timezone()
         today = local_now()
         today_start = today.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_date = today_start + timedelta(days=days_ahead)
         
         # Get all active employees (exclude terminated employees)
         result = await self.db.execute(
@@ -241,186 +245,100 @@ class HolidayManager:
             return 0
         
         print(f"📋 Generating holiday meetings for next {days_ahead} days ({days_ahead // 365} years)...")
-        print(f"📅 Today: {today_start.strftime('%Y-%m-%d %H:%M:%S %Z') if today_start.tzinfo else today_start.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"📅 End date: {end_date.strftime('%Y-%m-%d %H:%M:%S %Z') if end_date.tzinfo else end_date.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"🌍 Timezone: {today.tzinfo if today.tzinfo else 'America/New_York'}")
         
-        meetings_created = 0
-        skipped_existing = 0
-        errors = 0
+        breakrooms = [
+            (f"{ROOM_BREAKROOM}_floor2", 2),  # Floor 2 breakroom
+            (ROOM_BREAKROOM, 1),  # Floor 1 breakroom
+        ]
+        celebration_messages = {
+            "New Year's Day": "🎉 Happy New Year! Let's celebrate together!",
+            "Martin Luther King Jr. Day": "✊ Honoring MLK Day - a day of reflection and celebration!",
+            "Presidents' Day": "🇺🇸 Celebrating Presidents' Day with the team!",
+            "Washington's Birthday": "🇺🇸 Celebrating Presidents' Day with the team!",
+            "Memorial Day": "🇺🇸 Honoring Memorial Day - remembering those who served!",
+            "Independence Day": "🎆 Happy Independence Day! Let's celebrate America's birthday!",
+            "Independence Day (Observed)": "🎆 Happy Independence Day! Let's celebrate America's birthday!",
+            "Labor Day": "💼 Celebrating Labor Day - honoring the American worker!",
+            "Columbus Day": "🌎 Celebrating Columbus Day with the office!",
+            "Veterans Day": "🇺🇸 Honoring Veterans Day - thank you to all who served!",
+            "Thanksgiving": "🦃 Happy Thanksgiving! Let's give thanks together!",
+            "Christmas": "🎄 Merry Christmas! Time for holiday cheer!",
+            "Christmas Day": "🎄 Merry Christmas! Time for holiday cheer!",
+            "Juneteenth National Independence Day": "🎉 Celebrating Juneteenth - freedom and equality for all!",
+        }
         
-        # Get all holidays in the date range
+        # Build every holiday party in the range
+        rows = []
         for i in range(days_ahead):
             check_date = today_start.date() + timedelta(days=i)
             holiday_name = self.us_holidays.get(check_date)
-            
             if not holiday_name:
                 continue
             
-            try:
-                # Create holiday start time (2 PM party) in NY timezone
-                # Use the same timezone as the current time to ensure consistency
-                holiday_start = datetime(check_date.year, check_date.month, check_date.day, 14, 0, 0)
-                if today.tzinfo:
-                    # Ensure timezone is set correctly (NY timezone)
-                    holiday_start = holiday_start.replace(tzinfo=today.tzinfo)
-                else:
-                    # If no timezone info, use NY timezone from config
-                    from config import get_timezone
-                    ny_tz = get_timezone()
-                    holiday_start = ny_tz.localize(holiday_start)
-                holiday_end = holiday_start + timedelta(hours=1)
-                
-                # Check if a meeting already exists for this holiday
-                # Use a wider time window to catch any existing meetings on the same date
-                check_start = holiday_start - timedelta(hours=24)  # Check 24 hours before
-                check_end = holiday_start + timedelta(hours=24)    # Check 24 hours after
-                existing_result = await self.db.execute(
-                    select(Meeting)
-                    .where(Meeting.start_time >= check_start)
-                    .where(Meeting.start_time <= check_end)
-                )
-                existing_meetings = existing_result.scalars().all()
-                existing = None
-                for meeting in existing_meetings:
-                    meta = meeting.meeting_metadata
-                    if meta and isinstance(meta, dict):
-                        # Check if it's a holiday party and matches the holiday name
-                        if meta.get('is_holiday_party') and meta.get('holiday_name') == holiday_name:
-                            existing = meeting
-                            break
-                    # Also check the title for holiday party indicators
-                    if meeting.title and ('Office Party' in meeting.title or '🎉' in meeting.title):
-                        if holiday_name in meeting.title:
-                            existing = meeting
-                            break
-                
-                if existing:
-                    skipped_existing += 1
-                    if skipped_existing <= 5:  # Only log first few to avoid spam
-                        print(f"  ⏭️  Skipped {holiday_name} on {check_date.strftime('%Y-%m-%d')} (meeting already exists)")
-                    continue
-                
-                # Get attendees (up to 20 employees for holidays)
-                num_attendees = min(20, len(all_employees))
-                attendees = random.sample(all_employees, num_attendees) if all_employees else []
-                attendee_ids = [int(emp.id) for emp in attendees]
-                
-                # Choose a breakroom for the party
-                breakrooms = [
-                    (f"{ROOM_BREAKROOM}_floor2", 2),  # Floor 2 breakroom
-                    (ROOM_BREAKROOM, 1),  # Floor 1 breakroom
-                ]
-                party_breakroom, party_floor = random.choice(breakrooms)
-                room_name = party_breakroom.replace("_floor2", "").replace("_", " ").title()
-                
-                # Create celebration message based on holiday
-                celebration_messages = {
-                    "New Year's Day": "🎉 Happy New Year! Let's celebrate together!",
-                    "Martin Luther King Jr. Day": "✊ Honoring MLK Day - a day of reflection and celebration!",
-                    "Presidents' Day": "🇺🇸 Celebrating Presidents' Day with the team!",
-                    "Washington's Birthday": "🇺🇸 Celebrating Presidents' Day with the team!",
-                    "Memorial Day": "🇺🇸 Honoring Memorial Day - remembering those who served!",
-                    "Independence Day": "🎆 Happy Independence Day! Let's celebrate America's birthday!",
-                    "Independence Day (Observed)": "🎆 Happy Independence Day! Let's celebrate America's birthday!",
-                    "Labor Day": "💼 Celebrating Labor Day - honoring the American worker!",
-                    "Columbus Day": "🌎 Celebrating Columbus Day with the office!",
-                    "Veterans Day": "🇺🇸 Honoring Veterans Day - thank you to all who served!",
-                    "Thanksgiving": "🦃 Happy Thanksgiving! Let's give thanks together!",
-                    "Christmas": "🎄 Merry Christmas! Time for holiday cheer!",
-                    "Christmas Day": "🎄 Merry Christmas! Time for holiday cheer!",
-                    "Juneteenth National Independence Day": "🎉 Celebrating Juneteenth - freedom and equality for all!",
-                }
-                
-                celebration_message = celebration_messages.get(
-                    holiday_name, 
-                    f"🎉 Happy {holiday_name}! Let's celebrate together!"
-                )
-                
-                # Create meeting description
-                attendee_names = [e.name for e in attendees]
-                description = f"🎉 Office Holiday Party: {holiday_name}!\n\n"
-                description += f"{celebration_message}\n"
-                description += f"📍 Location: {room_name} on Floor {party_floor}\n"
-                description += f"👥 Attendees: {', '.join(attendee_names[:5])}"
-                if len(attendee_names) > 5:
-                    description += f", and {len(attendee_names) - 5} more"
-                description += f"\n\n"
-                description += "✨ All employees are welcome to join the celebration!"
-                
-                # Get a random employee as organizer (or first employee if none)
-                organizer = random.choice(all_employees) if all_employees else None
-                
-                # Create the meeting
-                meeting = Meeting(
-                    title=f"🎉 {holiday_name} Office Party",
-                    description=description,
-                    organizer_id=organizer.id if organizer else None,
-                    attendee_ids=attendee_ids,
-                    start_time=holiday_start,
-                    end_time=holiday_end,
-                    status="scheduled",
-                    agenda=f"Office holiday celebration for {holiday_name}",
-                    outline=f"1. Welcome and holiday greetings\n2. Refreshments and snacks\n3. Team activities\n4. Holiday celebration",
-                    meeting_metadata={
-                        "is_holiday_party": True,
-                        "holiday_name": holiday_name,
-                        "party_room": party_breakroom,
-                        "party_floor": party_floor,
-                        "room_name": room_name,
-                        "celebration_message": celebration_message
-                    }
-                )
-                
-                # Final duplicate check right before adding (prevents race conditions)
-                final_check = await self.db.execute(
-                    select(Meeting)
-                    .where(Meeting.start_time >= check_start)
-                    .where(Meeting.start_time <= check_end)
-                    .where(Meeting.title.like(f"%{holiday_name}%"))
-                )
-                final_existing = final_check.scalars().first()
-                if final_existing:
-                    skipped_existing += 1
-                    if skipped_existing <= 5:
-                        print(f"  ⏭️  Skipped {holiday_name} on {check_date.strftime('%Y-%m-%d')} (duplicate detected in final check)")
-                    continue
-                
-                self.db.add(meeting)
-                meetings_created += 1
-                if meetings_created <= 15:
-                    tz_str = f" {holiday_start.strftime('%Z')}" if holiday_start.tzinfo else ""
-                    print(f"  ✅ Created holiday party for {holiday_name} on {holiday_start.strftime('%Y-%m-%d')} at {holiday_start.strftime('%H:%M')}{tz_str}")
-                
-            except Exception as e:
-                errors += 1
-                if errors <= 5:
-                    print(f"❌ Error generating holiday meeting for {holiday_name}: {e}")
-                    import traceback
-                    traceback.print_exc()
-                continue
+            # Holiday party at 2 PM local time
+            holiday_start = tz.localize(datetime(check_date.year, check_date.month, check_date.day, 14, 0, 0))
+            holiday_end = holiday_start + timedelta(hours=1)
+            
+            # Get attendees (up to 20 employees for holidays)
+            num_attendees = min(20, len(all_employees))
+            attendees = random.sample(all_employees, num_attendees)
+            attendee_ids = [int(emp.id) for emp in attendees]
+            
+            # Choose a breakroom for the party
+            party_breakroom, party_floor = random.choice(breakrooms)
+            room_name = party_breakroom.replace("_floor2", "").replace("_", " ").title()
+            
+            celebration_message = celebration_messages.get(
+                holiday_name, 
+                f"🎉 Happy {holiday_name}! Let's celebrate together!"
+            )
+            
+            # Create meeting description
+            attendee_names = [e.name for e in attendees]
+            description = f"🎉 Office Holiday Party: {holiday_name}!\n\n"
+            description += f"{celebration_message}\n"
+            description += f"📍 Location: {room_name} on Floor {party_floor}\n"
+            description += f"👥 Attendees: {', '.join(attendee_names[:5])}"
+            if len(attendee_names) > 5:
+                description += f", and {len(attendee_names) - 5} more"
+            description += f"\n\n"
+            description += "✨ All employees are welcome to join the celebration!"
+            
+            organizer = random.choice(all_employees)
+            
+            rows.append({
+                "title": f"🎉 {holiday_name} Office Party",
+                "description": description,
+                "organizer_id": organizer.id,
+                "attendee_ids": attendee_ids,
+                "start_time": holiday_start,
+                "end_time": holiday_end,
+                "status": "scheduled",
+                "agenda": f"Office holiday celebration for {holiday_name}",
+                "outline": f"1. Welcome and holiday greetings\n2. Refreshments and snacks\n3. Team activities\n4. Holiday celebration",
+                "meeting_metadata": {
+                    "is_holiday_party": True,
+                    "holiday_name": holiday_name,
+                    "party_room": party_breakroom,
+                    "party_floor": party_floor,
+                    "room_name": room_name,
+                    "celebration_message": celebration_message
+                },
+                "event_kind": EVENT_HOLIDAY_PARTY,
+                "event_subject_id": HOLIDAY_SUBJECT_ID,
+                "event_date": check_date,
+            })
         
-        # Commit the transaction
         try:
-            if meetings_created > 0:
-                await self.db.commit()
-                print(f"✅ Committed {meetings_created} new holiday party meetings to database")
-                print(f"   No duplicates created - all meetings are unique.")
-            else:
-                await self.db.commit()
-                print(f"ℹ️ No new meetings to commit (all holidays already scheduled - no duplicates)")
-        except Exception as commit_error:
-            print(f"❌ Error committing meetings: {commit_error}")
+            meetings_created = await insert_calendar_events(self.db, rows)
+            await self.db.commit()
+        except Exception as e:
+            print(f"❌ Error committing holiday meetings: {e}")
             await self.db.rollback()
             import traceback
             traceback.print_exc()
             return 0
         
-        if skipped_existing > 0:
-            print(f"ℹ️ Skipped {skipped_existing} holidays (meetings already exist)")
-        
-        print(f"📊 Summary: Created {meetings_created} holiday meetings, Skipped {skipped_existing}, Errors {errors}")
-        if meetings_created > 0:
-            print(f"✅ All holiday parties are scheduled with proper NY timezone and will appear on the calendar.")
+        print(f"📊 Summary: {len(rows)} holidays in range, created {meetings_created}, "
+              f"skipped {len(rows) - meetings_created} (already scheduled)")
         return meetings_created
-
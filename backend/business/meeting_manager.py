@@ -4,7 +4,9 @@ Meeting Manager - Handles meeting generation, scheduling, and live meeting trans
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from database.models import Employee, Meeting
+from database.hot_queries import ACTIVE_EMPLOYEES, EMPLOYEE_BY_ID
 from database.database import safe_commit
+from business.meeting_scheduler import meeting_scheduler
 from datetime import datetime, timedelta
 import random
 import json
@@ -26,9 +28,7 @@ class MeetingManager:
     async def generate_meetings(self) -> int:
         """Generate important meetings for the day with employees and managers."""
         # Get all active employees
-        result = await self.db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await self.db.execute(ACTIVE_EMPLOYEES)
         all_employees = result.scalars().all()
         
         if len(all_employees) < 2:
@@ -57,6 +57,7 @@ class MeetingManager:
         business_context = await get_business_context(self.db)
         
         meetings_created = 0
+        created = []
         
         # Generate 3-8 meetings throughout the day (but only if we don't have enough)
         target_meetings = random.randint(3, 8)
@@ -160,17 +161,17 @@ class MeetingManager:
             )
             
             self.db.add(meeting)
+            created.append(meeting)
             meetings_created += 1
         
         await safe_commit(self.db)
+        meeting_scheduler.add_meetings(created)
         return meetings_created
     
     async def generate_meetings_for_date_range(self, start_date: datetime, end_date: datetime) -> int:
         """Generate meetings for a specific date range (e.g., last week)."""
         # Get all active employees
-        result = await self.db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await self.db.execute(ACTIVE_EMPLOYEES)
         all_employees = result.scalars().all()
         
         if len(all_employees) < 2:
@@ -181,6 +182,7 @@ class MeetingManager:
         business_context = await get_business_context(self.db)
         
         meetings_created = 0
+        created = []
         current_date = datetime(start_date.year, start_date.month, start_date.day, 9, 0)  # Start at 9 AM
         
         # Meeting types and topics
@@ -278,6 +280,7 @@ class MeetingManager:
                 )
                 
                 self.db.add(meeting)
+                created.append(meeting)
                 meetings_created += 1
             
             # Move to next day
@@ -285,14 +288,13 @@ class MeetingManager:
             current_date = current_date.replace(hour=9, minute=0, second=0, microsecond=0)
         
         await safe_commit(self.db)
+        meeting_scheduler.add_meetings(created)
         return meetings_created
     
     async def generate_in_progress_meeting(self) -> Optional[Meeting]:
         """Generate an in-progress meeting happening right now."""
         # Get all active employees
-        result = await self.db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await self.db.execute(ACTIVE_EMPLOYEES)
         all_employees = result.scalars().all()
         
         if len(all_employees) < 2:
@@ -368,6 +370,7 @@ class MeetingManager:
         
         self.db.add(meeting)
         await safe_commit(self.db)
+        meeting_scheduler.add_meeting(meeting)
         
         # Generate initial live content
         await self._generate_live_meeting_content(meeting)
@@ -403,14 +406,14 @@ Format:
 [HH:MM] Another Speaker: Response"""
 
         try:
-            client = await self.llm_client._get_client()
-            response = await client.post(
-                f"{self.llm_client.base_url}/api/generate",
-                json={
+            response = await self.llm_client._make_request_with_fallback(
+                "/api/generate",
+                {
                     "model": self.llm_client.model,
                     "prompt": prompt,
                     "stream": False
-                }
+                },
+                kind="meeting"
             )
             
             if response.status_code == 200:
@@ -458,15 +461,15 @@ Respond in JSON format:
 }}"""
 
         try:
-            client = await self.llm_client._get_client()
-            response = await client.post(
-                f"{self.llm_client.base_url}/api/generate",
-                json={
+            response = await self.llm_client._make_request_with_fallback(
+                "/api/generate",
+                {
                     "model": self.llm_client.model,
                     "prompt": prompt,
                     "stream": False,
                     "format": "json"
-                }
+                },
+                kind="meeting"
             )
             
             if response.status_code == 200:
@@ -501,10 +504,13 @@ Respond in JSON format:
             return agenda, outline
     
     async def update_meeting_status(self):
-        """Update meeting status based on current time (scheduled -> in_progress -> completed)."""
+        """
+        Full sweep of meeting status based on current time (scheduled -> in_progress -> completed).
+        The simulator relies on business/meeting_scheduler.py for transitions; this is kept for the
+        manual update endpoints and scripts.
+        """
         now = local_now()
         
-        # Update meetings that should be in progress
         result = await self.db.execute(
             select(Meeting).where(
                 Meeting.status == "scheduled",
@@ -512,141 +518,186 @@ Respond in JSON format:
                 Meeting.end_time > now
             )
         )
-        in_progress_meetings = result.scalars().all()
+        await self.start_meetings(result.scalars().all(), now)
         
-        print(f"🔍 Checking for meetings to start: found {len(in_progress_meetings)} meeting(s) that should be in progress")
+        await self.update_live_meetings(now)
         
-        for meeting in in_progress_meetings:
-            print(f"🔄 Starting meeting {meeting.id}: {meeting.title} (scheduled for {meeting.start_time}, current time: {now})")
-            # CRITICAL: Explicitly set status and ensure it's tracked
+        result = await self.db.execute(
+            select(Meeting).where(
+                Meeting.status.in_(["in_progress", "scheduled"]),
+                Meeting.end_time <= now
+            )
+        )
+        await self.complete_meetings(result.scalars().all())
+    
+    async def run_transitions(self, start_ids: List[int], end_ids: List[int]) -> Dict[str, int]:
+        """
+        Apply the start and end transitions the meeting scheduler found due.
+        Each meeting is re-checked here, so entries for meetings that were moved,
+        deleted or already handled are skipped.
+        
+        Args:
+            start_ids: Meetings whose start time has come
+            end_ids: Meetings whose end time has come
+        
+        Returns:
+            {"started": n, "completed": n}
+        """
+        now = local_now()
+        started = []
+        completed = []
+        if start_ids:
+            result = await self.db.execute(
+                select(Meeting).where(
+                    Meeting.id.in_(start_ids),
+                    Meeting.status == "scheduled",
+                    Meeting.start_time <= now,
+                    Meeting.end_time > now
+                )
+            )
+            started = result.scalars().all()
+            await self.start_meetings(started, now)
+        if end_ids:
+            result = await self.db.execute(
+                select(Meeting).where(
+                    Meeting.id.in_(end_ids),
+                    Meeting.status.in_(["in_progress", "scheduled"]),
+                    Meeting.end_time <= now
+                )
+            )
+            completed = result.scalars().all()
+            await self.complete_meetings(completed)
+        return {"started": len(started), "completed": len(completed)}
+    
+    async def start_meetings(self, meetings: List[Meeting], now: datetime):
+        """
+        Move meetings to in_progress. Birthday party notifications and attendee moves
+        run once for the whole batch; opening live content is generated per meeting.
+        """
+        if not meetings:
+            return
+        
+        for meeting in meetings:
+            logger.info(f"🔄 Starting meeting {meeting.id}: {meeting.title} (scheduled for {meeting.start_time}, current time: {now})")
             meeting.status = "in_progress"
-            # Force SQLAlchemy to track this change
-            from sqlalchemy.orm.attributes import flag_modified
-            # Status is a regular column, not JSON, so we don't need flag_modified for it
-            # But we do need to ensure the object is in the session
-            self.db.add(meeting)  # Ensure it's tracked
             # Initialize live transcript if not exists
             if not meeting.live_transcript:
                 meeting.live_transcript = f"Meeting started at {now.strftime('%H:%M')}\n"
             # Initialize metadata if needed
             if not meeting.meeting_metadata:
                 meeting.meeting_metadata = {"live_messages": []}
-            
-            # Check if this is a birthday party meeting and send notifications
-            metadata = meeting.meeting_metadata or {}
-            if metadata.get("is_birthday_party"):
-                try:
-                    from database.models import Notification
-                    # Get all active employees
-                    result = await self.db.execute(
-                        select(Employee).where(Employee.status == "active")
-                    )
-                    all_employees = result.scalars().all()
-                    
-                    # Get party details from metadata
-                    room_name = metadata.get("room_name", "Breakroom")
-                    party_floor = metadata.get("party_floor", 1)
-                    birthday_employee_id = metadata.get("birthday_employee_id")
-                    
-                    # Get birthday person name
-                    birthday_person = None
-                    if birthday_employee_id:
-                        birthday_result = await self.db.execute(
-                            select(Employee).where(Employee.id == birthday_employee_id)
-                        )
-                        birthday_person = birthday_result.scalar_one_or_none()
-                    
-                    birthday_name = birthday_person.name if birthday_person else meeting.title.replace("🎂 ", "").replace("'s Birthday Party", "")
-                    
-                    # Send notifications to all employees (with duplicate prevention)
-                    from business.notification_helper import create_notification_if_not_duplicate
-                    for emp in all_employees:
-                        notification = await create_notification_if_not_duplicate(
-                            self.db,
-                            notification_type="birthday_party",
-                            title=f"🎉 Birthday Party: {birthday_name}!",
-                            message=f"{birthday_name}'s birthday party is happening now in the {room_name} on Floor {party_floor}!",
-                            employee_id=emp.id,
-                            duplicate_window_minutes=10  # 10 minute window for birthday parties
-                        )
-                        # Only add if not a duplicate (notification will be None if duplicate)
-                        if notification:
-                            # Already added to session by helper function
-                            pass
-                    
-                    print(f"🎉 Sent birthday party notifications for {birthday_name}'s party in {room_name} on Floor {party_floor}")
-                    
-                    # Enforce attendance - move all attendees to the breakroom
-                    try:
-                        from engine.movement_system import update_employee_location
-                        from employees.room_assigner import ROOM_BREAKROOM
-                        from database.models import BirthdayCelebration
-                        from sqlalchemy import func
-                        
-                        party_room = metadata.get("party_room", ROOM_BREAKROOM)
-                        party_floor = metadata.get("party_floor", 1)
-                        
-                        # Get or create birthday celebration
-                        celebration_result = await self.db.execute(
-                            select(BirthdayCelebration)
-                            .where(BirthdayCelebration.employee_id == birthday_employee_id)
-                            .where(func.date(BirthdayCelebration.celebration_date) == now.date())
-                        )
-                        celebration = celebration_result.scalar_one_or_none()
-                        
-                        # Get all attendees from meeting
-                        attendee_ids = meeting.attendee_ids or []
-                        if birthday_employee_id and birthday_employee_id not in attendee_ids:
-                            attendee_ids.append(birthday_employee_id)
-                        
-                        # Move all attendees to breakroom
-                        attendees_result = await self.db.execute(
-                            select(Employee).where(Employee.id.in_(attendee_ids))
-                        )
-                        attendees = attendees_result.scalars().all()
-                        
-                        for attendee in attendees:
-                            await update_employee_location(attendee, party_room, "break", self.db)
-                            attendee.floor = party_floor
-                        
-                        # Update celebration party_time if not set
-                        if celebration and not celebration.party_time:
-                            celebration.party_time = meeting.start_time
-                        
-                        print(f"🎉 Moved {len(attendees)} employees to {room_name} on Floor {party_floor} for birthday party")
-                    except Exception as e:
-                        print(f"❌ Error enforcing birthday party attendance: {e}")
-                        import traceback
-                        traceback.print_exc()
-                    
-                except Exception as e:
-                    print(f"❌ Error sending birthday party notifications: {e}")
-                    import traceback
-                    traceback.print_exc()
-            
-            # Generate initial live messages immediately
+        
+        parties = [m for m in meetings if (m.meeting_metadata or {}).get("is_birthday_party")]
+        if parties:
+            try:
+                await self._start_birthday_parties(parties, now)
+            except Exception as e:
+                print(f"❌ Error starting birthday parties: {e}")
+                import traceback
+                traceback.print_exc()
+        
+        # Commit status changes before generating content, so a failed LLM call can't undo them
+        await safe_commit(self.db)
+        logger.debug(f"✅ Committed status changes for {len(meetings)} meeting(s) starting")
+        
+        # Generate initial live messages immediately
+        for meeting in meetings:
             try:
                 await self._generate_live_meeting_content(meeting)
-                meeting.meeting_metadata["last_content_update"] = now.isoformat()
+                metadata = dict(meeting.meeting_metadata or {})
+                metadata["last_content_update"] = now.isoformat()
+                meeting.meeting_metadata = metadata
+                await safe_commit(self.db)
                 print(f"✅ Initialized and generated content for new in-progress meeting {meeting.id}: {meeting.title}")
             except Exception as e:
                 print(f"❌ Error generating initial content for meeting {meeting.id}: {e}")
                 import traceback
                 traceback.print_exc()
+                try:
+                    await self.db.rollback()
+                except Exception as rollback_error:
+                    print(f"⚠️  Error during rollback: {rollback_error}")
+    
+    async def _start_birthday_parties(self, parties: List[Meeting], now: datetime):
+        """Notify everyone and move attendees to the party room for every party in the batch."""
+        from business.notification_helper import create_notifications_for_employees
+        from engine.movement_system import update_employee_location
+        from employees.room_assigner import ROOM_BREAKROOM
+        from database.models import BirthdayCelebration
+        from sqlalchemy import func
+        
+        result = await self.db.execute(select(Employee.id).where(Employee.status == "active"))
+        active_ids = [row[0] for row in result.all()]
+        
+        birthday_ids = {
+            (m.meeting_metadata or {}).get("birthday_employee_id") for m in parties
+        } - {None}
+        attendee_ids = set(birthday_ids)
+        for meeting in parties:
+            attendee_ids.update(meeting.attendee_ids or [])
+        
+        people = {}
+        if attendee_ids:
+            result = await self.db.execute(select(Employee).where(Employee.id.in_(attendee_ids)))
+            people = {emp.id: emp for emp in result.scalars().all()}
+        
+        celebrations = {}
+        if birthday_ids:
+            result = await self.db.execute(
+                select(BirthdayCelebration)
+                .where(BirthdayCelebration.employee_id.in_(birthday_ids))
+                .where(func.date(BirthdayCelebration.celebration_date) == now.date())
+            )
+            celebrations = {c.employee_id: c for c in result.scalars().all()}
         
-        # Commit status changes BEFORE continuing with other updates
-        if in_progress_meetings:
-            # CRITICAL: Refresh each meeting to ensure changes are tracked
-            for meeting in in_progress_meetings:
-                await self.db.refresh(meeting)
-            await safe_commit(self.db)
-            # Refresh again after commit to verify
-            for meeting in in_progress_meetings:
-                await self.db.refresh(meeting)
-            print(f"✅ Committed status changes for {len(in_progress_meetings)} meeting(s) starting")
-            for meeting in in_progress_meetings:
-                print(f"   ✅ Meeting {meeting.id} status is now: {meeting.status}")
-        
+        for meeting in parties:
+            metadata = meeting.meeting_metadata or {}
+            room_name = metadata.get("room_name", "Breakroom")
+            party_room = metadata.get("party_room", ROOM_BREAKROOM)
+            party_floor = metadata.get("party_floor", 1)
+            birthday_employee_id = metadata.get("birthday_employee_id")
+            birthday_person = people.get(birthday_employee_id)
+            birthday_name = birthday_person.name if birthday_person else meeting.title.replace("🎂 ", "").replace("'s Birthday Party", "")
+            
+            # Send notifications to all employees (with duplicate prevention)
+            try:
+                await create_notifications_for_employees(
+                    self.db,
+                    active_ids,
+                    notification_type="birthday_party",
+                    title=f"🎉 Birthday Party: {birthday_name}!",
+                    message=f"{birthday_name}'s birthday party is happening now in the {room_name} on Floor {party_floor}!",
+                    duplicate_window_minutes=10  # 10 minute window for birthday parties
+                )
+                print(f"🎉 Sent birthday party notifications for {birthday_name}'s party in {room_name} on Floor {party_floor}")
+            except Exception as e:
+                print(f"❌ Error sending birthday party notifications: {e}")
+                import traceback
+                traceback.print_exc()
+            
+            # Enforce attendance - move all attendees to the party room
+            try:
+                party_attendee_ids = list(meeting.attendee_ids or [])
+                if birthday_employee_id and birthday_employee_id not in party_attendee_ids:
+                    party_attendee_ids.append(birthday_employee_id)
+                attendees = [people[i] for i in party_attendee_ids if i in people]
+                for attendee in attendees:
+                    await update_employee_location(attendee, party_room, "break", self.db)
+                    attendee.floor = party_floor
+                
+                celebration = celebrations.get(birthday_employee_id)
+                if celebration and not celebration.party_time:
+                    celebration.party_time = meeting.start_time
+                
+                print(f"🎉 Moved {len(attendees)} employees to {room_name} on Floor {party_floor} for birthday party")
+            except Exception as e:
+                print(f"❌ Error enforcing birthday party attendance: {e}")
+                import traceback
+                traceback.print_exc()
+    
+    async def update_live_meetings(self, now: Optional[datetime] = None):
+        """Generate new live content for in-progress meetings (every 10 seconds per meeting)."""
+        now = now or local_now()
         # Update live content for in-progress meetings (generate new messages periodically)
         result = await self.db.execute(
             select(Meeting).where(
@@ -657,7 +708,7 @@ Respond in JSON format:
         active_meetings = result.scalars().all()
         
         if len(active_meetings) > 0:
-            print(f"Found {len(active_meetings)} active meeting(s) to update")
+            logger.debug(f"Found {len(active_meetings)} active meeting(s) to update")
         
         for meeting in active_meetings:
             # Refresh meeting to get latest state
@@ -675,7 +726,7 @@ Respond in JSON format:
             if not last_update or last_update == "Never":
                 # No previous update - generate immediately
                 should_update = True
-                print(f"🔄 Meeting {meeting.id} ({meeting.title}) has no previous update - generating content immediately")
+                logger.debug(f"🔄 Meeting {meeting.id} ({meeting.title}) has no previous update - generating content immediately")
             else:
                 try:
                     if isinstance(last_update, str):
@@ -695,9 +746,9 @@ Respond in JSON format:
                     # Generate new content every 10-15 seconds for active meetings (slower pace, one at a time)
                     if time_since_update >= 10:
                         should_update = True
-                        print(f"🔄 Meeting {meeting.id} ({meeting.title}): {time_since_update:.1f}s since last update - generating new content")
+                        logger.debug(f"🔄 Meeting {meeting.id} ({meeting.title}): {time_since_update:.1f}s since last update - generating new content")
                     else:
-                        print(f"⏸️ Meeting {meeting.id} ({meeting.title}): {time_since_update:.1f}s since last update - waiting (need 10s)")
+                        logger.debug(f"⏸️ Meeting {meeting.id} ({meeting.title}): {time_since_update:.1f}s since last update - waiting (need 10s)")
                 except Exception as e:
                     # If parsing fails, update anyway
                     print(f"⚠️ Error parsing last_update for meeting {meeting.id}: {e}")
@@ -754,17 +805,13 @@ Respond in JSON format:
                         await self.db.rollback()
                     except Exception as rollback_error:
                         print(f"⚠️  Error during rollback: {rollback_error}")
+    
+    async def complete_meetings(self, meetings: List[Meeting]):
+        """Close meetings whose end time has passed: closing sequence, final transcript and AI summary."""
+        if not meetings:
+            return
         
-        # Update meetings that should be completed (both in_progress and scheduled that have passed)
-        result = await self.db.execute(
-            select(Meeting).where(
-                Meeting.status.in_(["in_progress", "scheduled"]),
-                Meeting.end_time <= now
-            )
-        )
-        completed_meetings = result.scalars().all()
-        
-        for meeting in completed_meetings:
+        for meeting in meetings:
             # Refresh to get latest state
             await self.db.refresh(meeting)
             
@@ -812,9 +859,7 @@ Respond in JSON format:
                 # For scheduled meetings that passed, generate a transcript indicating they happened
                 if was_scheduled:
                     # Get organizer and attendees for transcript generation
-                    organizer_result = await self.db.execute(
-                        select(Employee).where(Employee.id == meeting.organizer_id)
-                    )
+                    organizer_result = await self.db.execute(EMPLOYEE_BY_ID, {"employee_id": meeting.organizer_id})
                     organizer = organizer_result.scalar_one_or_none()
                     
                     attendees = []
@@ -910,15 +955,15 @@ Write only the summary, nothing else."""
 
         organizer_summary = None
         try:
-            client = await self.llm_client._get_client()
-            response = await client.post(
-                f"{self.llm_client.base_url}/api/generate",
-                json={
+            response = await self.llm_client._make_request_with_fallback(
+                "/api/generate",
+                {
                     "model": self.llm_client.model,
                     "prompt": summary_prompt,
                     "stream": False
                 },
-                timeout=httpx.Timeout(30.0, connect=10.0)
+                timeout=httpx.Timeout(30.0, connect=10.0),
+                kind="meeting"
             )
             
             if response.status_code == 200:
@@ -947,15 +992,15 @@ Write only the thank you message, nothing else."""
 
         organizer_goodbye = None
         try:
-            client = await self.llm_client._get_client()
-            response = await client.post(
-                f"{self.llm_client.base_url}/api/generate",
-                json={
+            response = await self.llm_client._make_request_with_fallback(
+                "/api/generate",
+                {
                     "model": self.llm_client.model,
                     "prompt": goodbye_prompt,
                     "stream": False
                 },
-                timeout=httpx.Timeout(30.0, connect=10.0)
+                timeout=httpx.Timeout(30.0, connect=10.0),
+                kind="meeting"
             )
             
             if response.status_code == 200:
@@ -1026,15 +1071,15 @@ Write only the goodbye message, nothing else."""
 
             attendee_goodbye = None
             try:
-                client = await self.llm_client._get_client()
-                response = await client.post(
-                    f"{self.llm_client.base_url}/api/generate",
-                    json={
+                response = await self.llm_client._make_request_with_fallback(
+                    "/api/generate",
+                    {
                         "model": self.llm_client.model,
                         "prompt": attendee_goodbye_prompt,
                         "stream": False
                     },
-                    timeout=httpx.Timeout(30.0, connect=10.0)
+                    timeout=httpx.Timeout(30.0, connect=10.0),
+                    kind="meeting"
                 )
                 
                 if response.status_code == 200:
@@ -1448,15 +1493,15 @@ Write only the message, nothing else."""
 
             message_text = None
             try:
-                client = await self.llm_client._get_client()
-                response = await client.post(
-                    f"{self.llm_client.base_url}/api/generate",
-                    json={
+                response = await self.llm_client._make_request_with_fallback(
+                    "/api/generate",
+                    {
                         "model": self.llm_client.model,
                         "prompt": prompt,
                         "stream": False
                     },
-                    timeout=httpx.Timeout(30.0, connect=10.0)
+                    timeout=httpx.Timeout(30.0, connect=10.0),
+                    kind="meeting"
                 )
                 
                 if response.status_code == 200:
@@ -1630,14 +1675,14 @@ Format:
 [HH:MM] Another Speaker: Response"""
 
         try:
-            client = await self.llm_client._get_client()
-            response = await client.post(
-                f"{self.llm_client.base_url}/api/generate",
-                json={
+            response = await self.llm_client._make_request_with_fallback(
+                "/api/generate",
+                {
                     "model": self.llm_client.model,
                     "prompt": prompt,
                     "stream": False
-                }
+                },
+                kind="meeting"
             )
             
             if response.status_code == 200:
@@ -1663,9 +1708,7 @@ Format:
         attendee_list = ", ".join([f"{e.name} ({e.title})" for e in attendees])
         
         # Get organizer
-        organizer_result = await self.db.execute(
-            select(Employee).where(Employee.id == meeting.organizer_id)
-        )
+        organizer_result = await self.db.execute(EMPLOYEE_BY_ID, {"employee_id": meeting.organizer_id})
         organizer = organizer_result.scalar_one_or_none()
         organizer_name = organizer.name if organizer else "Unknown"
         
@@ -1692,15 +1735,15 @@ Format the summary in clear paragraphs. Be concise but comprehensive. Focus on t
 Write only the summary, nothing else."""
 
         try:
-            client = await self.llm_client._get_client()
-            response = await client.post(
-                f"{self.llm_client.base_url}/api/generate",
-                json={
+            response = await self.llm_client._make_request_with_fallback(
+                "/api/generate",
+                {
                     "model": self.llm_client.model,
                     "prompt": prompt,
                     "stream": False
                 },
-                timeout=httpx.Timeout(60.0, connect=10.0)
+                timeout=httpx.Timeout(60.0, connect=10.0),
+                kind="meeting"
             )
             
             if response.status_code == 200:
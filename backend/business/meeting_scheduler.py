@@ -0,0 +1,227 @@
+"""
+In-process scheduler for meeting start and end transitions.
+
+Meetings used to be moved from scheduled to in_progress to completed by
+MeetingManager.update_meeting_status(), which ran on every simulator tick and
+every 10 s from the meeting loop, querying the meetings table each time even
+though every start and end time is known when the meeting is created.
+
+MeetingScheduler keeps a heap of (due time, transition) entries instead:
+
+- At startup (and every MEETING_SCHEDULER_RESYNC_SECONDS afterwards, to pick up
+  meetings written by paths that don't report them) it loads the start and end
+  times of all scheduled and in-progress meetings.
+- The code that creates meetings (generate_meetings, the schedule-in-* and
+  party endpoints, ...) hands them to add() right away; deleting one calls
+  forget(). Re-adding a meeting with different times supersedes its old
+  entries.
+- The run() loop sleeps until the earliest entry is due (or until add() brings
+  an earlier one), pops every entry that is due and hands the batch to
+  MeetingManager.run_transitions(), which re-checks each meeting against the
+  database, so stale entries for moved or deleted meetings are harmless.
+  A batch that fails is retried after MEETING_SCHEDULER_RETRY_SECONDS.
+
+The database work therefore scales with the number of transitions, not with how
+often anything polls. Live transcript content for in-progress meetings is still
+generated by the simulator's meeting loop.
+"""
+import asyncio
+import heapq
+import os
+import traceback
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from config import now as local_now, get_timezone, sleep as clock_sleep
+from database.models import Meeting
+
+RESYNC_SECONDS = float(os.getenv("MEETING_SCHEDULER_RESYNC_SECONDS", "300"))
+RETRY_SECONDS = float(os.getenv("MEETING_SCHEDULER_RETRY_SECONDS", "10"))
+
+START = "start"
+END = "end"
+
+OPEN_STATUSES = ("scheduled", "in_progress")
+
+OPEN_MEETING_TIMES = select(Meeting.id, Meeting.start_time, Meeting.end_time, Meeting.status).where(
+    Meeting.status.in_(OPEN_STATUSES)
+)
+
+
+def _aware(value: datetime) -> datetime:
+    """Meeting times without tzinfo are in the configured timezone."""
+    if value.tzinfo is None:
+        return get_timezone().localize(value)
+    return value
+
+
+class MeetingScheduler:
+    """Heap of pending meeting transitions, fired as batches when they fall due."""
+
+    def __init__(self):
+        # (due, seq, meeting_id, transition, token)
+        self._heap: List[Tuple[datetime, int, int, str, int]] = []
+        # meeting_id -> (start_time, end_time, token) of the entries currently in force
+        self._meetings: Dict[int, Tuple[datetime, datetime, int]] = {}
+        self._seq = 0
+        self._tokens = 0
+        # Set by add() when an earlier entry arrives and by stop(); created in run() on its loop
+        self._wake: Optional[asyncio.Event] = None
+        self.running = False
+        self.loads = 0
+        self.batches = 0
+        self.started = 0
+        self.completed = 0
+        self.stale = 0
+        self.failed_batches = 0
+
+    def add(self, meeting_id: Optional[int], start_time: datetime, end_time: datetime, status: str = "scheduled"):
+        """
+        Schedule the transitions of one meeting (no-op if it is already scheduled with these times).
+
+        Args:
+            meeting_id: Meeting ID (ignored when None, e.g. the insert failed)
+            start_time: Meeting start
+            end_time: Meeting end
+            status: Current status; in-progress meetings only get an end transition
+        """
+        if meeting_id is None or start_time is None or end_time is None:
+            return
+        if status not in OPEN_STATUSES:
+            self.forget(meeting_id)
+            return
+        start_time, end_time = _aware(start_time), _aware(end_time)
+        known = self._meetings.get(meeting_id)
+        if known and known[0] == start_time and known[1] == end_time:
+            return
+
+        self._tokens += 1
+        token = self._tokens
+        self._meetings[meeting_id] = (start_time, end_time, token)
+        if status == "scheduled":
+            self._push(start_time, meeting_id, START, token)
+        self._push(end_time, meeting_id, END, token)
+
+    def add_meeting(self, meeting: Meeting):
+        """Schedule a Meeting row (after it has been flushed, so it has an ID)."""
+        self.add(meeting.id, meeting.start_time, meeting.end_time, meeting.status or "scheduled")
+
+    def add_meetings(self, meetings: Iterable[Meeting]):
+        for meeting in meetings:
+            self.add_meeting(meeting)
+
+    def forget(self, meeting_id: int):
+        """Drop a deleted or cancelled meeting; its heap entries are discarded when they come up."""
+        self._meetings.pop(meeting_id, None)
+
+    def _push(self, due: datetime, meeting_id: int, transition: str, token: int):
+        wake = not self._heap or due < self._heap[0][0]
+        heapq.heappush(self._heap, (due, self._seq, meeting_id, transition, token))
+        self._seq += 1
+        if wake:
+            self._wakeup()
+
+    async def load(self, db=None):
+        """Add every scheduled and in-progress meeting from the database."""
+        if db is None:
+            from database.database import async_session_maker
+            async with async_session_maker() as session:
+                rows = (await session.execute(OPEN_MEETING_TIMES)).all()
+        else:
+            rows = (await db.execute(OPEN_MEETING_TIMES)).all()
+        for meeting_id, start_time, end_time, status in rows:
+            self.add(meeting_id, start_time, end_time, status)
+        self.loads += 1
+
+    def _pop_due(self, now: datetime) -> List[Tuple[datetime, int, int, str, int]]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            known = self._meetings.get(entry[2])
+            if known is None or known[2] != entry[4]:
+                self.stale += 1
+                continue
+            due.append(entry)
+        return due
+
+    async def _fire(self, entries: List[Tuple[datetime, int, int, str, int]]):
+        from database.database import async_session_maker
+        from business.meeting_manager import MeetingManager
+
+        start_ids = sorted({entry[2] for entry in entries if entry[3] == START})
+        end_ids = sorted({entry[2] for entry in entries if entry[3] == END})
+        self.batches += 1
+        try:
+            async with async_session_maker() as db:
+                result = await MeetingManager(db).run_transitions(start_ids, end_ids)
+            self.started += result["started"]
+            self.completed += result["completed"]
+        except Exception as e:
+            self.failed_batches += 1
+            print(f"❌ Meeting transitions failed for {len(entries)} transition(s), retrying in {RETRY_SECONDS:.0f}s: {e}")
+            traceback.print_exc()
+            retry_at = local_now() + timedelta(seconds=RETRY_SECONDS)
+            for _, _, meeting_id, transition, token in entries:
+                self._push(retry_at, meeting_id, transition, token)
+            return
+
+        for _, _, meeting_id, transition, token in entries:
+            known = self._meetings.get(meeting_id)
+            if transition == END and known and known[2] == token:
+                del self._meetings[meeting_id]
+
+    def _wakeup(self):
+        if self._wake is not None:
+            self._wake.set()
+
+    async def run(self):
+        """Fire transitions as they fall due until stop() is called."""
+        self.running = True
+        self._wake = asyncio.Event()
+        next_resync = local_now()
+        while self.running:
+            try:
+                now = local_now()
+                if now >= next_resync:
+                    await self.load()
+                    next_resync = local_now() + timedelta(seconds=RESYNC_SECONDS)
+                    now = local_now()
+                entries = self._pop_due(now)
+                if entries:
+                    await self._fire(entries)
+                    continue
+                delay = (next_resync - now).total_seconds()
+                if self._heap:
+                    delay = min(delay, (self._heap[0][0] - now).total_seconds())
+                # Nothing awaited since the heap was read, so no add() can slip in before the clear
+                self._wake.clear()
+                await clock_sleep(max(delay, 0.0), self._wake)
+            except Exception as e:
+                print(f"❌ Error in meeting scheduler: {e}")
+                traceback.print_exc()
+                self._wake.clear()
+                await clock_sleep(RETRY_SECONDS, self._wake)
+
+    def stop(self):
+        self.running = False
+        self._wakeup()
+
+    def stats(self) -> Dict:
+        next_due = self._heap[0][0].isoformat() if self._heap else None
+        return {
+            "running": self.running,
+            "meetings": len(self._meetings),
+            "pending_entries": len(self._heap),
+            "next_due": next_due,
+            "loads": self.loads,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "started": self.started,
+            "completed": self.completed,
+            "stale_entries": self.stale,
+        }
+
+
+meeting_scheduler = MeetingScheduler()
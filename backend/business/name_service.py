@@ -0,0 +1,222 @@
+"""
+Unique names for new hires.
+
+Hiring used to put every existing employee name into the LLM prompt and retry
+on collisions, so each hire got slower as the company grew. The name service
+keeps that work out of the prompt:
+
+- NameIndex: a set of normalised (first, last) keys of every employee name,
+  loaded once from the database and updated as names are handed out (and
+  reloaded every NAME_INDEX_TTL seconds to pick up hires made by other
+  processes). Uniqueness checks are set lookups.
+- A pool of LLM-generated, validated candidate names per department. A
+  fixed-size prompt asks for a batch of names; candidates that fail
+  validation or already exist are dropped. Pools are refilled in the
+  background (only while the LLM is idle) whenever they fall below
+  NAME_POOL_SIZE / 2.
+- When a department's pool is empty, names come from a combinatorial
+  generator over first/last name lists, so a hiring burst never waits on
+  the LLM.
+"""
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import sleep as clock_sleep
+from database.models import Employee
+from llm.ollama_client import OllamaClient, llm_requests_in_flight
+
+POOL_SIZE = int(os.getenv("NAME_POOL_SIZE", "8"))
+INDEX_TTL_SECONDS = float(os.getenv("NAME_INDEX_TTL", "600"))
+IDLE_THRESHOLD = int(os.getenv("NAME_POOL_IDLE_THRESHOLD", "2"))
+
+FIRST_NAMES = [
+    "Alexandra", "Benjamin", "Catherine", "Daniel", "Elena", "Felix", "Gabriela", "Hector",
+    "Isabella", "Julian", "Katherine", "Lucas", "Maya", "Nathan", "Olivia", "Parker",
+    "Quinn", "Rachel", "Samuel", "Tessa", "Victor", "Wendy", "Xavier", "Yara", "Zoe",
+    "Adrian", "Brianna", "Caleb", "Diana", "Ethan", "Fiona", "George", "Hannah",
+    "Ian", "Jasmine", "Kevin", "Lily", "Marcus", "Nora", "Oscar", "Penelope",
+    "Amara", "Bruno", "Chiara", "Dmitri", "Esther", "Farah", "Goran", "Helena",
+    "Imani", "Jonas", "Kenji", "Leila", "Mateo", "Nadia", "Omar", "Priya",
+    "Rafael", "Sofia", "Tomas", "Uma", "Vikram", "Wei", "Yusuf", "Zara",
+]
+
+LAST_NAMES = [
+    "Anderson", "Bennett", "Chen", "Davis", "Evans", "Foster", "Garcia", "Hughes",
+    "Ivanov", "Jackson", "Kim", "Lopez", "Martinez", "Nguyen", "O'Brien", "Patel",
+    "Quinn", "Rodriguez", "Singh", "Thompson", "Ueda", "Vargas", "Wang", "Xu",
+    "Yamamoto", "Zhang", "Adams", "Brown", "Clark", "Diaz", "Edwards", "Fisher",
+    "Green", "Hall", "Irwin", "Johnson", "Kumar", "Lee", "Moore", "Nelson",
+    "Okafor", "Novak", "Silva", "Tanaka", "Murphy", "Haddad", "Larsen", "Moreau",
+    "Schmidt", "Costa", "Mendes", "Lindqvist", "Romero", "Walsh", "Kowalski", "Nakamura",
+]
+
+DEFAULT_DEPARTMENT = "General"
+
+NameKey = Tuple[str, ...]
+
+
+def name_key(name: str) -> NameKey:
+    """Normalised form of a name used for uniqueness checks (case and spacing ignored)."""
+    return tuple(name.casefold().split())
+
+
+def combinatorial_name(taken: "NameIndex", rng: Optional[random.Random] = None) -> str:
+    """
+    Pick an unused name from the first/last name lists.
+
+    Random picks first (cheap while most combinations are free), then every
+    combination in random order, then double-barrelled last names.
+    """
+    rng = rng or random
+    for _ in range(30):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        if name not in taken:
+            return name
+    combinations = [(first, last) for first in FIRST_NAMES for last in LAST_NAMES]
+    rng.shuffle(combinations)
+    for first, last in combinations:
+        name = f"{first} {last}"
+        if name not in taken:
+            return name
+    while True:
+        first_last, second_last = rng.sample(LAST_NAMES, 2)
+        name = f"{rng.choice(FIRST_NAMES)} {first_last}-{second_last}"
+        if name not in taken:
+            return name
+
+
+class NameIndex:
+    """Hash set of normalised names."""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._keys: Set[NameKey] = {name_key(n) for n in names if n}
+
+    def __contains__(self, name: str) -> bool:
+        return name_key(name) in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, name: str):
+        self._keys.add(name_key(name))
+
+
+class NameService:
+    """Hands out unique, validated employee names without growing the LLM prompt."""
+
+    def __init__(self, pool_size: int = POOL_SIZE):
+        self.pool_size = pool_size
+        self.llm_client = OllamaClient()
+        self._index: Optional[NameIndex] = None
+        self._loaded_at = 0.0
+        self._load_lock = asyncio.Lock()
+        self._pools: Dict[str, Deque[str]] = {}
+        self._refill_task: Optional[asyncio.Task] = None
+        self.pooled_names_used = 0
+        self.generated_names_used = 0
+
+    async def _get_index(self, db: AsyncSession) -> NameIndex:
+        if self._index is None or time.monotonic() - self._loaded_at > INDEX_TTL_SECONDS:
+            async with self._load_lock:
+                if self._index is None or time.monotonic() - self._loaded_at > INDEX_TTL_SECONDS:
+                    result = await db.execute(select(Employee.name))
+                    index = NameIndex(row[0] for row in result.all())
+                    # Keep names handed out since the load started but not committed yet
+                    if self._index is not None:
+                        index._keys |= self._index._keys
+                    self._index = index
+                    self._loaded_at = time.monotonic()
+        return self._index
+
+    async def _exists_in_db(self, db: AsyncSession, name: str) -> bool:
+        result = await db.execute(
+            select(Employee.id).where(func.lower(Employee.name) == name.lower()).limit(1)
+        )
+        return result.first() is not None
+
+    async def next_name(self, db: AsyncSession, department: Optional[str] = None, role: Optional[str] = None) -> str:
+        """
+        Reserve a unique name for a new hire.
+
+        Args:
+            db: Database session (used to load the name index)
+            department: Department of the hire; candidates are pooled per department
+            role: Role of the hire (used when generating candidates)
+
+        Returns:
+            A validated "First Last" name not used by any employee
+        """
+        index = await self._get_index(db)
+        department = department or DEFAULT_DEPARTMENT
+        pool = self._pools.setdefault(department, deque())
+
+        name = None
+        while pool:
+            candidate = pool.popleft()
+            if candidate not in index:
+                name = candidate
+                self.pooled_names_used += 1
+                break
+        if name is None:
+            name = combinatorial_name(index)
+            self.generated_names_used += 1
+        # The index may predate hires made by other processes
+        while await self._exists_in_db(db, name):
+            index.add(name)
+            name = combinatorial_name(index)
+        index.add(name)
+
+        if len(pool) < max(1, self.pool_size // 2):
+            self._start_refill(role)
+        return name
+
+    def _start_refill(self, role: Optional[str] = None):
+        if self.pool_size <= 0:
+            return
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._refill(role))
+
+    async def _refill(self, role: Optional[str]):
+        """Top up every department pool that is below the low-water mark."""
+        while True:
+            low = [d for d, pool in self._pools.items() if len(pool) < self.pool_size]
+            if not low:
+                return
+            if llm_requests_in_flight() >= IDLE_THRESHOLD:
+                await clock_sleep(1)
+                continue
+            department = min(low, key=lambda d: len(self._pools[d]))
+            pool = self._pools[department]
+            try:
+                candidates = await self.llm_client.generate_name_candidates(
+                    department=department, role=role, count=self.pool_size - len(pool)
+                )
+            except Exception as e:
+                print(f"Error generating name candidates for {department}: {e}")
+                return
+            added = 0
+            for candidate in candidates:
+                if (self._index is not None and candidate in self._index) or candidate in pool:
+                    continue
+                pool.append(candidate)
+                added += 1
+            if added == 0:
+                return  # The model keeps repeating itself - the generator covers the rest
+
+    def stats(self) -> Dict:
+        return {
+            "indexed_names": len(self._index) if self._index is not None else None,
+            "pools": {d: len(pool) for d, pool in self._pools.items()},
+            "pooled_names_used": self.pooled_names_used,
+            "generated_names_used": self.generated_names_used,
+        }
+
+
+name_service = NameService()
@@ -4,6 +4,7 @@ Helper utility for creating notifications with duplicate prevention.
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from datetime import timedelta
+from typing import List
 from database.models import Notification
 from config import now as local_now
 
@@ -81,3 +82,58 @@ async def create_notification_if_not_duplicate(
     
     return notification
 
+
+
+async def create_notifications_for_employees(
+    db: AsyncSession,
+    employee_ids: List[int],
+    notification_type: str,
+    title: str,
+    message: str,
+    duplicate_window_minutes: int = 5
+) -> int:
+    """
+    Send the same notification to many employees with one duplicate check for all of them.
+    
+    Args:
+        db: Database session
+        employee_ids: Employees to notify
+        notification_type: Type of notification
+        title: Notification title
+        message: Notification message
+        duplicate_window_minutes: Employees who got this notification within the window are skipped (default: 5)
+    
+    Returns:
+        Number of notifications created
+    """
+    if not employee_ids:
+        return 0
+    threshold_time = local_now() - timedelta(minutes=duplicate_window_minutes)
+    result = await db.execute(
+        select(Notification.employee_id).where(
+            and_(
+                Notification.notification_type == notification_type,
+                Notification.title == title,
+                Notification.message == message,
+                Notification.created_at >= threshold_time,
+                Notification.employee_id.in_(employee_ids),
+                Notification.review_id.is_(None)
+            )
+        )
+    )
+    already_notified = {row[0] for row in result.all()}
+    
+    notifications = [
+        Notification(
+            notification_type=notification_type,
+            title=title,
+            message=message,
+            employee_id=employee_id,
+            read=False
+        )
+        for employee_id in dict.fromkeys(employee_ids)
+        if employee_id not in already_notified
+    ]
+    db.add_all(notifications)
+    await db.flush()
+    return len(notifications)
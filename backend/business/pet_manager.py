@@ -426,7 +426,7 @@ Respond in JSON format:
 }}"""
 
         try:
-            response_text = await self.llm_client.generate_response(prompt)
+            response_text = await self.llm_client.generate_response(prompt, kind="pet_care_employee")
             
             # Try to parse JSON from response
             try:
@@ -514,7 +514,7 @@ Respond in JSON format:
 }}"""
 
         try:
-            response_text = await self.llm_client.generate_response(prompt)
+            response_text = await self.llm_client.generate_response(prompt, kind="pet_care_action")
             
             # Try to parse JSON
             try:
@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from database.models import Project, Task, Employee
+from database.models import Project, Task
+from database.hot_queries import ACTIVE_EMPLOYEES, OPEN_PROJECTS
 from sqlalchemy import select
 from datetime import datetime, timedelta
 from config import now as local_now
@@ -33,9 +34,7 @@ class ProjectManager:
     
     async def get_active_projects(self) -> list[Project]:
         """Get all active projects."""
-        result = await self.db.execute(
-            select(Project).where(Project.status.in_(["planning", "active"]))
-        )
+        result = await self.db.execute(OPEN_PROJECTS)
         return list(result.scalars().all())
     
     async def get_project_by_id(self, project_id: int) -> Project:
@@ -281,9 +280,7 @@ class ProjectManager:
         Returns (can_create, reason)
         """
         # Get active employees
-        result = await self.db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await self.db.execute(ACTIVE_EMPLOYEES)
         active_employees = result.scalars().all()
         employee_count = len(active_employees)
         
@@ -322,9 +319,7 @@ class ProjectManager:
         Returns dict with hiring_needed, employees_short, etc.
         """
         # Get active employees
-        result = await self.db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await self.db.execute(ACTIVE_EMPLOYEES)
         active_employees = result.scalars().all()
         employee_count = len(active_employees)
         
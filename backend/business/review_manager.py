@@ -4,11 +4,17 @@ Review Manager - Handles periodic employee reviews and performance evaluations.
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc
 from database.models import Employee, EmployeeReview, Task, Activity, Project, Email, ChatMessage
+from database.hot_queries import ACTIVE_EMPLOYEES
 from database.database import safe_commit, safe_flush
+from database.employee_summaries import record_review
 from datetime import datetime, timedelta
+from config import utcnow
 import random
 from typing import Optional, List
 from llm.ollama_client import OllamaClient
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class ReviewManager:
@@ -21,13 +27,11 @@ class ReviewManager:
         Reviews are conducted every 6 hours by default.
         This function is called frequently to ensure reviews happen promptly.
         """
-        now = datetime.utcnow()
+        now = utcnow()
         cutoff_date = now - timedelta(hours=hours_since_last_review)
         
         # Get all active employees
-        result = await self.db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await self.db.execute(ACTIVE_EMPLOYEES)
         all_employees = result.scalars().all()
         
         # Get employees who need reviews
@@ -82,7 +86,7 @@ class ReviewManager:
                     needs_review = True
                     # Store name early to avoid lazy loading
                     employee_name_temp = employee.name
-                    print(f"  [!] Employee {employee_name_temp} has no hire date - scheduling review anyway")
+                    logger.warning(f"[!] Employee {employee_name_temp} has no hire date - scheduling review anyway")
             else:
                 # Check if last review was before cutoff
                 if last_review.review_date:
@@ -102,15 +106,15 @@ class ReviewManager:
                 employee_hierarchy = employee.hierarchy_level
                 
                 try:
-                    print(f"  [*] Generating review for {employee_name} (hired: {employee_hired_at}, role: {employee_role}, hierarchy: {employee_hierarchy})")
+                    logger.debug(f"[*] Generating review for {employee_name} (hired: {employee_hired_at}, role: {employee_role}, hierarchy: {employee_hierarchy})")
                     review = await self._generate_review(employee)
                     if review:
                         reviews_created.append(review)
                         if is_overdue:
                             overdue_count += 1
-                        print(f"  [+] Successfully created review for {employee_name}")
+                        logger.debug(f"[+] Successfully created review for {employee_name}")
                     else:
-                        print(f"  [-] Failed to create review for {employee_name} - no manager available or generation failed")
+                        logger.warning(f"[-] Failed to create review for {employee_name} - no manager available or generation failed")
                 except Exception as e:
                     import traceback
                     from sqlalchemy.exc import OperationalError, PendingRollbackError
@@ -124,10 +128,9 @@ class ReviewManager:
                     
                     error_msg = str(e).lower()
                     if "database is locked" in error_msg or "locked" in error_msg:
-                        print(f"  [!] Database locked while generating review for {employee_name}, will retry later")
+                        logger.warning(f"[!] Database locked while generating review for {employee_name}, will retry later")
                     else:
-                        print(f"  [-] Error generating review for {employee_name}: {e}")
-                        print(f"  Traceback: {traceback.format_exc()}")
+                        logger.error(f"[-] Error generating review for {employee_name}: {e}", exc_info=True)
         
         if reviews_created:
             try:
@@ -146,10 +149,10 @@ class ReviewManager:
                     )
                     verified_review = verify_result.scalar_one_or_none()
                     if verified_review:
-                        print(f"  [+] Verified Review ID {verified_review.id} for employee {verified_review.employee_id} - Date: {verified_review.review_date}, Rating: {verified_review.overall_rating}")
-                        print(f"    Comments: {len(verified_review.comments or '')} chars, Strengths: {len(verified_review.strengths or '')} chars")
+                        logger.debug(f"[+] Verified Review ID {verified_review.id} for employee {verified_review.employee_id} - Date: {verified_review.review_date}, Rating: {verified_review.overall_rating}")
+                        logger.debug(f"Comments: {len(verified_review.comments or '')} chars, Strengths: {len(verified_review.strengths or '')} chars")
                     else:
-                        print(f"  [-] WARNING: Review ID {review.id} not found in database after commit!")
+                        logger.warning(f"[-] WARNING: Review ID {review.id} not found in database after commit!")
                 
                 if overdue_count > 0:
                     print(f"[!] Created {overdue_count} overdue review(s) - reviews are being pushed to managers!")
@@ -222,7 +225,7 @@ class ReviewManager:
         print(f"  [*] Found {len(reviewers)} reviewer(s) - assigning to {manager_name}")
         
         # Determine review period (last 6 hours or since last review)
-        review_period_end = datetime.utcnow()
+        review_period_end = utcnow()
         result = await self.db.execute(
             select(EmployeeReview)
             .where(EmployeeReview.employee_id == employee.id)
@@ -238,7 +241,7 @@ class ReviewManager:
             if employee.hired_at:
                 review_period_start = employee.hired_at.replace(tzinfo=None) if employee.hired_at.tzinfo else employee.hired_at
             else:
-                review_period_start = datetime.utcnow() - timedelta(hours=6)
+                review_period_start = utcnow() - timedelta(hours=6)
         
         # Calculate performance metrics for the review period
         metrics = await self._calculate_performance_metrics(employee, review_period_start)
@@ -267,7 +270,7 @@ class ReviewManager:
         )
         
         # Create review with explicit review_date
-        review_date = datetime.utcnow()
+        review_date = utcnow()
         review = EmployeeReview(
             employee_id=employee.id,
             manager_id=manager.id,
@@ -290,10 +293,13 @@ class ReviewManager:
         
         # Verify the review was added and has an ID
         if not review.id:
-            print(f"  ⚠️  Warning: Review for {employee_name} has no ID after flush")
+            logger.warning(f"⚠️  Warning: Review for {employee_name} has no ID after flush")
             await safe_flush(self.db)  # Try again
         else:
-            print(f"  ✓ Review ID {review.id} created for {employee_name}")
+            logger.debug(f"✓ Review ID {review.id} created for {employee_name}")
+        
+        # Keep the employees list projection in step with the new review
+        await record_review(self.db, employee.id, overall_rating, review_date)
         
         # Create activity log
         from database.models import Activity
@@ -409,7 +415,7 @@ class ReviewManager:
         if review_period_start:
             cutoff = review_period_start
         else:
-            cutoff = datetime.utcnow() - timedelta(hours=6)
+            cutoff = utcnow() - timedelta(hours=6)
         
         result = await self.db.execute(
             select(Task)
@@ -633,7 +639,7 @@ Be professional, fair, and constructive. Match your personality traits when writ
 
         try:
             llm_client = OllamaClient()
-            response_text = await llm_client.generate_response(prompt)
+            response_text = await llm_client.generate_response(prompt, kind="employee_review")
             
             # Try to parse JSON from response
             import json
@@ -701,17 +707,17 @@ Be professional, fair, and constructive. Match your personality traits when writ
             strengths = strengths.strip() if strengths else "Ongoing development"
             areas_for_improvement = areas_for_improvement.strip() if areas_for_improvement else "Continue professional growth"
             
-            print(f"  📝 Generated review content - Comments: {len(comments)} chars, Strengths: {len(strengths)} chars, Areas: {len(areas_for_improvement)} chars")
+            logger.debug(f"📝 Generated review content - Comments: {len(comments)} chars, Strengths: {len(strengths)} chars, Areas: {len(areas_for_improvement)} chars")
             
             return comments, strengths, areas_for_improvement
             
         except Exception as e:
-            print(f"  ⚠️  Error generating review with Ollama: {e}")
+            logger.warning(f"⚠️  Error generating review with Ollama: {e}")
             # Fallback to simple review - ensure non-empty values
             comments = f"{employee_name} has shown {'strong' if overall_rating >= 4.0 else 'satisfactory' if overall_rating >= 3.0 else 'areas needing improvement'} performance this period."
             strengths = "Good performance" if overall_rating >= 3.0 else "Room for growth"
             areas_for_improvement = "Continue developing skills" if overall_rating < 4.0 else "Maintain excellence"
-            print(f"  📝 Using fallback review content")
+            logger.debug(f"📝 Using fallback review content")
             return comments, strengths, areas_for_improvement
     
     async def get_average_rating(self, employee_id: int) -> Optional[float]:
@@ -751,9 +757,7 @@ Be professional, fair, and constructive. Match your personality traits when writ
         """
         try:
             # Get all active employees who have received reviews
-            result = await self.db.execute(
-                select(Employee).where(Employee.status == "active")
-            )
+            result = await self.db.execute(ACTIVE_EMPLOYEES)
             all_employees = result.scalars().all()
             
             # Get the most recent review for each employee
@@ -929,9 +933,7 @@ Be professional, fair, and constructive. Match your personality traits when writ
             self.db.add(winner_activity)
             
             # Create a general notification for all employees (acknowledgment)
-            all_employees_result = await self.db.execute(
-                select(Employee).where(Employee.status == "active")
-            )
+            all_employees_result = await self.db.execute(ACTIVE_EMPLOYEES)
             all_active_employees = all_employees_result.scalars().all()
             
             for emp in all_active_employees:
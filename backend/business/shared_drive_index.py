@@ -0,0 +1,223 @@
+"""
+Cached name-tree index for the shared drive.
+
+The shared drive tree (department -> employee -> project -> files, plus a
+Training folder) only needs names, types and versions. It is loaded from a
+narrow projection of shared_drive_files - content_html and the other body
+columns are never selected - and kept in memory.
+
+SharedDriveManager and TrainingManager report the files they create or update
+with record_file_change(). Changes are held on the session and applied to the
+index only when that session commits, so a rolled-back generation never shows
+up in the tree. Writers that don't report changes (maintenance scripts, deletes)
+are picked up by a full reload every SHARED_DRIVE_INDEX_TTL seconds
+(default 300).
+
+The serialized tree is cached together with a content-hash ETag, so
+/api/shared-drive/structure answers a matching If-None-Match with 304 and
+otherwise returns the cached bytes without touching the database.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from database.models import Employee, Project, SharedDriveFile
+
+INDEX_TTL_SECONDS = float(os.getenv("SHARED_DRIVE_INDEX_TTL", "300"))
+
+_PENDING_KEY = "shared_drive_index_pending"
+
+
+def _is_training(entry: Dict) -> bool:
+    return entry["purpose"] == "Training Material" or (
+        entry["employee_id"] is None
+        and entry["project_id"] is None
+        and "Training" in (entry["file_path"] or "")
+    )
+
+
+def _sort_key(entry: Dict):
+    # Same order as ORDER BY department, employee_id, project_id, file_name (NULLs last)
+    return (
+        entry["department"] is None, entry["department"] or "",
+        entry["employee_id"] is None, entry["employee_id"] or 0,
+        entry["project_id"] is None, entry["project_id"] or 0,
+        entry["file_name"],
+    )
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def build_tree(entries: List[Dict]) -> Dict:
+    """
+    Arrange file entries into the nested structure served by the API.
+
+    Args:
+        entries: Rows from load_entries() (or index entries)
+
+    Returns:
+        {"Training": {dept: [files]}, dept: {employee: {project: [files]}}}
+    """
+    structure: Dict = {}
+    for entry in sorted(entries, key=_sort_key):
+        item = {
+            "id": entry["id"],
+            "file_name": entry["file_name"],
+            "file_type": entry["file_type"],
+            "current_version": entry["current_version"],
+            "updated_at": _iso(entry["updated_at"]),
+        }
+        dept = entry["department"] or "General"
+        if _is_training(entry):
+            structure.setdefault("Training", {}).setdefault(dept, []).append(item)
+        else:
+            emp_name = entry["employee_name"] or "Shared"
+            proj_name = entry["project_name"] or "General"
+            structure.setdefault(dept, {}).setdefault(emp_name, {}).setdefault(proj_name, []).append(item)
+    return structure
+
+
+async def load_entries(db: AsyncSession) -> List[Dict]:
+    """Load every file's tree fields without reading document bodies."""
+    result = await db.execute(
+        select(
+            SharedDriveFile.id,
+            SharedDriveFile.file_name,
+            SharedDriveFile.file_type,
+            SharedDriveFile.department,
+            SharedDriveFile.employee_id,
+            SharedDriveFile.project_id,
+            SharedDriveFile.file_path,
+            SharedDriveFile.current_version,
+            SharedDriveFile.updated_at,
+            SharedDriveFile.file_metadata["purpose"].as_string().label("purpose"),
+            Employee.name.label("employee_name"),
+            Project.name.label("project_name"),
+        )
+        .outerjoin(Employee, Employee.id == SharedDriveFile.employee_id)
+        .outerjoin(Project, Project.id == SharedDriveFile.project_id)
+    )
+    return [dict(row._mapping) for row in result]
+
+
+class SharedDriveTreeIndex:
+    """In-memory file entries plus the serialized tree and its ETag."""
+
+    def __init__(self, ttl: float = INDEX_TTL_SECONDS):
+        self.ttl = ttl
+        self._entries: Dict[int, Dict] = {}
+        self._loaded_at: Optional[float] = None
+        self._body: Optional[bytes] = None
+        self._etag: Optional[str] = None
+        self._lock = asyncio.Lock()
+
+    def _needs_reload(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    async def reload(self, db: AsyncSession):
+        """Replace the index with a fresh load from the database."""
+        entries = await load_entries(db)
+        self._entries = {entry["id"]: entry for entry in entries}
+        self._loaded_at = time.monotonic()
+        self._body = None
+
+    async def get_tree(self, db: AsyncSession) -> Tuple[str, bytes]:
+        """
+        Get the serialized tree, reloading the index first if it is stale.
+
+        Returns:
+            (etag, JSON body)
+        """
+        if self._needs_reload() or self._body is None:
+            async with self._lock:
+                if self._needs_reload():
+                    await self.reload(db)
+                if self._body is None:
+                    self._body = json.dumps(build_tree(list(self._entries.values()))).encode("utf-8")
+                    self._etag = '"' + hashlib.blake2b(self._body, digest_size=12).hexdigest() + '"'
+        return self._etag, self._body
+
+    def apply(self, changes: List[Dict]):
+        """Apply committed file changes (full entries or partial updates keyed by id)."""
+        if self._loaded_at is None:
+            return
+        for change in changes:
+            existing = self._entries.get(change["id"])
+            if existing is not None:
+                existing.update(change)
+            elif "file_name" in change:
+                self._entries[change["id"]] = dict(change)
+            else:
+                # Update for a file we don't know yet - reload on next read
+                self._loaded_at = None
+        self._body = None
+
+    def invalidate(self):
+        """Force a full reload on the next read."""
+        self._loaded_at = None
+        self._body = None
+
+
+shared_drive_index = SharedDriveTreeIndex()
+
+
+def file_entry(file: SharedDriveFile, employee_name: Optional[str], project_name: Optional[str],
+               updated_at: Optional[datetime] = None) -> Dict:
+    """
+    Build a full index entry for a file that was just created.
+
+    Args:
+        file: Flushed SharedDriveFile (must have an id)
+        employee_name: Creator's name, None for shared/training files
+        project_name: Project name, None if not tied to a project
+        updated_at: Timestamp to show until the next reload (server default isn't loaded after flush)
+    """
+    metadata = file.file_metadata or {}
+    return {
+        "id": file.id,
+        "file_name": file.file_name,
+        "file_type": file.file_type,
+        "department": file.department,
+        "employee_id": file.employee_id,
+        "project_id": file.project_id,
+        "file_path": file.file_path,
+        "current_version": file.current_version,
+        "updated_at": _iso(updated_at),
+        "purpose": metadata.get("purpose"),
+        "employee_name": employee_name,
+        "project_name": project_name,
+    }
+
+
+def record_file_change(db: AsyncSession, change: Dict):
+    """
+    Queue a file change for the index; it is applied when the session commits.
+
+    Args:
+        db: Session the change was made in
+        change: A file_entry() for new files, or {"id", "current_version", "updated_at"} for updates
+    """
+    db.sync_session.info.setdefault(_PENDING_KEY, []).append(change)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_changes(session):
+    changes = session.info.pop(_PENDING_KEY, None)
+    if changes:
+        shared_drive_index.apply(changes)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_changes(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
@@ -9,26 +9,32 @@ from database.models import (
     Employee, Project, Task, Activity, 
     SharedDriveFile, SharedDriveFileVersion
 )
-from datetime import datetime, timedelta
+from database.hot_queries import ACTIVE_EMPLOYEES
+import asyncio
 import os
 import json
 import re
 from typing import List, Optional, Dict
 import httpx
+from llm.circuit_breaker import CircuitOpenError
 from llm.ollama_client import OllamaClient
 from engine.office_simulator import get_business_context
 from sqlalchemy import select, func
 from database.models import Project, Employee, Financial
 from config import now as local_now
+from business.document_similarity import duplicate_index, is_similar, minhash_signature
+from business.shared_drive_versions import build_version
+from business.shared_drive_sink import shared_drive_sink
+from business.shared_drive_index import build_tree, file_entry, load_entries, record_file_change
 
 
 class SharedDriveManager:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.llm_client = OllamaClient()
+        self._last_signature = None
         # Base directory for shared drive files
         self.base_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "shared_drive")
-        os.makedirs(self.base_dir, exist_ok=True)
     
     def _get_file_path(self, department: str, employee_name: str, project_name: str, file_name: str) -> str:
         """Generate file path based on organization structure."""
@@ -46,8 +52,8 @@ class SharedDriveManager:
             else:
                 safe_file += '.html'
         
+        # Directories are created by the file sink when the file is written
         dir_path = os.path.join(self.base_dir, safe_dept, safe_emp, safe_proj)
-        os.makedirs(dir_path, exist_ok=True)
         return os.path.join(dir_path, safe_file)
     
     def _validate_content_quality(self, content: str, file_type: str) -> tuple[bool, str]:
@@ -110,78 +116,30 @@ class SharedDriveManager:
     
     def _check_content_similarity(self, content1: str, content2: str, threshold: float = 0.80) -> bool:
         """Check if two document contents are similar (to prevent duplicates).
-        Improved with better similarity detection."""
-        # Remove HTML tags and normalize whitespace for comparison
-        import re
-        from difflib import SequenceMatcher
-        
-        def normalize(text):
-            # Remove HTML tags
-            text = re.sub(r'<[^>]+>', '', text)
-            # Normalize whitespace
-            text = re.sub(r'\s+', ' ', text).strip().lower()
-            # Remove common variable parts (dates, names that might differ)
-            # Keep numbers for spreadsheets but normalize them
-            text = re.sub(r'\b\d{4}-\d{2}-\d{2}\b', '[DATE]', text)  # Normalize dates
-            text = re.sub(r'\$\d+[.,]?\d*', '[AMOUNT]', text)  # Normalize currency
-            # Remove very short words and common stop words for better comparison
-            words = [w for w in text.split() if len(w) > 3]
-            return ' '.join(words)
-        
-        norm1 = normalize(content1)
-        norm2 = normalize(content2)
-        
-        if not norm1 or not norm2:
-            return False
-        
-        # Use SequenceMatcher for better similarity detection
-        similarity_ratio = SequenceMatcher(None, norm1, norm2).ratio()
-        
-        # Also check if one is a substantial substring of the other
-        if len(norm1) > 200 and len(norm2) > 200:
-            # Check if significant portion matches
-            if norm1 in norm2 or norm2 in norm1:
-                return True
-            
-            # Check word-level similarity
-            words1 = set(norm1.split())
-            words2 = set(norm2.split())
-            if len(words1) > 0 and len(words2) > 0:
-                word_overlap = len(words1 & words2) / max(len(words1), len(words2))
-                if word_overlap > threshold:
-                    return True
-        
-        return similarity_ratio >= threshold
+        Blocking - quadratic in document length; call through asyncio.to_thread."""
+        return is_similar(content1, content2, threshold)
     
     async def _check_duplicate_content(self, new_content: str, employee_id: int, file_type: str) -> bool:
         """Check if similar content already exists for this employee.
-        Enhanced to check across all file types and recent files."""
-        # Get all files for this employee (check across all types to prevent cross-type duplicates)
-        result = await self.db.execute(
-            select(SharedDriveFile).where(
-                SharedDriveFile.employee_id == employee_id
-            ).order_by(desc(SharedDriveFile.updated_at))
-        )
-        existing_files = result.scalars().all()
-        
-        # Prioritize checking same-type files first
-        same_type_files = [f for f in existing_files if f.file_type == file_type]
-        other_type_files = [f for f in existing_files if f.file_type != file_type]
-        
-        # Check same-type files first (most likely duplicates)
-        for existing_file in same_type_files:
-            if self._check_content_similarity(new_content, existing_file.content_html, threshold=0.80):
-                print(f"  ⚠️  Skipping duplicate: similar {file_type} content already exists in '{existing_file.file_name}'")
-                return True
-        
-        # Also check other types (to prevent creating same content as different types)
-        for existing_file in other_type_files[:5]:  # Check last 5 files of other types
-            if self._check_content_similarity(new_content, existing_file.content_html, threshold=0.85):
-                print(f"  ⚠️  Skipping duplicate: similar content exists in different type '{existing_file.file_name}' ({existing_file.file_type})")
-                return True
-        
+        Uses the MinHash/LSH index so only likely duplicates are compared in full."""
+        duplicate, signature = await duplicate_index.find_duplicate(self.db, employee_id, new_content, file_type)
+        # Keep the signature so the file created from this content doesn't hash it again
+        self._last_signature = (new_content, signature)
+        if duplicate:
+            _, file_name, existing_type = duplicate
+            if existing_type == file_type:
+                print(f"  ⚠️  Skipping duplicate: similar {file_type} content already exists in '{file_name}'")
+            else:
+                print(f"  ⚠️  Skipping duplicate: similar content exists in different type '{file_name}' ({existing_type})")
+            return True
         return False
     
+    async def _content_signature(self, content: str) -> List[int]:
+        """MinHash signature of content, reusing the one computed by the last duplicate check."""
+        if self._last_signature is not None and self._last_signature[0] is content:
+            return self._last_signature[1]
+        return await asyncio.to_thread(minhash_signature, content)
+    
     async def _get_enhanced_business_context(self, business_context: Dict) -> Dict:
         """Get enhanced business context with more detailed data."""
         enhanced = business_context.copy()
@@ -203,9 +161,7 @@ class SharedDriveManager:
         ]
         
         # Get employee statistics by department
-        result = await self.db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await self.db.execute(ACTIVE_EMPLOYEES)
         employees = result.scalars().all()
         dept_counts = {}
         for emp in employees:
@@ -274,15 +230,15 @@ Examples:
 Generate ONLY the file name with appropriate extension (.docx, .xlsx, or .pptx). Do not include any explanation or quotes."""
 
         try:
-            client = await self.llm_client._get_client()
-            response = await client.post(
-                f"{self.llm_client.base_url}/api/generate",
-                json={
+            response = await self.llm_client._make_request_with_fallback(
+                "/api/generate",
+                {
                     "model": self.llm_client.model,
                     "prompt": prompt,
                     "stream": False
                 },
-                timeout=httpx.Timeout(60.0, connect=10.0)  # Increased from 15s to 60s for LLM processing
+                timeout=httpx.Timeout(60.0, connect=10.0),  # Increased from 15s to 60s for LLM processing
+                kind="shared_drive"
             )
             
             if response.status_code == 200:
@@ -308,7 +264,7 @@ Generate ONLY the file name with appropriate extension (.docx, .xlsx, or .pptx).
             print(f"Error generating file name: {e}")
         
         # Fallback file name
-        timestamp = datetime.now().strftime("%Y%m%d")
+        timestamp = local_now().strftime("%Y%m%d")
         extensions = {'word': '.docx', 'spreadsheet': '.xlsx', 'powerpoint': '.pptx'}
         return f"Document_{timestamp}{extensions.get(file_type, '.docx')}"
     
@@ -429,16 +385,16 @@ IMPORTANT: Use the ACTUAL business data provided. Reference real projects, real
 Generate the complete HTML document now. Return ONLY the HTML with inline styles."""
 
         try:
-            client = await self.llm_client._get_client()
             # Increased timeout for complex document generation (120 seconds total, 10 seconds connect)
-            response = await client.post(
-                f"{self.llm_client.base_url}/api/generate",
-                json={
+            response = await self.llm_client._make_request_with_fallback(
+                "/api/generate",
+                {
                     "model": self.llm_client.model,
                     "prompt": prompt,
                     "stream": False
                 },
-                timeout=httpx.Timeout(120.0, connect=10.0)
+                timeout=httpx.Timeout(120.0, connect=10.0),
+                kind="shared_drive"
             )
             
             if response.status_code == 200:
@@ -596,16 +552,16 @@ IMPORTANT: Use the ACTUAL business data provided. Create realistic calculations,
 Generate the complete HTML spreadsheet now. Return ONLY the HTML table with inline styles."""
 
         try:
-            client = await self.llm_client._get_client()
             # Increased timeout for complex document generation (120 seconds total, 10 seconds connect)
-            response = await client.post(
-                f"{self.llm_client.base_url}/api/generate",
-                json={
+            response = await self.llm_client._make_request_with_fallback(
+                "/api/generate",
+                {
                     "model": self.llm_client.model,
                     "prompt": prompt,
                     "stream": False
                 },
-                timeout=httpx.Timeout(120.0, connect=10.0)
+                timeout=httpx.Timeout(120.0, connect=10.0),
+                kind="shared_drive"
             )
             
             if response.status_code == 200:
@@ -803,16 +759,16 @@ IMPORTANT: Use the ACTUAL business data provided. Reference real projects, real
 Generate the complete HTML presentation now. Return ONLY the HTML with inline styles. Wrap each slide in a div with class="slide"."""
 
         try:
-            client = await self.llm_client._get_client()
             # Increased timeout for complex document generation (120 seconds total, 10 seconds connect)
-            response = await client.post(
-                f"{self.llm_client.base_url}/api/generate",
-                json={
+            response = await self.llm_client._make_request_with_fallback(
+                "/api/generate",
+                {
                     "model": self.llm_client.model,
                     "prompt": prompt,
                     "stream": False
                 },
-                timeout=httpx.Timeout(120.0, connect=10.0)
+                timeout=httpx.Timeout(120.0, connect=10.0),
+                kind="shared_drive"
             )
             
             if response.status_code == 200:
@@ -916,15 +872,15 @@ Write in third person. Example: "Updated financial figures with Q4 results. Adde
 Return ONLY the summary text, nothing else."""
 
         try:
-            client = await self.llm_client._get_client()
-            response = await client.post(
-                f"{self.llm_client.base_url}/api/generate",
-                json={
+            response = await self.llm_client._make_request_with_fallback(
+                "/api/generate",
+                {
                     "model": self.llm_client.model,
                     "prompt": prompt,
                     "stream": False
                 },
-                timeout=httpx.Timeout(60.0, connect=10.0)  # Increased from 15s to 60s for LLM processing
+                timeout=httpx.Timeout(60.0, connect=10.0),  # Increased from 15s to 60s for LLM processing
+                kind="shared_drive"
             )
             
             if response.status_code == 200:
@@ -955,11 +911,12 @@ Return ONLY the summary text, nothing else."""
         # Generate change summary using AI
         change_summary = await self.generate_change_summary(old_content, new_content, employee)
         
-        # Create new version
-        new_version = SharedDriveFileVersion(
-            file_id=file.id,
-            version_number=file.current_version + 1,
-            content_html=old_content,  # Store the old content
+        # Create new version - stores the old content as a reverse delta against the new content
+        new_version = await build_version(
+            file,
+            file.current_version + 1,
+            old_content,
+            new_content,
             file_size=len(old_content.encode('utf-8')),
             created_by_id=employee.id,
             change_summary=change_summary,
@@ -1087,16 +1044,16 @@ IMPORTANT - EQUAL DISTRIBUTION REQUIRED:
 Generate 1 document suggestion. Choose the type that will help BALANCE the distribution. Prioritize spreadsheets and PowerPoints when they're underrepresented."""
 
         try:
-            client = await self.llm_client._get_client()
-            response = await client.post(
-                f"{self.llm_client.base_url}/api/generate",
-                json={
+            response = await self.llm_client._make_request_with_fallback(
+                "/api/generate",
+                {
                     "model": self.llm_client.model,
                     "prompt": prompt,
                     "stream": False,
                     "format": "json"  # Request JSON format from LLM
                 },
-                timeout=httpx.Timeout(120.0, connect=10.0)  # Increased from 15s to 120s for LLM processing
+                timeout=httpx.Timeout(120.0, connect=10.0),  # Increased from 15s to 120s for LLM processing
+                kind="shared_drive"
             )
             
             documents_to_create = []
@@ -1342,6 +1299,7 @@ Generate 1 document suggestion. Choose the type that will help BALANCE the distr
                         file_path=file_path,
                         file_size=len(content.encode('utf-8')),
                         content_html=content,
+                        content_signature=await self._content_signature(content),
                         file_metadata={
                             "purpose": doc_spec.get("purpose", ""),
                             "created_by_ai": True,
@@ -1353,10 +1311,8 @@ Generate 1 document suggestion. Choose the type that will help BALANCE the distr
                     self.db.add(drive_file)
                     created_files.append(drive_file)
                     
-                    # Save to filesystem
-                    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
+                    # Save to filesystem (written in the background)
+                    shared_drive_sink.write(file_path, content)
                     
                     print(f"  ✓ Created {file_type} document: {file_name}")
                 except Exception as e:
@@ -1366,6 +1322,10 @@ Generate 1 document suggestion. Choose the type that will help BALANCE the distr
                     continue
             
             await self.db.flush()
+            project_name = current_project.name if current_project else None
+            for drive_file in created_files:
+                record_file_change(self.db, file_entry(drive_file, employee.name, project_name, local_now()))
+                duplicate_index.add(employee.id, drive_file.id, drive_file.file_type, drive_file.content_signature)
             return created_files
         
         except httpx.ReadTimeout:
@@ -1374,6 +1334,8 @@ Generate 1 document suggestion. Choose the type that will help BALANCE the distr
         except httpx.TimeoutException:
             print(f"⚠️  Connection timeout generating documents for employee {employee.id}. Skipping this cycle.")
             return []
+        except CircuitOpenError:
+            return []  # LLM unavailable - try again next cycle
         except Exception as e:
             print(f"Error generating documents for employee {employee.id}: {e}")
             import traceback
@@ -1472,10 +1434,17 @@ Generate 1 document suggestion. Choose the type that will help BALANCE the distr
                     
                     # Create version history
                     await self.create_new_version(file, new_content, employee)
+                    file.content_signature = await self._content_signature(new_content)
+                    if file.employee_id is not None:
+                        duplicate_index.add(file.employee_id, file.id, file.file_type, file.content_signature)
+                    record_file_change(self.db, {
+                        "id": file.id,
+                        "current_version": file.current_version,
+                        "updated_at": file.updated_at.isoformat(),
+                    })
                     
-                    # Update filesystem
-                    with open(file.file_path, 'w', encoding='utf-8') as f:
-                        f.write(new_content)
+                    # Update filesystem (written in the background)
+                    shared_drive_sink.write(file.file_path, new_content)
                     
                     updated_files.append(file)
         
@@ -1494,7 +1463,7 @@ Generate 1 document suggestion. Choose the type that will help BALANCE the distr
                 selectinload(SharedDriveFile.employee),
                 selectinload(SharedDriveFile.project),
                 selectinload(SharedDriveFile.last_updated_by),
-                selectinload(SharedDriveFile.versions)
+                selectinload(SharedDriveFile.versions)  # version bodies are deferred
             )
             .where(
                 (SharedDriveFile.employee_id == employee_id) |
@@ -1504,71 +1473,5 @@ Generate 1 document suggestion. Choose the type that will help BALANCE the distr
         return list(result.scalars().all())
     
     async def get_file_structure(self) -> Dict:
-        """Get hierarchical file structure for API."""
-        result = await self.db.execute(
-            select(SharedDriveFile)
-            .options(
-                selectinload(SharedDriveFile.employee),
-                selectinload(SharedDriveFile.project)
-            )
-            .order_by(
-                SharedDriveFile.department,
-                SharedDriveFile.employee_id,
-                SharedDriveFile.project_id,
-                SharedDriveFile.file_name
-            )
-        )
-        all_files = result.scalars().all()
-        
-        structure = {}
-        for file in all_files:
-            # Check if this is a training material
-            is_training = (
-                file.file_metadata and 
-                file.file_metadata.get("purpose") == "Training Material"
-            ) or (
-                file.employee_id is None and 
-                file.project_id is None and
-                "Training" in (file.file_path or "")
-            )
-            
-            if is_training:
-                # Organize training materials under Training folder
-                dept = file.department or "General"
-                
-                if "Training" not in structure:
-                    structure["Training"] = {}
-                if dept not in structure["Training"]:
-                    structure["Training"][dept] = []
-                
-                structure["Training"][dept].append({
-                    "id": file.id,
-                    "file_name": file.file_name,
-                    "file_type": file.file_type,
-                    "current_version": file.current_version,
-                    "updated_at": file.updated_at.isoformat() if file.updated_at else None
-                })
-            else:
-                # Regular files organized by department -> employee -> project
-                dept = file.department or "General"
-                # Access employee name safely - already loaded
-                emp_name = file.employee.name if file.employee else "Shared"
-                proj_name = file.project.name if file.project else "General"
-                
-                if dept not in structure:
-                    structure[dept] = {}
-                if emp_name not in structure[dept]:
-                    structure[dept][emp_name] = {}
-                if proj_name not in structure[dept][emp_name]:
-                    structure[dept][emp_name][proj_name] = []
-                
-                structure[dept][emp_name][proj_name].append({
-                    "id": file.id,
-                    "file_name": file.file_name,
-                    "file_type": file.file_type,
-                    "current_version": file.current_version,
-                    "updated_at": file.updated_at.isoformat() if file.updated_at else None
-                })
-        
-        return structure
-
+        """Get hierarchical file structure for API (names only - document bodies are not loaded)."""
+        return build_tree(await load_entries(self.db))
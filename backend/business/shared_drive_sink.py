@@ -0,0 +1,157 @@
+"""
+Asynchronous writer for the on-disk shared drive mirror.
+
+The database is the source of truth for shared drive documents; backend/shared_drive/
+is a mirror of it. Writes to the mirror go through shared_drive_sink instead of
+blocking open().write() calls inside coroutines:
+
+- write() only records the latest content for a path and returns immediately.
+- Repeated writes to the same path within SHARED_DRIVE_WRITE_COALESCE_SECONDS
+  (default 2) are coalesced - only the last content is written.
+- The actual I/O runs on a small thread pool (SHARED_DRIVE_WRITE_WORKERS,
+  default 4): directories are created, content goes to a temp file in the target
+  directory, is fsynced and renamed over the target, so readers never see a
+  partially written document. Files get the usual 0666 & ~umask permissions.
+- Writes to the same path are serialised, and each takes the latest pending
+  content, so an older write can never land after a newer one.
+- flush() writes everything pending right away and waits for writes already
+  running (used on shutdown); rebuild_from_db() rewrites the whole mirror from
+  the database.
+"""
+import asyncio
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import sleep as clock_sleep
+from database.models import SharedDriveFile
+
+COALESCE_SECONDS = float(os.getenv("SHARED_DRIVE_WRITE_COALESCE_SECONDS", "2"))
+WRITE_WORKERS = int(os.getenv("SHARED_DRIVE_WRITE_WORKERS", "4"))
+
+# mkstemp creates 0600 files; mirrored files get the mode open() would have given them
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+
+def atomic_write(path: str, content: str):
+    """Write content to path via temp file + rename (blocking)."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        os.fchmod(fd, FILE_MODE)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SharedDriveFileSink:
+    """Coalescing, thread-pooled, atomic writer for shared drive files."""
+
+    def __init__(self, coalesce_seconds: float = COALESCE_SECONDS, workers: int = WRITE_WORKERS):
+        self.coalesce_seconds = coalesce_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shared-drive-writer")
+        self._pending: Dict[str, str] = {}
+        self._scheduled: Dict[str, asyncio.Task] = {}
+        # One lock per path: writes to a path run one at a time
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def write(self, path: str, content: str):
+        """
+        Schedule content to be written to path. Returns immediately; a later
+        write to the same path before it is flushed replaces this one.
+        """
+        self._pending[path] = content
+        if path not in self._scheduled:
+            self._scheduled[path] = asyncio.create_task(self._write_later(path))
+
+    async def _write_later(self, path: str):
+        try:
+            await clock_sleep(self.coalesce_seconds)
+        except asyncio.CancelledError:
+            # Content stays pending for flush()
+            self._scheduled.pop(path, None)
+            raise
+        self._scheduled.pop(path, None)
+        await self._write_now(path)
+
+    def _lock(self, path: str) -> asyncio.Lock:
+        lock = self._locks.get(path)
+        if lock is None:
+            lock = self._locks[path] = asyncio.Lock()
+        return lock
+
+    async def _write_now(self, path: str):
+        async with self._lock(path):
+            # Taken under the lock, so this is the newest content when the write starts
+            content = self._pending.pop(path, None)
+            if content is None:
+                return
+            await self._write_file(path, content)
+
+    async def _write_file(self, path: str, content: str, lock: Optional[asyncio.Lock] = None):
+        """Run atomic_write on the pool (the caller holds the path's lock, or passes it)."""
+        loop = asyncio.get_running_loop()
+        try:
+            if lock is None:
+                await loop.run_in_executor(self._executor, atomic_write, path, content)
+            else:
+                async with lock:
+                    await loop.run_in_executor(self._executor, atomic_write, path, content)
+        except Exception as e:
+            print(f"Error writing shared drive file {path}: {e}")
+
+    async def flush(self):
+        """Write every pending file now and wait for writes that are already running."""
+        for task in list(self._scheduled.values()):
+            task.cancel()
+        self._scheduled.clear()
+        await asyncio.gather(*(self._write_now(path) for path in list(self._pending)))
+        for lock in list(self._locks.values()):
+            async with lock:
+                pass
+
+    async def rebuild_from_db(self, db: AsyncSession, batch_size: int = 200) -> int:
+        """
+        Rewrite every file of the on-disk mirror from the database. Files on disk
+        that have no database row are left alone.
+
+        Returns:
+            Number of files written
+        """
+        await self.flush()
+        written = 0
+        last_id = 0
+        while True:
+            result = await db.execute(
+                select(SharedDriveFile.id, SharedDriveFile.file_path, SharedDriveFile.content_html)
+                .where(SharedDriveFile.id > last_id)
+                .order_by(SharedDriveFile.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                return written
+            last_id = rows[-1].id
+            await asyncio.gather(*(
+                self._write_file(row.file_path, row.content_html, lock=self._lock(row.file_path))
+                for row in rows if row.file_path
+            ))
+            written += sum(1 for row in rows if row.file_path)
+
+
+shared_drive_sink = SharedDriveFileSink()
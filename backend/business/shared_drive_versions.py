@@ -0,0 +1,213 @@
+"""
+Delta-compressed version history for shared drive files.
+
+The current document is kept in full in shared_drive_files.content_html. Each
+SharedDriveFileVersion row stores a zlib-compressed reverse delta in
+content_delta: the instructions to rebuild that version from the next newer
+one (for the newest row, from the file's current content). Rebuilding an old
+version walks the chain from the current content down to it.
+
+Deltas work on HTML tokens (text up to and including each '>' or newline),
+since generated documents are often a single long line. An operation is
+either [start, end] - copy tokens from the newer version - or a literal
+string.
+
+Rows written before delta storage keep their full text in content_html and are
+converted by compact_legacy_versions(), which runs as a background startup job.
+Both content columns are deferred, so listing versions never loads bodies.
+"""
+import asyncio
+import json
+import re
+import zlib
+from difflib import SequenceMatcher
+from typing import List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import SharedDriveFile, SharedDriveFileVersion
+
+_TOKEN_RE = re.compile(r'(?<=[>\n])')
+
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.split(text or '') if t]
+
+
+def encode_reverse_delta(old_content: str, new_content: str) -> bytes:
+    """
+    Encode old_content as a compressed delta against new_content.
+    Blocking (difflib) - call through asyncio.to_thread for large documents.
+    """
+    reference = _tokens(new_content)
+    target = _tokens(old_content)
+    ops: List = []
+    matcher = SequenceMatcher(None, reference, target, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([i1, i2])
+        elif tag in ('replace', 'insert'):
+            ops.append(''.join(target[j1:j2]))
+    return zlib.compress(json.dumps(ops, separators=(',', ':')).encode('utf-8'), 9)
+
+
+def apply_reverse_delta(new_content: str, delta: bytes) -> str:
+    """Rebuild the older content from the newer content and its reverse delta."""
+    reference = _tokens(new_content)
+    parts = []
+    for op in json.loads(zlib.decompress(delta)):
+        if isinstance(op, list):
+            parts.extend(reference[op[0]:op[1]])
+        else:
+            parts.append(op)
+    return ''.join(parts)
+
+
+def _rebuild_chain(current_content: str, rows) -> List[str]:
+    """Contents of rows (newest first), each rebuilt from the one before it."""
+    contents = []
+    content = current_content
+    for row in rows:
+        if row.content_html is not None:
+            content = row.content_html
+        else:
+            content = apply_reverse_delta(content, row.content_delta)
+        contents.append(content)
+    return contents
+
+
+def _chain_query(file_id: int, min_version: int = 0):
+    return (
+        select(
+            SharedDriveFileVersion.id,
+            SharedDriveFileVersion.version_number,
+            SharedDriveFileVersion.content_html,
+            SharedDriveFileVersion.content_delta,
+        )
+        .where(SharedDriveFileVersion.file_id == file_id, SharedDriveFileVersion.version_number >= min_version)
+        .order_by(SharedDriveFileVersion.version_number.desc(), SharedDriveFileVersion.id.desc())
+    )
+
+
+async def build_version(
+    file: SharedDriveFile,
+    version_number: int,
+    old_content: str,
+    new_content: str,
+    **fields,
+) -> SharedDriveFileVersion:
+    """
+    Create the version row recording old_content before the file changes to new_content.
+    The caller adds it to the session.
+
+    Args:
+        file: File being updated (content_html must still be old_content)
+        version_number: Version number of the new row
+        old_content: Content the row preserves
+        new_content: Content the file is being changed to
+        **fields: Remaining SharedDriveFileVersion columns (created_by_id, change_summary, ...)
+    """
+    delta = await asyncio.to_thread(encode_reverse_delta, old_content, new_content)
+    return SharedDriveFileVersion(
+        file_id=file.id,
+        version_number=version_number,
+        content_html=None,
+        content_delta=delta,
+        **fields,
+    )
+
+
+async def rebase_latest_version(db: AsyncSession, file: SharedDriveFile, new_content: str):
+    """
+    Re-encode the newest version row against new_content. Call before overwriting a
+    file's content without creating a version, or its history can't be rebuilt.
+
+    Args:
+        db: Database session
+        file: File whose content_html is still the old content
+        new_content: Content the file is being changed to
+    """
+    result = await db.execute(_chain_query(file.id).limit(1))
+    newest = result.one_or_none()
+    if newest is None or newest.content_delta is None:
+        return  # No history, or a legacy full-text row that doesn't depend on the current content
+    old_current = file.content_html
+
+    def rebase():
+        content = apply_reverse_delta(old_current, newest.content_delta)
+        return encode_reverse_delta(content, new_content)
+
+    delta = await asyncio.to_thread(rebase)
+    await db.execute(
+        update(SharedDriveFileVersion).where(SharedDriveFileVersion.id == newest.id).values(content_delta=delta)
+    )
+
+
+async def get_version_content(db: AsyncSession, file_id: int, version_number: int) -> Optional[str]:
+    """
+    Rebuild the content stored for a version.
+
+    Returns:
+        The version's HTML, or None if the file or version doesn't exist
+    """
+    current = (await db.execute(
+        select(SharedDriveFile.content_html).where(SharedDriveFile.id == file_id)
+    )).scalar_one_or_none()
+    if current is None:
+        return None
+    rows = (await db.execute(_chain_query(file_id, version_number))).all()
+    if not rows or rows[-1].version_number != version_number:
+        return None
+    if rows[-1].content_html is not None:
+        return rows[-1].content_html
+    contents = await asyncio.to_thread(_rebuild_chain, current, rows)
+    return contents[-1]
+
+
+async def compact_legacy_versions(db: AsyncSession, max_files: int = 50) -> int:
+    """
+    Convert full-text version rows of up to max_files files to reverse deltas.
+    Commits once per file.
+
+    Returns:
+        Number of rows converted
+    """
+    result = await db.execute(
+        select(SharedDriveFileVersion.file_id)
+        .join(SharedDriveFile, SharedDriveFile.id == SharedDriveFileVersion.file_id)
+        .where(SharedDriveFileVersion.content_html.isnot(None))
+        # Files without current content can't be rebased; selecting them would stall the batches
+        .where(SharedDriveFile.content_html.isnot(None))
+        .distinct()
+        .limit(max_files)
+    )
+    file_ids = [row[0] for row in result]
+    converted = 0
+    for file_id in file_ids:
+        current = (await db.execute(
+            select(SharedDriveFile.content_html).where(SharedDriveFile.id == file_id)
+        )).scalar_one_or_none()
+        if current is None:
+            continue  # Content was cleared since the select - leave its history alone
+        rows = (await db.execute(_chain_query(file_id))).all()
+
+        def encode_legacy_rows():
+            contents = _rebuild_chain(current, rows)
+            deltas = []
+            newer = current
+            for row, content in zip(rows, contents):
+                if row.content_html is not None:
+                    deltas.append((row.id, encode_reverse_delta(content, newer)))
+                newer = content
+            return deltas
+
+        for row_id, delta in await asyncio.to_thread(encode_legacy_rows):
+            await db.execute(
+                update(SharedDriveFileVersion)
+                .where(SharedDriveFileVersion.id == row_id)
+                .values(content_delta=delta, content_html=None)
+            )
+            converted += 1
+        await db.commit()
+    return converted
@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.models import Employee, FamilyMember, HomePet, Activity
+from database.hot_queries import ACTIVE_EMPLOYEES
 from config import now, TIMEZONE_NAME
 
 logger = logging.getLogger(__name__)
@@ -283,9 +284,7 @@ class SleepManager:
         activities_created = []
         
         # Get all active employees
-        result = await self.db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await self.db.execute(ACTIVE_EMPLOYEES)
         employees = result.scalars().all()
         
         # Determine if it's a sleep period (10pm-5:30am on weekdays, or 10pm-7:30am on weekends)
@@ -597,9 +596,7 @@ class SleepManager:
         Returns:
             Dictionary with reset statistics
         """
-        result = await self.db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await self.db.execute(ACTIVE_EMPLOYEES)
         employees = result.scalars().all()
 
         for emp in employees:
@@ -1,9 +1,9 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.models import Suggestion, Employee, Activity, Notification, SuggestionVote
+from database.hot_queries import ACTIVE_EMPLOYEES
 from sqlalchemy import select, desc
-from datetime import datetime
-from config import now as local_now
+from config import now as local_now, utcnow
 from llm.ollama_client import OllamaClient
 from engine.office_simulator import get_business_context
 import random
@@ -149,7 +149,7 @@ class SuggestionManager:
         """Process votes on suggestions using AI to decide if employees would vote."""
         # Get all pending suggestions that are at least 1 hour old
         from datetime import timedelta
-        cutoff_time = datetime.utcnow() - timedelta(hours=1)
+        cutoff_time = utcnow() - timedelta(hours=1)
         
         result = await self.db.execute(
             select(Suggestion)
@@ -162,9 +162,7 @@ class SuggestionManager:
             return
         
         # Get all active employees (excluding the suggestion authors)
-        result = await self.db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await self.db.execute(ACTIVE_EMPLOYEES)
         all_employees = result.scalars().all()
         
         business_context = await get_business_context(self.db)
@@ -260,7 +258,7 @@ Consider:
 Respond with ONLY "yes" or "no", nothing else."""
 
         try:
-            response = await self.llm_client.generate_response(prompt)
+            response = await self.llm_client.generate_response(prompt, kind="suggestion_vote")
             response_lower = response.strip().lower()
             return response_lower.startswith("yes") or response_lower == "y"
         except Exception as e:
@@ -272,7 +270,7 @@ Respond with ONLY "yes" or "no", nothing else."""
         """Process manager comments and status updates on suggestions using AI."""
         # Get all pending suggestions that are at least 2 hours old and don't have comments
         from datetime import timedelta
-        cutoff_time = datetime.utcnow() - timedelta(hours=2)
+        cutoff_time = utcnow() - timedelta(hours=2)
         
         result = await self.db.execute(
             select(Suggestion)
@@ -328,7 +326,7 @@ Respond with ONLY "yes" or "no", nothing else."""
                 
                 suggestion.manager_comments = comment
                 suggestion.reviewed_by_id = manager.id
-                suggestion.reviewed_at = datetime.utcnow()
+                suggestion.reviewed_at = utcnow()
                 
                 # Update status if it changed
                 if new_status and new_status != old_status:
@@ -397,7 +395,7 @@ As a manager, write a brief, professional comment on this suggestion (2-4 senten
 Write only the comment text, nothing else."""
 
         try:
-            response = await self.llm_client.generate_response(prompt)
+            response = await self.llm_client.generate_response(prompt, kind="suggestion_comment")
             comment = response.strip()
             
             # Clean up the response
@@ -464,7 +462,7 @@ Based on your analysis, respond with ONLY one of these exact words: pending, rev
 Do not include any explanation, just the status word."""
 
         try:
-            response = await self.llm_client.generate_response(prompt)
+            response = await self.llm_client.generate_response(prompt, kind="suggestion_status")
             status = response.strip().lower()
             
             # Clean up the response
@@ -0,0 +1,340 @@
+"""
+Global task dispatcher.
+
+Task assignment used to happen in four places - every manager's _assign_tasks,
+the simulator's _ensure_active_work, the goal system's emergency assignment and
+the stuck-task reassignment - each rescanning the task, project and employee
+tables, scoring tasks with one query per task, and sometimes handing the same
+task to two employees. The simulator now calls task_dispatcher.dispatch() once
+per tick instead:
+
+1. Open projects get starter tasks if they have none (and follow-up tasks when
+   employees are idle and nothing is left to hand out).
+2. Tasks stuck on an employee who no longer works on them go back to the queue.
+3. Unassigned tasks are queued per (priority, project); projects are served from
+   a heap ordered by priority, revenue and progress (high > medium > low first,
+   then revenue, then the project closest to done).
+4. Idle employees who are not in training are pooled by department. Each task
+   goes to an idle employee from a department whose skills match the task
+   description, otherwise to the department with the most idle people.
+5. All matches are written with one UPDATE of the task table (guarded by
+   employee_id IS NULL, so a task can't be handed out twice), then one UPDATE
+   each for the employees and the projects that got work.
+"""
+import heapq
+import random
+from collections import defaultdict, deque
+from datetime import timedelta, timezone
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import case, exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import now as local_now, utc_to_local
+from database.hot_queries import IDLE_EMPLOYEES, OPEN_PROJECT_TASK_STATS, UNASSIGNED_TASKS
+from database.models import Employee, Project, Task, TrainingSession
+from employees.room_assigner import ROOM_TRAINING_ROOM
+
+PRIORITY_WEIGHTS = {"high": 3, "medium": 2, "low": 1}
+
+TRAINING_ROOMS = frozenset(
+    [ROOM_TRAINING_ROOM]
+    + [f"{ROOM_TRAINING_ROOM}_{suffix}" for suffix in ("floor2", "floor4", "floor4_2", "floor4_3", "floor4_4", "floor4_5")]
+)
+
+# New hires count as in training for this long
+TRAINING_GRACE = timedelta(hours=1)
+
+# In-progress tasks below this progress whose employee has moved on are requeued
+STUCK_PROGRESS_THRESHOLD = 10.0
+
+# Task description keyword -> departments whose people are best suited for it
+TASK_SKILLS = [
+    ("design", ("Design", "Product")),
+    ("research", ("Product", "Marketing")),
+    ("planning", ("Product", "Operations")),
+    ("development", ("Engineering", "IT")),
+    ("implementation", ("Engineering", "IT")),
+    ("optimization", ("Engineering", "IT")),
+    ("testing", ("Engineering", "Operations")),
+    ("quality", ("Operations", "Engineering")),
+    ("documentation", ("Product", "Operations")),
+]
+
+STARTER_TASKS = [
+    "Initial planning for {name}",
+    "Research and analysis for {name}",
+    "Design phase for {name}",
+    "Development for {name}",
+    "Testing for {name}",
+]
+
+FOLLOW_UP_TASKS = [
+    "Additional work on {name}",
+    "Follow-up tasks for {name}",
+    "Quality assurance for {name}",
+    "Documentation for {name}",
+    "Optimization for {name}",
+]
+
+
+def project_score(priority: Optional[str], revenue: Optional[float], progress: float) -> float:
+    """Priority score of a project: priority weight first, then revenue, then progress."""
+    return PRIORITY_WEIGHTS.get(priority, 1) * 1000 + (revenue or 0.0) / 1000 + progress
+
+
+def task_departments(description: Optional[str]) -> Tuple[str, ...]:
+    """Departments suited for a task, best match first (empty if nothing matches)."""
+    text = (description or "").lower()
+    for keyword, departments in TASK_SKILLS:
+        if keyword in text:
+            return departments
+    return ()
+
+
+def is_in_training(employee, in_training_session: Set[int], now=None) -> bool:
+    """
+    Whether an employee is still in training and must not get a task.
+
+    Args:
+        employee: Employee row (or any object with id, activity_state, current_room, hired_at)
+        in_training_session: IDs of employees with an in-progress TrainingSession
+        now: Current local time (defaults to config.now())
+
+    Returns:
+        True if the employee is training, in a training room, in a training
+        session, or was hired less than TRAINING_GRACE ago
+    """
+    if employee.activity_state == "training" or employee.current_room in TRAINING_ROOMS:
+        return True
+    if employee.id in in_training_session:
+        return True
+    hired_at = employee.hired_at
+    if hired_at is not None:
+        if hired_at.tzinfo is None:
+            hired_at = hired_at.replace(tzinfo=timezone.utc)
+        if (now or local_now()) - utc_to_local(hired_at) <= TRAINING_GRACE:
+            return True
+    return False
+
+
+class _IdlePool:
+    """Idle employee IDs grouped by department."""
+
+    def __init__(self):
+        self._by_department: Dict[str, Deque[int]] = defaultdict(deque)
+        self.size = 0
+
+    def add(self, employee_id: int, department: Optional[str]):
+        self._by_department[department or ""].append(employee_id)
+        self.size += 1
+
+    def take(self, departments: Tuple[str, ...]) -> Optional[int]:
+        """Pop an employee from the first preferred department that has one, else from the largest pool."""
+        for department in departments:
+            pool = self._by_department.get(department)
+            if pool:
+                self.size -= 1
+                return pool.popleft()
+        candidates = [pool for pool in self._by_department.values() if pool]
+        if not candidates:
+            return None
+        self.size -= 1
+        return max(candidates, key=len).popleft()
+
+
+class TaskDispatcher:
+    """Matches unassigned tasks to idle employees once per simulation tick."""
+
+    def __init__(self):
+        self.dispatches = 0
+        self.tasks_assigned = 0
+        self.tasks_created = 0
+        self.tasks_requeued = 0
+        self.last_result: Dict = {}
+
+    async def dispatch(self, db: AsyncSession) -> Dict:
+        """
+        Create missing tasks, requeue stuck ones and assign unassigned tasks to idle employees.
+
+        Args:
+            db: Database session (the caller commits)
+
+        Returns:
+            Counts of tasks created, requeued and assigned in this run
+        """
+        now = local_now()
+        projects, progress = await self._load_projects(db)
+        idle = await self._load_idle_pool(db, now)
+
+        created = await self._create_missing_tasks(db, projects, progress, idle.size)
+        requeued = await self._requeue_stuck_tasks(db)
+
+        assignments: List[Tuple[int, int]] = []
+        if idle.size:
+            result = await db.execute(UNASSIGNED_TASKS)
+            queues: Dict[Tuple[str, Optional[int]], Deque] = defaultdict(deque)
+            for task in result.all():
+                project = projects.get(task.project_id)
+                priority = project.priority if project is not None else "low"
+                queues[(priority, task.project_id)].append(task)
+
+            heap = []
+            for key in queues:
+                priority, project_id = key
+                project = projects.get(project_id)
+                score = (
+                    project_score(priority, project.revenue, progress.get(project_id, 0.0))
+                    if project is not None else 0.0
+                )
+                heap.append((-score, project_id or 0, key))
+            heapq.heapify(heap)
+
+            while heap and idle.size:
+                entry = heapq.heappop(heap)
+                queue = queues[entry[2]]
+                task = queue.popleft()
+                employee_id = idle.take(task_departments(task.description))
+                if employee_id is None:
+                    break
+                assignments.append((task.id, employee_id))
+                if queue:
+                    heapq.heappush(heap, entry)
+
+        assigned = await self._write_assignments(db, assignments, now)
+
+        self.dispatches += 1
+        self.tasks_created += created
+        self.tasks_requeued += requeued
+        self.tasks_assigned += assigned
+        self.last_result = {"created": created, "requeued": requeued, "assigned": assigned, "idle": idle.size}
+        if assigned:
+            print(f"Task dispatcher assigned {assigned} task(s) ({idle.size} employee(s) still idle)")
+        return self.last_result
+
+    async def _load_projects(self, db: AsyncSession):
+        """Open projects by id, and each project's progress computed from its tasks in one query."""
+        result = await db.execute(OPEN_PROJECT_TASK_STATS)
+        projects = {}
+        progress = {}
+        for row in result.all():
+            projects[row.id] = row
+            progress[row.id] = max(0.0, min(100.0, float(row.progress or 0.0)))
+        return projects, progress
+
+    async def _load_idle_pool(self, db: AsyncSession, now) -> _IdlePool:
+        result = await db.execute(
+            select(TrainingSession.employee_id).where(TrainingSession.status == "in_progress")
+        )
+        in_training_session = {row[0] for row in result.all()}
+
+        pool = _IdlePool()
+        result = await db.execute(IDLE_EMPLOYEES)
+        employees = result.all()
+        random.shuffle(employees)  # Don't always favour the lowest IDs
+        for employee in employees:
+            if not is_in_training(employee, in_training_session, now):
+                pool.add(employee.id, employee.department)
+        return pool
+
+    async def _create_missing_tasks(self, db: AsyncSession, projects: Dict, progress: Dict, idle_count: int) -> int:
+        """Starter tasks for projects without tasks; follow-up tasks if people are idle and nothing is open."""
+        new_tasks = []
+        for project in projects.values():
+            if project.task_count == 0:
+                for _ in range(random.randint(2, 4)):
+                    new_tasks.append(self._new_task(project, STARTER_TASKS))
+
+        if idle_count and not new_tasks and not any(p.unassigned_count for p in projects.values()):
+            unfinished = [p for p in projects.values() if progress.get(p.id, 0.0) < 100.0]
+            if unfinished:
+                project = max(unfinished, key=lambda p: project_score(p.priority, p.revenue, progress.get(p.id, 0.0)))
+                for _ in range(min(idle_count, random.randint(1, 2))):
+                    new_tasks.append(self._new_task(project, FOLLOW_UP_TASKS))
+
+        if new_tasks:
+            db.add_all(new_tasks)
+            await db.flush()
+        return len(new_tasks)
+
+    @staticmethod
+    def _new_task(project, descriptions: List[str]) -> Task:
+        return Task(
+            employee_id=None,
+            project_id=project.id,
+            description=random.choice(descriptions).format(name=project.name),
+            status="pending",
+            priority=project.priority,
+            progress=0.0,
+        )
+
+    async def _requeue_stuck_tasks(self, db: AsyncSession) -> int:
+        """Unassign barely started tasks whose employee is gone or working on something else."""
+        still_current = exists().where(
+            Employee.id == Task.employee_id,
+            Employee.status == "active",
+            Employee.current_task_id == Task.id,
+        )
+        result = await db.execute(
+            update(Task)
+            .where(
+                Task.status == "in_progress",
+                Task.employee_id.isnot(None),
+                Task.progress < STUCK_PROGRESS_THRESHOLD,
+                ~still_current,
+            )
+            .values(employee_id=None)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
+
+    async def _write_assignments(self, db: AsyncSession, assignments: List[Tuple[int, int]], now) -> int:
+        if not assignments:
+            return 0
+        employee_for_task = dict(assignments)
+        result = await db.execute(
+            update(Task)
+            .where(Task.id.in_(employee_for_task), Task.employee_id.is_(None))
+            .values(
+                employee_id=case(employee_for_task, value=Task.id),
+                status="in_progress",
+            )
+            .returning(Task.id, Task.employee_id, Task.project_id)
+            .execution_options(synchronize_session=False)
+        )
+        assigned = result.all()
+        if not assigned:
+            return 0
+
+        task_for_employee = {row.employee_id: row.id for row in assigned}
+        await db.execute(
+            update(Employee)
+            .where(Employee.id.in_(task_for_employee), Employee.current_task_id.is_(None))
+            .values(current_task_id=case(task_for_employee, value=Employee.id))
+            .execution_options(synchronize_session=False)
+        )
+
+        project_ids = {row.project_id for row in assigned if row.project_id is not None}
+        if project_ids:
+            await db.execute(
+                update(Project)
+                .where(Project.id.in_(project_ids))
+                .values(
+                    last_activity_at=now,
+                    status=case((Project.status == "planning", "active"), else_=Project.status),
+                )
+                .execution_options(synchronize_session=False)
+            )
+        return len(assigned)
+
+    def stats(self) -> Dict:
+        return {
+            "dispatches": self.dispatches,
+            "tasks_assigned": self.tasks_assigned,
+            "tasks_created": self.tasks_created,
+            "tasks_requeued": self.tasks_requeued,
+            "last_dispatch": self.last_result,
+        }
+
+
+task_dispatcher = TaskDispatcher()
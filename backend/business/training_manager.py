@@ -9,13 +9,15 @@ import json
 import os
 import re
 from config import now as local_now, now_naive
+from business.shared_drive_index import file_entry, record_file_change
+from business.shared_drive_versions import rebase_latest_version
+from business.shared_drive_sink import shared_drive_sink
 
 class TrainingManager:
     def __init__(self):
         self.ollama_client = OllamaClient()
         # Base directory for shared drive files
         self.base_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "shared_drive")
-        os.makedirs(self.base_dir, exist_ok=True)
     
     async def start_training_session(
         self,
@@ -136,7 +138,7 @@ Generate a specific, relevant training topic that would benefit this employee. E
 
 Return ONLY the training topic name (2-5 words), nothing else."""
             
-            response = await self.ollama_client.generate_response(prompt)
+            response = await self.ollama_client.generate_response(prompt, kind="training_topic")
             topic = response.strip()
             
             # Clean up the response
@@ -240,7 +242,7 @@ Make it professional, clear, and actionable. The content should be suitable for
 
 Format the response as clear, readable text with sections. Do not use markdown formatting."""
             
-            content = await self.ollama_client.generate_response(prompt)
+            content = await self.ollama_client.generate_response(prompt, kind="training_material")
             
             if not content or len(content) < 100:
                 # Fallback content
@@ -457,8 +459,8 @@ This training provides a foundation in {topic} that can be applied to improve jo
         safe_topic = re.sub(r'[^\w\s-]', '', topic).strip()
         
         # Create path: Training/Department/Topic.html
+        # Directories are created by the file sink when the file is written
         dir_path = os.path.join(self.base_dir, "Training", safe_dept)
-        os.makedirs(dir_path, exist_ok=True)
         
         # Create safe filename
         safe_file = re.sub(r'[^\w\s.-]', '', topic).strip()
@@ -554,6 +556,8 @@ This training provides a foundation in {topic} that can be applied to improve jo
             if existing:
                 # Update existing file
                 content_html = self._format_training_material_as_html(material)
+                # No new version here - keep the version history rebuildable from the new content
+                await rebase_latest_version(db_session, existing, content_html)
                 existing.content_html = content_html
                 existing.file_size = len(content_html.encode('utf-8'))
                 existing.updated_at = local_now()
@@ -565,11 +569,10 @@ This training provides a foundation in {topic} that can be applied to improve jo
                     "updated_at": local_now().isoformat()
                 }
                 
-                # Update filesystem
-                os.makedirs(os.path.dirname(existing.file_path), exist_ok=True)
-                with open(existing.file_path, 'w', encoding='utf-8') as f:
-                    f.write(content_html)
+                # Update filesystem (written in the background)
+                shared_drive_sink.write(existing.file_path, content_html)
                 
+                record_file_change(db_session, {"id": existing.id, "updated_at": existing.updated_at.isoformat()})
                 print(f"  ✓ Updated training material in shared drive: {material.topic}")
                 return existing
             
@@ -603,11 +606,10 @@ This training provides a foundation in {topic} that can be applied to improve jo
             db_session.add(drive_file)
             await db_session.flush()
             
-            # Save to filesystem
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content_html)
+            # Save to filesystem (written in the background)
+            shared_drive_sink.write(file_path, content_html)
             
+            record_file_change(db_session, file_entry(drive_file, None, None, local_now()))
             print(f"  ✓ Saved training material to shared drive: {material.topic}")
             return drive_file
             
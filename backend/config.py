@@ -3,6 +3,7 @@ Timezone configuration module for the application.
 Provides centralized timezone handling with configurable timezone support.
 """
 import os
+import asyncio
 from datetime import datetime, timezone
 from typing import Optional
 import pytz
@@ -14,6 +15,45 @@ TIMEZONE_NAME = os.getenv("TIMEZONE", "America/New_York")
 # Cache the timezone object
 _timezone_cache: Optional[pytz.BaseTzInfo] = None
 
+# Virtual clock used by headless runs (engine/headless.py). None means wall-clock time.
+_virtual_clock = None
+
+
+def set_virtual_clock(clock) -> None:
+    """
+    Replace wall-clock time for now(), is_work_hours() and sleep().
+    
+    Args:
+        clock: Object with now() -> aware datetime and async sleep(seconds), or None for real time
+    """
+    global _virtual_clock
+    _virtual_clock = clock
+
+
+def get_virtual_clock():
+    """Get the active virtual clock, or None when running on wall-clock time."""
+    return _virtual_clock
+
+
+async def sleep(seconds: float, wake: Optional[asyncio.Event] = None) -> None:
+    """
+    Sleep for the given number of seconds of simulation time.
+    Periodic loops should use this instead of asyncio.sleep so headless runs can skip ahead.
+    
+    Args:
+        seconds: Simulation time to sleep
+        wake: Optional event that ends the sleep early once it is set
+    """
+    if _virtual_clock is not None:
+        await _virtual_clock.sleep(seconds, wake)
+    elif wake is None:
+        await asyncio.sleep(seconds)
+    else:
+        try:
+            await asyncio.wait_for(wake.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
 
 def get_timezone() -> pytz.BaseTzInfo:
     """
@@ -40,11 +80,24 @@ def now() -> datetime:
         datetime object with timezone info set to the configured timezone
     """
     tz = get_timezone()
+    if _virtual_clock is not None:
+        return _virtual_clock.now().astimezone(tz)
     # Get UTC time first, then convert to local timezone
     utc_now = datetime.now(timezone.utc)
     return utc_now.astimezone(tz)
 
 
+def utcnow() -> datetime:
+    """
+    Get the current UTC time as a naive datetime (drop-in for datetime.utcnow()).
+    Follows the virtual clock in headless runs.
+    
+    Returns:
+        datetime object without timezone info, representing UTC
+    """
+    return now().astimezone(timezone.utc).replace(tzinfo=None)
+
+
 def utc_to_local(utc_dt: datetime) -> datetime:
     """
     Convert a UTC datetime to the configured local timezone.
@@ -0,0 +1,254 @@
+"""
+Connection admission control for database sessions.
+
+Every session opened with `async with async_session_maker() as db:` first takes
+a slot from the subsystem it runs in:
+
+- "api": HTTP and WebSocket handlers (the default)
+- "simulator": the simulation tick
+- "background": the simulator's periodic loops, startup jobs and other
+  background refreshers
+
+Each subsystem has a reserved share and a limit, and all of them share the
+capacity of the SQLAlchemy pool (pool_size + max_overflow). A subsystem can
+borrow idle capacity up to its limit, but never the part another subsystem has
+reserved and isn't using, so a burst of simulator sessions can't take the
+connections API requests need. When a slot frees up it goes to the waiting
+subsystem that is furthest below its limit (waiters within a subsystem are
+served first come, first served).
+
+A task that already holds a slot opens nested sessions without queueing again,
+so code that opens a second session while holding one can't deadlock itself.
+
+Code runs in the subsystem set with set_db_subsystem(); the value is inherited
+by tasks created afterwards. Wait times are reported per subsystem on
+GET /api/debug/db-admission.
+"""
+import asyncio
+import contextvars
+import os
+import time
+from collections import deque
+from typing import Dict, Optional
+
+ADMISSION_ENABLED = os.getenv("DB_ADMISSION", "1").lower() not in ("0", "false", "no", "off")
+ADMISSION_TIMEOUT = float(os.getenv("DB_ADMISSION_TIMEOUT", "60"))
+# Samples kept per subsystem for wait percentiles
+SAMPLE_WINDOW = 1000
+
+# subsystem -> "reserved:limit"
+DEFAULT_QUOTAS = {
+    "api": os.getenv("DB_QUOTA_API", "10:40"),
+    "simulator": os.getenv("DB_QUOTA_SIMULATOR", "5:20"),
+    "background": os.getenv("DB_QUOTA_BACKGROUND", "3:12"),
+}
+
+_subsystem: contextvars.ContextVar[str] = contextvars.ContextVar("db_subsystem", default="api")
+
+
+class DBAdmissionTimeout(TimeoutError):
+    """Raised when a session waits longer than DB_ADMISSION_TIMEOUT for a slot."""
+
+
+def set_db_subsystem(name: str):
+    """
+    Attribute sessions opened from the current task (and tasks it creates from now on) to a subsystem.
+
+    Args:
+        name: "api", "simulator" or "background"
+    """
+    _subsystem.set(name)
+
+
+def get_db_subsystem() -> str:
+    """Subsystem the current task's sessions are attributed to."""
+    return _subsystem.get()
+
+
+def _percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class _Budget:
+    """Quota, queue and wait statistics of one subsystem."""
+
+    def __init__(self, reserved: int, limit: int):
+        self.reserved = reserved
+        self.limit = max(limit, reserved)
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.waiters: deque = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.nested = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.samples: deque = deque(maxlen=SAMPLE_WINDOW)
+
+    def record_wait(self, wait_ms: float):
+        self.queued += 1
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        self.samples.append(wait_ms)
+
+    def to_dict(self) -> Dict:
+        samples = sorted(self.samples)
+        return {
+            "reserved": self.reserved,
+            "limit": self.limit,
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "waiting": len(self.waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "nested": self.nested,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.total_wait_ms / self.queued, 2) if self.queued else 0.0,
+            "p50_wait_ms": round(_percentile(samples, 50), 2),
+            "p99_wait_ms": round(_percentile(samples, 99), 2),
+            "max_wait_ms": round(self.max_wait_ms, 2),
+        }
+
+
+class AdmissionController:
+    """Shares a fixed number of connection slots between subsystems."""
+
+    def __init__(self, capacity: int, quotas: Dict[str, str], timeout: float = ADMISSION_TIMEOUT):
+        self.capacity = capacity
+        self.timeout = timeout
+        self.budgets: Dict[str, _Budget] = {}
+        for name, quota in quotas.items():
+            reserved, _, limit = quota.partition(":")
+            self.budgets[name] = _Budget(int(reserved), int(limit or reserved))
+        self._holders: Dict[asyncio.Task, int] = {}
+
+    def _budget(self, subsystem: str) -> _Budget:
+        budget = self.budgets.get(subsystem)
+        if budget is None:
+            # Unknown subsystems share the background budget
+            budget = self.budgets["background"]
+        return budget
+
+    def _can_grant(self, budget: _Budget) -> bool:
+        if budget.in_use >= budget.limit:
+            return False
+        in_use = sum(b.in_use for b in self.budgets.values())
+        held_for_others = sum(
+            max(0, b.reserved - b.in_use) for b in self.budgets.values() if b is not budget
+        )
+        return self.capacity - in_use - held_for_others > 0
+
+    def _grant(self, budget: _Budget):
+        budget.in_use += 1
+        budget.admitted += 1
+        budget.peak_in_use = max(budget.peak_in_use, budget.in_use)
+
+    def _dispatch(self):
+        """Hand free slots to waiters, least-served subsystem (in_use / limit) first."""
+        while True:
+            eligible = [
+                b for b in self.budgets.values()
+                if b.waiters and self._can_grant(b)
+            ]
+            if not eligible:
+                return
+            budget = min(eligible, key=lambda b: b.in_use / b.limit)
+            waiter = budget.waiters.popleft()
+            if waiter.done():
+                continue  # Timed out or cancelled while queued
+            self._grant(budget)
+            waiter.set_result(None)
+
+    async def acquire(self) -> Optional[_Budget]:
+        """
+        Wait for a slot for the current subsystem.
+
+        Returns:
+            The budget charged (pass to release()), or None for a nested session
+
+        Raises:
+            DBAdmissionTimeout: No slot became free within the timeout
+        """
+        budget = self._budget(_subsystem.get())
+        task = asyncio.current_task()
+        if task is not None and self._holders.get(task):
+            budget.nested += 1
+            self._holders[task] += 1
+            return None
+
+        if not budget.waiters and self._can_grant(budget):
+            self._grant(budget)
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            budget.waiters.append(waiter)
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter), self.timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                if waiter.done() and not waiter.cancelled():
+                    # Granted just as we gave up - pass the slot on
+                    self._release_slot(budget)
+                else:
+                    waiter.cancel()
+                if isinstance(e, asyncio.TimeoutError):
+                    budget.timeouts += 1
+                    raise DBAdmissionTimeout(
+                        f"No database connection slot for '{_subsystem.get()}' within {self.timeout:.0f}s"
+                    ) from None
+                raise
+            finally:
+                budget.record_wait((time.perf_counter() - started) * 1000)
+
+        if task is not None:
+            self._holders[task] = 1
+        return budget
+
+    def release(self, budget: Optional[_Budget]):
+        """Give back a slot taken with acquire()."""
+        task = asyncio.current_task()
+        if task is not None and task in self._holders:
+            self._holders[task] -= 1
+            if self._holders[task] <= 0:
+                del self._holders[task]
+        if budget is not None:
+            self._release_slot(budget)
+
+    def _release_slot(self, budget: _Budget):
+        budget.in_use -= 1
+        self._dispatch()
+
+    def snapshot(self) -> Dict:
+        return {
+            "enabled": ADMISSION_ENABLED,
+            "capacity": self.capacity,
+            "in_use": sum(b.in_use for b in self.budgets.values()),
+            "timeout_seconds": self.timeout,
+            "subsystems": {name: b.to_dict() for name, b in self.budgets.items()},
+        }
+
+    def reset_stats(self):
+        """Clear counters and wait samples (current usage and queues are kept)."""
+        for budget in self.budgets.values():
+            budget.peak_in_use = budget.in_use
+            budget.admitted = budget.queued = budget.nested = budget.timeouts = 0
+            budget.total_wait_ms = budget.max_wait_ms = 0.0
+            budget.samples.clear()
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def install(capacity: int) -> Optional[AdmissionController]:
+    """Create the process-wide controller for a pool of `capacity` connections (no-op when DB_ADMISSION=0)."""
+    global _controller
+    if ADMISSION_ENABLED:
+        _controller = AdmissionController(capacity, DEFAULT_QUOTAS)
+    return _controller
+
+
+def get_controller() -> Optional[AdmissionController]:
+    return _controller
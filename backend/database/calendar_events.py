@@ -0,0 +1,85 @@
+"""
+Generated calendar events (birthday and holiday parties).
+
+Each generated party carries a natural key - (event_kind, event_subject_id,
+event_date) - protected by the uq_meetings_event_key unique constraint. The
+generators build the full set of parties they want in memory and hand it to
+insert_calendar_events(), which writes everything in one INSERT ... ON CONFLICT
+DO NOTHING. Running a generator twice, or two generators at once, can never
+create duplicates.
+"""
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import Meeting
+
+EVENT_BIRTHDAY_PARTY = "birthday_party"
+EVENT_HOLIDAY_PARTY = "holiday_party"
+# Holidays are not tied to an employee; a fixed subject keeps the key non-NULL so it stays unique
+HOLIDAY_SUBJECT_ID = 0
+
+# asyncpg allows 32767 bind parameters per statement; meetings rows use ~15 each
+INSERT_CHUNK_SIZE = 1000
+
+
+async def insert_calendar_events(session: AsyncSession, rows: List[Dict]) -> int:
+    """
+    Insert generated calendar events, skipping any whose natural key already exists.
+    Runs inside the caller's transaction - the caller commits.
+
+    Args:
+        session: Database session
+        rows: Meeting column values; each must include event_kind, event_subject_id and event_date
+
+    Returns:
+        Number of events actually inserted
+    """
+    created = 0
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        chunk = rows[start:start + INSERT_CHUNK_SIZE]
+        if not chunk:
+            continue
+        stmt = (
+            insert(Meeting)
+            .values(chunk)
+            .on_conflict_do_nothing(
+                index_elements=[Meeting.event_kind, Meeting.event_subject_id, Meeting.event_date]
+            )
+            .returning(Meeting.id)
+        )
+        result = await session.execute(stmt)
+        created += len(result.scalars().all())
+    return created
+
+
+async def get_calendar_event(session: AsyncSession, event_kind: str, subject_id: int, event_date: date) -> Optional[Meeting]:
+    """Look up a generated calendar event by its natural key."""
+    result = await session.execute(
+        select(Meeting)
+        .where(Meeting.event_kind == event_kind)
+        .where(Meeting.event_subject_id == subject_id)
+        .where(Meeting.event_date == event_date)
+    )
+    return result.scalar_one_or_none()
+
+
+async def insert_calendar_event(session: AsyncSession, row: Dict) -> Tuple[Optional[Meeting], bool]:
+    """
+    Insert one generated calendar event unless its natural key already exists.
+    Runs inside the caller's transaction - the caller commits.
+
+    Args:
+        session: Database session
+        row: Meeting column values, including event_kind, event_subject_id and event_date
+
+    Returns:
+        (meeting, created): the event now stored under the key (whoever wrote it) and
+        whether this call inserted it
+    """
+    created = await insert_calendar_events(session, [row]) > 0
+    meeting = await get_calendar_event(session, row["event_kind"], row["event_subject_id"], row["event_date"])
+    return meeting, created
@@ -0,0 +1,141 @@
+"""
+Employee summary projection.
+
+The employees list needs a termination reason, review count and latest review
+for every employee. Instead of scanning all firing activities and aggregating
+all reviews on every request, those values are kept in the employee_summaries
+table and updated by the code paths that fire employees and create reviews.
+Writes that bypass those paths (manual SQL, bulk loads, a crash between the
+source row and its upsert) are repaired by rebuild_employee_summaries(), which
+the simulator's employee_summaries job runs every hour and
+rebuild_employee_summaries.py runs on demand.
+"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select, text, case, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.models import EmployeeSummary
+
+
+async def record_termination(session: AsyncSession, employee_id: int, termination_reason: Optional[str]):
+    """
+    Store the termination reason for a fired employee.
+    Runs inside the caller's transaction - the caller commits.
+    """
+    stmt = insert(EmployeeSummary).values(
+        employee_id=employee_id,
+        termination_reason=termination_reason,
+        review_count=0
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EmployeeSummary.employee_id],
+        set_={"termination_reason": stmt.excluded.termination_reason}
+    )
+    await session.execute(stmt)
+
+
+async def record_review(session: AsyncSession, employee_id: int, overall_rating: float, review_date: Optional[datetime]):
+    """
+    Count a new review and move the latest rating/date forward if it is the newest one.
+    Runs inside the caller's transaction - the caller commits.
+    """
+    stmt = insert(EmployeeSummary).values(
+        employee_id=employee_id,
+        review_count=1,
+        latest_rating=overall_rating,
+        latest_review_date=review_date
+    )
+    is_newer = or_(
+        EmployeeSummary.latest_review_date.is_(None),
+        stmt.excluded.latest_review_date >= EmployeeSummary.latest_review_date
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EmployeeSummary.employee_id],
+        set_={
+            "review_count": EmployeeSummary.review_count + 1,
+            "latest_rating": case((is_newer, stmt.excluded.latest_rating), else_=EmployeeSummary.latest_rating),
+            "latest_review_date": case((is_newer, stmt.excluded.latest_review_date), else_=EmployeeSummary.latest_review_date),
+        }
+    )
+    await session.execute(stmt)
+
+
+async def get_termination_reason(session: AsyncSession, employee_id: int) -> Optional[str]:
+    """Get the stored termination reason for a single employee."""
+    result = await session.execute(
+        select(EmployeeSummary.termination_reason).where(EmployeeSummary.employee_id == employee_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def rebuild_employee_summaries(session: AsyncSession) -> int:
+    """
+    Recompute every summary row from employee_reviews and firing activities.
+    Used to backfill the projection for databases created before it existed
+    and to repair drift. Runs inside the caller's transaction - the caller commits.
+
+    Returns:
+        Number of summary rows written
+    """
+    result = await session.execute(text("""
+        INSERT INTO employee_summaries (employee_id, termination_reason, review_count, latest_rating, latest_review_date)
+        SELECT
+            e.id,
+            f.termination_reason,
+            COALESCE(rc.review_count, 0),
+            lr.overall_rating,
+            lr.review_date
+        FROM employees e
+        LEFT JOIN (
+            SELECT employee_id, COUNT(*) AS review_count
+            FROM employee_reviews
+            GROUP BY employee_id
+        ) rc ON rc.employee_id = e.id
+        LEFT JOIN (
+            SELECT DISTINCT ON (employee_id)
+                employee_id,
+                COALESCE(review_date, created_at) AS review_date,
+                overall_rating
+            FROM employee_reviews
+            ORDER BY employee_id, COALESCE(review_date, created_at) DESC
+        ) lr ON lr.employee_id = e.id
+        LEFT JOIN (
+            SELECT DISTINCT ON (employee_id) employee_id, termination_reason
+            FROM (
+                SELECT
+                    (activity_metadata->>'employee_id')::int AS employee_id,
+                    activity_metadata->>'termination_reason' AS termination_reason,
+                    timestamp
+                FROM activities
+                WHERE activity_type = 'firing'
+                AND activity_metadata->>'employee_id' ~ '^[0-9]+$'
+            ) firings
+            ORDER BY employee_id, timestamp DESC
+        ) f ON f.employee_id = e.id
+        ON CONFLICT (employee_id) DO UPDATE SET
+            termination_reason = EXCLUDED.termination_reason,
+            review_count = EXCLUDED.review_count,
+            latest_rating = EXCLUDED.latest_rating,
+            latest_review_date = EXCLUDED.latest_review_date
+    """))
+    return result.rowcount or 0
+
+
+async def backfill_employee_summaries_if_empty(session: AsyncSession) -> int:
+    """Populate the projection once, when the table is still empty."""
+    result = await session.execute(text("SELECT EXISTS (SELECT 1 FROM employee_summaries)"))
+    if result.scalar():
+        return 0
+    rows = await rebuild_employee_summaries(session)
+    await session.commit()
+    return rows
+
+
+async def repair_employee_summaries() -> int:
+    """Rebuild the whole projection in its own session (employee_summaries job and rebuild script)."""
+    from database.database import async_session_maker
+    async with async_session_maker() as session:
+        rows = await rebuild_employee_summaries(session)
+        await session.commit()
+    return rows
@@ -0,0 +1,193 @@
+"""
+Prebuilt statements for the queries the simulator runs on every tick.
+
+Building a select() and generating its cache key costs Python time on the event
+loop thread; doing it for the same handful of statements thousands of times an
+hour adds up. The statements below are built once at import. Values that change
+between calls are bindparam()s, so every execution reuses the same construct,
+the same memoized cache key and the same entry in the engine's compiled cache;
+only the parameters differ:
+
+    result = await db.execute(ROOM_OCCUPANCY, {"room_id": room_id})
+
+Chaining (.limit(), .order_by(), ...) on these builds a new statement, so keep
+the full statement here if it is hot.
+
+install() counts how executions hit SQLAlchemy's compiled cache (overall and per
+statement below) for GET /api/debug/statement-cache. Statements that miss again
+and again mean the cache is too small (DB_QUERY_CACHE_SIZE) or a statement
+embeds literal values instead of bound parameters.
+"""
+from typing import Dict
+
+from sqlalchemy import and_, bindparam, case, event, func, select
+
+from database.models import Employee, Financial, Project, Task
+
+# --- Employees ---
+
+ACTIVE_EMPLOYEES = select(Employee).where(Employee.status == "active")
+
+EMPLOYEE_BY_ID = select(Employee).where(Employee.id == bindparam("employee_id"))
+
+IDLE_EMPLOYEES = select(
+    Employee.id,
+    Employee.department,
+    Employee.activity_state,
+    Employee.current_room,
+    Employee.hired_at,
+).where(Employee.status == "active", Employee.current_task_id.is_(None))
+
+# --- Projects ---
+
+OPEN_PROJECTS = select(Project).where(Project.status.in_(["planning", "active"]))
+
+COMPLETED_PROJECTS = select(Project).where(Project.status == "completed")
+
+# Same rules as ProjectManager.calculate_project_progress
+_task_progress = case(
+    (Task.progress.isnot(None), Task.progress),
+    (Task.status == "completed", 100.0),
+    (Task.status == "in_progress", 50.0),
+    else_=0.0,
+)
+
+OPEN_PROJECT_TASK_STATS = (
+    select(
+        Project.id,
+        Project.name,
+        Project.priority,
+        Project.revenue,
+        func.count(Task.id).label("task_count"),
+        func.coalesce(func.sum(case(
+            (and_(Task.employee_id.is_(None), Task.status.in_(["pending", "in_progress"])), 1),
+            else_=0,
+        )), 0).label("unassigned_count"),
+        func.coalesce(func.avg(_task_progress), 0.0).label("progress"),
+    )
+    .outerjoin(Task, Task.project_id == Project.id)
+    .where(Project.status.in_(["planning", "active"]))
+    .group_by(Project.id)
+)
+
+# --- Tasks ---
+
+UNASSIGNED_TASKS = (
+    select(Task.id, Task.project_id, Task.description)
+    .where(Task.employee_id.is_(None), Task.status.in_(["pending", "in_progress"]))
+    .order_by(Task.id)
+)
+
+# --- Room occupancy ---
+
+ROOM_OCCUPANCY = select(func.count(Employee.id)).where(
+    Employee.status == "active",
+    Employee.current_room == bindparam("room_id"),
+)
+
+ROOMS_OCCUPANCY = select(func.count(Employee.id)).where(
+    Employee.status == "active",
+    Employee.current_room.in_(bindparam("room_ids", expanding=True)),
+)
+
+OCCUPANCY_BY_ROOM = (
+    select(Employee.current_room, func.count(Employee.id).label("count"))
+    .where(Employee.status == "active", Employee.current_room.isnot(None))
+    .group_by(Employee.current_room)
+)
+
+EMPLOYEES_IN_ROOM = select(Employee).where(
+    Employee.status == "active",
+    Employee.current_room == bindparam("room_id"),
+)
+
+EMPLOYEE_IN_ROOM = select(Employee).where(
+    Employee.id == bindparam("employee_id"),
+    Employee.current_room == bindparam("room_id"),
+)
+
+# --- Financial totals ---
+
+FINANCIAL_TOTAL = select(func.sum(Financial.amount)).where(Financial.type == bindparam("type"))
+
+FINANCIAL_TOTAL_SINCE = select(func.sum(Financial.amount)).where(
+    Financial.type == bindparam("type"),
+    Financial.timestamp >= bindparam("since"),
+)
+
+_NAMES: Dict[int, str] = {
+    id(value): name for name, value in list(globals().items())
+    if name.isupper() and hasattr(value, "_generate_cache_key")
+}
+
+
+class _CacheCounter:
+    __slots__ = ("hits", "misses", "other")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.other = 0
+
+    def to_dict(self) -> Dict:
+        compiled = self.hits + self.misses
+        return {
+            "executions": compiled + self.other,
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncached": self.other,
+            "hit_rate": round(self.hits / compiled, 4) if compiled else None,
+        }
+
+
+_overall = _CacheCounter()
+_per_statement: Dict[str, _CacheCounter] = {}
+_engine = None
+
+
+def _count(conn, cursor, statement, parameters, context, executemany):
+    if context is None or context.compiled is None:
+        return  # Plain text SQL
+    status = context.cache_hit
+    invoked = getattr(context, "invoked_statement", None)
+    name = _NAMES.get(id(invoked)) if invoked is not None else None
+    counters = [_overall]
+    if name:
+        counter = _per_statement.get(name)
+        if counter is None:
+            counter = _per_statement[name] = _CacheCounter()
+        counters.append(counter)
+    for counter in counters:
+        if status == context.dialect.CACHE_HIT:
+            counter.hits += 1
+        elif status == context.dialect.CACHE_MISS:
+            counter.misses += 1
+        else:
+            counter.other += 1
+
+
+def install(engine):
+    """Count compiled-cache hits and misses for every statement the engine executes."""
+    global _engine
+    _engine = engine
+    event.listen(engine.sync_engine, "before_cursor_execute", _count)
+
+
+def get_report() -> Dict:
+    """Compiled-cache hit rates, overall and per prebuilt statement."""
+    cache = getattr(_engine.sync_engine, "_compiled_cache", None) if _engine is not None else None
+    return {
+        "compiled_cache": {
+            "size": len(cache) if cache is not None else None,
+            "capacity": getattr(cache, "capacity", None),
+        },
+        "overall": _overall.to_dict(),
+        "statements": {name: counter.to_dict() for name, counter in sorted(_per_statement.items())},
+    }
+
+
+def reset():
+    """Clear the hit/miss counters."""
+    global _overall
+    _overall = _CacheCounter()
+    _per_statement.clear()
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, JSON, Boolean, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey, Text, JSON, Boolean, UniqueConstraint, LargeBinary
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.sql.expression import FunctionElement
@@ -120,6 +120,27 @@ class Task(Base):
     employee = relationship("Employee", back_populates="tasks", foreign_keys=[employee_id])
     project = relationship("Project", back_populates="tasks")
 
+class EmployeeSummary(Base):
+    """Denormalised per-employee projection served by the employees list endpoint."""
+    __tablename__ = "employee_summaries"
+    
+    employee_id = Column(Integer, ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    termination_reason = Column(Text, nullable=True)  # Copied from the firing activity when the employee is terminated
+    review_count = Column(Integer, default=0, nullable=False)  # Number of EmployeeReview rows for the employee
+    latest_rating = Column(Float, nullable=True)  # overall_rating of the most recent review
+    latest_review_date = Column(DateTime(timezone=True), nullable=True)  # review_date of the most recent review
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class DashboardSnapshot(Base):
+    """Precomputed GET /api/dashboard document (a single row, rebuilt by business/dashboard_read_model.py)."""
+    __tablename__ = "dashboard_snapshots"
+
+    id = Column(Integer, primary_key=True)  # Always 1
+    version = Column(Integer, nullable=False, default=1)  # Incremented whenever the document content changes (ETag)
+    content_hash = Column(String, nullable=False)  # SHA-1 of the serialised document
+    document = Column(JSON, nullable=False)
+    built_at = Column(DateTime(timezone=True), nullable=False)  # Last rebuild, even when the content was unchanged
+
 class Decision(Base):
     __tablename__ = "decisions"
     
@@ -139,6 +160,7 @@ class Financial(Base):
     type = Column(String, nullable=False)  # income, expense
     amount = Column(Float, nullable=False)
     description = Column(Text, nullable=True)
+    category = Column(String, nullable=True)  # Code from business.financial_manager.categorize, set on insert
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=True)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -315,10 +337,18 @@ class Meeting(Base):
     transcript = Column(Text, nullable=True)  # Full meeting transcript (for completed meetings)
     live_transcript = Column(Text, nullable=True)  # Live transcript (for in-progress meetings)
     meeting_metadata = Column(JSON, default=dict)  # Additional metadata (live messages, etc.)
+    # Natural key for generated calendar events (birthday/holiday parties); NULL for regular meetings
+    event_kind = Column(String, nullable=True)  # birthday_party, holiday_party
+    event_subject_id = Column(Integer, nullable=True)  # Employee ID for birthdays, 0 for holidays
+    event_date = Column(Date, nullable=True)  # Local calendar date of the event
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     organizer = relationship("Employee", foreign_keys=[organizer_id])
+    
+    __table_args__ = (
+        UniqueConstraint('event_kind', 'event_subject_id', 'event_date', name='uq_meetings_event_key'),
+    )
 
 class OfficePet(Base):
     __tablename__ = "office_pets"
@@ -490,6 +520,8 @@ class SharedDriveFile(Base):
     file_size = Column(Integer, default=0)
     content_html = Column(Text, nullable=False)  # Current version HTML
     file_metadata = Column(JSON, default=dict)  # Renamed from metadata (reserved in SQLAlchemy)
+    # MinHash signature for near-duplicate detection (deferred - only the duplicate index reads it)
+    content_signature = deferred(Column(JSON, nullable=True))
     last_updated_by_id = Column(Integer, ForeignKey("employees.id"), nullable=True)
     current_version = Column(Integer, default=1)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -506,7 +538,9 @@ class SharedDriveFileVersion(Base):
     id = Column(Integer, primary_key=True, index=True)
     file_id = Column(Integer, ForeignKey("shared_drive_files.id"), nullable=False)
     version_number = Column(Integer, nullable=False)
-    content_html = Column(Text, nullable=False)
+    # Bodies are deferred so listing versions stays metadata-only (see business/shared_drive_versions.py)
+    content_html = deferred(Column(Text, nullable=True))  # Full text - only rows not yet converted to deltas
+    content_delta = deferred(Column(LargeBinary, nullable=True))  # Compressed reverse delta against the next newer version
     file_size = Column(Integer, default=0)
     created_by_id = Column(Integer, ForeignKey("employees.id"), nullable=True)
     change_summary = Column(Text, nullable=True)  # AI-generated summary
@@ -0,0 +1,351 @@
+"""
+Opt-in query instrumentation built on SQLAlchemy engine events.
+
+Enable with QUERY_STATS=1. When enabled, every statement sent to the database is
+timed and attributed to:
+
+- its fingerprint (statement text with literals and IN-lists collapsed), with
+  count, total time and p50/p99 over the most recent samples
+- every active unit of work: an API request (see the middleware in main.py) or
+  a simulator phase (query_unit("tick.reviews", "phase"))
+
+When a unit of work finishes, any fingerprint executed more than
+QUERY_STATS_N_PLUS_ONE times (default 10) inside it is reported as a likely N+1
+pattern. The slowest statements are kept with their parameters so the debug
+endpoint can show EXPLAIN output for them.
+
+Everything is exposed on GET /api/debug/queries (reset with DELETE).
+"""
+import contextvars
+import heapq
+import itertools
+import logging
+import os
+import re
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS", "").lower() in ("1", "true", "yes", "on")
+N_PLUS_ONE_THRESHOLD = int(os.getenv("QUERY_STATS_N_PLUS_ONE", "10"))
+SLOW_QUERY_LIMIT = int(os.getenv("QUERY_STATS_SLOW_LIMIT", "20"))
+# Samples kept per fingerprint for percentiles
+SAMPLE_WINDOW = 1000
+# Findings / unit summaries are bounded so a long-running server does not grow forever
+MAX_FINGERPRINTS = 2000
+MAX_N_PLUS_ONE_FINDINGS = 100
+
+_NUMBER_RE = re.compile(r"\b\d+(\.\d+)?\b")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_PARAM_LIST_RE = re.compile(r"\((\s*(\$\d+|\?|%\(\w+\)s|:\w+)\s*,)+\s*(\$\d+|\?|%\(\w+\)s|:\w+)\s*\)")
+_VALUES_LIST_RE = re.compile(r"(VALUES\s*\([^)]*\))(\s*,\s*\([^)]*\))+", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a SQL statement so executions that differ only in values group together.
+
+    Args:
+        statement: SQL as sent to the driver
+
+    Returns:
+        Normalized statement text
+    """
+    fp = _STRING_RE.sub("?", statement)
+    fp = _PARAM_LIST_RE.sub("(...)", fp)
+    fp = _VALUES_LIST_RE.sub(r"\1, ...", fp)
+    fp = _NUMBER_RE.sub("?", fp)
+    return _WHITESPACE_RE.sub(" ", fp).strip()
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class FingerprintStats:
+    """Counters and recent durations for one statement fingerprint."""
+
+    __slots__ = ("count", "total_ms", "max_ms", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+
+    def add(self, duration_ms: float):
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.samples.append(duration_ms)
+
+    def to_dict(self) -> Dict:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 2),
+            "p50_ms": round(_percentile(ordered, 50), 3),
+            "p99_ms": round(_percentile(ordered, 99), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class UnitOfWork:
+    """Queries issued while one request or simulator phase was running."""
+
+    __slots__ = ("name", "kind", "query_count", "db_ms", "fingerprints", "started")
+
+    def __init__(self, name: str, kind: str):
+        self.name = name
+        self.kind = kind
+        self.query_count = 0
+        self.db_ms = 0.0
+        self.fingerprints: Dict[str, int] = {}
+        self.started = time.perf_counter()
+
+
+class UnitSummary:
+    """Aggregate over all runs of units with the same name."""
+
+    __slots__ = ("kind", "runs", "queries", "max_queries", "db_ms", "wall_ms")
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.runs = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.db_ms = 0.0
+        self.wall_ms = 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "kind": self.kind,
+            "runs": self.runs,
+            "avg_queries": round(self.queries / self.runs, 1) if self.runs else 0,
+            "max_queries": self.max_queries,
+            "avg_db_ms": round(self.db_ms / self.runs, 2) if self.runs else 0,
+            "avg_wall_ms": round(self.wall_ms / self.runs, 2) if self.runs else 0,
+        }
+
+
+# Stack of active units for the current task (contextvars are copied into child tasks)
+_active_units: contextvars.ContextVar[tuple] = contextvars.ContextVar("query_units", default=())
+# Set while the report runs its own EXPLAINs so they are not recorded
+_paused: contextvars.ContextVar[bool] = contextvars.ContextVar("query_stats_paused", default=False)
+
+_fingerprints: Dict[str, FingerprintStats] = {}
+_units: Dict[str, UnitSummary] = {}
+_n_plus_one: deque = deque(maxlen=MAX_N_PLUS_ONE_FINDINGS)
+_slow_queries: List = []  # min-heap of (duration_ms, seq, entry)
+_slow_seq = itertools.count()
+_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not _paused.get():
+        conn.info["query_stats_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("query_stats_start", None)
+    if started is None:
+        return
+    duration_ms = (time.perf_counter() - started) * 1000
+    fp = fingerprint(statement)
+
+    stats = _fingerprints.get(fp)
+    if stats is None:
+        if len(_fingerprints) >= MAX_FINGERPRINTS:
+            fp = "<other>"
+            stats = _fingerprints.setdefault(fp, FingerprintStats())
+        else:
+            stats = _fingerprints[fp] = FingerprintStats()
+    stats.add(duration_ms)
+
+    units = _active_units.get()
+    for unit in units:
+        unit.query_count += 1
+        unit.db_ms += duration_ms
+        unit.fingerprints[fp] = unit.fingerprints.get(fp, 0) + 1
+
+    if len(_slow_queries) < SLOW_QUERY_LIMIT or duration_ms > _slow_queries[0][0]:
+        entry = {
+            "duration_ms": round(duration_ms, 3),
+            "statement": statement,
+            "parameters": None if executemany else parameters,
+            "fingerprint": fp,
+            "unit": units[-1].name if units else None,
+            "at": time.time(),
+        }
+        item = (duration_ms, next(_slow_seq), entry)
+        if len(_slow_queries) < SLOW_QUERY_LIMIT:
+            heapq.heappush(_slow_queries, item)
+        else:
+            heapq.heapreplace(_slow_queries, item)
+
+
+def install(engine) -> bool:
+    """
+    Attach the instrumentation to an engine if QUERY_STATS is enabled.
+
+    Args:
+        engine: AsyncEngine or Engine
+
+    Returns:
+        True if instrumentation is active
+    """
+    global _installed
+    if not QUERY_STATS_ENABLED or _installed:
+        return _installed
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    _installed = True
+    logger.info(f"Query instrumentation enabled (N+1 threshold {N_PLUS_ONE_THRESHOLD})")
+    return True
+
+
+def is_enabled() -> bool:
+    """True when statements are being recorded."""
+    return _installed
+
+
+def begin_unit(name: str, kind: str):
+    """
+    Start attributing queries to a unit of work. Pair with end_unit().
+
+    Returns:
+        (unit, token) to pass to end_unit, or None when instrumentation is off
+    """
+    if not _installed:
+        return None
+    unit = UnitOfWork(name, kind)
+    token = _active_units.set(_active_units.get() + (unit,))
+    return unit, token
+
+
+def end_unit(handle):
+    """Finish a unit started with begin_unit and record its totals and N+1 findings."""
+    if handle is None:
+        return
+    unit, token = handle
+    _active_units.reset(token)
+
+    summary = _units.get(unit.name)
+    if summary is None:
+        summary = _units[unit.name] = UnitSummary(unit.kind)
+    summary.runs += 1
+    summary.queries += unit.query_count
+    summary.max_queries = max(summary.max_queries, unit.query_count)
+    summary.db_ms += unit.db_ms
+    summary.wall_ms += (time.perf_counter() - unit.started) * 1000
+
+    for fp, count in unit.fingerprints.items():
+        if count > N_PLUS_ONE_THRESHOLD:
+            _n_plus_one.append({
+                "unit": unit.name,
+                "kind": unit.kind,
+                "fingerprint": fp,
+                "count": count,
+                "at": time.time(),
+            })
+            logger.warning(f"Possible N+1 in {unit.kind} '{unit.name}': {count}x {fp[:200]}")
+
+
+@contextmanager
+def _unit_context(name: str, kind: str):
+    handle = begin_unit(name, kind)
+    try:
+        yield handle[0] if handle else None
+    finally:
+        end_unit(handle)
+
+
+def query_unit(name: str, kind: str = "phase"):
+    """
+    Context manager attributing the queries of a block to a named unit of work.
+    Costs nothing when instrumentation is disabled.
+
+    Usage:
+        with query_unit("tick.reviews"):
+            await review_manager.conduct_periodic_reviews()
+    """
+    if not _installed:
+        return nullcontext()
+    return _unit_context(name, kind)
+
+
+def reset():
+    """Forget everything recorded so far."""
+    _fingerprints.clear()
+    _units.clear()
+    _n_plus_one.clear()
+    _slow_queries.clear()
+
+
+async def _explain(engine, entry: Dict) -> Optional[str]:
+    """EXPLAIN a captured SELECT with its original parameters (never ANALYZE - nothing is executed)."""
+    statement = entry["statement"].lstrip()
+    if statement[:6].upper() != "SELECT":
+        return None
+    try:
+        async with engine.connect() as conn:
+            params = entry["parameters"]
+            if isinstance(params, list):
+                params = tuple(params)
+            result = await conn.exec_driver_sql(f"EXPLAIN {statement}", params or ())
+            return "\n".join(row[0] for row in result)
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+
+
+async def get_report(engine=None, top: int = 25, explain: bool = True) -> Dict:
+    """
+    Build the debug report.
+
+    Args:
+        engine: Engine used to run EXPLAIN for the slow statements (skipped if None)
+        top: Number of fingerprints to list
+        explain: Include EXPLAIN plans for the slow statements
+
+    Returns:
+        Report dict
+    """
+    if not _installed:
+        return {"enabled": False, "hint": "Set QUERY_STATS=1 and restart to record queries."}
+
+    by_total = sorted(_fingerprints.items(), key=lambda item: item[1].total_ms, reverse=True)[:top]
+    slow = [entry for _, _, entry in sorted(_slow_queries, key=lambda item: item[0], reverse=True)]
+
+    slow_report = []
+    for entry in slow:
+        item = {k: v for k, v in entry.items() if k != "parameters"}
+        item["parameters"] = repr(entry["parameters"])[:500] if entry["parameters"] is not None else None
+        if explain and engine is not None:
+            token = _paused.set(True)
+            try:
+                item["explain"] = await _explain(engine, entry)
+            finally:
+                _paused.reset(token)
+        slow_report.append(item)
+
+    return {
+        "enabled": True,
+        "n_plus_one_threshold": N_PLUS_ONE_THRESHOLD,
+        "total_queries": sum(s.count for s in _fingerprints.values()),
+        "total_db_ms": round(sum(s.total_ms for s in _fingerprints.values()), 2),
+        "fingerprints": [dict(fingerprint=fp, **stats.to_dict()) for fp, stats in by_total],
+        "units": {name: summary.to_dict() for name, summary in
+                  sorted(_units.items(), key=lambda item: item[1].queries, reverse=True)},
+        "n_plus_one": list(_n_plus_one)[::-1],
+        "slow_queries": slow_report,
+    }
@@ -1,8 +1,13 @@
 from typing import Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.models import Employee, Task, Project, Decision, Activity, Email, ChatMessage
+from database.hot_queries import EMPLOYEE_BY_ID
 from llm.ollama_client import OllamaClient
 import random
+from config import utcnow
+import logging
+
+logger = logging.getLogger(__name__)
 
 def generate_thread_id(employee_id1: int, employee_id2: int) -> str:
     """Generate a consistent thread ID for a pair of employees.
@@ -300,10 +305,10 @@ class EmployeeAgent:
     async def _check_and_respond_to_messages(self, business_context: Dict):
         """Check for unread messages and respond to all messages."""
         from sqlalchemy import select, desc
-        from datetime import datetime, timedelta
+        from datetime import timedelta
         
         # Check for unread emails from the last 48 hours (extended to catch all emails)
-        cutoff_time = datetime.utcnow() - timedelta(hours=48)
+        cutoff_time = utcnow() - timedelta(hours=48)
         result = await self.db.execute(
             select(Email)
             .where(
@@ -318,7 +323,7 @@ class EmployeeAgent:
         
         # Check for recent chat messages (chats don't have read status, so check last 48 hours)
         # Extended time window to catch all messages and increased limit to ensure all messages get responses
-        chat_cutoff = datetime.utcnow() - timedelta(hours=48)
+        chat_cutoff = utcnow() - timedelta(hours=48)
         result = await self.db.execute(
             select(ChatMessage)
             .where(
@@ -332,7 +337,7 @@ class EmployeeAgent:
         recent_chats = result.scalars().all()
         
         if unread_emails or recent_chats:
-            print(f"📬 {self.employee.name} checking messages: {len(unread_emails)} unread emails, {len(recent_chats)} recent chats")
+            logger.debug(f"📬 {self.employee.name} checking messages: {len(unread_emails)} unread emails, {len(recent_chats)} recent chats")
         
         emails_responded = 0
         chats_responded = 0
@@ -367,27 +372,25 @@ class EmployeeAgent:
             if not already_responded:
                 try:
                     # Get sender name for logging
-                    sender_result = await self.db.execute(
-                        select(Employee).where(Employee.id == email.sender_id)
-                    )
+                    sender_result = await self.db.execute(EMPLOYEE_BY_ID, {"employee_id": email.sender_id})
                     sender = sender_result.scalar_one_or_none()
                     sender_name = sender.name if sender else f"Employee {email.sender_id}"
                     
-                    print(f"📧 {self.employee.name} responding to email from {sender_name} (ID: {email.sender_id}, subject: {email.subject[:50]}...)")
+                    logger.debug(f"📧 {self.employee.name} responding to email from {sender_name} (ID: {email.sender_id}, subject: {email.subject[:50]}...)")
                     await self._respond_to_email(email, business_context)
                     await self.db.flush()  # Ensure response is saved immediately
                     email.read = True
                     emails_responded += 1
-                    print(f"✅ {self.employee.name} successfully responded to email from {sender_name}")
+                    logger.debug(f"✅ {self.employee.name} successfully responded to email from {sender_name}")
                 except Exception as e:
-                    print(f"❌ Error responding to email from {email.sender_id} to {self.employee.name}: {e}")
+                    logger.error(f"❌ Error responding to email from {email.sender_id} to {self.employee.name}: {e}")
                     import traceback
                     traceback.print_exc()
                     continue
             else:
                 # Mark as read even if we already responded
                 email.read = True
-                print(f"ℹ️  {self.employee.name} already responded to email from {email.sender_id}")
+                logger.debug(f"ℹ️  {self.employee.name} already responded to email from {email.sender_id}")
         
         # Respond to ALL chat messages (not just those that need response)
         # Process in reverse order (oldest first) to maintain conversation flow
@@ -399,7 +402,7 @@ class EmployeeAgent:
             # CRITICAL: Skip if sender is the same as recipient (employee replying to themselves)
             # This should never happen, but prevent it just in case
             if chat.sender_id == self.employee.id:
-                print(f"⚠️  Skipping chat where {self.employee.name} would reply to themselves (chat ID: {chat.id})")
+                logger.warning(f"⚠️  Skipping chat where {self.employee.name} would reply to themselves (chat ID: {chat.id})")
                 continue
 
             # Get the thread_id for this conversation
@@ -429,28 +432,26 @@ class EmployeeAgent:
             if not already_responded:
                 try:
                     # Get sender name for logging
-                    sender_result = await self.db.execute(
-                        select(Employee).where(Employee.id == chat.sender_id)
-                    )
+                    sender_result = await self.db.execute(EMPLOYEE_BY_ID, {"employee_id": chat.sender_id})
                     sender = sender_result.scalar_one_or_none()
                     sender_name = sender.name if sender else f"Employee {chat.sender_id}"
                     
-                    print(f"💬 {self.employee.name} responding to chat from {sender_name} (ID: {chat.sender_id}, message: {chat.message[:50]}...)")
+                    logger.debug(f"💬 {self.employee.name} responding to chat from {sender_name} (ID: {chat.sender_id}, message: {chat.message[:50]}...)")
                     await self._respond_to_chat(chat, business_context)
                     await self.db.flush()  # Ensure response is saved immediately
                     chats_responded += 1
-                    print(f"✅ {self.employee.name} successfully responded to chat from {sender_name}")
+                    logger.debug(f"✅ {self.employee.name} successfully responded to chat from {sender_name}")
                 except Exception as e:
-                    print(f"❌ Error responding to chat from {chat.sender_id} to {self.employee.name}: {e}")
+                    logger.error(f"❌ Error responding to chat from {chat.sender_id} to {self.employee.name}: {e}")
                     import traceback
                     traceback.print_exc()
                     continue
             else:
-                print(f"ℹ️  {self.employee.name} already responded to chat from {chat.sender_id}")
+                logger.debug(f"ℹ️  {self.employee.name} already responded to chat from {chat.sender_id}")
         
         # Summary
         if emails_responded > 0 or chats_responded > 0:
-            print(f"📊 {self.employee.name} responded to {emails_responded} email(s) and {chats_responded} chat(s)")
+            logger.info(f"📊 {self.employee.name} responded to {emails_responded} email(s) and {chats_responded} chat(s)")
     
     async def _message_needs_response(self, message_text: str) -> bool:
         """Check if a message contains a question or request that needs a response."""
@@ -479,9 +480,7 @@ class EmployeeAgent:
         from sqlalchemy import select
         
         # Get sender information
-        result = await self.db.execute(
-            select(Employee).where(Employee.id == email.sender_id)
-        )
+        result = await self.db.execute(EMPLOYEE_BY_ID, {"employee_id": email.sender_id})
         sender = result.scalar_one_or_none()
         if not sender:
             return
@@ -554,9 +553,7 @@ class EmployeeAgent:
             return
         
         # Get sender information
-        result = await self.db.execute(
-            select(Employee).where(Employee.id == chat.sender_id)
-        )
+        result = await self.db.execute(EMPLOYEE_BY_ID, {"employee_id": chat.sender_id})
         sender = result.scalar_one_or_none()
         if not sender:
             print(f"⚠️  Cannot respond: sender with ID {chat.sender_id} not found")
@@ -2,8 +2,8 @@ from .base import EmployeeAgent
 from typing import Dict
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.models import Employee, Task, Project
+from database.hot_queries import ACTIVE_EMPLOYEES, COMPLETED_PROJECTS
 from llm.ollama_client import OllamaClient
-from sqlalchemy import select
 from config import now as local_now
 import random
 
@@ -15,7 +15,6 @@ class CEOAgent(EmployeeAgent):
         # Add profitability and business metrics to context for decision-making
         from business.financial_manager import FinancialManager
         from business.project_manager import ProjectManager
-        from sqlalchemy import select
         
         financial_manager = FinancialManager(self.db)
         project_manager = ProjectManager(self.db)
@@ -26,9 +25,7 @@ class CEOAgent(EmployeeAgent):
         
         # Get project completion metrics
         active_projects = await project_manager.get_active_projects()
-        result = await self.db.execute(
-            select(Project).where(Project.status == "completed")
-        )
+        result = await self.db.execute(COMPLETED_PROJECTS)
         completed_projects = result.scalars().all()
         completed_count = len(completed_projects)
         
@@ -98,7 +95,6 @@ class CEOAgent(EmployeeAgent):
         # Proactively create projects when we have capacity and need workload
         if not should_create_project:
             from business.project_manager import ProjectManager
-            from sqlalchemy import select
             project_manager = ProjectManager(self.db)
             
             # Check current capacity
@@ -107,9 +103,7 @@ class CEOAgent(EmployeeAgent):
             project_count = len(active_projects)
             
             # Get employee count
-            result = await self.db.execute(
-                select(Employee).where(Employee.status == "active")
-            )
+            result = await self.db.execute(ACTIVE_EMPLOYEES)
             active_employees = result.scalars().all()
             employee_count = len(active_employees)
             max_projects = max(1, int(employee_count / 3))
@@ -237,7 +231,6 @@ class CEOAgent(EmployeeAgent):
         """Focus leadership attention on getting active projects completed."""
         from business.project_manager import ProjectManager
         from database.models import Activity, Task
-        from sqlalchemy import select
         
         project_manager = ProjectManager(self.db)
         active_projects = await project_manager.get_active_projects()
@@ -337,8 +330,7 @@ class CEOAgent(EmployeeAgent):
     async def _create_strategic_project(self, decision: Dict):
         """Create a new strategic project. If capacity is low, trigger hiring instead of deferring."""
         from business.project_manager import ProjectManager
-        from database.models import Activity, Employee
-        from sqlalchemy import select
+        from database.models import Activity
         import random
         project_manager = ProjectManager(self.db)
         
@@ -348,9 +340,7 @@ class CEOAgent(EmployeeAgent):
         if not can_create:
             # Instead of deferring, trigger hiring initiative!
             # Get current employee count
-            result = await self.db.execute(
-                select(Employee).where(Employee.status == "active")
-            )
+            result = await self.db.execute(ACTIVE_EMPLOYEES)
             active_employees = result.scalars().all()
             employee_count = len(active_employees)
             
@@ -416,7 +406,6 @@ class CEOAgent(EmployeeAgent):
         """CEO makes strategic business decisions to improve company performance."""
         from business.financial_manager import FinancialManager
         from database.models import Activity
-        from sqlalchemy import select
         import random
         
         financial_manager = FinancialManager(self.db)
@@ -430,9 +419,7 @@ class CEOAgent(EmployeeAgent):
         active_projects = await project_manager.get_active_projects()
         project_count = len(active_projects)
         
-        result = await self.db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await self.db.execute(ACTIVE_EMPLOYEES)
         active_employees = result.scalars().all()
         employee_count = len(active_employees)
         
@@ -536,7 +523,6 @@ class ManagerAgent(EmployeeAgent):
         # Add profitability and operational metrics to context
         from business.financial_manager import FinancialManager
         from business.project_manager import ProjectManager
-        from sqlalchemy import select
         
         financial_manager = FinancialManager(self.db)
         project_manager = ProjectManager(self.db)
@@ -547,9 +533,7 @@ class ManagerAgent(EmployeeAgent):
         
         # Get project completion metrics
         active_projects = await project_manager.get_active_projects()
-        result = await self.db.execute(
-            select(Project).where(Project.status == "completed")
-        )
+        result = await self.db.execute(COMPLETED_PROJECTS)
         completed_projects = result.scalars().all()
         completed_count = len(completed_projects)
         
@@ -603,33 +587,8 @@ class ManagerAgent(EmployeeAgent):
         # PRIORITY 1: Focus on getting projects completed
         await self._focus_on_project_completion()
         
-        # PRIORITY 2: Managers focus on business operations: task assignment AND business decisions
-        # Check for task overload - if severe, always assign tasks
-        from sqlalchemy import select
-        from database.models import Task, Employee
-        
-        result = await self.db.execute(
-            select(Task).where(
-                Task.employee_id.is_(None),
-                Task.status.in_(["pending", "in_progress"])
-            )
-        )
-        unassigned_count = len(list(result.scalars().all()))
-        
-        result = await self.db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
-        employee_count = len(list(result.scalars().all()))
-        
-        # Calculate task overload ratio
-        tasks_per_employee = unassigned_count / max(1, employee_count)
-        
-        # Always assign tasks if there's significant overload (>2 tasks per employee)
-        # Otherwise, 95% chance (increased from 70% to ensure better coverage)
-        should_assign = tasks_per_employee > 2.0 or random.random() < 0.95
-        
-        if should_assign:
-            await self._assign_tasks()
+        # PRIORITY 2: Task assignment is handled for the whole office by the task
+        # dispatcher once per tick (business/task_dispatcher.py)
         
         # PRIORITY 3: Managers make strategic operational decisions (increased to 70% chance)
         if random.random() < 0.7:  # Increased from 50% to 70%
@@ -645,7 +604,6 @@ class ManagerAgent(EmployeeAgent):
         """Managers focus on getting active projects completed to enable growth."""
         from business.project_manager import ProjectManager
         from database.models import Activity, Task
-        from sqlalchemy import select
         
         project_manager = ProjectManager(self.db)
         active_projects = await project_manager.get_active_projects()
@@ -737,305 +695,10 @@ class ManagerAgent(EmployeeAgent):
                     )
                     self.db.add(activity)
     
-    async def _assign_tasks(self):
-        """Assign tasks to team members."""
-        from sqlalchemy import select
-        
-        # Get employees in this manager's department
-        result = await self.db.execute(
-            select(Employee).where(
-                Employee.department == self.employee.department,
-                Employee.hierarchy_level > self.employee.hierarchy_level,
-                Employee.id != self.employee.id
-            )
-        )
-        team_members = result.scalars().all()
-        
-        # Get active and planning projects
-        result = await self.db.execute(
-            select(Project).where(Project.status.in_(["planning", "active"]))
-        )
-        projects = result.scalars().all()
-        
-        if projects:
-            from business.project_manager import ProjectManager
-            from sqlalchemy import select
-            project_manager = ProjectManager(self.db)
-            
-            # First, ensure projects have tasks
-            for project in projects:
-                # Check if project has any tasks
-                result = await self.db.execute(
-                    select(Task).where(Task.project_id == project.id)
-                )
-                existing_tasks = result.scalars().all()
-                
-                # If no tasks, create some initial tasks
-                if not existing_tasks:
-                    task_descriptions = [
-                        f"Initial planning for {project.name}",
-                        f"Research and analysis for {project.name}",
-                        f"Design phase for {project.name}",
-                        f"Development for {project.name}",
-                        f"Testing for {project.name}"
-                    ]
-                    # Create 2-4 tasks per project
-                    num_tasks = random.randint(2, 4)
-                    for i in range(num_tasks):
-                        task = Task(
-                            employee_id=None,  # Unassigned initially
-                            project_id=project.id,
-                            description=random.choice(task_descriptions),
-                            status="pending",
-                            priority=project.priority,
-                            progress=0.0  # Initialize with 0% progress
-                        )
-                        self.db.add(task)
-                    await self.db.flush()
-            
-            # Now assign tasks to team members - ensure all available employees get tasks
-            if team_members:
-                # Get unassigned tasks from ALL projects (not just manager's department)
-                # This ensures we can assign tasks across departments if needed
-                result = await self.db.execute(
-                    select(Task).where(
-                        Task.employee_id.is_(None),
-                        Task.status == "pending"
-                    )
-                )
-                unassigned_tasks = result.scalars().all()
-                
-                # If no unassigned tasks but we have employees without tasks, create more tasks
-                if not unassigned_tasks:
-                    # Create additional tasks for active projects to ensure workload
-                    for project in projects:
-                        if project.status in ["planning", "active"]:
-                            # Create 1-2 more tasks per project if employees are idle
-                            idle_count = sum(1 for m in team_members if m.current_task_id is None)
-                            if idle_count > 0:
-                                task_descriptions = [
-                                    f"Additional work on {project.name}",
-                                    f"Follow-up tasks for {project.name}",
-                                    f"Quality assurance for {project.name}",
-                                    f"Documentation for {project.name}",
-                                    f"Optimization for {project.name}"
-                                ]
-                                num_new_tasks = min(idle_count, random.randint(1, 2))
-                                for i in range(num_new_tasks):
-                                    task = Task(
-                                        employee_id=None,
-                                        project_id=project.id,
-                                        description=random.choice(task_descriptions),
-                                        status="pending",
-                                        priority=project.priority,
-                                        progress=0.0
-                                    )
-                                    self.db.add(task)
-                                await self.db.flush()
-                                
-                                # Re-fetch unassigned tasks
-                                result = await self.db.execute(
-                                    select(Task).where(
-                                        Task.employee_id.is_(None),
-                                        Task.status == "pending"
-                                    )
-                                )
-                                unassigned_tasks = result.scalars().all()
-                                break  # Created tasks, now assign them
-                
-                # PRIORITY: Sort tasks by: 1) Project priority (high > medium > low), 2) Revenue, 3) Progress
-                # This ensures we focus on high-priority, high-revenue projects first
-                task_priorities = []
-                priority_weights = {"high": 3, "medium": 2, "low": 1}
-                
-                for task in unassigned_tasks:
-                    if task.project_id:
-                        result = await self.db.execute(
-                            select(Project).where(Project.id == task.project_id)
-                        )
-                        project = result.scalar_one_or_none()
-                        
-                        if project:
-                            project_progress = await project_manager.calculate_project_progress(task.project_id)
-                            priority_weight = priority_weights.get(project.priority, 1)
-                            revenue = project.revenue or 0.0
-                            
-                            # Calculate priority score: priority (0-3) * 1000 + revenue + progress
-                            # This ensures high-priority projects always come first, then by revenue, then by progress
-                            priority_score = (priority_weight * 1000) + (revenue / 1000) + project_progress
-                            task_priorities.append((task, priority_score, project.priority, revenue, project_progress))
-                        else:
-                            task_priorities.append((task, 0.0, "low", 0.0, 0.0))
-                    else:
-                        task_priorities.append((task, 0.0, "low", 0.0, 0.0))
-                
-                # Sort by priority score (descending) - high-priority, high-revenue projects get priority
-                task_priorities.sort(key=lambda x: x[1], reverse=True)
-                unassigned_list = [task for task, _, _, _, _ in task_priorities]
-                
-                # Assign tasks to ALL team members who don't have a task
-                # IMPORTANT: Do NOT assign tasks to employees who are still in training
-                assigned_count = 0
-                from datetime import datetime, timedelta
-                from config import now as local_now
-                from employees.room_assigner import ROOM_TRAINING_ROOM
-                
-                for member in team_members:
-                    # Skip employees who are in training
-                    is_in_training = False
-                    
-                    # Check if activity_state is "training"
-                    if hasattr(member, 'activity_state') and member.activity_state == "training":
-                        is_in_training = True
-                    
-                    # Check if employee is in training (either by activity state, training room, or active training session)
-                    is_in_training = False
-                    
-                    # First check activity state
-                    if member.activity_state == "training":
-                        is_in_training = True
-                    else:
-                        # Check if they're in any training room (floors 1, 2, or 4)
-                        current_room = getattr(member, 'current_room', None)
-                        if (current_room == ROOM_TRAINING_ROOM or 
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor2" or
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor4" or
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor4_2" or
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor4_3" or
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor4_4" or
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor4_5"):
-                            is_in_training = True
-                        else:
-                            # Check if they have an active training session
-                            from database.models import TrainingSession
-                            from sqlalchemy import select, and_
-                            session_result = await self.db.execute(
-                                select(TrainingSession).where(
-                                    and_(
-                                        TrainingSession.employee_id == member.id,
-                                        TrainingSession.status == "in_progress"
-                                    )
-                                )
-                            )
-                            active_session = session_result.scalar_one_or_none()
-                            if active_session:
-                                is_in_training = True
-                            else:
-                                # Fallback: Check if recently hired (within 30 minutes)
-                                hired_at = getattr(member, 'hired_at', None)
-                                if hired_at:
-                                    try:
-                                        if hasattr(hired_at, 'replace'):
-                                            if hired_at.tzinfo is not None:
-                                                hired_at_naive = hired_at.replace(tzinfo=None)
-                                            else:
-                                                hired_at_naive = hired_at
-                                        else:
-                                            hired_at_naive = hired_at
-                                        
-                                        time_since_hire = local_now() - hired_at_naive
-                                        if time_since_hire <= timedelta(minutes=30):
-                                            is_in_training = True
-                                    except Exception:
-                                        pass
-                    
-                    # Only assign tasks if not in training and doesn't have a task
-                    # FOCUS: Employees must complete their current task to 100% before getting a new one
-                    # IMPORTANT: Employees in training cannot be assigned tasks - they must complete training first!
-                    if not is_in_training and member.current_task_id is None and unassigned_list:
-                        # Take highest priority task (from project closest to 100% completion)
-                        task = unassigned_list[0]
-                        task.employee_id = member.id
-                        task.status = "in_progress"
-                        member.current_task_id = task.id
-                        unassigned_list.remove(task)
-                        assigned_count += 1
-                        
-                        # Update project activity and activate if in planning
-                        await project_manager.update_project_activity(task.project_id)
-                        result = await self.db.execute(
-                            select(Project).where(Project.id == task.project_id)
-                        )
-                        project = result.scalar_one_or_none()
-                        if project and project.status == "planning":
-                            project.status = "active"
-                
-                # Also assign tasks to employees outside this manager's department if they're idle
-                # IMPORTANT: Do NOT assign tasks to employees who are still in training
-                # This ensures all employees are working (except those in training)
-                if unassigned_list:
-                    result = await self.db.execute(
-                        select(Employee).where(
-                            Employee.status == "active",
-                            Employee.current_task_id.is_(None),
-                            Employee.id.notin_([m.id for m in team_members])
-                        )
-                    )
-                    other_idle_employees = result.scalars().all()
-                    
-                    for employee in other_idle_employees[:min(len(other_idle_employees), len(unassigned_list))]:
-                        # Skip employees who are in training
-                        is_in_training = False
-                        
-                        # Check if activity_state is "training"
-                        if hasattr(employee, 'activity_state') and employee.activity_state == "training":
-                            is_in_training = True
-                        
-                        # Check if they're in any training room (floors 1, 2, or 4)
-                        current_room = getattr(employee, 'current_room', None)
-                        if (current_room == ROOM_TRAINING_ROOM or 
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor2" or
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor4" or
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor4_2" or
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor4_3" or
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor4_4" or
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor4_5"):
-                            is_in_training = True
-                        
-                        # Check if they were hired recently (within last hour = still in training)
-                        hired_at = getattr(employee, 'hired_at', None)
-                        if hired_at:
-                            try:
-                                if hasattr(hired_at, 'replace'):
-                                    if hired_at.tzinfo is not None:
-                                        hired_at_naive = hired_at.replace(tzinfo=None)
-                                    else:
-                                        hired_at_naive = hired_at
-                                else:
-                                    hired_at_naive = hired_at
-                                
-                                time_since_hire = local_now() - hired_at_naive
-                                if time_since_hire <= timedelta(hours=1):
-                                    is_in_training = True
-                            except Exception:
-                                pass
-                        
-                        # Only assign tasks if not in training
-                        if not is_in_training and unassigned_list:
-                            # Prioritize tasks from projects near completion (already sorted by progress)
-                            task = unassigned_list[0]  # Take highest priority task (from project closest to 100%)
-                            task.employee_id = employee.id
-                            task.status = "in_progress"
-                            employee.current_task_id = task.id
-                            unassigned_list.remove(task)
-                            assigned_count += 1
-                            
-                            await project_manager.update_project_activity(task.project_id)
-                            result = await self.db.execute(
-                                select(Project).where(Project.id == task.project_id)
-                            )
-                            project = result.scalar_one_or_none()
-                            if project and project.status == "planning":
-                                project.status = "active"
-                
-                if assigned_count > 0:
-                    print(f"Manager {self.employee.name} assigned {assigned_count} task(s) to ensure workload")
-    
     async def _focus_on_business_operations(self, business_context: Dict):
         """Managers focus on business operations, profitability, and making everything work."""
         from business.financial_manager import FinancialManager
         from database.models import Activity
-        from sqlalchemy import select
         import random
         
         financial_manager = FinancialManager(self.db)
@@ -1050,9 +713,7 @@ class ManagerAgent(EmployeeAgent):
         project_count = len(active_projects)
         
         # Get employee count
-        result = await self.db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await self.db.execute(ACTIVE_EMPLOYEES)
         active_employees = result.scalars().all()
         employee_count = len(active_employees)
         
@@ -1120,9 +781,7 @@ class ManagerAgent(EmployeeAgent):
         active_projects = await project_manager.get_active_projects()
         project_count = len(active_projects)
         
-        result = await self.db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await self.db.execute(ACTIVE_EMPLOYEES)
         active_employees = result.scalars().all()
         employee_count = len(active_employees)
         
@@ -0,0 +1,208 @@
+"""
+Headless accelerated-time runner.
+
+Runs the office simulation without the API server or a real LLM, on a virtual
+clock that jumps straight to the next scheduled wake-up instead of waiting in
+real time. A simulated week takes minutes instead of a week, which makes it
+usable for regression checks, profiling and before/after comparisons.
+
+Usage (from the backend directory):
+    LLM_BACKEND=mock python -m engine.headless --days 7 --seed 42
+
+The mock LLM backend (llm/mock_backend.py) is installed automatically. The
+database from DATABASE_URL is used as-is and seeded if empty, so point it at a
+throwaway database.
+
+Known limitation: columns with server-side defaults (func.now()) are still
+stamped by the database's wall clock, not by the virtual clock.
+"""
+import argparse
+import asyncio
+import heapq
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Set, Tuple
+
+
+class VirtualClock:
+    """
+    Simulation clock that only advances when every task using it is asleep.
+
+    Tasks become participants the first time they call sleep(). As long as any
+    live participant is running (doing work, waiting on the database, ...) time
+    stands still; once all of them are sleeping, the clock jumps to the earliest
+    wake-up time and wakes every sleeper that is due. This keeps the relative
+    order of periodic loops the same as in real time while skipping the idle gaps.
+    """
+
+    def __init__(self, start: Optional[datetime] = None):
+        start = start or datetime.now(timezone.utc)
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        self._now = start.astimezone(timezone.utc)
+        self._sleepers: List[Tuple[datetime, int, asyncio.Future, asyncio.Task]] = []
+        self._seq = 0
+        self._participants: Set[asyncio.Task] = set()
+        self._sleeping: Set[asyncio.Task] = set()
+        self._advance_scheduled = False
+        self.advances = 0
+
+    def now(self) -> datetime:
+        """Current virtual time (timezone-aware, UTC)."""
+        return self._now
+
+    async def sleep(self, seconds: float, wake: Optional[asyncio.Event] = None) -> None:
+        """Suspend the calling task for the given amount of virtual time (or until wake is set)."""
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        if task not in self._participants:
+            self._participants.add(task)
+            task.add_done_callback(self._on_task_done)
+
+        future = loop.create_future()
+        wake_at = self._now + timedelta(seconds=max(0.0, float(seconds)))
+        heapq.heappush(self._sleepers, (wake_at, self._seq, future, task))
+        self._seq += 1
+        self._sleeping.add(task)
+        self._schedule_advance(loop)
+        # The waiter never sleeps on the clock, so it doesn't hold time still
+        waiter = loop.create_task(self._wake_on(wake, future, task)) if wake is not None else None
+        try:
+            await future
+        finally:
+            self._sleeping.discard(task)
+            if waiter is not None:
+                waiter.cancel()
+
+    async def _wake_on(self, wake: asyncio.Event, future: asyncio.Future, task: asyncio.Task):
+        await wake.wait()
+        # Resolved here rather than in a done callback, so it lands before an advance queued by whoever set wake
+        if not future.done():
+            self._sleeping.discard(task)
+            future.set_result(None)
+
+    def _on_task_done(self, task: asyncio.Task):
+        self._participants.discard(task)
+        self._sleeping.discard(task)
+        try:
+            self._schedule_advance(asyncio.get_running_loop())
+        except RuntimeError:
+            pass
+
+    def _schedule_advance(self, loop: asyncio.AbstractEventLoop):
+        if not self._advance_scheduled:
+            self._advance_scheduled = True
+            loop.call_soon(self._advance)
+
+    def _advance(self):
+        self._advance_scheduled = False
+        # Someone is still working - the next sleep() call will try again
+        if self._participants - self._sleeping:
+            return
+
+        # Drop sleepers that were cancelled
+        while self._sleepers and self._sleepers[0][2].done():
+            heapq.heappop(self._sleepers)
+        if not self._sleepers:
+            return
+
+        wake_at = self._sleepers[0][0]
+        if wake_at > self._now:
+            self._now = wake_at
+            self.advances += 1
+
+        while self._sleepers and self._sleepers[0][0] <= self._now:
+            _, _, future, task = heapq.heappop(self._sleepers)
+            if not future.done():
+                self._sleeping.discard(task)
+                future.set_result(None)
+
+
+async def run_headless(days: float, seed: int = 0, start: Optional[datetime] = None) -> dict:
+    """
+    Run the simulation for a span of virtual time as fast as possible.
+
+    Args:
+        days: Virtual days to simulate
+        seed: Seed for Python's RNG and the mock LLM backend
+        start: Virtual start time (defaults to the current time)
+
+    Returns:
+        Summary with virtual/real elapsed time and the number of ticks
+    """
+    from config import set_virtual_clock
+    from llm.ollama_client import use_mock_backend
+
+    random.seed(seed)
+    clock = VirtualClock(start)
+    set_virtual_clock(clock)
+    mock = use_mock_backend(seed)
+
+    from database.database import init_db, async_session_maker
+    from database.models import Employee
+    from engine.office_simulator import OfficeSimulator
+    from sqlalchemy import select
+
+    await init_db()
+    async with async_session_maker() as db:
+        result = await db.execute(select(Employee.id).limit(1))
+        has_employees = result.scalar_one_or_none() is not None
+    if not has_employees:
+        from seed import seed_database
+        await seed_database()
+
+    simulator = OfficeSimulator()
+    virtual_start = clock.now()
+    real_start = time.perf_counter()
+
+    sim_task = asyncio.create_task(simulator.run())
+    try:
+        await clock.sleep(days * 86400)
+    finally:
+        simulator.stop()
+        from business.shared_drive_sink import shared_drive_sink
+        await shared_drive_sink.flush()
+        pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        set_virtual_clock(None)
+
+    summary = {
+        "seed": seed,
+        "virtual_start": virtual_start.isoformat(),
+        "virtual_end": clock.now().isoformat(),
+        "virtual_seconds": (clock.now() - virtual_start).total_seconds(),
+        "real_seconds": round(time.perf_counter() - real_start, 2),
+        "ticks": simulator.tick_number,
+        "clock_advances": clock.advances,
+        "llm_requests": mock.request_count,
+    }
+    if summary["real_seconds"] > 0:
+        summary["speedup"] = round(summary["virtual_seconds"] / summary["real_seconds"], 1)
+    if sim_task.done() and not sim_task.cancelled() and sim_task.exception():
+        summary["error"] = repr(sim_task.exception())
+    return summary
+
+
+def _main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Run the office simulation headless on a virtual clock.")
+    parser.add_argument("--days", type=float, default=1.0, help="virtual days to simulate (default: 1)")
+    parser.add_argument("--seed", type=int, default=int(os.getenv("SIMULATION_SEED", "0")), help="RNG seed")
+    parser.add_argument("--start", type=str, default=None,
+                        help="virtual start time as ISO 8601 (default: now)")
+    args = parser.parse_args(argv)
+
+    start = datetime.fromisoformat(args.start) if args.start else None
+    summary = asyncio.run(run_headless(args.days, seed=args.seed, start=start))
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+    return 1 if "error" in summary else 0
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.exit(_main(sys.argv[1:]))
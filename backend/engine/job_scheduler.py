@@ -0,0 +1,279 @@
+"""
+Periodic job scheduler for the simulator's background work.
+
+OfficeSimulator.run() used to start a dozen independent
+"while self.running: ...; await sleep(N)" loops, each with its own start-up
+delay, error back-off and copy of the loop boilerplate, and no way to see what
+they were doing; some of their work was repeated inside the simulation tick.
+Every periodic job is now declared once with register():
+
+    job_scheduler.register("suggestions", self.process_suggestions, interval=3600)
+
+- interval: seconds between scheduled starts (fixed rate), or a callable
+  returning the seconds until the next run (e.g. "until midnight")
+- jitter: each interval is moved by a random amount in [-jitter, +jitter]
+- initial_delay / run_on_start: when the first run happens
+- retry_interval: delay before the next run after a run raised
+- max_concurrency / skip_if_running: a job whose runs are still busy when the
+  next one is due skips that slot (counted as skipped) instead of piling up;
+  with skip_if_running=False it waits and starts right after
+- deadline: runs longer than this (default: the interval) count as overruns
+
+Each job gets a worker task that sleeps on the simulation clock until the job
+is due, so headless runs skip ahead exactly as the old loops did. JOB_INTERVALS
+("name=seconds,...") overrides declared intervals and JOBS_DISABLED
+("name,...") turns jobs off without code changes. Per-job runs, failures,
+skips, overruns, start lag and durations are reported by stats() at
+GET /api/debug/jobs.
+"""
+import asyncio
+import os
+import random
+import traceback
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+
+from config import now as local_now, sleep as clock_sleep
+
+Interval = Union[float, Callable[[], float]]
+
+
+def parse_job_settings(value: str) -> Dict[str, float]:
+    """
+    Parse JOB_INTERVALS.
+
+    Args:
+        value: "name=seconds,name=seconds"
+
+    Returns:
+        {name: seconds}; malformed entries are ignored
+    """
+    settings = {}
+    for item in (value or "").split(","):
+        name, _, seconds = item.strip().partition("=")
+        if not name or not seconds:
+            continue
+        try:
+            settings[name.strip()] = float(seconds)
+        except ValueError:
+            print(f"Warning: ignoring invalid JOB_INTERVALS entry '{item.strip()}'")
+    return settings
+
+
+INTERVAL_OVERRIDES = parse_job_settings(os.getenv("JOB_INTERVALS", ""))
+DISABLED_JOBS = {name.strip() for name in os.getenv("JOBS_DISABLED", "").split(",") if name.strip()}
+
+
+class Job:
+    """One periodic job: its cadence and the statistics of its runs."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable],
+        interval: Interval,
+        jitter: float = 0.0,
+        initial_delay: float = 0.0,
+        run_on_start: bool = True,
+        retry_interval: Optional[float] = None,
+        max_concurrency: int = 1,
+        skip_if_running: bool = True,
+        deadline: Optional[float] = None,
+    ):
+        self.name = name
+        self.func = func
+        self.interval = INTERVAL_OVERRIDES.get(name, interval)
+        self.jitter = jitter
+        self.initial_delay = initial_delay
+        self.run_on_start = run_on_start
+        self.retry_interval = retry_interval
+        self.max_concurrency = max(1, max_concurrency)
+        self.skip_if_running = skip_if_running
+        self.deadline = deadline
+        self.enabled = name not in DISABLED_JOBS
+
+        self.running = 0
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.overruns = 0
+        self.last_error: Optional[str] = None
+        self.last_started: Optional[datetime] = None
+        self.last_duration: Optional[float] = None
+        self.max_duration = 0.0
+        self.total_duration = 0.0
+        self.last_lag: Optional[float] = None
+        self.max_lag = 0.0
+        self.next_run: Optional[datetime] = None
+        self._tasks: set = set()
+
+    def next_interval(self) -> float:
+        """Seconds until the next scheduled start, jitter included."""
+        base = self.interval() if callable(self.interval) else self.interval
+        if self.jitter:
+            base += random.uniform(-self.jitter, self.jitter)
+        return max(0.0, base)
+
+    def deadline_seconds(self) -> Optional[float]:
+        if self.deadline is not None:
+            return self.deadline
+        if callable(self.interval):
+            return None
+        return self.interval + self.jitter
+
+    async def run_once(self, due: datetime) -> bool:
+        """Run the job once and record its statistics. Returns False if it raised."""
+        started = local_now()
+        lag = max(0.0, (started - due).total_seconds())
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.last_started = started
+        self.running += 1
+        ok = True
+        try:
+            await self.func()
+        except Exception as e:
+            ok = False
+            self.failures += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"❌ [JOB {self.name}] {self.last_error}")
+            traceback.print_exc()
+        finally:
+            self.running -= 1
+            # Simulation-clock time, so headless runs report the durations the simulation saw
+            duration = (local_now() - started).total_seconds()
+            self.runs += 1
+            self.last_duration = duration
+            self.max_duration = max(self.max_duration, duration)
+            self.total_duration += duration
+            deadline = self.deadline_seconds()
+            if deadline is not None and duration > deadline:
+                self.overruns += 1
+                print(f"⚠️  [JOB {self.name}] run took {duration:.1f}s (deadline {deadline:.1f}s)")
+        return ok
+
+    def to_dict(self) -> Dict:
+        interval = None if callable(self.interval) else self.interval
+        return {
+            "name": self.name,
+            "enabled": self.enabled,
+            "interval_seconds": interval,
+            "jitter_seconds": self.jitter,
+            "max_concurrency": self.max_concurrency,
+            "skip_if_running": self.skip_if_running,
+            "deadline_seconds": self.deadline_seconds(),
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "overruns": self.overruns,
+            "last_error": self.last_error,
+            "last_started": self.last_started.isoformat() if self.last_started else None,
+            "next_run": self.next_run.isoformat() if self.next_run else None,
+            "last_duration_seconds": round(self.last_duration, 3) if self.last_duration is not None else None,
+            "avg_duration_seconds": round(self.total_duration / self.runs, 3) if self.runs else None,
+            "max_duration_seconds": round(self.max_duration, 3),
+            "last_start_lag_seconds": round(self.last_lag, 3) if self.last_lag is not None else None,
+            "max_start_lag_seconds": round(self.max_lag, 3),
+        }
+
+
+class JobScheduler:
+    """Registry of periodic jobs, each driven by its own worker task."""
+
+    def __init__(self):
+        self.jobs: Dict[str, Job] = {}
+        self._workers: List[asyncio.Task] = []
+        self.running = False
+
+    def register(self, name: str, func: Callable[[], Awaitable], interval: Interval, **options) -> Job:
+        """
+        Declare a periodic job (replaces an earlier job with the same name).
+
+        Args:
+            name: Unique job name (used by JOB_INTERVALS, JOBS_DISABLED and /api/debug/jobs)
+            func: Coroutine function run on every occurrence
+            interval: Seconds between starts, or a callable returning them
+            **options: jitter, initial_delay, run_on_start, retry_interval,
+                max_concurrency, skip_if_running, deadline (see Job)
+
+        Returns:
+            The registered job
+        """
+        job = Job(name, func, interval, **options)
+        self.jobs[name] = job
+        return job
+
+    def start(self):
+        """Start a worker for every enabled job (call from the simulator's event loop)."""
+        self.running = True
+        for job in self.jobs.values():
+            if job.enabled:
+                self._workers.append(asyncio.create_task(self._worker(job), name=f"job:{job.name}"))
+            else:
+                print(f"[i] Job '{job.name}' disabled by JOBS_DISABLED")
+
+    def stop(self):
+        """Stop scheduling; workers and the runs they started as separate tasks are cancelled."""
+        self.running = False
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        for job in self.jobs.values():
+            for task in job._tasks:
+                task.cancel()
+            job._tasks = set()
+
+    async def _worker(self, job: Job):
+        delay = job.initial_delay if job.run_on_start else job.initial_delay + job.next_interval()
+        due = local_now() + timedelta(seconds=delay)
+        while self.running:
+            job.next_run = due
+            wait = (due - local_now()).total_seconds()
+            if wait > 0:
+                await clock_sleep(wait)
+            if not self.running:
+                break
+
+            ok = await self._dispatch(job, due)
+
+            now = local_now()
+            if not ok and job.retry_interval is not None:
+                due = now + timedelta(seconds=job.retry_interval)
+                continue
+            if callable(job.interval):
+                due = now + timedelta(seconds=job.next_interval())
+                continue
+            due = due + timedelta(seconds=job.next_interval())
+            if due <= now:
+                if job.skip_if_running:
+                    # The run overran its slot(s): drop them instead of bursting to catch up
+                    while due <= now:
+                        job.skipped += 1
+                        due = due + timedelta(seconds=job.next_interval() or 1.0)
+                else:
+                    due = now
+
+    async def _dispatch(self, job: Job, due: datetime) -> bool:
+        """Run inline for single-concurrency jobs, otherwise start a run task if a slot is free."""
+        if job.max_concurrency == 1:
+            return await job.run_once(due)
+
+        job._tasks = {task for task in job._tasks if not task.done()}
+        if len(job._tasks) >= job.max_concurrency:
+            if job.skip_if_running:
+                job.skipped += 1
+                return True
+            await asyncio.wait(job._tasks, return_when=asyncio.FIRST_COMPLETED)
+        task = asyncio.create_task(job.run_once(due), name=f"job:{job.name}:run")
+        job._tasks.add(task)
+        return True
+
+    def stats(self) -> Dict:
+        return {
+            "running": self.running,
+            "jobs": [job.to_dict() for job in sorted(self.jobs.values(), key=lambda j: j.name)],
+        }
+
+
+job_scheduler = JobScheduler()
@@ -3,6 +3,7 @@
 import random
 import logging
 from typing import Optional
+from config import utcnow
 
 logger = logging.getLogger(__name__)
 from employees.room_assigner import (
@@ -100,15 +101,9 @@ async def get_room_occupancy(room_id: str, db_session) -> int:
     Returns:
         int: Number of employees currently in the room
     """
-    from database.models import Employee
-    from sqlalchemy import select, func
+    from database.hot_queries import ROOM_OCCUPANCY
     
-    result = await db_session.execute(
-        select(func.count(Employee.id)).where(
-            Employee.status == "active",
-            Employee.current_room == room_id
-        )
-    )
+    result = await db_session.execute(ROOM_OCCUPANCY, {"room_id": room_id})
     count = result.scalar() or 0
     return count
 
@@ -130,13 +125,9 @@ async def check_room_has_space(room_id: str, db_session, exclude_employee_id: in
     
     # If excluding an employee (they're leaving), reduce occupancy by 1
     if exclude_employee_id:
-        from database.models import Employee
-        from sqlalchemy import select
+        from database.hot_queries import EMPLOYEE_IN_ROOM
         result = await db_session.execute(
-            select(Employee).where(
-                Employee.id == exclude_employee_id,
-                Employee.current_room == room_id
-            )
+            EMPLOYEE_IN_ROOM, {"employee_id": exclude_employee_id, "room_id": room_id}
         )
         if result.scalar_one_or_none():
             occupancy = max(0, occupancy - 1)
@@ -244,34 +235,18 @@ async def determine_target_room(activity_type: str, activity_description: str, e
         # Balance conference room usage across all floors
         if db_session:
             try:
-                from database.models import Employee
-                from sqlalchemy import select, func
+                from database.hot_queries import ROOM_OCCUPANCY, ROOMS_OCCUPANCY
                 
                 # Count employees in conference room on floor 1
-                result = await db_session.execute(
-                    select(func.count(Employee.id)).where(
-                        Employee.status == "active",
-                        Employee.current_room == ROOM_CONFERENCE_ROOM
-                    )
-                )
+                result = await db_session.execute(ROOM_OCCUPANCY, {"room_id": ROOM_CONFERENCE_ROOM})
                 floor1_count = result.scalar() or 0
                 
                 # Count employees in conference room on floor 2
-                result = await db_session.execute(
-                    select(func.count(Employee.id)).where(
-                        Employee.status == "active",
-                        Employee.current_room == f"{ROOM_CONFERENCE_ROOM}_floor2"
-                    )
-                )
+                result = await db_session.execute(ROOM_OCCUPANCY, {"room_id": f"{ROOM_CONFERENCE_ROOM}_floor2"})
                 floor2_count = result.scalar() or 0
                 
                 # Count employees in huddle or war room on floor 3
-                result = await db_session.execute(
-                    select(func.count(Employee.id)).where(
-                        Employee.status == "active",
-                        Employee.current_room.in_([f"{ROOM_HUDDLE}_floor3", f"{ROOM_WAR_ROOM}_floor3"])
-                    )
-                )
+                result = await db_session.execute(ROOMS_OCCUPANCY, {"room_ids": [f"{ROOM_HUDDLE}_floor3", f"{ROOM_WAR_ROOM}_floor3"]})
                 floor3_count = result.scalar() or 0
                 
                 # Assign to floor with fewer people
@@ -444,25 +419,14 @@ async def determine_target_room(activity_type: str, activity_description: str, e
             # Balance conference room usage across floors
             if db_session:
                 try:
-                    from database.models import Employee
-                    from sqlalchemy import select, func
+                    from database.hot_queries import ROOM_OCCUPANCY
                     
                     # Count employees in conference room on floor 1
-                    result = await db_session.execute(
-                        select(func.count(Employee.id)).where(
-                            Employee.status == "active",
-                            Employee.current_room == ROOM_CONFERENCE_ROOM
-                        )
-                    )
+                    result = await db_session.execute(ROOM_OCCUPANCY, {"room_id": ROOM_CONFERENCE_ROOM})
                     floor1_count = result.scalar() or 0
                     
                     # Count employees in conference room on floor 2
-                    result = await db_session.execute(
-                        select(func.count(Employee.id)).where(
-                            Employee.status == "active",
-                            Employee.current_room == f"{ROOM_CONFERENCE_ROOM}_floor2"
-                        )
-                    )
+                    result = await db_session.execute(ROOM_OCCUPANCY, {"room_id": f"{ROOM_CONFERENCE_ROOM}_floor2"})
                     floor2_count = result.scalar() or 0
                     
                     # Assign to floor with fewer people
@@ -1292,7 +1256,7 @@ async def process_employee_movement(employee, activity_type: str, activity_descr
     """
     # Check if employee has been in training room too long (more than 30 minutes - training limit)
     from employees.room_assigner import ROOM_TRAINING_ROOM
-    from datetime import datetime, timedelta
+    from datetime import timedelta
     current_room = getattr(employee, 'current_room', None)
     is_in_training_room = (current_room == ROOM_TRAINING_ROOM or 
                            current_room == f"{ROOM_TRAINING_ROOM}_floor2" or
@@ -1327,10 +1291,10 @@ async def process_employee_movement(employee, activity_type: str, activity_descr
         if training_session and training_session.start_time:
             # Check session duration
             start_time_naive = training_session.start_time.replace(tzinfo=None) if training_session.start_time.tzinfo else training_session.start_time
-            time_in_training = datetime.utcnow() - start_time_naive
+            time_in_training = utcnow() - start_time_naive
             if time_in_training > timedelta(minutes=30):
                 # Training exceeded 30 minutes - end session and move employee out
-                training_session.end_time = datetime.utcnow()
+                training_session.end_time = utcnow()
                 training_session.status = "completed"
                 duration = training_session.end_time - start_time_naive
                 training_session.duration_minutes = int(duration.total_seconds() / 60)
@@ -1368,7 +1332,7 @@ async def process_employee_movement(employee, activity_type: str, activity_descr
                 else:
                     hired_at_naive = hired_at
                 
-                time_since_hire = datetime.utcnow() - hired_at_naive
+                time_since_hire = utcnow() - hired_at_naive
                 # If hired more than 30 minutes ago and still in training room, move them out
                 # (Training should never last more than 30 minutes)
                 if time_since_hire > timedelta(minutes=30):
@@ -1406,7 +1370,7 @@ async def process_employee_movement(employee, activity_type: str, activity_descr
         hired_at = getattr(employee, 'hired_at', None)
         if hired_at:
             try:
-                from datetime import datetime, timedelta
+                from datetime import timedelta
                 if hasattr(hired_at, 'replace'):
                     if hired_at.tzinfo is not None:
                         hired_at_naive = hired_at.replace(tzinfo=None)
@@ -1415,7 +1379,7 @@ async def process_employee_movement(employee, activity_type: str, activity_descr
                 else:
                     hired_at_naive = hired_at
                 
-                time_since_hire = datetime.utcnow() - hired_at_naive
+                time_since_hire = utcnow() - hired_at_naive
                 if time_since_hire > timedelta(hours=1):
                     # Training complete - move to home room and start working
                     employee.activity_state = "working"
@@ -1539,7 +1503,7 @@ async def process_employee_movement(employee, activity_type: str, activity_descr
                 hired_at = getattr(employee, 'hired_at', None)
                 if hired_at:
                     try:
-                        from datetime import datetime, timedelta
+                        from datetime import timedelta
                         if hasattr(hired_at, 'replace'):
                             if hired_at.tzinfo is not None:
                                 hired_at_naive = hired_at.replace(tzinfo=None)
@@ -1548,7 +1512,7 @@ async def process_employee_movement(employee, activity_type: str, activity_descr
                         else:
                             hired_at_naive = hired_at
                         
-                        time_since_hire = datetime.utcnow() - hired_at_naive
+                        time_since_hire = utcnow() - hired_at_naive
                         if time_since_hire > timedelta(hours=1):
                             # Training complete - move to home room and start working
                             employee.activity_state = "working"
@@ -1978,8 +1942,7 @@ async def enforce_room_capacity(db_session) -> dict:
     Returns:
         dict: Statistics about the fix operation
     """
-    from database.models import Employee
-    from sqlalchemy import select, func
+    from database.hot_queries import OCCUPANCY_BY_ROOM, EMPLOYEES_IN_ROOM
     import random
     
     stats = {
@@ -1989,11 +1952,7 @@ async def enforce_room_capacity(db_session) -> dict:
     }
     
     # Get all unique rooms that have employees
-    result = await db_session.execute(
-        select(Employee.current_room, func.count(Employee.id).label('count'))
-        .where(Employee.status == "active", Employee.current_room.isnot(None))
-        .group_by(Employee.current_room)
-    )
+    result = await db_session.execute(OCCUPANCY_BY_ROOM)
     room_occupancies = result.all()
     
     # Check each room for over-capacity
@@ -2020,12 +1979,7 @@ async def enforce_room_capacity(db_session) -> dict:
         over_by = room_info["over_by"]
         
         # Get all employees in this over-capacity room
-        result = await db_session.execute(
-            select(Employee).where(
-                Employee.status == "active",
-                Employee.current_room == room_id
-            )
-        )
+        result = await db_session.execute(EMPLOYEES_IN_ROOM, {"room_id": room_id})
         employees_in_room = result.scalars().all()
         
         # Shuffle to randomly select who gets moved
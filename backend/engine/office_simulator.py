@@ -1,20 +1,29 @@
 import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_
-from database.models import Employee, Activity, BusinessMetric, Financial, EmployeeReview, Project
+from database.models import Employee, Activity, BusinessMetric, Financial
+from database.hot_queries import ACTIVE_EMPLOYEES, OPEN_PROJECTS, COMPLETED_PROJECTS, EMPLOYEE_BY_ID
 from sqlalchemy import select
 from database.database import async_session_maker
+from database.employee_summaries import record_termination
 from employees.roles import create_employee_agent
 from employees.room_assigner import assign_home_room, assign_rooms_to_existing_employees
 from engine.movement_system import process_employee_movement
 from llm.ollama_client import OllamaClient
+from business.name_service import name_service
 from business.financial_manager import FinancialManager
 from business.project_manager import ProjectManager
 from business.goal_system import GoalSystem
+from business.task_dispatcher import task_dispatcher
+from business.dashboard_read_model import dashboard_read_model
+from business.meeting_scheduler import meeting_scheduler
+from engine.job_scheduler import job_scheduler
 from typing import Set
-from datetime import datetime, timedelta
+from datetime import timedelta
 import random
-from config import now as local_now, get_midnight_tomorrow
+from config import now as local_now, now_naive, get_midnight_tomorrow, sleep as clock_sleep
+from database.query_stats import query_unit
+from database.admission import set_db_subsystem
 import logging
 
 # Set up logger for this module
@@ -54,7 +63,6 @@ class OfficeSimulator:
         self.boardroom_discussion_counter = 0  # Counter for boardroom discussions (every 15 ticks = 2 minutes)
         self.meeting_generation_counter = 0  # Counter for meeting generation (every 450 ticks = 1 hour)
         self.last_meeting_check_date = None  # Track the last date we checked for meetings
-        self.award_update_counter = 0  # Counter for award updates (every 30 ticks = 4 minutes)
         self.quick_wins_counter = 0  # Counter for quick wins features
         self.last_weather_date = None  # Track last weather update date
         self.last_birthday_meeting_generation = None  # Track last birthday meeting generation date
@@ -62,6 +70,10 @@ class OfficeSimulator:
         self.last_holiday_check_date = None  # Track last holiday check date
         self.shared_drive_update_counter = 0  # Counter for shared drive updates
         self.last_shared_drive_update = None  # Track last shared drive update time
+        self.customer_reviews_generated = False  # First customer review run covers all completed projects
+        self.shared_drive_updated = False  # First shared drive run creates initial documents
+        self.tick_number = 0  # Number of simulation ticks run since start
+        self.journal = None  # SimulationJournal when SIMULATION_JOURNAL is set
     
     async def add_websocket(self, websocket):
         """Add a WebSocket connection for real-time updates."""
@@ -184,7 +196,6 @@ class OfficeSimulator:
                     determine_target_room
                 )
                 from employees.room_assigner import ROOM_TRAINING_ROOM, ROOM_CUBICLES, ROOM_OPEN_OFFICE
-                from datetime import datetime, timedelta
                 
                 # Get ALL waiting employees - process them all immediately
                 result = await db.execute(
@@ -375,7 +386,6 @@ class OfficeSimulator:
             from employees.room_assigner import ROOM_TRAINING_ROOM
             from sqlalchemy import select, and_
             from database.models import Employee, TrainingSession
-            from datetime import datetime, timedelta
             from engine.movement_system import update_employee_location
             
             training_manager = TrainingManager()
@@ -414,10 +424,10 @@ class OfficeSimulator:
                 # Check if employee has been in training room for more than 30 minutes
                 should_move_out = False
                 if existing_session and existing_session.start_time:
-                    time_in_training = datetime.now() - existing_session.start_time
+                    time_in_training = now_naive() - existing_session.start_time
                     if time_in_training > timedelta(minutes=30):
                         # Training session exceeded 30 minutes - end it and move employee out
-                        existing_session.end_time = datetime.now()
+                        existing_session.end_time = now_naive()
                         existing_session.status = "completed"
                         duration = existing_session.end_time - existing_session.start_time
                         existing_session.duration_minutes = int(duration.total_seconds() / 60)
@@ -438,7 +448,7 @@ class OfficeSimulator:
                             print(f"Error creating training session for {employee.name}: {e}")
                             # If we can't create a session, check hired_at as fallback
                             if hasattr(employee, 'hired_at') and employee.hired_at:
-                                time_since_hire = datetime.now() - employee.hired_at.replace(tzinfo=None) if employee.hired_at.tzinfo else datetime.now() - employee.hired_at
+                                time_since_hire = now_naive() - employee.hired_at.replace(tzinfo=None)
                                 if time_since_hire > timedelta(minutes=30):
                                     should_move_out = True
                 
@@ -467,15 +477,11 @@ class OfficeSimulator:
     async def update_employee_locations_based_on_time(self):
         """Update employee locations based on current time (7pm-7am home, 7am-7pm office)."""
         from config import is_work_hours, should_be_at_home
-        from database.models import Employee
-        from sqlalchemy import select
 
         try:
             async with async_session_maker() as db:
                 # Get all active employees
-                result = await db.execute(
-                    select(Employee).where(Employee.status == "active")
-                )
+                result = await db.execute(ACTIVE_EMPLOYEES)
                 employees = result.scalars().all()
 
                 if should_be_at_home():
@@ -562,7 +568,8 @@ class OfficeSimulator:
         try:
             async with async_session_maker() as capacity_db:
                 from engine.movement_system import enforce_room_capacity
-                capacity_stats = await enforce_room_capacity(capacity_db)
+                with query_unit("tick.enforce_room_capacity"):
+                    capacity_stats = await enforce_room_capacity(capacity_db)
                 if capacity_stats["employees_redistributed"] > 0:
                     await capacity_db.commit()
                     logger.warning(f"🔧 Capacity enforcement: Fixed {capacity_stats['over_capacity_rooms']} over-capacity rooms, redistributed {capacity_stats['employees_redistributed']} employees")
@@ -586,59 +593,6 @@ class OfficeSimulator:
         except Exception as e:
             logger.error(f"[-] Error in system-level break enforcement: {e}", exc_info=True)
         
-        # Conduct periodic reviews every tick to ensure reviews happen promptly
-        # This ensures we catch reviews as soon as they're due
-        try:
-            async with async_session_maker() as review_db:
-                from business.review_manager import ReviewManager
-                review_manager = ReviewManager(review_db)
-                reviews_created = await review_manager.conduct_periodic_reviews(hours_since_last_review=6.0)
-                # Commit is handled inside conduct_periodic_reviews, but ensure session stays open
-                if reviews_created:
-                    print(f"[+] Conducted {len(reviews_created)} employee performance reviews")
-                    # Verify reviews are in the database by querying them
-                    for review in reviews_created:
-                        # Query back to verify persistence
-                        verify_result = await review_db.execute(
-                            select(EmployeeReview).where(EmployeeReview.id == review.id)
-                        )
-                        verified = verify_result.scalar_one_or_none()
-                        if verified:
-                            # Get employee and manager names for logging
-                            emp_result = await review_db.execute(
-                                select(Employee).where(Employee.id == review.employee_id)
-                            )
-                            emp = emp_result.scalar_one_or_none()
-                            mgr_result = await review_db.execute(
-                                select(Employee).where(Employee.id == review.manager_id)
-                            )
-                            mgr = mgr_result.scalar_one_or_none()
-                            if emp and mgr:
-                                print(f"   [*] {mgr.name} reviewed {emp.name} - Rating: {review.overall_rating}/5.0 (Review ID: {review.id})")
-                        else:
-                            print(f"   [!] WARNING: Review {review.id} not found after commit!")
-        except Exception as e:
-            import traceback
-            print(f"[-] Error conducting periodic reviews: {e}")
-            print(f"Traceback: {traceback.format_exc()}")
-        
-        # Update performance award periodically (every 4 minutes = 30 ticks)
-        self.award_update_counter += 1
-        if self.award_update_counter >= 30:  # 30 * 8 seconds = 240 seconds = 4 minutes
-            self.award_update_counter = 0
-            try:
-                async with async_session_maker() as award_db:
-                    from business.review_manager import ReviewManager
-                    review_manager = ReviewManager(award_db)
-                    print("[AWARD] Running performance award update from simulation tick...")
-                    await review_manager._update_performance_award()
-                    await award_db.commit()
-                    print("[AWARD] Award update from simulation tick completed!")
-            except Exception as e:
-                import traceback
-                print(f"[-] [AWARD] Error updating award in simulation tick: {e}")
-                print(f"Traceback: {traceback.format_exc()}")
-        
         # Generate boardroom discussions every 2 minutes (120 seconds)
         # Check every tick (8 seconds), so every 15 ticks = 2 minutes
         self.boardroom_discussion_counter += 1
@@ -657,7 +611,7 @@ class OfficeSimulator:
                 print(f"Traceback: {traceback.format_exc()}")
         
         # Customer reviews are now handled by a dedicated background task (runs immediately, then every 30 minutes)
-        # See generate_customer_reviews_periodically() method
+        # See the customer_reviews job (generate_customer_reviews())
         
         # Quick Wins Features Integration
         self.quick_wins_counter += 1
@@ -844,24 +798,14 @@ class OfficeSimulator:
                 print(f"❌ Error generating meetings: {e}")
                 print(f"Traceback: {traceback.format_exc()}")
         
-        # Update meeting statuses every tick (check for in_progress and completed)
-        # This MUST run every tick to keep meetings active
-        try:
-            async with async_session_maker() as meeting_status_db:
-                from business.meeting_manager import MeetingManager
-                meeting_manager = MeetingManager(meeting_status_db)
-                await meeting_manager.update_meeting_status()
-        except Exception as e:
-            # Log errors but don't crash - but make them visible
-            print(f"❌ CRITICAL: Error updating meeting status: {e}")
-            import traceback
-            traceback.print_exc()
+        # Meeting start/end transitions are fired by meeting_scheduler (started in run()),
+        # live meeting content by the meeting_live_content job
         
         # Use a separate session to get employee list (read-only)
         async with async_session_maker() as read_db:
             try:
                 # Get all active employees
-                result = await read_db.execute(select(Employee).where(Employee.status == "active"))
+                result = await read_db.execute(ACTIVE_EMPLOYEES)
                 employees = result.scalars().all()
                 
                 if not employees:
@@ -880,7 +824,7 @@ class OfficeSimulator:
                     async with async_session_maker() as db:
                         try:
                             # Get fresh employee instance in this session
-                            result = await db.execute(select(Employee).where(Employee.id == employee.id))
+                            result = await db.execute(EMPLOYEE_BY_ID, {"employee_id": employee.id})
                             employee_instance = result.scalar_one()
                             
                             # Create employee agent with this session
@@ -1079,15 +1023,14 @@ class OfficeSimulator:
                                 print(f"Error checking project completion: {e}")
                                 await completion_check_db.rollback()
                         
-                        # Ensure projects and tasks are actively being worked on (50% chance per tick)
-                        if random.random() < 0.5:  # 50% chance per tick
-                            async with async_session_maker() as activity_db:
-                                try:
-                                    await self._ensure_active_work(activity_db)
-                                    await activity_db.commit()
-                                except Exception as e:
-                                    print(f"Error ensuring active work: {e}")
-                                    await activity_db.rollback()
+                        # Match unassigned tasks to idle employees (once per tick, for the whole office)
+                        async with async_session_maker() as dispatch_db:
+                            try:
+                                await task_dispatcher.dispatch(dispatch_db)
+                                await dispatch_db.commit()
+                            except Exception as e:
+                                print(f"Error dispatching tasks: {e}")
+                                await dispatch_db.rollback()
                 
             except Exception as e:
                 print(f"Error in simulation tick: {e}")
@@ -1096,17 +1039,15 @@ class OfficeSimulator:
     
     async def _generate_revenue_from_active_projects(self, db: AsyncSession):
         """Generate revenue from active projects as they progress."""
-        from database.models import Project, Task
-        from sqlalchemy import select, func
+        from database.models import Task
+        from sqlalchemy import func
         from business.project_manager import ProjectManager
         
         project_manager = ProjectManager(db)
         financial_manager = FinancialManager(db)
         
         # Get active projects with progress
-        result = await db.execute(
-            select(Project).where(Project.status.in_(["active", "planning"]))
-        )
+        result = await db.execute(OPEN_PROJECTS)
         projects = result.scalars().all()
         
         for project in projects:
@@ -1135,12 +1076,8 @@ class OfficeSimulator:
     
     async def _generate_revenue_from_projects(self, db: AsyncSession):
         """Generate final revenue from completed projects."""
-        from database.models import Project
-        from sqlalchemy import select
         
-        result = await db.execute(
-            select(Project).where(Project.status == "completed")
-        )
+        result = await db.execute(COMPLETED_PROJECTS)
         projects = result.scalars().all()
         
         financial_manager = FinancialManager(db)
@@ -1162,12 +1099,9 @@ class OfficeSimulator:
     
     async def _generate_regular_expenses(self, db: AsyncSession):
         """Generate regular business expenses (salaries, overhead, etc.)."""
-        from database.models import Employee
         from sqlalchemy import select
         
-        result = await db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await db.execute(ACTIVE_EMPLOYEES)
         employees = result.scalars().all()
         
         if employees:
@@ -1227,7 +1161,6 @@ class OfficeSimulator:
         """Manage employee hiring and firing based on business performance."""
         from database.models import Employee, Activity
         from sqlalchemy import select
-        from datetime import datetime
         from business.financial_manager import FinancialManager
         from config import now, is_work_hours
         
@@ -1236,9 +1169,7 @@ class OfficeSimulator:
         revenue = await financial_manager.get_total_revenue()
         
         # Get active employees
-        result = await db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await db.execute(ACTIVE_EMPLOYEES)
         active_employees = result.scalars().all()
         active_count = len(active_employees)
         
@@ -1277,7 +1208,7 @@ class OfficeSimulator:
                         fired_this_tick = True
                         active_count -= 1
                         # Re-fetch active employees after firing
-                        result = await db.execute(select(Employee).where(Employee.status == "active"))
+                        result = await db.execute(ACTIVE_EMPLOYEES)
                         active_employees = result.scalars().all()
             
             # Priority 2: Check for restructuring needs (overstaffing, department changes, etc.)
@@ -1291,7 +1222,7 @@ class OfficeSimulator:
                         await self._fire_employee_for_restructuring(db, active_employees, restructuring_reason)
                         fired_this_tick = True
                         # Re-fetch active count after firing
-                        result = await db.execute(select(Employee).where(Employee.status == "active"))
+                        result = await db.execute(ACTIVE_EMPLOYEES)
                         active_employees_after = result.scalars().all()
                         active_count = len(active_employees_after)
             
@@ -1314,7 +1245,7 @@ class OfficeSimulator:
                     await self._fire_employee(db, active_employees)
                     fired_this_tick = True
                     # Re-fetch active count after firing
-                    result = await db.execute(select(Employee).where(Employee.status == "active"))
+                    result = await db.execute(ACTIVE_EMPLOYEES)
                     active_employees_after = result.scalars().all()
                     active_count = len(active_employees_after)
         elif not is_work_time and active_count > MIN_EMPLOYEES:
@@ -1361,7 +1292,7 @@ class OfficeSimulator:
             
             # Priority 3: Project-based hiring (if we have many projects/tasks, hire to support them)
             if active_count >= MIN_EMPLOYEES:
-                from database.models import Task, Project
+                from database.models import Task
                 from business.project_manager import ProjectManager
                 
                 project_manager = ProjectManager(db)
@@ -1710,7 +1641,7 @@ class OfficeSimulator:
                     traceback.print_exc()
         
         # Final summary - get updated count
-        result = await db.execute(select(Employee).where(Employee.status == "active"))
+        result = await db.execute(ACTIVE_EMPLOYEES)
         final_active_employees = result.scalars().all()
         final_count = len(final_active_employees)
         
@@ -1723,26 +1654,17 @@ class OfficeSimulator:
         """Hire a new employee."""
         try:
             from database.models import Employee, Activity
-            from datetime import datetime
             import random
             
             departments = ["Engineering", "Product", "Marketing", "Sales", "Operations", "IT", "Administration", "HR", "Design"]
             roles = ["Employee", "Manager"]
             
-            # Get existing employee names to avoid duplicates
-            result = await db.execute(select(Employee.name))
-            existing_names = [row[0] for row in result.all()]
-            
-            # Generate unique employee name using AI
             role = random.choice(roles)
             department = random.choice(departments)
             hierarchy_level = 2 if role in ["Manager", "CTO", "COO", "CFO"] else 3
             
-            name = await self.llm_client.generate_unique_employee_name(
-                existing_names=existing_names,
-                department=department,
-                role=role
-            )
+            # Unique name from the name service (pre-generated pool or combinatorial fallback)
+            name = await name_service.next_name(db, department=department, role=role)
             
             titles_by_role = {
                 "Employee": [
@@ -1963,21 +1885,12 @@ class OfficeSimulator:
                                      department: str = None, title: str = None, role: str = "Employee"):
         """Hire a specific type of employee (e.g., IT, Reception)."""
         from database.models import Employee, Activity
-        from datetime import datetime
         import random
         
-        # Get existing employee names to avoid duplicates
-        result = await db.execute(select(Employee.name))
-        existing_names = [row[0] for row in result.all()]
-        
         hierarchy_level = 2 if role in ["Manager", "CTO", "COO", "CFO"] else 3
         
-        # Generate unique employee name using AI
-        name = await self.llm_client.generate_unique_employee_name(
-            existing_names=existing_names,
-            department=department,
-            role=role
-        )
+        # Unique name from the name service (pre-generated pool or combinatorial fallback)
+        name = await name_service.next_name(db, department=department, role=role)
         
         # Determine title and department based on parameters
         if title:
@@ -2178,7 +2091,6 @@ class OfficeSimulator:
     async def _fire_employee(self, db: AsyncSession, active_employees: list):
         """Fire an underperforming employee (not CEO, not last IT/Reception)."""
         from database.models import Activity
-        from datetime import datetime
         from sqlalchemy import select
         
         # Don't fire CEO, and prefer firing regular employees over managers
@@ -2321,6 +2233,7 @@ class OfficeSimulator:
             }
         )
         db.add(activity)
+        await record_termination(db, employee_to_fire.id, termination_reason)
         
         # Create notification for employee termination
         from database.models import Notification
@@ -2407,7 +2320,6 @@ class OfficeSimulator:
         Fire an employee specifically for consistently bad performance reviews.
         """
         from database.models import Activity, Notification
-        from datetime import datetime
         from business.review_manager import ReviewManager
         
         review_manager = ReviewManager(db)
@@ -2436,6 +2348,7 @@ class OfficeSimulator:
             }
         )
         db.add(activity)
+        await record_termination(db, employee.id, termination_reason)
         
         # Create notification
         notification = Notification(
@@ -2455,8 +2368,6 @@ class OfficeSimulator:
         Fire an employee specifically for restructuring reasons.
         """
         from database.models import Activity, Notification
-        from datetime import datetime
-        from sqlalchemy import select
         
         # Don't fire CEO or C-level executives
         candidates = [e for e in active_employees if e.role not in ["CEO", "CTO", "COO", "CFO"]]
@@ -2495,6 +2406,7 @@ class OfficeSimulator:
             }
         )
         db.add(activity)
+        await record_termination(db, employee_to_fire.id, termination_reason)
         
         # Create notification
         notification = Notification(
@@ -2569,9 +2481,8 @@ class OfficeSimulator:
     async def _handle_completed_projects(self, db: AsyncSession):
         """Monitor for completed projects and ensure new ones are created to maintain growth."""
         from business.project_manager import ProjectManager
-        from database.models import Project, Activity, Employee
+        from database.models import Project, Activity
         from sqlalchemy import select
-        from datetime import datetime, timedelta
         
         project_manager = ProjectManager(db)
         
@@ -2593,9 +2504,7 @@ class OfficeSimulator:
         active_count = len(active_projects)
         
         # Get employee count
-        result = await db.execute(
-            select(Employee).where(Employee.status == "active")
-        )
+        result = await db.execute(ACTIVE_EMPLOYEES)
         active_employees = result.scalars().all()
         employee_count = len(active_employees)
         max_projects = max(1, int(employee_count / 3))
@@ -2687,7 +2596,6 @@ class OfficeSimulator:
     async def _check_and_complete_projects(self, db: AsyncSession):
         """Check all active projects and mark those at 100% as completed."""
         from business.project_manager import ProjectManager
-        from database.models import Project
         
         project_manager = ProjectManager(db)
         
@@ -2715,264 +2623,6 @@ class OfficeSimulator:
         if completed_count > 0:
             print(f"✅ Completed {completed_count} project(s) that reached completion criteria")
     
-    async def _ensure_active_work(self, db: AsyncSession):
-        """Ensure projects and tasks are actively being worked on."""
-        from business.project_manager import ProjectManager
-        from database.models import Project, Task, Employee, Activity
-        from sqlalchemy import select
-        from datetime import datetime, timedelta
-        
-        project_manager = ProjectManager(db)
-        
-        # Get active projects
-        active_projects = await project_manager.get_active_projects()
-        
-        if not active_projects:
-            return
-        
-        # Check for stalled projects (no activity in last 24 hours)
-        now = local_now()
-        cutoff_time = now - timedelta(hours=24)
-        
-        stalled_projects = []
-        for project in active_projects:
-            # Check if project has recent activity
-            if hasattr(project, 'last_activity_at') and project.last_activity_at:
-                from config import utc_to_local
-                from datetime import timezone as tz
-                last_activity = project.last_activity_at
-                # Normalize to timezone-aware datetime
-                if last_activity.tzinfo is None:
-                    # If naive, assume it's UTC and convert to local timezone
-                    last_activity = utc_to_local(last_activity.replace(tzinfo=tz.utc))
-                else:
-                    # If already timezone-aware, convert to local timezone
-                    last_activity = utc_to_local(last_activity)
-                
-                if (now - last_activity) > timedelta(hours=24):
-                    stalled_projects.append(project)
-            else:
-                # No activity timestamp - check if project has tasks
-                result = await db.execute(
-                    select(Task).where(Task.project_id == project.id)
-                )
-                tasks = result.scalars().all()
-                if tasks:
-                    # Has tasks but no activity - might be stalled
-                    stalled_projects.append(project)
-        
-        # For stalled projects, ensure tasks are assigned and being worked on
-        for project in stalled_projects:
-            # Get tasks for this project
-            result = await db.execute(
-                select(Task).where(
-                    Task.project_id == project.id,
-                    Task.status.in_(["pending", "in_progress"])
-                )
-            )
-            project_tasks = result.scalars().all()
-            
-            if not project_tasks:
-                # No tasks - create some
-                task_descriptions = [
-                    f"Work on {project.name}",
-                    f"Continue development for {project.name}",
-                    f"Progress on {project.name}",
-                    f"Implementation for {project.name}",
-                    f"Testing for {project.name}"
-                ]
-                num_tasks = random.randint(2, 4)
-                for i in range(num_tasks):
-                    task = Task(
-                        employee_id=None,
-                        project_id=project.id,
-                        description=random.choice(task_descriptions),
-                        status="pending",
-                        priority=project.priority,
-                        progress=0.0
-                    )
-                    db.add(task)
-                await db.flush()
-                print(f"Created tasks for stalled project: {project.name}")
-            else:
-                # Check for unassigned tasks
-                unassigned_tasks = [t for t in project_tasks if t.employee_id is None]
-                
-                if unassigned_tasks:
-                    # Get available employees (not in training, not busy)
-                    result = await db.execute(
-                        select(Employee).where(
-                            Employee.status == "active",
-                            Employee.current_task_id.is_(None)
-                        )
-                    )
-                    available_employees = result.scalars().all()
-                    
-                    # Filter out employees in training
-                    from employees.room_assigner import ROOM_TRAINING_ROOM
-                    
-                    assignable_employees = []
-                    for emp in available_employees:
-                        is_in_training = False
-                        
-                        if hasattr(emp, 'activity_state') and emp.activity_state == "training":
-                            is_in_training = True
-                        
-                        current_room = getattr(emp, 'current_room', None)
-                        if (current_room == ROOM_TRAINING_ROOM or 
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor2" or
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor4" or
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor4_2" or
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor4_3" or
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor4_4" or
-                            current_room == f"{ROOM_TRAINING_ROOM}_floor4_5"):
-                            is_in_training = True
-                        
-                        hired_at = getattr(emp, 'hired_at', None)
-                        if hired_at:
-                            try:
-                                if hasattr(hired_at, 'replace'):
-                                    if hired_at.tzinfo is not None:
-                                        hired_at_naive = hired_at.replace(tzinfo=None)
-                                    else:
-                                        hired_at_naive = hired_at
-                                else:
-                                    hired_at_naive = hired_at
-                                
-                                time_since_hire = local_now() - hired_at_naive
-                                if time_since_hire <= timedelta(hours=1):
-                                    is_in_training = True
-                            except Exception:
-                                pass
-                        
-                        if not is_in_training:
-                            assignable_employees.append(emp)
-                    
-                    # PRIORITY: Sort tasks by: 1) Project priority (high > medium > low), 2) Revenue, 3) Progress
-                    # This ensures we focus on high-priority, high-revenue projects first
-                    task_priorities = []
-                    priority_weights = {"high": 3, "medium": 2, "low": 1}
-                    
-                    for task in unassigned_tasks:
-                        if task.project_id:
-                            # Fetch project to get priority and revenue
-                            result = await db.execute(
-                                select(Project).where(Project.id == task.project_id)
-                            )
-                            task_project = result.scalar_one_or_none()
-                            
-                            if task_project:
-                                project_progress = await project_manager.calculate_project_progress(task.project_id)
-                                priority_weight = priority_weights.get(task_project.priority, 1)
-                                revenue = task_project.revenue or 0.0
-                                
-                                # Calculate priority score: priority (0-3) * 1000 + revenue + progress
-                                # This ensures high-priority projects always come first, then by revenue, then by progress
-                                priority_score = (priority_weight * 1000) + (revenue / 1000) + project_progress
-                                task_priorities.append((task, priority_score, task_project.priority, revenue, project_progress))
-                            else:
-                                task_priorities.append((task, 0.0, "low", 0.0, 0.0))
-                        else:
-                            task_priorities.append((task, 0.0, "low", 0.0, 0.0))
-                    
-                    # Sort by priority score (descending) - high-priority, high-revenue projects get priority
-                    task_priorities.sort(key=lambda x: x[1], reverse=True)
-                    prioritized_tasks = [task for task, _, _, _, _ in task_priorities]
-                    
-                    # Assign tasks to available employees (prioritizing high-priority, high-revenue projects)
-                    assigned_count = 0
-                    for task in prioritized_tasks[:len(assignable_employees)]:
-                        if assignable_employees:
-                            employee = random.choice(assignable_employees)
-                            task.employee_id = employee.id
-                            task.status = "in_progress"
-                            employee.current_task_id = task.id
-                            assignable_employees.remove(employee)
-                            assigned_count += 1
-                            
-                            # Update project activity
-                            await project_manager.update_project_activity(project.id)
-                            
-                            # Activate project if in planning
-                            if project.status == "planning":
-                                project.status = "active"
-                    
-                    if assigned_count > 0:
-                        print(f"Assigned {assigned_count} task(s) to restart work on stalled project: {project.name}")
-                
-                # Update project activity even if tasks are assigned (to show it's being monitored)
-                await project_manager.update_project_activity(project.id)
-        
-        # Also check for tasks that haven't made progress in a while
-        result = await db.execute(
-            select(Task).where(
-                Task.status == "in_progress",
-                Task.employee_id.isnot(None)
-            )
-        )
-        in_progress_tasks = result.scalars().all()
-        
-        # Check for tasks with employees that might be stuck
-        stuck_tasks = []
-        for task in in_progress_tasks:
-            # If task has been in progress for more than 2 hours with no progress update
-            # (we can't easily track last progress update, so we'll check if progress is very low)
-            if task.progress is not None and task.progress < 10:
-                # Check if employee is actually working
-                result = await db.execute(
-                    select(Employee).where(Employee.id == task.employee_id)
-                )
-                employee = result.scalar_one_or_none()
-                
-                if employee and employee.current_task_id == task.id:
-                    # Employee has the task assigned - ensure they're working
-                    # Update project activity to show monitoring
-                    if task.project_id:
-                        await project_manager.update_project_activity(task.project_id)
-                else:
-                    # Task assigned but employee doesn't have it as current task - reassign
-                    stuck_tasks.append(task)
-        
-        # Reassign stuck tasks
-        if stuck_tasks:
-            result = await db.execute(
-                select(Employee).where(
-                    Employee.status == "active",
-                    Employee.current_task_id.is_(None)
-                )
-            )
-            available_employees = result.scalars().all()
-            
-            # Filter out training employees
-            from employees.room_assigner import ROOM_TRAINING_ROOM
-            assignable_employees = []
-            for emp in available_employees:
-                is_in_training = False
-                if hasattr(emp, 'activity_state') and emp.activity_state == "training":
-                    is_in_training = True
-                current_room = getattr(emp, 'current_room', None)
-                if (current_room == ROOM_TRAINING_ROOM or 
-                    current_room == f"{ROOM_TRAINING_ROOM}_floor2" or
-                    current_room == f"{ROOM_TRAINING_ROOM}_floor4"):
-                    is_in_training = True
-                if not is_in_training:
-                    assignable_employees.append(emp)
-            
-            reassigned_count = 0
-            for task in stuck_tasks[:len(assignable_employees)]:
-                if assignable_employees:
-                    employee = random.choice(assignable_employees)
-                    task.employee_id = employee.id
-                    employee.current_task_id = task.id
-                    assignable_employees.remove(employee)
-                    reassigned_count += 1
-                    
-                    if task.project_id:
-                        await project_manager.update_project_activity(task.project_id)
-            
-            if reassigned_count > 0:
-                print(f"Reassigned {reassigned_count} stuck task(s) to ensure work continues")
-    
     async def _generate_termination_reason(self, employee, business_context: dict) -> str:
         """Generate an AI-based termination reason for an employee."""
         try:
@@ -3008,7 +2658,7 @@ Generate a brief, professional termination reason (1-2 sentences) that:
 
 Return ONLY the termination reason text, nothing else."""
 
-            response = await self.llm_client.generate_response(prompt)
+            response = await self.llm_client.generate_response(prompt, kind="termination_reason")
             termination_reason = response.strip()
             
             # Fallback if AI doesn't return a good reason
@@ -3030,821 +2680,574 @@ Return ONLY the termination reason text, nothing else."""
                 return "Terminated due to budget constraints and cost-cutting measures."
             return f"Terminated due to performance issues in the {employee.department or 'department'}."
     
-    async def update_meetings_frequently(self):
-        """Background task to update meeting status and generate live content very frequently (every 2-3 seconds)."""
-        print("[*] Starting frequent meeting update background task...")
+    # --- Periodic jobs (registered with job_scheduler in run()) ---
+    
+    async def update_live_meetings(self):
+        """Generate live content for in-progress meetings."""
         from database.database import retry_on_lock
-        from sqlalchemy.exc import OperationalError
         
-        while self.running:
-            try:
-                async def update_meetings():
-                    async with async_session_maker() as meeting_db:
-                        from business.meeting_manager import MeetingManager
-                        meeting_manager = MeetingManager(meeting_db)
-                        await meeting_manager.update_meeting_status()
-                
-                # Use retry logic for database operations
-                await retry_on_lock(update_meetings, max_retries=3, initial_delay=1.0)
-                await asyncio.sleep(10)  # Update meetings every 10 seconds (slower pace, one message at a time)
-            except OperationalError as e:
-                if "database is locked" in str(e):
-                    print(f"❌ Meeting update failed after retries (database locked)")
-                    await asyncio.sleep(5)  # Wait longer before retrying
-                else:
-                    print(f"❌ Error in frequent meeting update: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    await asyncio.sleep(2)  # Wait a bit before retrying
-            except Exception as e:
-                print(f"❌ Error in frequent meeting update: {e}")
-                import traceback
-                traceback.print_exc()
-                await asyncio.sleep(2)  # Wait a bit before retrying
-    
-    async def update_performance_award_periodically(self):
-        """Background task to periodically update the performance award (every 5 minutes)."""
-        print("[*] Starting performance award update background task...")
-        # Run immediately on startup
-        try:
-            async with async_session_maker() as award_db:
-                from business.review_manager import ReviewManager
-                review_manager = ReviewManager(award_db)
-                print("[AWARD] Running initial performance award update on startup...")
-                await review_manager._update_performance_award()
-                await award_db.commit()
-                print("[AWARD] Initial award update completed!")
-        except Exception as e:
-            print(f"[-] [AWARD] Error in initial award update: {e}")
-            import traceback
-            traceback.print_exc()
+        async def update_meetings():
+            async with async_session_maker() as meeting_db:
+                from business.meeting_manager import MeetingManager
+                meeting_manager = MeetingManager(meeting_db)
+                await meeting_manager.update_live_meetings()
         
-        # Then run periodically every 5 minutes
-        while self.running:
-            try:
-                await asyncio.sleep(300)  # Wait 5 minutes (300 seconds)
-                if not self.running:
-                    break
-                    
-                async with async_session_maker() as award_db:
-                    from business.review_manager import ReviewManager
-                    review_manager = ReviewManager(award_db)
-                    print("[AWARD] Running periodic performance award update...")
-                    await review_manager._update_performance_award()
-                    await award_db.commit()
-                    print("[AWARD] Periodic award update completed!")
-            except Exception as e:
-                print(f"[-] [AWARD] Error in periodic award update: {e}")
-                import traceback
-                traceback.print_exc()
-                await asyncio.sleep(60)  # Wait 1 minute before retrying on error
+        # Use retry logic for database operations
+        await retry_on_lock(update_meetings, max_retries=3, initial_delay=1.0)
     
-    async def update_goals_daily(self):
-        """Background task to update business goals daily at midnight (00:00)."""
-        from datetime import datetime, time, timezone, timedelta
-        
-        print("[*] Starting daily goal update background task...")
-        
-        # Check immediately on startup
-        try:
-            async with async_session_maker() as goal_db:
-                from business.goal_system import GoalSystem
-                goal_system = GoalSystem(goal_db)
-                
-                # Check if goals need to be updated today
-                if await goal_system.should_update_goals_today():
-                    print("[*] Updating business goals on startup...")
-                    await goal_system.generate_daily_goals()
-                else:
-                    print("[i] Business goals are up to date")
-        except Exception as e:
-            print(f"❌ Error in initial goal update: {e}")
-            import traceback
-            traceback.print_exc()
-        
-        # Main loop: check daily at midnight
-        while self.running:
-            try:
-                # Calculate time until next midnight (tomorrow at 00:00:00) in configured timezone
-                now = local_now()
-                # Get tomorrow's midnight in local timezone
-                tomorrow_midnight = get_midnight_tomorrow()
-                seconds_until_midnight = (tomorrow_midnight - now).total_seconds()
-                
-                from config import get_timezone
-                tz_name = get_timezone().zone
-                print(f"[*] Next goal update scheduled for {tomorrow_midnight.strftime('%Y-%m-%d %H:%M:%S')} {tz_name} (in {seconds_until_midnight/3600:.1f} hours)")
-                
-                # Wait until midnight
-                await asyncio.sleep(seconds_until_midnight)
-                
-                # Update goals at midnight
-                if self.running:
-                    async with async_session_maker() as goal_db:
-                        from business.goal_system import GoalSystem
-                        goal_system = GoalSystem(goal_db)
-                        
-                        # Check if goals need to be updated (should be true at midnight)
-                        if await goal_system.should_update_goals_today():
-                            print("[*] Updating business goals for new day...")
-                            await goal_system.generate_daily_goals()
-                        else:
-                            print("[i] Goals already updated today")
-                            
-            except Exception as e:
-                print(f"❌ Error in daily goal update: {e}")
-                import traceback
-                traceback.print_exc()
-                # If error occurs, wait 1 hour before retrying
-                await asyncio.sleep(3600)
+    async def update_performance_award(self):
+        """Update the performance award."""
+        async with async_session_maker() as award_db:
+            from business.review_manager import ReviewManager
+            review_manager = ReviewManager(award_db)
+            print("[AWARD] Running performance award update...")
+            await review_manager._update_performance_award()
+            await award_db.commit()
+            print("[AWARD] Award update completed!")
     
-    async def conduct_employee_reviews_periodically(self):
-        """Background task to conduct employee reviews every 6 hours."""
-        print("[*] Starting employee review generation background task (runs immediately, then every 6 hours)...")
-        
-        # Run immediately on startup
-        first_run = True
-        
-        while self.running:
-            try:
-                async with async_session_maker() as review_db:
-                    from business.review_manager import ReviewManager
-                    review_manager = ReviewManager(review_db)
-                    
-                    print("[REVIEW] Running periodic employee review generation...")
-                    reviews_created = await review_manager.conduct_periodic_reviews(hours_since_last_review=6.0)
-                    
-                    if reviews_created:
-                        print(f"[+] [REVIEW] Conducted {len(reviews_created)} employee performance review(s)")
-                        # Log details for first few reviews
-                        for i, review in enumerate(reviews_created[:5]):
-                            try:
-                                emp_result = await review_db.execute(
-                                    select(Employee).where(Employee.id == review.employee_id)
-                                )
-                                emp = emp_result.scalar_one_or_none()
-                                mgr_result = await review_db.execute(
-                                    select(Employee).where(Employee.id == review.manager_id)
-                                )
-                                mgr = mgr_result.scalar_one_or_none()
-                                if emp and mgr:
-                                    print(f"   [*] {mgr.name} reviewed {emp.name} ({emp.role}) - Rating: {review.overall_rating}/5.0")
-                            except:
-                                pass
-                    else:
-                        if first_run:
-                            print("[i] [REVIEW] No reviews needed at this time (employees may not have been hired long enough)")
-            except Exception as e:
-                print(f"❌ [REVIEW] Error conducting employee reviews: {e}")
-                import traceback
-                traceback.print_exc()
-                await asyncio.sleep(60)  # Wait 1 minute before retrying on error
-                continue
+    async def repair_employee_summaries(self):
+        """Recompute the employee_summaries projection so it can't drift from reviews and firings for long."""
+        from database.employee_summaries import repair_employee_summaries
+        rows = await repair_employee_summaries()
+        print(f"[SUMMARIES] Employee summaries rebuilt ({rows} rows)")
+    
+    def seconds_until_midnight(self) -> float:
+        """Seconds until the next midnight in the configured timezone (cadence of the goals job)."""
+        from config import get_timezone
+        tomorrow_midnight = get_midnight_tomorrow()
+        seconds = (tomorrow_midnight - local_now()).total_seconds()
+        print(f"[*] Next goal update scheduled for {tomorrow_midnight.strftime('%Y-%m-%d %H:%M:%S')} {get_timezone().zone} (in {seconds/3600:.1f} hours)")
+        return seconds
+    
+    async def update_goals(self):
+        """Generate the day's business goals if they haven't been generated yet (startup and midnight)."""
+        async with async_session_maker() as goal_db:
+            from business.goal_system import GoalSystem
+            goal_system = GoalSystem(goal_db)
             
-            first_run = False
-            # Wait 6 hours (21600 seconds) before next review cycle
-            await asyncio.sleep(21600)
+            if await goal_system.should_update_goals_today():
+                print("[*] Updating business goals for the day...")
+                await goal_system.generate_daily_goals()
+            else:
+                print("[i] Business goals are up to date")
     
-    async def generate_customer_reviews_periodically(self):
-        """Background task to generate customer reviews every 30 minutes."""
-        print("[*] Starting customer review generation background task (runs immediately, then every 30 minutes)...")
-        
-        # Run immediately on startup
-        first_run = True
-        
-        while self.running:
-            try:
-                async with async_session_maker() as customer_review_db:
-                    from business.customer_review_manager import CustomerReviewManager
-                    customer_review_manager = CustomerReviewManager(customer_review_db)
-                    
-                    # On first run, generate for all completed projects (hours_since_completion=0)
-                    # On subsequent runs, generate for projects completed at least 1 hour ago
-                    hours_threshold = 0.0 if first_run else 1.0
-                    reviews_created = await customer_review_manager.generate_reviews_for_completed_projects(
-                        hours_since_completion=hours_threshold
-                    )
-                    if reviews_created:
-                        print(f"[+] Generated {len(reviews_created)} customer review(s) for completed projects")
-                    else:
-                        if first_run:
-                            print("[i] No new customer reviews to generate at this time (no completed projects or reviews already exist)")
-                        # Don't print on every periodic run to avoid spam
-            except Exception as e:
-                print(f"❌ Error generating customer reviews: {e}")
-                import traceback
-                traceback.print_exc()
+    async def conduct_employee_reviews(self):
+        """Conduct the performance reviews that are due (employees not reviewed in the last 6 hours)."""
+        async with async_session_maker() as review_db:
+            from business.review_manager import ReviewManager
+            review_manager = ReviewManager(review_db)
+            
+            with query_unit("periodic.employee_reviews"):
+                reviews_created = await review_manager.conduct_periodic_reviews(hours_since_last_review=6.0)
             
-            first_run = False
-            # Wait 30 minutes (1800 seconds) before next generation
-            await asyncio.sleep(1800)
+            if reviews_created:
+                print(f"[+] [REVIEW] Conducted {len(reviews_created)} employee performance review(s)")
+                # Log details for first few reviews
+                for i, review in enumerate(reviews_created[:5]):
+                    try:
+                        emp_result = await review_db.execute(EMPLOYEE_BY_ID, {"employee_id": review.employee_id})
+                        emp = emp_result.scalar_one_or_none()
+                        mgr_result = await review_db.execute(EMPLOYEE_BY_ID, {"employee_id": review.manager_id})
+                        mgr = mgr_result.scalar_one_or_none()
+                        if emp and mgr:
+                            print(f"   [*] {mgr.name} reviewed {emp.name} ({emp.role}) - Rating: {review.overall_rating}/5.0")
+                    except:
+                        pass
     
-    async def process_suggestions_periodically(self):
-        """Background task to process suggestion votes and manager comments every 60 minutes."""
-        print("[*] Starting suggestion processing background task (every 60 minutes)...")
-        while self.running:
-            try:
-                async with async_session_maker() as suggestion_db:
-                    from business.suggestion_manager import SuggestionManager
-                    suggestion_manager = SuggestionManager(suggestion_db)
-                    
-                    # Process votes
-                    await suggestion_manager.process_suggestion_votes()
-                    
-                    # Process manager comments
-                    await suggestion_manager.process_manager_comments()
-                    
-                    print("[+] Suggestion processing completed")
-            except Exception as e:
-                print(f"❌ Error processing suggestions: {e}")
-                import traceback
-                traceback.print_exc()
+    async def generate_customer_reviews(self):
+        """Generate customer reviews for completed projects."""
+        first_run = not self.customer_reviews_generated
+        async with async_session_maker() as customer_review_db:
+            from business.customer_review_manager import CustomerReviewManager
+            customer_review_manager = CustomerReviewManager(customer_review_db)
+            
+            # On first run, generate for all completed projects (hours_since_completion=0)
+            # On subsequent runs, generate for projects completed at least 1 hour ago
+            hours_threshold = 0.0 if first_run else 1.0
+            reviews_created = await customer_review_manager.generate_reviews_for_completed_projects(
+                hours_since_completion=hours_threshold
+            )
+            self.customer_reviews_generated = True
+            if reviews_created:
+                print(f"[+] Generated {len(reviews_created)} customer review(s) for completed projects")
+            elif first_run:
+                print("[i] No new customer reviews to generate at this time (no completed projects or reviews already exist)")
+    
+    async def process_suggestions(self):
+        """Process suggestion votes and manager comments."""
+        async with async_session_maker() as suggestion_db:
+            from business.suggestion_manager import SuggestionManager
+            suggestion_manager = SuggestionManager(suggestion_db)
+            
+            # Process votes
+            await suggestion_manager.process_suggestion_votes()
+            
+            # Process manager comments
+            await suggestion_manager.process_manager_comments()
             
-            # Wait 60 minutes (3600 seconds) before next processing
-            await asyncio.sleep(3600)
+            print("[+] Suggestion processing completed")
     
-    async def update_shared_drive_periodically(self):
-        """Background task to update shared drive every 5-10 minutes (optimized to prevent freezing)."""
+    async def update_shared_drive(self):
+        """Create and update shared drive documents for a few random employees."""
         import random
         from business.shared_drive_manager import SharedDriveManager
         from database.database import retry_on_lock
-        from sqlalchemy.exc import OperationalError
         
-        # Wait longer on startup to let system stabilize
-        await asyncio.sleep(30)
-        first_run = True
+        first_run = not self.shared_drive_updated
+        self.shared_drive_updated = True
         
-        while self.running:
-            try:
-                async def update_shared_drive():
-                    async with async_session_maker() as db:
-                        shared_drive_manager = SharedDriveManager(db)
-                        business_context = await get_business_context(db)
-                        
-                        # Get active employees
-                        result = await db.execute(
-                            select(Employee).where(Employee.status == "active")
-                        )
-                        employees = result.scalars().all()
+        async def update_shared_drive():
+            async with async_session_maker() as db:
+                shared_drive_manager = SharedDriveManager(db)
+                business_context = await get_business_context(db)
+                
+                # Get active employees
+                result = await db.execute(ACTIVE_EMPLOYEES)
+                employees = result.scalars().all()
+                
+                if employees:
+                    # Process 2-3 employees per cycle for more frequent updates
+                    if first_run:
+                        num_to_process = min(3, len(employees))  # 3 on startup
+                    else:
+                        num_to_process = min(2, len(employees))  # 2 per cycle for better coverage
+                    
+                    employees_to_process = random.sample(list(employees), num_to_process)
+                    
+                    files_created = 0
+                    files_updated = 0
+                    
+                    print(f"📁 Processing {num_to_process} employee(s) for shared drive update...")
+                    
+                    for employee in employees_to_process:
+                        # Store employee info before try block
+                        employee_name = employee.name
+                        employee_id = employee.id
                         
-                        if employees:
-                            # Process 2-3 employees per cycle for more frequent updates
-                            if first_run:
-                                num_to_process = min(3, len(employees))  # 3 on startup
-                            else:
-                                num_to_process = min(2, len(employees))  # 2 per cycle for better coverage
+                        try:
+                            # Generate new documents (AI decides what to create, limited to 1 per cycle)
+                            created = await shared_drive_manager.generate_documents_for_employee(
+                                employee, business_context, max_documents=1
+                            )
+                            files_created += len(created)
                             
-                            employees_to_process = random.sample(list(employees), num_to_process)
+                            # Small delay to prevent overwhelming the system
+                            await clock_sleep(1)
                             
-                            files_created = 0
-                            files_updated = 0
+                            # Update existing documents (only if not too many files)
+                            updated = await shared_drive_manager.update_existing_documents(
+                                employee, business_context, max_updates=1
+                            )
+                            files_updated += len(updated)
                             
-                            print(f"📁 Processing {num_to_process} employee(s) for shared drive update...")
+                            await db.commit()
                             
-                            for employee in employees_to_process:
-                                # Store employee info before try block
-                                employee_name = employee.name
-                                employee_id = employee.id
-                                
-                                try:
-                                    # Generate new documents (AI decides what to create, limited to 1 per cycle)
-                                    created = await shared_drive_manager.generate_documents_for_employee(
-                                        employee, business_context, max_documents=1
-                                    )
-                                    files_created += len(created)
-                                    
-                                    # Small delay to prevent overwhelming the system
-                                    await asyncio.sleep(1)
-                                    
-                                    # Update existing documents (only if not too many files)
-                                    updated = await shared_drive_manager.update_existing_documents(
-                                        employee, business_context, max_updates=1
-                                    )
-                                    files_updated += len(updated)
-                                    
-                                    await db.commit()
-                                    
-                                    if created or updated:
-                                        print(f"  ✓ Employee {employee_name}: {len(created)} created, {len(updated)} updated")
-                                    
-                                    # Delay between employees to prevent blocking
-                                    await asyncio.sleep(2)
-                                    
-                                except Exception as e:
-                                    print(f"  ✗ Error processing shared drive for employee {employee_id} ({employee_name}): {e}")
-                                    import traceback
-                                    traceback.print_exc()
-                                    await db.rollback()
-                                    # Continue with next employee even if one fails
-                                    await asyncio.sleep(1)
+                            if created or updated:
+                                print(f"  ✓ Employee {employee_name}: {len(created)} created, {len(updated)} updated")
                             
-                            if files_created > 0 or files_updated > 0:
-                                print(f"📁 Shared drive updated: {files_created} created, {files_updated} updated")
-                            elif first_run:
-                                print(f"📁 Shared drive background task started (processed {num_to_process} employees)")
-                        else:
-                            print("⚠️  No active employees found for shared drive update")
-                
-                # Use retry logic for database operations
-                await retry_on_lock(update_shared_drive, max_retries=3, initial_delay=1.0)
-                        
-            except OperationalError as e:
-                if "database is locked" in str(e):
-                    print(f"❌ Shared drive update failed after retries (database locked)")
+                            # Delay between employees to prevent blocking
+                            await clock_sleep(2)
+                            
+                        except Exception as e:
+                            print(f"  ✗ Error processing shared drive for employee {employee_id} ({employee_name}): {e}")
+                            import traceback
+                            traceback.print_exc()
+                            await db.rollback()
+                            # Continue with next employee even if one fails
+                            await clock_sleep(1)
+                    
+                    if files_created > 0 or files_updated > 0:
+                        print(f"📁 Shared drive updated: {files_created} created, {files_updated} updated")
+                    elif first_run:
+                        print(f"📁 Shared drive background task started (processed {num_to_process} employees)")
                 else:
-                    print(f"❌ Error updating shared drive: {e}")
-                    import traceback
-                    traceback.print_exc()
-            except Exception as e:
-                print(f"❌ Error updating shared drive: {e}")
-                import traceback
-                traceback.print_exc()
-            
-            # Mark first run as complete
-            first_run = False
-            
-            # Wait 5-10 minutes (300-600 seconds) before next update - more frequent updates
-            wait_time = random.randint(300, 600)
-            print(f"📁 Next shared drive update in {wait_time // 60} minutes")
-            await asyncio.sleep(wait_time)
+                    print("⚠️  No active employees found for shared drive update")
+        
+        # Use retry logic for database operations
+        await retry_on_lock(update_shared_drive, max_retries=3, initial_delay=1.0)
     
-    async def check_and_respond_to_messages_periodically(self):
-        """Background task to check and respond to messages for all employees every 20 seconds."""
-        print("💬 Starting message response background task (every 20 seconds - BALANCED)...")
-
-        # Wait a bit on startup to let system stabilize
-        await asyncio.sleep(5)
-
-        while self.running:
-            try:
-                async with async_session_maker() as message_db:
-                    from employees.roles import create_employee_agent
-                    from sqlalchemy import select
-
-                    # Get all active employees
-                    result = await message_db.execute(
-                        select(Employee).where(Employee.status == "active")
-                    )
-                    employees = result.scalars().all()
-
-                    if not employees:
-                        print("ℹ️  No active employees to check messages for")
-                    else:
-                        # Get business context
-                        business_context = await self.get_business_context(message_db)
+    async def check_and_respond_to_messages(self):
+        """Let every active employee check and respond to their messages."""
+        async with async_session_maker() as message_db:
+            from employees.roles import create_employee_agent
 
-                        responses_count = 0
-                        for employee in employees:
-                            try:
-                                # Create employee agent
-                                agent = create_employee_agent(employee, message_db, self.llm_client)
+            # Get all active employees
+            result = await message_db.execute(ACTIVE_EMPLOYEES)
+            employees = result.scalars().all()
 
-                                # Check and respond to messages
-                                await agent._check_and_respond_to_messages(business_context)
+            if not employees:
+                print("ℹ️  No active employees to check messages for")
+            else:
+                # Get business context
+                business_context = await self.get_business_context(message_db)
 
-                                responses_count += 1
-                            except Exception as e:
-                                print(f"❌ Error checking messages for {employee.name}: {e}")
-                                import traceback
-                                traceback.print_exc()
-                                continue
+                responses_count = 0
+                for employee in employees:
+                    try:
+                        # Create employee agent
+                        agent = create_employee_agent(employee, message_db, self.llm_client)
 
-                        await message_db.commit()
-                        logger.info(f"💬 Message response check completed for {responses_count} employee(s)")
-                        print(f"💬 Message response check completed for {responses_count} employee(s)")
+                        # Check and respond to messages
+                        await agent._check_and_respond_to_messages(business_context)
 
-            except Exception as e:
-                logger.error(f"[-] Error in message response background task: {e}", exc_info=True)
-                import traceback
-                traceback.print_exc()
+                        responses_count += 1
+                    except Exception as e:
+                        print(f"❌ Error checking messages for {employee.name}: {e}")
+                        import traceback
+                        traceback.print_exc()
+                        continue
 
-            # Wait 20 seconds before next check (balanced for performance and DB load)
-            if self.running:
-                await asyncio.sleep(20)
+                await message_db.commit()
+                logger.info(f"💬 Message response check completed for {responses_count} employee(s)")
+                print(f"💬 Message response check completed for {responses_count} employee(s)")
     
-    async def generate_communications_periodically(self):
-        """Background task to generate spontaneous communications between employees every 5 minutes."""
-        print("💬 Starting periodic communication generation task (every 5 minutes)...")
-        
-        # Wait a bit on startup to let system stabilize
-        await asyncio.sleep(60)
-        
-        while self.running:
-            try:
-                async with async_session_maker() as comm_db:
-                    from employees.roles import create_employee_agent
-                    from sqlalchemy import select
-                    import random
-                    
-                    # Get all active employees
-                    result = await comm_db.execute(
-                        select(Employee).where(Employee.status == "active")
-                    )
-                    employees = result.scalars().all()
-                    
-                    if not employees or len(employees) < 2:
-                        print("ℹ️  Not enough employees for communication generation")
-                    else:
-                        # Get business context
-                        business_context = await self.get_business_context(comm_db)
-                        
-                        # Select 3-5 random employees to generate communications
-                        num_to_process = min(random.randint(3, 5), len(employees))
-                        selected_employees = random.sample(employees, num_to_process)
-                        
-                        communications_generated = 0
-                        for employee in selected_employees:
-                            try:
-                                # Create employee agent
-                                agent = create_employee_agent(employee, comm_db, self.llm_client)
-                                
-                                # Create a simple decision context for spontaneous communication
-                                decision = {
-                                    "action_type": "communication",
-                                    "decision": "Reach out to a teammate",
-                                    "reasoning": "Spontaneous team communication to stay connected",
-                                    "confidence": 0.7
-                                }
-                                
-                                # Generate communication (this will use the improved probabilities)
-                                await agent._generate_communication(decision, business_context)
-                                communications_generated += 1
-                            except Exception as e:
-                                print(f"❌ Error generating communication for {employee.name}: {e}")
-                                import traceback
-                                traceback.print_exc()
-                                continue
+    async def generate_communications(self):
+        """Generate spontaneous communications from a few random employees."""
+        async with async_session_maker() as comm_db:
+            from employees.roles import create_employee_agent
+            import random
+            
+            # Get all active employees
+            result = await comm_db.execute(ACTIVE_EMPLOYEES)
+            employees = result.scalars().all()
+            
+            if not employees or len(employees) < 2:
+                print("ℹ️  Not enough employees for communication generation")
+            else:
+                # Get business context
+                business_context = await self.get_business_context(comm_db)
+                
+                # Select 3-5 random employees to generate communications
+                num_to_process = min(random.randint(3, 5), len(employees))
+                selected_employees = random.sample(employees, num_to_process)
+                
+                communications_generated = 0
+                for employee in selected_employees:
+                    try:
+                        # Create employee agent
+                        agent = create_employee_agent(employee, comm_db, self.llm_client)
                         
-                        await comm_db.commit()
-                        if communications_generated > 0:
-                            logger.info(f"[+] Generated {communications_generated} spontaneous communication(s)")
+                        # Create a simple decision context for spontaneous communication
+                        decision = {
+                            "action_type": "communication",
+                            "decision": "Reach out to a teammate",
+                            "reasoning": "Spontaneous team communication to stay connected",
+                            "confidence": 0.7
+                        }
                         
-            except Exception as e:
-                logger.error(f"[-] Error in periodic communication generation task: {e}", exc_info=True)
-                import traceback
-                traceback.print_exc()
-            
-            # Wait 5 minutes (300 seconds) before next generation
-            if self.running:
-                await asyncio.sleep(300)
+                        # Generate communication (this will use the improved probabilities)
+                        await agent._generate_communication(decision, business_context)
+                        communications_generated += 1
+                    except Exception as e:
+                        print(f"❌ Error generating communication for {employee.name}: {e}")
+                        import traceback
+                        traceback.print_exc()
+                        continue
+                
+                await comm_db.commit()
+                if communications_generated > 0:
+                    logger.info(f"[+] Generated {communications_generated} spontaneous communication(s)")
     
-    async def manage_employees_periodically(self):
-        """Background task to manage employee hiring and firing every 30-60 seconds."""
-        logger.info("👥 Starting employee management background task (every 30-60 seconds)...")
-        import random
+    async def manage_employees(self):
+        """Hiring/firing decisions, then project capacity management."""
         from database.database import retry_on_lock
         from sqlalchemy.exc import OperationalError
         
-        # Wait a bit on startup to let system stabilize
-        await asyncio.sleep(10)
-        
-        while self.running:
-            try:
-                async def manage_employees():
-                    async with async_session_maker() as manage_db:
-                        try:
-                            business_context = await self.get_business_context(manage_db)
-                            
-                            logger.info(f"[*] Running employee management background task...")
-                            await self._manage_employees(manage_db, business_context)
-                            await manage_db.commit()
-                            logger.info(f"[+] Employee management background task completed")
-                        except Exception as e:
-                            await manage_db.rollback()
-                            raise
-                
-                # Use retry logic for database operations
-                await retry_on_lock(manage_employees, max_retries=3, initial_delay=1.0)
+        async def manage_employees():
+            async with async_session_maker() as manage_db:
+                try:
+                    business_context = await self.get_business_context(manage_db)
                     
-            except OperationalError as e:
-                if "database is locked" in str(e):
-                    logger.error(f"[-] Employee management failed after retries (database locked)")
-                else:
-                    logger.error(f"[-] Error in employee management background task: {e}", exc_info=True)
-            except Exception as e:
+                    logger.info(f"[*] Running employee management background task...")
+                    await self._manage_employees(manage_db, business_context)
+                    await manage_db.commit()
+                    logger.info(f"[+] Employee management background task completed")
+                except Exception as e:
+                    await manage_db.rollback()
+                    raise
+        
+        try:
+            # Use retry logic for database operations
+            await retry_on_lock(manage_employees, max_retries=3, initial_delay=1.0)
+        except OperationalError as e:
+            if "database is locked" in str(e):
+                logger.error(f"[-] Employee management failed after retries (database locked)")
+            else:
                 logger.error(f"[-] Error in employee management background task: {e}", exc_info=True)
-            
-            # Also manage project capacity in the same task
-            try:
-                async def manage_projects():
-                    async with async_session_maker() as project_db:
-                        try:
-                            logger.info(f"[*] Running project capacity management...")
-                            await self._manage_project_capacity(project_db)
-                            await project_db.commit()
-                            logger.info(f"[+] Project capacity management completed")
-                        except Exception as e:
-                            await project_db.rollback()
-                            raise
-                
-                # Use retry logic for database operations
-                await retry_on_lock(manage_projects, max_retries=3, initial_delay=1.0)
-            except OperationalError as e:
-                if "database is locked" in str(e):
-                    logger.error(f"[-] Project management failed after retries (database locked)")
-                else:
-                    logger.error(f"[-] Error in project capacity management: {e}", exc_info=True)
-            except Exception as e:
+        except Exception as e:
+            logger.error(f"[-] Error in employee management background task: {e}", exc_info=True)
+        
+        # Also manage project capacity in the same job
+        async def manage_projects():
+            async with async_session_maker() as project_db:
+                try:
+                    logger.info(f"[*] Running project capacity management...")
+                    await self._manage_project_capacity(project_db)
+                    await project_db.commit()
+                    logger.info(f"[+] Project capacity management completed")
+                except Exception as e:
+                    await project_db.rollback()
+                    raise
+        
+        try:
+            await retry_on_lock(manage_projects, max_retries=3, initial_delay=1.0)
+        except OperationalError as e:
+            if "database is locked" in str(e):
+                logger.error(f"[-] Project management failed after retries (database locked)")
+            else:
                 logger.error(f"[-] Error in project capacity management: {e}", exc_info=True)
-            
-            # Wait 2-4 minutes before next check (reduced frequency to prevent excessive terminations)
-            wait_time = random.randint(120, 240)  # 2-4 minutes
-            await asyncio.sleep(wait_time)
+        except Exception as e:
+            logger.error(f"[-] Error in project capacity management: {e}", exc_info=True)
     
-    async def process_clock_events_periodically(self):
-        """Background task to process employee clock in/out events every 2 minutes (or every 1 minute during departure hours)."""
-        from config import now as local_now
-        while self.running:
-            try:
-                async with async_session_maker() as db:
-                    from business.clock_manager import ClockManager
-                    clock_manager = ClockManager(db)
-
-                    # Process end-of-day departures (5:00pm-7:15pm)
-                    departure_stats = await clock_manager.process_end_of_day_departures()
-                    if departure_stats["departed"] > 0:
-                        logger.info(f"[CLOCK OUT] {departure_stats['message']}")
-                    
-                    # Backfill missing clock-outs for employees who already left
-                    # This ensures employees who left before the fix have clock-out records
-                    backfill_stats = await clock_manager.backfill_missing_clock_outs()
-                    if backfill_stats["backfilled"] > 0:
-                        logger.info(f"[CLOCK OUT BACKFILL] {backfill_stats['message']}")
-
-                    # Process commuting employees (transition leaving_work -> at_home)
-                    commute_stats = await clock_manager.process_commuting_employees()
-                    if commute_stats["arrived_home"] > 0:
-                        logger.info(f"[ARRIVED HOME] {commute_stats['message']}")
-
-                    # Process morning arrivals (6:45am-7:45am)
-                    arrival_stats = await clock_manager.process_morning_arrivals()
-                    if arrival_stats["arrived"] > 0:
-                        logger.info(f"[CLOCK IN] {arrival_stats['message']}")
-
-            except Exception as e:
-                logger.error(f"Error in clock event processing: {e}", exc_info=True)
-
-            # Run more frequently during departure hours (5pm-7:15pm) - every 1 minute
-            # Otherwise run every 2 minutes
-            current_time = local_now()
-            current_hour = current_time.hour
-            is_departure_hours = (17 <= current_hour <= 19) and current_time.weekday() < 5
-            wait_time = 60 if is_departure_hours else 120  # 1 minute during departure hours, 2 minutes otherwise
-            await asyncio.sleep(wait_time)
-
-    async def process_sleep_schedules_periodically(self):
-        """Background task to process sleep schedules (bedtime 10pm-12am, wake 5:30am-9am)."""
-        while self.running:
-            try:
-                async with async_session_maker() as db:
-                    from business.sleep_manager import SleepManager
-                    sleep_manager = SleepManager(db)
-
-                    # First, enforce sleep rules to ensure everyone follows the schedule
-                    enforce_stats = await sleep_manager.enforce_sleep_rules()
-                    if enforce_stats["enforced_sleep"] > 0 or enforce_stats["enforced_wake"] > 0:
-                        logger.info(f"[SLEEP ENFORCE] {enforce_stats['message']}")
-
-                    # Process bedtime (10pm-12am)
-                    bedtime_stats = await sleep_manager.process_bedtime()
-                    if bedtime_stats["went_to_sleep"] > 0:
-                        logger.info(f"[BEDTIME] {bedtime_stats['message']}")
+    def clock_events_interval(self) -> float:
+        """Clock in/out cadence: every minute during departure hours (5pm-7pm weekdays), otherwise every 2 minutes."""
+        current_time = local_now()
+        is_departure_hours = (17 <= current_time.hour <= 19) and current_time.weekday() < 5
+        return 60 if is_departure_hours else 120
+    
+    async def process_clock_events(self):
+        """Process employee clock in/out events."""
+        async with async_session_maker() as db:
+            from business.clock_manager import ClockManager
+            clock_manager = ClockManager(db)
+
+            # Process end-of-day departures (5:00pm-7:15pm)
+            departure_stats = await clock_manager.process_end_of_day_departures()
+            if departure_stats["departed"] > 0:
+                logger.info(f"[CLOCK OUT] {departure_stats['message']}")
+            
+            # Backfill missing clock-outs for employees who already left
+            # This ensures employees who left before the fix have clock-out records
+            backfill_stats = await clock_manager.backfill_missing_clock_outs()
+            if backfill_stats["backfilled"] > 0:
+                logger.info(f"[CLOCK OUT BACKFILL] {backfill_stats['message']}")
+
+            # Process commuting employees (transition leaving_work -> at_home)
+            commute_stats = await clock_manager.process_commuting_employees()
+            if commute_stats["arrived_home"] > 0:
+                logger.info(f"[ARRIVED HOME] {commute_stats['message']}")
+
+            # Process morning arrivals (6:45am-7:45am)
+            arrival_stats = await clock_manager.process_morning_arrivals()
+            if arrival_stats["arrived"] > 0:
+                logger.info(f"[CLOCK IN] {arrival_stats['message']}")
+
+    async def process_sleep_schedules(self):
+        """Process sleep schedules (bedtime 10pm-12am, wake 5:30am-9am)."""
+        async with async_session_maker() as db:
+            from business.sleep_manager import SleepManager
+            sleep_manager = SleepManager(db)
+
+            # First, enforce sleep rules to ensure everyone follows the schedule
+            enforce_stats = await sleep_manager.enforce_sleep_rules()
+            if enforce_stats["enforced_sleep"] > 0 or enforce_stats["enforced_wake"] > 0:
+                logger.info(f"[SLEEP ENFORCE] {enforce_stats['message']}")
+
+            # Process bedtime (10pm-12am)
+            bedtime_stats = await sleep_manager.process_bedtime()
+            if bedtime_stats["went_to_sleep"] > 0:
+                logger.info(f"[BEDTIME] {bedtime_stats['message']}")
+
+            # Process wake-ups (employees 5:30am-6:45am, family 7:30am-9am)
+            wakeup_stats = await sleep_manager.process_wake_up()
+            if wakeup_stats["woke_employees"] > 0 or wakeup_stats["woke_family"] > 0:
+                logger.info(f"[WAKE UP] {wakeup_stats['message']}")
+
+    async def generate_random_breaks(self):
+        """Randomly send some working employees on breaks (work hours only)."""
+        from config import is_work_hours
 
-                    # Process wake-ups (employees 5:30am-6:45am, family 7:30am-9am)
-                    wakeup_stats = await sleep_manager.process_wake_up()
-                    if wakeup_stats["woke_employees"] > 0 or wakeup_stats["woke_family"] > 0:
-                        logger.info(f"[WAKE UP] {wakeup_stats['message']}")
+        # Only generate breaks during work hours
+        if not is_work_hours():
+            return
 
-            except Exception as e:
-                logger.error(f"Error in sleep schedule processing: {e}", exc_info=True)
+        async with async_session_maker() as db:
+            from business.coffee_break_manager import CoffeeBreakManager
+            from sqlalchemy import select
 
-            # Run every 2 minutes (120 seconds)
-            await asyncio.sleep(120)
+            break_manager = CoffeeBreakManager(db)
 
-    async def generate_random_breaks_periodically(self):
-        """Background task to randomly send employees on breaks every 3-5 minutes."""
-        logger.info("☕ Starting random break generation task (every 3-5 minutes)...")
+            # Get all active employees who are working (not on break, not in meetings)
+            result = await db.execute(
+                select(Employee).where(
+                    Employee.status == "active",
+                    Employee.activity_state == "working"
+                )
+            )
+            working_employees = result.scalars().all()
+
+            if not working_employees:
+                return
+
+            # Randomly select 10-20% of working employees to check for breaks
+            num_to_check = max(1, int(len(working_employees) * random.uniform(0.10, 0.20)))
+            employees_to_check = random.sample(working_employees, min(num_to_check, len(working_employees)))
+
+            breaks_taken = 0
+            breaks_denied = 0
+            denial_reasons = {
+                "capacity": 0,
+                "meeting": 0,
+                "too_soon": 0,
+                "manager_abuse": 0,
+                "other": 0
+            }
 
-        while self.running:
-            try:
-                from config import is_work_hours
+            for employee in employees_to_check:
+                try:
+                    # Check if employee should take a break
+                    if await break_manager.should_take_coffee_break(employee):
+                        # Send employee on break
+                        activity = await break_manager.take_coffee_break(employee)
+
+                        # Broadcast break activity
+                        await self.broadcast_activity({
+                            "type": "activity",
+                            "data": {
+                                "id": activity.id,
+                                "employee_id": employee.id,
+                                "employee_name": employee.name,
+                                "activity_type": activity.activity_type,
+                                "description": activity.description
+                            }
+                        })
+
+                        breaks_taken += 1
+                        logger.info(f"☕ {employee.name} is taking a break")
+
+                except ValueError as ve:
+                    # Break was denied - categorize the reason
+                    breaks_denied += 1
+                    reason_str = str(ve).lower()
+
+                    if "capacity" in reason_str or "break rooms are" in reason_str:
+                        denial_reasons["capacity"] += 1
+                        # logger.debug(f"🚫 Break denied for {employee.name}: Break rooms at capacity")
+                    elif "meeting" in reason_str:
+                        denial_reasons["meeting"] += 1
+                        # logger.debug(f"🚫 Break denied for {employee.name}: Has upcoming meeting")
+                    elif "hours since" in reason_str or "too soon" in reason_str:
+                        denial_reasons["too_soon"] += 1
+                        # logger.debug(f"🚫 Break denied for {employee.name}: Too soon since last break")
+                    elif "abuse" in reason_str or "manager" in reason_str:
+                        denial_reasons["manager_abuse"] += 1
+                        logger.warning(f"🚫 Break denied for {employee.name}: {ve}")
+                    else:
+                        denial_reasons["other"] += 1
+                        # logger.debug(f"🚫 Break denied for {employee.name}: {ve}")
 
-                # Only generate breaks during work hours
-                if not is_work_hours():
-                    await asyncio.sleep(300)  # Check again in 5 minutes
+                except Exception as e:
+                    # Other errors, log and continue
+                    logger.error(f"Error processing break for {employee.name}: {e}")
                     continue
 
-                async with async_session_maker() as db:
-                    from business.coffee_break_manager import CoffeeBreakManager
-                    from sqlalchemy import select
-
-                    break_manager = CoffeeBreakManager(db)
-
-                    # Get all active employees who are working (not on break, not in meetings)
-                    result = await db.execute(
-                        select(Employee).where(
-                            Employee.status == "active",
-                            Employee.activity_state == "working"
-                        )
-                    )
-                    working_employees = result.scalars().all()
-
-                    if not working_employees:
-                        await asyncio.sleep(random.randint(180, 300))
-                        continue
-
-                    # Randomly select 10-20% of working employees to check for breaks
-                    num_to_check = max(1, int(len(working_employees) * random.uniform(0.10, 0.20)))
-                    employees_to_check = random.sample(working_employees, min(num_to_check, len(working_employees)))
-
-                    breaks_taken = 0
-                    breaks_denied = 0
-                    denial_reasons = {
-                        "capacity": 0,
-                        "meeting": 0,
-                        "too_soon": 0,
-                        "manager_abuse": 0,
-                        "other": 0
-                    }
-
-                    for employee in employees_to_check:
-                        try:
-                            # Check if employee should take a break
-                            if await break_manager.should_take_coffee_break(employee):
-                                # Send employee on break
-                                activity = await break_manager.take_coffee_break(employee)
-
-                                # Broadcast break activity
-                                await self.broadcast_activity({
-                                    "type": "activity",
-                                    "data": {
-                                        "id": activity.id,
-                                        "employee_id": employee.id,
-                                        "employee_name": employee.name,
-                                        "activity_type": activity.activity_type,
-                                        "description": activity.description
-                                    }
-                                })
-
-                                breaks_taken += 1
-                                logger.info(f"☕ {employee.name} is taking a break")
-
-                        except ValueError as ve:
-                            # Break was denied - categorize the reason
-                            breaks_denied += 1
-                            reason_str = str(ve).lower()
-
-                            if "capacity" in reason_str or "break rooms are" in reason_str:
-                                denial_reasons["capacity"] += 1
-                                # logger.debug(f"🚫 Break denied for {employee.name}: Break rooms at capacity")
-                            elif "meeting" in reason_str:
-                                denial_reasons["meeting"] += 1
-                                # logger.debug(f"🚫 Break denied for {employee.name}: Has upcoming meeting")
-                            elif "hours since" in reason_str or "too soon" in reason_str:
-                                denial_reasons["too_soon"] += 1
-                                # logger.debug(f"🚫 Break denied for {employee.name}: Too soon since last break")
-                            elif "abuse" in reason_str or "manager" in reason_str:
-                                denial_reasons["manager_abuse"] += 1
-                                logger.warning(f"🚫 Break denied for {employee.name}: {ve}")
-                            else:
-                                denial_reasons["other"] += 1
-                                # logger.debug(f"🚫 Break denied for {employee.name}: {ve}")
-
-                        except Exception as e:
-                            # Other errors, log and continue
-                            logger.error(f"Error processing break for {employee.name}: {e}")
-                            continue
-
-                    if breaks_taken > 0:
-                        logger.info(f"☕ Generated {breaks_taken} random breaks")
-
-                    # Log denial summary if there were denials
-                    if breaks_denied > 0:
-                        summary_parts = []
-                        if denial_reasons["capacity"] > 0:
-                            summary_parts.append(f"{denial_reasons['capacity']} capacity")
-                        if denial_reasons["meeting"] > 0:
-                            summary_parts.append(f"{denial_reasons['meeting']} meeting")
-                        if denial_reasons["too_soon"] > 0:
-                            summary_parts.append(f"{denial_reasons['too_soon']} too soon")
-                        if denial_reasons["manager_abuse"] > 0:
-                            summary_parts.append(f"{denial_reasons['manager_abuse']} manager abuse")
-                        if denial_reasons["other"] > 0:
-                            summary_parts.append(f"{denial_reasons['other']} other")
-
-                        logger.debug(f"☕ Denied {breaks_denied} breaks: {', '.join(summary_parts)}")
-
-            except Exception as e:
-                logger.error(f"Error in random break generation: {e}", exc_info=True)
-
-            # Run every 3-5 minutes (randomized to feel natural)
-            wait_time = random.randint(180, 300)
-            await asyncio.sleep(wait_time)
-
-    async def process_sick_days_periodically(self):
-        """Background task to process sick day call-ins and auto-recovery."""
-        logger.info("🤒 Starting sick day processing task (every 5 minutes)...")
-
-        while self.running:
-            try:
-                async with async_session_maker() as db:
-                    from business.sick_day_manager import SickDayManager
-                    sick_manager = SickDayManager(db)
-
-                    # Generate random sick calls (5am-8am weekdays only)
-                    sick_call_result = await sick_manager.generate_random_sick_calls()
-                    if sick_call_result["sick_calls"] > 0:
-                        logger.info(f"🤒 [SICK CALLS] {sick_call_result['message']}")
-
-                        # Broadcast sick call notifications
-                        for notification in sick_call_result.get("notifications", []):
-                            await self.broadcast_activity({
-                                "type": "sick_call",
-                                "data": notification
-                            })
-
-                    # Auto-recover sick employees (check throughout the day)
-                    recovery_result = await sick_manager.auto_recover_sick_employees()
-                    if recovery_result["recovered"] > 0:
-                        logger.info(f"🏥 [RECOVERY] {recovery_result['message']}")
-
-            except Exception as e:
-                logger.error(f"Error in sick day processing: {e}", exc_info=True)
-
-            # Run every 5 minutes (300 seconds)
-            await asyncio.sleep(300)
-
+            if breaks_taken > 0:
+                logger.info(f"☕ Generated {breaks_taken} random breaks")
+
+            # Log denial summary if there were denials
+            if breaks_denied > 0:
+                summary_parts = []
+                if denial_reasons["capacity"] > 0:
+                    summary_parts.append(f"{denial_reasons['capacity']} capacity")
+                if denial_reasons["meeting"] > 0:
+                    summary_parts.append(f"{denial_reasons['meeting']} meeting")
+                if denial_reasons["too_soon"] > 0:
+                    summary_parts.append(f"{denial_reasons['too_soon']} too soon")
+                if denial_reasons["manager_abuse"] > 0:
+                    summary_parts.append(f"{denial_reasons['manager_abuse']} manager abuse")
+                if denial_reasons["other"] > 0:
+                    summary_parts.append(f"{denial_reasons['other']} other")
+
+                logger.debug(f"☕ Denied {breaks_denied} breaks: {', '.join(summary_parts)}")
+
+    async def process_sick_days(self):
+        """Process sick day call-ins and auto-recovery."""
+        async with async_session_maker() as db:
+            from business.sick_day_manager import SickDayManager
+            sick_manager = SickDayManager(db)
+
+            # Generate random sick calls (5am-8am weekdays only)
+            sick_call_result = await sick_manager.generate_random_sick_calls()
+            if sick_call_result["sick_calls"] > 0:
+                logger.info(f"🤒 [SICK CALLS] {sick_call_result['message']}")
+
+                # Broadcast sick call notifications
+                for notification in sick_call_result.get("notifications", []):
+                    await self.broadcast_activity({
+                        "type": "sick_call",
+                        "data": notification
+                    })
+
+            # Auto-recover sick employees (check throughout the day)
+            recovery_result = await sick_manager.auto_recover_sick_employees()
+            if recovery_result["recovered"] > 0:
+                logger.info(f"🏥 [RECOVERY] {recovery_result['message']}")
+
+    def register_jobs(self):
+        """Declare the simulator's periodic background work (see engine/job_scheduler.py)."""
+        jobs = job_scheduler
+        # Live transcript content for in-progress meetings (start/end transitions are fired by meeting_scheduler)
+        jobs.register("meeting_live_content", self.update_live_meetings, interval=10, retry_interval=5)
+        jobs.register("business_goals", self.update_goals, interval=self.seconds_until_midnight, retry_interval=3600)
+        # Reviews and the performance award used to run from the tick as well; this is now their only schedule
+        jobs.register("employee_reviews", self.conduct_employee_reviews, interval=60, retry_interval=60)
+        jobs.register("performance_award", self.update_performance_award, interval=300, retry_interval=60)
+        jobs.register("employee_summaries", self.repair_employee_summaries, interval=3600, initial_delay=600)
+        jobs.register("customer_reviews", self.generate_customer_reviews, interval=1800)
+        jobs.register("suggestions", self.process_suggestions, interval=3600)
+        jobs.register("shared_drive", self.update_shared_drive, interval=450, jitter=150, initial_delay=30)
+        jobs.register("employee_management", self.manage_employees, interval=180, jitter=60, initial_delay=10)
+        jobs.register("message_responses", self.check_and_respond_to_messages, interval=20, initial_delay=5)
+        jobs.register("communications", self.generate_communications, interval=300, initial_delay=60)
+        jobs.register("clock_events", self.process_clock_events, interval=self.clock_events_interval)
+        jobs.register("sleep_schedules", self.process_sleep_schedules, interval=120)
+        jobs.register("random_breaks", self.generate_random_breaks, interval=240, jitter=60)
+        jobs.register("sick_days", self.process_sick_days, interval=300)
+        jobs.register("dashboard_read_model", dashboard_read_model.refresh_if_due, interval=dashboard_read_model.refresh_seconds)
+    
     async def run(self):
         """Run the simulation loop."""
         self.running = True
         logger.info("Office simulation started...")
         
-        # Start the frequent meeting update task in the background
-        meeting_task = asyncio.create_task(self.update_meetings_frequently())
-        logger.info(f"[+] Created meeting update background task: {meeting_task}")
-        
-        # Start the daily goal update task in the background
-        goal_task = asyncio.create_task(self.update_goals_daily())
-        logger.info(f"[+] Created daily goal update background task: {goal_task}")
-        
-        # Start the employee review generation task in the background (runs immediately, then every 6 hours)
-        employee_review_task = asyncio.create_task(self.conduct_employee_reviews_periodically())
-        logger.info(f"[+] Created employee review generation background task (runs immediately, then every 6 hours): {employee_review_task}")
-        
-        # Start the customer review generation task in the background (runs immediately, then every 30 minutes)
-        customer_review_task = asyncio.create_task(self.generate_customer_reviews_periodically())
-        logger.info(f"[+] Created customer review generation background task (runs immediately, then every 30 minutes): {customer_review_task}")
-        
-        # Start the performance award update task in the background (every 5 minutes)
-        award_task = asyncio.create_task(self.update_performance_award_periodically())
-        logger.info(f"[+] Created performance award update background task (every 5 minutes, runs immediately): {award_task}")
+        # Optional event journal / LLM replay for deterministic runs (see engine/simulation_journal.py)
+        from engine.simulation_journal import open_journal_from_env
+        self.journal = open_journal_from_env()
         
-        # Start the suggestion processing task in the background (every 60 minutes)
-        suggestion_task = asyncio.create_task(self.process_suggestions_periodically())
-        logger.info(f"[+] Created suggestion processing background task (every 60 minutes): {suggestion_task}")
+        # The periodic loops below draw on the background connection budget, the tick on the simulator's
+        set_db_subsystem("background")
         
-        # Start the shared drive update task in the background (every 20-30 minutes, optimized)
-        shared_drive_task = asyncio.create_task(self.update_shared_drive_periodically())
-        logger.info(f"[+] Created shared drive update background task (every 20-30 minutes, optimized): {shared_drive_task}")
+        # Start the meeting transition scheduler (loads scheduled meetings, fires starts/ends when due)
+        meeting_scheduler_task = asyncio.create_task(meeting_scheduler.run())
+        logger.info(f"[+] Created meeting transition scheduler task: {meeting_scheduler_task}")
         
-        # Start the employee management task in the background (every 30-60 seconds)
-        employee_management_task = asyncio.create_task(self.manage_employees_periodically())
-        logger.info(f"[+] Created employee management background task (every 30-60 seconds): {employee_management_task}")
+        # Everything else that runs periodically is a declared job (see register_jobs())
+        self.register_jobs()
+        job_scheduler.start()
+        logger.info(f"[+] Started {len(job_scheduler.jobs)} periodic background jobs")
         
-        # Start the message response task in the background (every 20 seconds - BALANCED)
-        message_response_task = asyncio.create_task(self.check_and_respond_to_messages_periodically())
-        logger.info(f"[+] Created message response background task (every 20 seconds - BALANCED): {message_response_task}")
-        
-        # Start the periodic communication generation task (every 5 minutes for spontaneous communications)
-        communication_task = asyncio.create_task(self.generate_communications_periodically())
-        logger.info(f"[+] Created periodic communication generation background task (every 5 minutes): {communication_task}")
-
-        # Start the clock in/out processing task (every 2 minutes for arrivals/departures)
-        clock_task = asyncio.create_task(self.process_clock_events_periodically())
-        logger.info(f"[+] Created clock in/out processing background task (every 2 minutes): {clock_task}")
-
-        # Start the sleep schedule processing task (every 2 minutes for bedtime/wake-up)
-        sleep_task = asyncio.create_task(self.process_sleep_schedules_periodically())
-        logger.info(f"[+] Created sleep schedule processing background task (every 2 minutes): {sleep_task}")
-
-        # Start the random break generation task (every 3-5 minutes for natural break patterns)
-        breaks_task = asyncio.create_task(self.generate_random_breaks_periodically())
-        logger.info(f"[+] Created random break generation background task (every 3-5 minutes): {breaks_task}")
-
-        # Start the sick day processing task (every 5 minutes for sick calls and recovery)
-        sick_days_task = asyncio.create_task(self.process_sick_days_periodically())
-        logger.info(f"[+] Created sick day processing background task (every 5 minutes): {sick_days_task}")
-
+        set_db_subsystem("simulator")
         while self.running:
             try:
-                await self.simulation_tick()
-                await asyncio.sleep(8)  # Wait 8 seconds between ticks
+                self.tick_number += 1
+                if self.journal:
+                    self.journal.begin_tick(self.tick_number)
+                with query_unit("simulation_tick"):
+                    await self.simulation_tick()
+                if self.journal:
+                    await asyncio.to_thread(self.journal.flush)
+                await clock_sleep(8)  # Wait 8 seconds between ticks
             except Exception as e:
                 logger.error(f"Error in simulation loop: {e}", exc_info=True)
-                await asyncio.sleep(5)
+                await clock_sleep(5)
     
     def stop(self):
         """Stop the simulation."""
         self.running = False
+        meeting_scheduler.stop()
+        job_scheduler.stop()
+        if self.journal:
+            self.journal.close()
+            self.journal = None
         print("Office simulation stopped.")
 
@@ -0,0 +1,469 @@
+"""
+Simulation journal - append-only binary log of state-changing simulation events.
+
+Recording is opt-in via environment variables:
+    SIMULATION_JOURNAL=path/to/run.journal   record every state change and LLM response
+    SIMULATION_SEED=1234                     base seed for the per-tick RNG (default: 0)
+    SIMULATION_REPLAY=path/to/run.journal    serve LLM responses from a recorded journal
+                                             instead of calling Ollama
+
+State changes are captured from SQLAlchemy flushes, so every call site that moves an
+employee, advances a task, hires, fires, sends a message or changes a meeting status
+is journaled without being modified. LLM traffic is captured at the httpx transport
+used by OllamaClient.
+
+Record layout (little endian):
+    u8 event type | u32 tick | f64 unix timestamp | u32 payload length | payload (compact JSON)
+
+Usage:
+    python -m engine.simulation_journal replay run.journal
+    python -m engine.simulation_journal diff baseline.journal candidate.journal
+"""
+import hashlib
+import json
+import os
+import random
+import struct
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+JOURNAL_MAGIC = b"OSJ1"
+_RECORD_HEADER = struct.Struct("<BIdI")
+
+# Event type codes (stable - they are written to disk)
+EVENT_TICK = 1
+EVENT_MOVE = 2
+EVENT_TASK_PROGRESS = 3
+EVENT_HIRE = 4
+EVENT_FIRE = 5
+EVENT_MESSAGE = 6
+EVENT_MEETING_STATUS = 7
+EVENT_LLM_RESPONSE = 8
+
+EVENT_NAMES = {
+    EVENT_TICK: "tick",
+    EVENT_MOVE: "move",
+    EVENT_TASK_PROGRESS: "task_progress",
+    EVENT_HIRE: "hire",
+    EVENT_FIRE: "fire",
+    EVENT_MESSAGE: "message",
+    EVENT_MEETING_STATUS: "meeting_status",
+    EVENT_LLM_RESPONSE: "llm_response",
+}
+
+_MOVE_FIELDS = ("current_room", "floor", "activity_state", "target_room")
+
+
+@dataclass
+class JournalEvent:
+    event_type: int
+    tick: int
+    timestamp: float
+    payload: Dict[str, Any]
+
+    @property
+    def name(self) -> str:
+        return EVENT_NAMES.get(self.event_type, str(self.event_type))
+
+
+def derive_tick_seed(base_seed: int, tick: int) -> int:
+    """Derive a stable 32-bit seed for a tick from the run's base seed."""
+    digest = hashlib.blake2b(f"{base_seed}:{tick}".encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "little")
+
+
+class SimulationJournal:
+    """
+    Buffered writer for the simulation journal.
+
+    Events are appended to an in-memory buffer from the event loop (and from
+    synchronous SQLAlchemy flush hooks) and written to disk by flush(), which
+    the simulator runs off the event loop once per tick.
+    """
+
+    def __init__(self, path: str, base_seed: int = 0):
+        self.path = path
+        self.base_seed = base_seed
+        self.tick = 0
+        self._buffer: List[bytes] = []
+        self._lock = threading.Lock()
+        # Serialises flush() (run in a worker thread) with close() (called from stop())
+        self._io_lock = threading.Lock()
+        self.closed = False
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "ab")
+        if new_file:
+            self._file.write(JOURNAL_MAGIC)
+            self._file.flush()
+
+    def append(self, event_type: int, payload: Dict[str, Any]):
+        """Append one event stamped with the current tick."""
+        body = json.dumps(payload, separators=(",", ":"), default=str, sort_keys=True).encode("utf-8")
+        record = _RECORD_HEADER.pack(event_type, self.tick, time.time(), len(body)) + body
+        with self._lock:
+            self._buffer.append(record)
+
+    def begin_tick(self, tick: int) -> int:
+        """
+        Start a new tick: seed the global RNG deterministically and record the seed.
+
+        Returns:
+            The seed used for this tick
+        """
+        self.tick = tick
+        seed = derive_tick_seed(self.base_seed, tick)
+        random.seed(seed)
+        self.append(EVENT_TICK, {"seed": seed})
+        return seed
+
+    def flush(self):
+        """Write buffered events to disk (blocking - run via asyncio.to_thread). No-op once closed."""
+        with self._io_lock:
+            if self.closed:
+                return
+            with self._lock:
+                pending, self._buffer = self._buffer, []
+            if pending:
+                self._file.write(b"".join(pending))
+                self._file.flush()
+
+    def close(self):
+        """Flush and close; waits for a flush running in another thread."""
+        self.flush()
+        with self._io_lock:
+            if not self.closed:
+                self.closed = True
+                self._file.close()
+
+
+def read_journal(path: str) -> Iterator[JournalEvent]:
+    """
+    Iterate over the events in a journal file.
+    A truncated trailing record (e.g. from a crash mid-write) is ignored.
+    """
+    with open(path, "rb") as f:
+        magic = f.read(len(JOURNAL_MAGIC))
+        if magic != JOURNAL_MAGIC:
+            raise ValueError(f"{path} is not a simulation journal")
+        while True:
+            header = f.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                return
+            event_type, tick, timestamp, length = _RECORD_HEADER.unpack(header)
+            body = f.read(length)
+            if len(body) < length:
+                return
+            yield JournalEvent(event_type, tick, timestamp, json.loads(body))
+
+
+# ---------------------------------------------------------------------------
+# Capture: SQLAlchemy flush hook
+# ---------------------------------------------------------------------------
+
+def _history_changed(state, attr: str) -> bool:
+    # history never emits SQL for unloaded attributes, so this is safe inside a flush
+    return state.attrs[attr].history.has_changes()
+
+
+def _capture_flush(journal: SimulationJournal, session):
+    from sqlalchemy import inspect
+    from database.models import Employee, Task, Meeting, ChatMessage, Email
+
+    # Read from the instance dict only - attribute access could emit SQL mid-flush
+    for obj in session.new:
+        values = inspect(obj).dict
+        if isinstance(obj, Employee):
+            payload = {"employee_id": values.get("id")}
+            payload.update({attr: values.get(attr) for attr in ("name", "title", "role", "department") + _MOVE_FIELDS})
+            journal.append(EVENT_HIRE, payload)
+        elif isinstance(obj, (ChatMessage, Email)):
+            journal.append(EVENT_MESSAGE, {
+                "kind": "chat" if isinstance(obj, ChatMessage) else "email",
+                "id": values.get("id"),
+                "sender_id": values.get("sender_id"),
+                "recipient_id": values.get("recipient_id"),
+                "thread_id": values.get("thread_id"),
+            })
+
+    for obj in session.dirty:
+        state = inspect(obj)
+        values = state.dict
+        if isinstance(obj, Employee):
+            if any(_history_changed(state, attr) for attr in _MOVE_FIELDS):
+                payload = {"employee_id": values.get("id")}
+                payload.update({attr: values.get(attr) for attr in _MOVE_FIELDS})
+                journal.append(EVENT_MOVE, payload)
+            if _history_changed(state, "status") and values.get("status") == "fired":
+                journal.append(EVENT_FIRE, {"employee_id": values.get("id")})
+        elif isinstance(obj, Task):
+            if _history_changed(state, "progress") or _history_changed(state, "status") or _history_changed(state, "employee_id"):
+                journal.append(EVENT_TASK_PROGRESS, {
+                    "task_id": values.get("id"),
+                    "employee_id": values.get("employee_id"),
+                    "progress": values.get("progress"),
+                    "status": values.get("status"),
+                })
+        elif isinstance(obj, Meeting):
+            if _history_changed(state, "status"):
+                journal.append(EVENT_MEETING_STATUS, {
+                    "meeting_id": values.get("id"),
+                    "status": values.get("status"),
+                })
+
+
+def install_flush_capture(journal: SimulationJournal):
+    """Record state changes from every ORM flush in the process."""
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    def after_flush(session, flush_context):
+        try:
+            _capture_flush(journal, session)
+        except Exception as e:
+            # Journaling must never break the simulation
+            print(f"Warning: simulation journal capture failed: {e}")
+
+    event.listen(Session, "after_flush", after_flush)
+    return after_flush
+
+
+# ---------------------------------------------------------------------------
+# Capture and replay: LLM transport
+# ---------------------------------------------------------------------------
+
+def _request_key(request: httpx.Request) -> str:
+    body = request.content or b""
+    return hashlib.sha1(request.method.encode() + request.url.path.encode() + body).hexdigest()
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """httpx transport that forwards to the network and journals every response."""
+
+    def __init__(self, journal: SimulationJournal, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.journal = journal
+        self._inner = inner or httpx.AsyncHTTPTransport(verify=False)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._inner.handle_async_request(request)
+        body = await response.aread()
+        self.journal.append(EVENT_LLM_RESPONSE, {
+            "path": request.url.path,
+            "key": _request_key(request),
+            "status": response.status_code,
+            "body": body.decode("utf-8", errors="replace"),
+        })
+        return httpx.Response(response.status_code, headers=response.headers, content=body, request=request)
+
+    async def aclose(self):
+        await self._inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that serves LLM responses recorded in a journal, never touching the network.
+
+    Responses are matched by request fingerprint first, then by recording order.
+    Every recorded response is served at most once, whichever way it is matched.
+    When the journal runs out, an empty generation is returned so callers fall back
+    to their built-in templates.
+    """
+
+    def __init__(self, responses: List[Dict[str, Any]]):
+        self._entries = list(responses)
+        self._served = [False] * len(self._entries)
+        # Both queues hold indexes into _entries; served ones are skipped when they come up
+        self._by_key: Dict[str, deque] = defaultdict(deque)
+        self._in_order: deque = deque(range(len(self._entries)))
+        for index, entry in enumerate(self._entries):
+            self._by_key[entry["key"]].append(index)
+        self.hits = 0
+        self.misses = 0
+
+    def _take(self, queue: Optional[deque]) -> Optional[Dict[str, Any]]:
+        while queue:
+            index = queue.popleft()
+            if not self._served[index]:
+                self._served[index] = True
+                return self._entries[index]
+        return None
+
+    @classmethod
+    def from_journal(cls, path: str) -> "ReplayTransport":
+        return cls([e.payload for e in read_journal(path) if e.event_type == EVENT_LLM_RESPONSE])
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        entry = self._take(self._by_key.get(_request_key(request)))
+        if entry is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            entry = self._take(self._in_order)
+            if entry is None:
+                entry = {"status": 200, "body": json.dumps({"response": "", "done": True})}
+        return httpx.Response(
+            entry["status"],
+            headers={"content-type": "application/json"},
+            content=entry["body"].encode("utf-8"),
+            request=request,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Replay: rebuild state from the journal
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SimulationState:
+    """In-memory state folded from journal events - no database or LLM required."""
+    ticks: int = 0
+    employees: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    tasks: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    meetings: Dict[int, str] = field(default_factory=dict)
+    messages: int = 0
+    hires: int = 0
+    fires: int = 0
+    llm_responses: int = 0
+    event_counts: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def apply(self, event: JournalEvent):
+        p = event.payload
+        self.event_counts[event.name] += 1
+        if event.event_type == EVENT_TICK:
+            self.ticks = max(self.ticks, event.tick)
+        elif event.event_type == EVENT_MOVE:
+            self.employees.setdefault(p["employee_id"], {}).update(
+                {attr: p.get(attr) for attr in _MOVE_FIELDS}
+            )
+        elif event.event_type == EVENT_HIRE:
+            self.hires += 1
+            self.employees.setdefault(p["employee_id"], {}).update(dict(p, status="active"))
+        elif event.event_type == EVENT_FIRE:
+            self.fires += 1
+            self.employees.setdefault(p["employee_id"], {})["status"] = "fired"
+        elif event.event_type == EVENT_TASK_PROGRESS:
+            self.tasks[p["task_id"]] = {k: p.get(k) for k in ("employee_id", "progress", "status")}
+        elif event.event_type == EVENT_MEETING_STATUS:
+            self.meetings[p["meeting_id"]] = p["status"]
+        elif event.event_type == EVENT_MESSAGE:
+            self.messages += 1
+        elif event.event_type == EVENT_LLM_RESPONSE:
+            self.llm_responses += 1
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "ticks": self.ticks,
+            "employees_tracked": len(self.employees),
+            "tasks_tracked": len(self.tasks),
+            "meetings_tracked": len(self.meetings),
+            "hires": self.hires,
+            "fires": self.fires,
+            "messages": self.messages,
+            "llm_responses": self.llm_responses,
+            "event_counts": dict(self.event_counts),
+        }
+
+
+def replay_journal(path: str) -> Tuple[SimulationState, float]:
+    """
+    Rebuild simulation state from a journal.
+
+    Returns:
+        (state, seconds taken)
+    """
+    state = SimulationState()
+    started = time.perf_counter()
+    for event in read_journal(path):
+        state.apply(event)
+    return state, time.perf_counter() - started
+
+
+def diff_journals(baseline_path: str, candidate_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Compare two journals event by event, ignoring wall-clock timestamps and LLM payloads.
+
+    Returns:
+        None if the runs are behaviourally identical, otherwise a description of the first divergence
+    """
+    def behavioural(path):
+        for index, event in enumerate(e for e in read_journal(path) if e.event_type != EVENT_LLM_RESPONSE):
+            yield index, (event.event_type, event.tick, event.payload)
+
+    baseline, candidate = behavioural(baseline_path), behavioural(candidate_path)
+    while True:
+        a, b = next(baseline, None), next(candidate, None)
+        if a is None and b is None:
+            return None
+        if a is None or b is None or a[1] != b[1]:
+            index = (a or b)[0]
+            return {
+                "index": index,
+                "baseline": {"type": EVENT_NAMES.get(a[1][0]), "tick": a[1][1], "payload": a[1][2]} if a else None,
+                "candidate": {"type": EVENT_NAMES.get(b[1][0]), "tick": b[1][1], "payload": b[1][2]} if b else None,
+            }
+
+
+# ---------------------------------------------------------------------------
+# Environment wiring
+# ---------------------------------------------------------------------------
+
+def open_journal_from_env() -> Optional[SimulationJournal]:
+    """
+    Configure journaling and LLM replay from environment variables.
+
+    Returns:
+        The active SimulationJournal, or None if recording is disabled
+    """
+    from llm.ollama_client import set_transport_factory, get_transport_factory
+
+    journal = None
+    journal_path = os.getenv("SIMULATION_JOURNAL")
+    replay_path = os.getenv("SIMULATION_REPLAY")
+    base_seed = int(os.getenv("SIMULATION_SEED", "0"))
+
+    if journal_path:
+        journal = SimulationJournal(journal_path, base_seed=base_seed)
+        install_flush_capture(journal)
+        print(f"Simulation journal recording to {journal_path} (seed {base_seed})")
+
+    if replay_path:
+        replay_transport = ReplayTransport.from_journal(replay_path)
+        set_transport_factory(lambda: replay_transport)
+        print(f"LLM responses replayed from {replay_path}")
+    elif journal:
+        # Keep any transport already installed (e.g. the mock backend) underneath the recorder
+        inner_factory = get_transport_factory()
+        set_transport_factory(lambda: RecordingTransport(journal, inner_factory() if inner_factory else None))
+
+    return journal
+
+
+def _main(argv: List[str]) -> int:
+    if len(argv) >= 2 and argv[0] == "replay":
+        state, elapsed = replay_journal(argv[1])
+        summary = state.summary()
+        summary["replay_seconds"] = round(elapsed, 4)
+        print(json.dumps(summary, indent=2))
+        return 0
+    if len(argv) >= 3 and argv[0] == "diff":
+        divergence = diff_journals(argv[1], argv[2])
+        if divergence is None:
+            print("Journals are behaviourally identical.")
+            return 0
+        print(json.dumps(divergence, indent=2, default=str))
+        return 1
+    print(__doc__)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.exit(_main(sys.argv[1:]))
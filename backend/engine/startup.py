@@ -0,0 +1,374 @@
+"""
+Staged server startup.
+
+Only the work the API cannot run without happens before the server starts
+accepting requests: creating/migrating the schema and seeding an empty
+database. Everything else that used to block startup - room assignment,
+minimum-staff hiring, calendar backfills, initial customer reviews and meeting
+history - runs afterwards as tracked background jobs, and the simulation starts
+once they are finished.
+
+Progress is exposed through /api/health/ready (readiness probe) and
+/api/health/startup (per-stage status and timings).
+"""
+import asyncio
+import os
+import time
+import traceback
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from config import now as local_now
+
+MIN_EMPLOYEES = 15
+
+
+class StartupStage:
+    """Status of one startup stage."""
+
+    def __init__(self, name: str, description: str, critical: bool):
+        self.name = name
+        self.description = description
+        self.critical = critical
+        self.status = "pending"  # pending, running, done, skipped, failed
+        self.detail: Optional[str] = None
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        duration = None
+        if self.started_at is not None:
+            duration = round((self.finished_at or time.time()) - self.started_at, 2)
+        return {
+            "name": self.name,
+            "description": self.description,
+            "critical": self.critical,
+            "status": self.status,
+            "detail": self.detail,
+            "error": self.error,
+            "duration_seconds": duration,
+        }
+
+
+class StartupProgress:
+    """Ordered list of startup stages and their status."""
+
+    def __init__(self):
+        self.stages: Dict[str, StartupStage] = {}
+        self.created_at = time.time()
+
+    def register(self, name: str, description: str, critical: bool = False) -> StartupStage:
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = StartupStage(name, description, critical)
+        return stage
+
+    async def run(self, name: str, description: str, func: Callable[[], Awaitable], critical: bool = False):
+        """
+        Run one stage and record its outcome. Errors are logged, not raised,
+        so a failing backfill does not stop the stages after it.
+
+        Returns:
+            The stage function's result, or None if it failed
+        """
+        stage = self.register(name, description, critical)
+        stage.status = "running"
+        stage.started_at = time.time()
+        try:
+            result = await func()
+            stage.status = "done"
+            if isinstance(result, str):
+                stage.detail = result
+            return result
+        except asyncio.CancelledError:
+            stage.status = "failed"
+            stage.error = "cancelled"
+            raise
+        except Exception as e:
+            stage.status = "failed"
+            stage.error = str(e)
+            print(f"❌ Startup stage '{name}' failed: {e}")
+            traceback.print_exc()
+            return None
+        finally:
+            stage.finished_at = time.time()
+
+    def skip(self, name: str, reason: str):
+        stage = self.stages.get(name)
+        if stage is not None and stage.status == "pending":
+            stage.status = "skipped"
+            stage.detail = reason
+
+    @property
+    def ready(self) -> bool:
+        """True once every critical stage has completed successfully."""
+        critical = [s for s in self.stages.values() if s.critical]
+        return bool(critical) and all(s.status == "done" for s in critical)
+
+    @property
+    def complete(self) -> bool:
+        """True once no stage is pending or running."""
+        return all(s.status not in ("pending", "running") for s in self.stages.values())
+
+    def snapshot(self) -> Dict:
+        stages = [s.to_dict() for s in self.stages.values()]
+        finished = sum(1 for s in self.stages.values() if s.status not in ("pending", "running"))
+        return {
+            "ready": self.ready,
+            "complete": self.complete,
+            "progress": round(finished / len(stages), 2) if stages else 0.0,
+            "uptime_seconds": round(time.time() - self.created_at, 1),
+            "stages": stages,
+        }
+
+
+startup_progress = StartupProgress()
+
+
+async def _count_active_employees() -> int:
+    from sqlalchemy import select, func
+    from database.database import async_session_maker
+    from database.models import Employee
+    async with async_session_maker() as db:
+        result = await db.execute(select(func.count(Employee.id)).where(Employee.status == "active"))
+        return result.scalar() or 0
+
+
+async def initialize_database() -> str:
+    """Create/migrate the schema and make sure the shared drive directory exists."""
+    from database.database import init_db
+    await init_db()
+    shared_drive_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared_drive")
+    os.makedirs(shared_drive_path, exist_ok=True)
+    return "schema ready"
+
+
+async def seed_if_empty() -> str:
+    """Seed the initial company when there are no employees yet."""
+    from sqlalchemy import select
+    from database.database import async_session_maker
+    from database.models import Employee
+    async with async_session_maker() as db:
+        result = await db.execute(select(Employee.id).limit(1))
+        if result.scalar_one_or_none() is not None:
+            return "existing data"
+    print("Database is empty. Seeding initial data...")
+    from seed import seed_database
+    await seed_database()
+    print("Database seeded successfully!")
+    return "seeded"
+
+
+async def assign_rooms() -> str:
+    from database.database import async_session_maker
+    from employees.room_assigner import assign_rooms_to_existing_employees
+    print("Assigning rooms to existing employees...")
+    async with async_session_maker() as db:
+        await assign_rooms_to_existing_employees(db)
+    print("Room assignment completed.")
+    return "rooms assigned"
+
+
+async def ensure_minimum_staff() -> str:
+    """Hire up to 5 employees when the office is below the minimum staffing level."""
+    from database.database import async_session_maker
+    from engine.office_simulator import OfficeSimulator
+
+    active_count = await _count_active_employees()
+    if active_count >= MIN_EMPLOYEES:
+        return f"{active_count} active employees"
+
+    employees_needed = MIN_EMPLOYEES - active_count
+    print(f"Office needs minimum {MIN_EMPLOYEES} employees to run. Current: {active_count}. Hiring {employees_needed} employees...")
+    async with async_session_maker() as db:
+        temp_simulator = OfficeSimulator()
+        business_context = await temp_simulator.get_business_context(db)
+        # Hire employees in batches (up to 5 at a time on startup)
+        hires_needed = min(employees_needed, 5)
+        for i in range(hires_needed):
+            await temp_simulator._hire_employee(db, business_context)
+            print(f"Hired employee {i+1}/{hires_needed}")
+    print(f"Startup hiring complete. Active employees: {active_count + hires_needed}")
+    return f"hired {hires_needed}"
+
+
+async def generate_birthday_parties() -> str:
+    """Schedule birthday party meetings for the next 90 days."""
+    from database.database import async_session_maker
+    from business.birthday_manager import BirthdayManager
+    async with async_session_maker() as db:
+        meetings_created = await BirthdayManager(db).generate_birthday_party_meetings(days_ahead=90)
+    if meetings_created > 0:
+        print(f"✅ Generated {meetings_created} birthday party meetings for the calendar.")
+    return f"{meetings_created} birthday parties created"
+
+
+async def generate_holiday_parties() -> str:
+    """Schedule holiday party meetings for the next 3 years so no holiday is missed."""
+    from database.database import async_session_maker
+    from business.holiday_manager import HolidayManager
+    async with async_session_maker() as db:
+        meetings_created = await HolidayManager(db).generate_holiday_meetings(days_ahead=1095)
+    if meetings_created > 0:
+        print(f"✅ Successfully generated {meetings_created} holiday party meetings for the next 3 years.")
+    return f"{meetings_created} holiday parties created"
+
+
+async def generate_initial_customer_reviews() -> str:
+    """Generate customer reviews for completed projects that don't have any yet."""
+    from sqlalchemy import select, func
+    from database.database import async_session_maker
+    from database.models import Project
+    from business.customer_review_manager import CustomerReviewManager
+
+    async with async_session_maker() as db:
+        result = await db.execute(select(func.count(Project.id)).where(Project.status == "completed"))
+        completed_count = result.scalar() or 0
+        if not completed_count:
+            return "no completed projects"
+        # 0 hours means generate for all completed projects (initial generation)
+        reviews_created = await CustomerReviewManager(db).generate_reviews_for_completed_projects(
+            hours_since_completion=0.0
+        )
+    if reviews_created:
+        print(f"⭐ Generated {len(reviews_created)} initial customer review(s) for {completed_count} completed project(s)")
+    return f"{len(reviews_created or [])} reviews created"
+
+
+async def generate_initial_meetings() -> str:
+    """Backfill meetings for the past week and today, and make sure one meeting is in progress."""
+    from sqlalchemy import select, func
+    from database.database import async_session_maker
+    from database.models import Meeting
+    from business.meeting_manager import MeetingManager
+
+    details = []
+    async with async_session_maker() as db:
+        meeting_manager = MeetingManager(db)
+        now = local_now()
+        last_week_start = (now - timedelta(days=7)).replace(hour=0, minute=0, second=0, microsecond=0)
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        tomorrow_start = today_start + timedelta(days=1)
+
+        result = await db.execute(
+            select(func.count(Meeting.id)).where(
+                Meeting.start_time >= last_week_start,
+                Meeting.start_time < tomorrow_start
+            )
+        )
+        if (result.scalar() or 0) == 0:
+            past_meetings = await meeting_manager.generate_meetings_for_date_range(last_week_start, today_start)
+            print(f"📅 Generated {past_meetings} meetings for the past week")
+            today_meetings = await meeting_manager.generate_meetings()
+            print(f"📅 Generated {today_meetings} meetings for today")
+            details.append(f"{past_meetings} past, {today_meetings} today")
+
+        result = await db.execute(select(func.count(Meeting.id)).where(Meeting.status == "in_progress"))
+        if (result.scalar() or 0) == 0:
+            in_progress_meeting = await meeting_manager.generate_in_progress_meeting()
+            if in_progress_meeting:
+                print(f"📅 Generated in-progress meeting: {in_progress_meeting.title}")
+                details.append("in-progress meeting created")
+    return ", ".join(details) or "meetings already present"
+
+
+async def compact_version_history() -> str:
+    """Convert full-text shared drive version rows to reverse deltas, a batch of files at a time."""
+    from database.database import async_session_maker
+    from business.shared_drive_versions import compact_legacy_versions
+    total = 0
+    while True:
+        async with async_session_maker() as db:
+            converted = await compact_legacy_versions(db)
+        if not converted:
+            break
+        total += converted
+    if total:
+        print(f"🗜️ Compacted {total} shared drive version(s) to deltas")
+    return f"{total} versions compacted"
+
+
+async def warm_up_llm() -> str:
+    """Load the LLM and evaluate the shared prompt prefix before the simulation needs them."""
+    from llm.ollama_client import OLLAMA_WARMUP, OllamaClient, get_transport_factory
+    if not OLLAMA_WARMUP:
+        return "disabled (OLLAMA_WARMUP=0)"
+    if get_transport_factory() is not None:
+        return "skipped (LLM traffic goes through a local transport)"
+    client = OllamaClient()
+    try:
+        return await client.warm_up()
+    finally:
+        await client.close()
+
+
+# Background jobs in the order they run after the server is up
+BACKGROUND_JOBS: List = [
+    ("assign_rooms", "Assign rooms to existing employees", assign_rooms),
+    ("minimum_staff", f"Hire up to the minimum of {MIN_EMPLOYEES} employees", ensure_minimum_staff),
+    ("birthday_parties", "Schedule birthday parties (90 days)", generate_birthday_parties),
+    ("holiday_parties", "Schedule holiday parties (3 years)", generate_holiday_parties),
+    ("customer_reviews", "Initial customer reviews for completed projects", generate_initial_customer_reviews),
+    ("initial_meetings", "Meeting history for the past week and today", generate_initial_meetings),
+]
+
+
+def register_stages():
+    """Register every stage up front so the progress view shows the full plan."""
+    startup_progress.register("database", "Create and migrate the database schema", critical=True)
+    startup_progress.register("seed", "Seed an empty database", critical=True)
+    startup_progress.register("llm_warmup", "Load the LLM model and warm its prompt cache")
+    for name, description, _ in BACKGROUND_JOBS:
+        startup_progress.register(name, description)
+    startup_progress.register("simulation", "Start the office simulation")
+    startup_progress.register("version_history", "Compact shared drive version history")
+
+
+async def run_critical_stages() -> bool:
+    """
+    Run the stages the API needs before it can serve requests.
+
+    Returns:
+        True if the database was seeded just now (background backfills are then unnecessary)
+    """
+    register_stages()
+    await startup_progress.run("database", "Create and migrate the database schema", initialize_database, critical=True)
+    seed_result = await startup_progress.run("seed", "Seed an empty database", seed_if_empty, critical=True)
+    return seed_result == "seeded"
+
+
+async def run_background_stages(simulator, freshly_seeded: bool):
+    """
+    Run the backfill jobs one after another, then start the simulation.
+
+    Args:
+        simulator: OfficeSimulator to start once the backfills are done
+        freshly_seeded: Skip the backfills - a new company has nothing to catch up on
+    """
+    from database.admission import set_db_subsystem
+    set_db_subsystem("background")
+    # The model loads while the backfills run; keep the task so it can't be collected mid-run
+    warmup = asyncio.create_task(
+        startup_progress.run("llm_warmup", "Load the LLM model and warm its prompt cache", warm_up_llm)
+    )
+    try:
+        for name, description, func in BACKGROUND_JOBS:
+            if freshly_seeded:
+                startup_progress.skip(name, "database was just seeded")
+                continue
+            await startup_progress.run(name, description, func)
+
+        async def start_simulation():
+            asyncio.create_task(simulator.run())
+            print("Office simulation started...")
+            return "running"
+
+        await startup_progress.run("simulation", "Start the office simulation", start_simulation)
+        # Runs alongside the simulation - converting a large legacy history can take a while
+        await startup_progress.run("version_history", "Compact shared drive version history", compact_version_history)
+        await warmup
+    finally:
+        # Shutdown cancels this coroutine; don't leave the warmup running behind it
+        if not warmup.done():
+            warmup.cancel()
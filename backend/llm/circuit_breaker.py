@@ -0,0 +1,167 @@
+"""
+Circuit breakers for LLM calls.
+
+Without them every LLM call made while Ollama is down or overloaded waits for
+its full timeout before the caller falls back to its template text, and since
+many calls run inside the simulator tick and the message loop, an outage
+stalls the simulation for minutes. A breaker counts consecutive failures:
+
+- closed: calls go through. LLM_BREAKER_FAILURES failures in a row open it.
+- open: calls fail at once with CircuitOpenError, so the caller's existing
+  fallback is used without waiting. After LLM_BREAKER_RESET_SECONDS it turns
+  half-open.
+- half-open: one trial call goes through (the others still fail fast). If it
+  succeeds the breaker closes, otherwise it opens again with the reset time
+  doubled (up to LLM_BREAKER_MAX_RESET_SECONDS).
+
+There is one breaker per Ollama server (in llm.endpoint_pool; a passing health
+probe closes it) and one per call type (the kind passed to
+OllamaClient._make_request_with_fallback), so a call type whose prompts keep
+timing out is cut off while short calls still reach the model. With
+LLM_BREAKER_SLOW_SECONDS set, a call type's calls that succeed but take longer
+than that count as failures too.
+"""
+import os
+import time
+from typing import Dict, Optional
+
+FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURES", "3"))
+RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+MAX_RESET_SECONDS = float(os.getenv("LLM_BREAKER_MAX_RESET_SECONDS", "300"))
+SLOW_CALL_SECONDS = float(os.getenv("LLM_BREAKER_SLOW_SECONDS", "0"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending an LLM request while its circuit is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open trial call."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_seconds: float = RESET_SECONDS,
+        max_reset_seconds: float = MAX_RESET_SECONDS,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.max_reset_seconds = max(reset_seconds, max_reset_seconds)
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.open_for = reset_seconds
+        self.trial_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.opened_at < self.open_for:
+            return OPEN
+        return HALF_OPEN
+
+    def available(self) -> bool:
+        """Whether a call may go through now (without reserving the half-open trial)."""
+        state = self.state
+        return state == CLOSED or (state == HALF_OPEN and not self.trial_in_flight)
+
+    def acquire(self) -> bool:
+        """
+        Let a call through if the breaker allows it.
+
+        Returns:
+            True if the call may proceed (in half-open state it becomes the trial
+            call); False if it must fail fast
+        """
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def check(self):
+        """acquire(), raising CircuitOpenError when the call must fail fast."""
+        if not self.acquire():
+            raise CircuitOpenError(f"LLM circuit '{self.name}' is open ({self.last_error})")
+
+    def record_success(self):
+        if self.opened_at is not None:
+            print(f"✅ LLM circuit '{self.name}' closed")
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.open_for = self.reset_seconds
+        self.trial_in_flight = False
+
+    def record_failure(self, error: Optional[str] = None):
+        if error:
+            self.last_error = error
+        self.consecutive_failures += 1
+        if self.opened_at is not None:
+            # The half-open trial failed (or a call started before opening finished late)
+            if self.trial_in_flight:
+                self.trial_in_flight = False
+                self.open_for = min(self.open_for * 2, self.max_reset_seconds)
+                self.opened_at = time.monotonic()
+            return
+        if self.consecutive_failures >= self.failure_threshold:
+            self.trip()
+
+    def trip(self, error: Optional[str] = None):
+        """Open the breaker now (e.g. after a failed health probe)."""
+        if error:
+            self.last_error = error
+        if self.opened_at is None:
+            self.times_opened += 1
+            print(f"⚡ LLM circuit '{self.name}' opened after {self.consecutive_failures} failure(s): {self.last_error}")
+        self.opened_at = time.monotonic()
+        self.trial_in_flight = False
+
+    def release_trial(self):
+        """Give back the half-open trial without an outcome (the call was never sent)."""
+        self.trial_in_flight = False
+
+    def to_dict(self) -> Dict:
+        state = self.state
+        return {
+            "state": state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected_calls": self.rejected,
+            "retry_in_seconds": (
+                round(max(0.0, self.opened_at + self.open_for - time.monotonic()), 1)
+                if state == OPEN else None
+            ),
+            "last_error": self.last_error,
+        }
+
+
+_method_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def method_breaker(kind: Optional[str]) -> CircuitBreaker:
+    """Breaker of a call type (created on first use)."""
+    kind = kind or "other"
+    breaker = _method_breakers.get(kind)
+    if breaker is None:
+        breaker = _method_breakers[kind] = CircuitBreaker(kind)
+    return breaker
+
+
+def method_report() -> Dict[str, Dict]:
+    return {kind: breaker.to_dict() for kind, breaker in sorted(_method_breakers.items())}
+
+
+def reset_methods():
+    _method_breakers.clear()
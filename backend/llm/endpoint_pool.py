@@ -0,0 +1,351 @@
+"""
+Routing of LLM requests across several Ollama servers.
+
+OLLAMA_ENDPOINTS lists the servers ("http://box1:11434,http://box2:11434=1";
+"=N" caps that server at N concurrent requests, default OLLAMA_MAX_CONCURRENCY).
+Without it the pool is OLLAMA_BASE_URL plus OLLAMA_FALLBACK_URL, routed in
+"primary" mode, which keeps the old behaviour of only using the fallback while
+the main server is down - except that a dead server is now skipped right away
+instead of after a full request timeout.
+
+- Routing (LLM_ROUTING): "least_outstanding" sends a request to the server with
+  the fewest requests in flight relative to its cap (ties go to the faster
+  one), "latency" weighs in-flight requests by each server's recent latency,
+  "primary" uses the first available server in the configured order that
+  has a free slot.
+- A server at its concurrency cap gets no more requests; callers wait for a
+  free slot (LLM_QUEUE_TIMEOUT) rather than piling onto a busy CPU box.
+- A request that fails on one server (connection error, timeout, 5xx, or 404
+  because the model isn't there) is retried on another one, up to
+  LLM_MAX_ATTEMPTS servers.
+- Health: every server has a circuit breaker (llm.circuit_breaker).
+  LLM_UNHEALTHY_AFTER consecutive failures, or a failed probe of its /api/tags
+  (every LLM_HEALTH_INTERVAL seconds, also checking that the configured model
+  is there), open it and take the server out of rotation; a passing probe or a
+  successful half-open trial request brings it back. When every server's
+  circuit is open, requests fail at once with CircuitOpenError.
+
+Per-server request counts, failures, retries, latency and probe results are
+reported at GET /api/debug/llm-endpoints.
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from llm.circuit_breaker import CLOSED, CircuitBreaker, CircuitOpenError
+
+ROUTING_MODES = ("least_outstanding", "latency", "primary")
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "4"))
+HEALTH_INTERVAL = float(os.getenv("LLM_HEALTH_INTERVAL", "15"))
+HEALTH_TIMEOUT = float(os.getenv("LLM_HEALTH_TIMEOUT", "3"))
+UNHEALTHY_AFTER = int(os.getenv("LLM_UNHEALTHY_AFTER", "2"))
+QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "60"))
+# Latency assumed for a server that hasn't answered yet (latency routing)
+DEFAULT_LATENCY_MS = 5000.0
+# Weight of the newest sample in the latency moving average
+EWMA_ALPHA = 0.2
+SAMPLE_WINDOW = 500
+
+
+class LLMEndpointsBusy(TimeoutError):
+    """Raised when no LLM server had a free slot within LLM_QUEUE_TIMEOUT."""
+
+
+def parse_endpoints(spec: str, default_max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> List[Tuple[str, int]]:
+    """
+    Parse "url[=max_concurrency],url..." into (url, max_concurrency) pairs.
+
+    Args:
+        spec: Comma-separated server URLs
+        default_max_concurrency: Cap for servers without "=N"
+
+    Returns:
+        (url without trailing slash, max_concurrency) per server
+    """
+    endpoints = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        url, sep, cap = item.rpartition("=")
+        if not sep or not cap.isdigit():
+            url, cap = item, str(default_max_concurrency)
+        endpoints.append((url.rstrip("/"), max(1, int(cap))))
+    return endpoints
+
+
+def _percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Endpoint:
+    """One Ollama server: its cap, load, health and statistics."""
+
+    def __init__(self, url: str, max_concurrency: int):
+        self.url = url
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.breaker = CircuitBreaker(f"server {url}", failure_threshold=UNHEALTHY_AFTER)
+        self.ewma_ms: Optional[float] = None
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.retried_elsewhere = 0
+        self.last_error: Optional[str] = None
+        self.last_probe: Optional[Dict] = None
+        self.samples: deque = deque(maxlen=SAMPLE_WINDOW)
+
+    def available(self) -> bool:
+        return self.breaker.available()
+
+    def has_capacity(self) -> bool:
+        return self.in_flight < self.max_concurrency
+
+    def record_success(self, latency_ms: float):
+        self.successes += 1
+        self.breaker.record_success()
+        self.samples.append(latency_ms)
+        self.ewma_ms = latency_ms if self.ewma_ms is None else (
+            EWMA_ALPHA * latency_ms + (1 - EWMA_ALPHA) * self.ewma_ms
+        )
+
+    def record_failure(self, error: Exception):
+        self.failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+        self.breaker.record_failure(self.last_error)
+
+    def to_dict(self) -> Dict:
+        samples = sorted(self.samples)
+        return {
+            "url": self.url,
+            "healthy": self.breaker.state == CLOSED,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "requests": self.requests,
+            "successes": self.successes,
+            "failures": self.failures,
+            "retried_elsewhere": self.retried_elsewhere,
+            "ewma_latency_ms": round(self.ewma_ms, 1) if self.ewma_ms is not None else None,
+            "p50_latency_ms": round(_percentile(samples, 50), 1),
+            "p99_latency_ms": round(_percentile(samples, 99), 1),
+            "last_error": self.last_error,
+            "last_probe": self.last_probe,
+            "circuit": self.breaker.to_dict(),
+        }
+
+
+class EndpointPool:
+    """Routes requests to Ollama servers with per-server caps, retries and health probes."""
+
+    def __init__(
+        self,
+        endpoints: List[Tuple[str, int]],
+        model: str,
+        routing: str = "least_outstanding",
+        max_attempts: Optional[int] = None,
+        queue_timeout: float = QUEUE_TIMEOUT,
+        health_interval: float = HEALTH_INTERVAL,
+        health_timeout: float = HEALTH_TIMEOUT,
+        probing_allowed: Callable[[], bool] = lambda: True,
+    ):
+        if not endpoints:
+            raise ValueError("EndpointPool needs at least one endpoint")
+        if routing not in ROUTING_MODES:
+            raise ValueError(f"Unknown LLM routing '{routing}' (expected one of {', '.join(ROUTING_MODES)})")
+        self.endpoints = [Endpoint(url, cap) for url, cap in endpoints]
+        self.model = model
+        self.routing = routing
+        self.max_attempts = max(1, min(max_attempts or len(self.endpoints), len(self.endpoints)))
+        self.queue_timeout = queue_timeout
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self._probing_allowed = probing_allowed
+        self._waiters: deque = deque()
+        self._probe_task: Optional[asyncio.Task] = None
+        self._probe_loop_ref = None
+        self.queued = 0
+        self.queue_timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    # --- Routing ---
+
+    def _pick(self, exclude: List[Endpoint]) -> Tuple[Optional[Endpoint], bool]:
+        """
+        Returns:
+            (endpoint with a free slot or None, whether any usable server is left at all)
+        """
+        candidates = [e for e in self.endpoints if e not in exclude and e.available()]
+        if not candidates:
+            return None, False
+
+        free = [e for e in candidates if e.has_capacity()]
+        if not free:
+            return None, True
+        if self.routing == "primary":
+            return free[0], True
+        if self.routing == "latency":
+            return min(free, key=lambda e: (e.in_flight + 1) * (e.ewma_ms or DEFAULT_LATENCY_MS)), True
+        return min(free, key=lambda e: (e.in_flight / e.max_concurrency, e.ewma_ms or 0.0)), True
+
+    async def _acquire(self, exclude: List[Endpoint]) -> Optional[Endpoint]:
+        """Take a slot on the best server not in exclude, waiting while all are at their cap."""
+        deadline = None
+        started = None
+        while True:
+            endpoint, any_left = self._pick(exclude)
+            if endpoint is not None and endpoint.breaker.acquire():
+                endpoint.in_flight += 1
+                endpoint.peak_in_flight = max(endpoint.peak_in_flight, endpoint.in_flight)
+                endpoint.requests += 1
+                if started is not None:
+                    wait_ms = (time.perf_counter() - started) * 1000
+                    self.total_wait_ms += wait_ms
+                    self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+                return endpoint
+            if endpoint is not None:
+                continue  # Another request took the half-open trial first
+            if not any_left:
+                return None
+            if started is None:
+                started = time.perf_counter()
+                deadline = started + self.queue_timeout
+                self.queued += 1
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                self.queue_timeouts += 1
+                raise LLMEndpointsBusy(f"No LLM server had a free slot within {self.queue_timeout:.0f}s")
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                # Also wake up periodically: a server may come back without a slot being released
+                await asyncio.wait_for(waiter, min(remaining, 1.0))
+            except asyncio.TimeoutError:
+                pass
+
+    def _release(self, endpoint: Endpoint):
+        endpoint.in_flight -= 1
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    async def post(self, client: httpx.AsyncClient, path: str, json_data: Dict, timeout=httpx.USE_CLIENT_DEFAULT) -> httpx.Response:
+        """
+        POST to the best available server, retrying on other servers if it fails.
+
+        Args:
+            client: HTTP client to send the request with
+            path: API path (e.g. "/api/generate")
+            json_data: JSON body
+            timeout: Per-request httpx timeout
+
+        Returns:
+            The successful response
+
+        Raises:
+            httpx.HTTPError: The last server's error once every attempt failed (or a 4xx reply)
+            LLMEndpointsBusy: Every server stayed at its concurrency cap for LLM_QUEUE_TIMEOUT
+            CircuitOpenError: Every server's circuit is open
+        """
+        self._ensure_probing()
+        tried: List[Endpoint] = []
+        last_error: Optional[Exception] = None
+        while len(tried) < self.max_attempts:
+            endpoint = await self._acquire(tried)
+            if endpoint is None:
+                break
+            if tried:
+                tried[-1].retried_elsewhere += 1
+            tried.append(endpoint)
+            # Right after acquiring, a reserved trial can only be this request's
+            is_trial = endpoint.breaker.trial_in_flight
+            started = time.perf_counter()
+            try:
+                response = await client.post(f"{endpoint.url}{path}", json=json_data, timeout=timeout)
+                if response.status_code >= 500 or response.status_code == 404:
+                    response.raise_for_status()
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                endpoint.record_failure(e)
+                last_error = e
+                if len(tried) < self.max_attempts and len(tried) < len(self.endpoints):
+                    print(f"⚠️  LLM server {endpoint.url} failed ({type(e).__name__}: {e}), retrying on another server")
+                continue
+            except BaseException:
+                # Cancelled or unexpected error: no verdict on the server
+                if is_trial:
+                    endpoint.breaker.release_trial()
+                raise
+            finally:
+                self._release(endpoint)
+            endpoint.record_success((time.perf_counter() - started) * 1000)
+            response.raise_for_status()
+            return response
+        if last_error is not None:
+            raise last_error
+        raise CircuitOpenError("Every LLM server's circuit is open")
+
+    # --- Health probes ---
+
+    def _ensure_probing(self):
+        if self.health_interval <= 0 or not self._probing_allowed():
+            return
+        loop = asyncio.get_running_loop()
+        if self._probe_task is None or self._probe_task.done() or self._probe_loop_ref is not loop:
+            self._probe_loop_ref = loop
+            self._probe_task = loop.create_task(self._probe_loop())
+
+    async def _probe_loop(self):
+        async with httpx.AsyncClient(timeout=self.health_timeout, verify=False) as client:
+            while self._probing_allowed():
+                await asyncio.gather(*(self.probe(client, e) for e in self.endpoints))
+                await asyncio.sleep(self.health_interval)
+
+    async def probe(self, client: httpx.AsyncClient, endpoint: Endpoint) -> bool:
+        """Check that a server answers /api/tags and has the model; update its health."""
+        started = time.perf_counter()
+        error = None
+        try:
+            response = await client.get(f"{endpoint.url}/api/tags")
+            response.raise_for_status()
+            names = {m.get("name", "") for m in response.json().get("models", [])}
+            if names and self.model not in names and f"{self.model}:latest" not in names:
+                error = f"model {self.model} not available"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        endpoint.last_probe = {
+            "at": time.time(),
+            "ok": error is None,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "error": error,
+        }
+        if error is None:
+            endpoint.breaker.record_success()
+        else:
+            endpoint.last_error = error
+            endpoint.breaker.trip(error)
+        return error is None
+
+    def snapshot(self) -> Dict:
+        return {
+            "routing": self.routing,
+            "max_attempts": self.max_attempts,
+            "health_interval_seconds": self.health_interval,
+            "probing": self.health_interval > 0 and self._probing_allowed(),
+            "queued": self.queued,
+            "queue_timeouts": self.queue_timeouts,
+            "waiting": len(self._waiters),
+            "avg_queue_wait_ms": round(self.total_wait_ms / self.queued, 1) if self.queued else 0.0,
+            "max_queue_wait_ms": round(self.max_wait_ms, 1),
+            "endpoints": [e.to_dict() for e in self.endpoints],
+        }
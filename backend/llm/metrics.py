@@ -0,0 +1,103 @@
+"""
+Token and timing metrics of LLM calls.
+
+Ollama reports, with every non-streaming reply, how many prompt tokens it had to
+evaluate (prompt_eval_count - tokens reused from its prompt cache are not
+counted), how many it generated (eval_count), how long each phase took and how
+long loading the model took (load_duration, non-zero only when the model was not
+in memory). The numbers are aggregated per call type for
+GET /api/debug/llm-metrics.
+"""
+import time
+from typing import Dict, Optional
+
+# A load_duration above this means the model was (re)loaded for the request
+MODEL_LOAD_THRESHOLD_MS = 500.0
+
+
+def _ms(nanoseconds) -> float:
+    return (nanoseconds or 0) / 1_000_000
+
+
+class _CallStats:
+    __slots__ = (
+        "calls", "prompt_tokens", "eval_tokens", "prompt_eval_ms", "eval_ms",
+        "load_ms", "model_loads", "total_ms", "wall_ms",
+    )
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.eval_tokens = 0
+        self.prompt_eval_ms = 0.0
+        self.eval_ms = 0.0
+        self.load_ms = 0.0
+        self.model_loads = 0
+        self.total_ms = 0.0
+        self.wall_ms = 0.0
+
+    def add(self, body: Dict, wall_ms: float):
+        self.calls += 1
+        self.prompt_tokens += body.get("prompt_eval_count") or 0
+        self.eval_tokens += body.get("eval_count") or 0
+        self.prompt_eval_ms += _ms(body.get("prompt_eval_duration"))
+        self.eval_ms += _ms(body.get("eval_duration"))
+        load_ms = _ms(body.get("load_duration"))
+        self.load_ms += load_ms
+        if load_ms > MODEL_LOAD_THRESHOLD_MS:
+            self.model_loads += 1
+        self.total_ms += _ms(body.get("total_duration"))
+        self.wall_ms += wall_ms
+
+    def to_dict(self) -> Dict:
+        calls = self.calls or 1
+        return {
+            "calls": self.calls,
+            "avg_prompt_tokens": round(self.prompt_tokens / calls, 1),
+            "avg_eval_tokens": round(self.eval_tokens / calls, 1),
+            "avg_prompt_eval_ms": round(self.prompt_eval_ms / calls, 1),
+            "avg_eval_ms": round(self.eval_ms / calls, 1),
+            "avg_wall_ms": round(self.wall_ms / calls, 1),
+            "prompt_tokens_per_second": round(self.prompt_tokens / (self.prompt_eval_ms / 1000), 1) if self.prompt_eval_ms else None,
+            "eval_tokens_per_second": round(self.eval_tokens / (self.eval_ms / 1000), 1) if self.eval_ms else None,
+            "prompt_eval_share": round(self.prompt_eval_ms / self.total_ms, 3) if self.total_ms else None,
+            "model_loads": self.model_loads,
+            "total_load_ms": round(self.load_ms, 1),
+        }
+
+
+_overall = _CallStats()
+_per_kind: Dict[str, _CallStats] = {}
+_since = time.time()
+
+
+def record(kind: Optional[str], body: Dict, wall_ms: float):
+    """
+    Add one reply's counters.
+
+    Args:
+        kind: Call type (e.g. "decision", "thoughts"); None is reported as "other"
+        body: Parsed JSON reply from Ollama
+        wall_ms: Time from sending the request to receiving the reply
+    """
+    kind = kind or "other"
+    stats = _per_kind.get(kind)
+    if stats is None:
+        stats = _per_kind[kind] = _CallStats()
+    stats.add(body, wall_ms)
+    _overall.add(body, wall_ms)
+
+
+def get_report() -> Dict:
+    return {
+        "since": _since,
+        "overall": _overall.to_dict(),
+        "by_kind": {kind: stats.to_dict() for kind, stats in sorted(_per_kind.items())},
+    }
+
+
+def reset():
+    global _overall, _since
+    _overall = _CallStats()
+    _per_kind.clear()
+    _since = time.time()
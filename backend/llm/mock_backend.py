@@ -0,0 +1,155 @@
+"""
+Deterministic stand-in for the Ollama HTTP API.
+
+Headless runs and benchmarks use this instead of a real model so that a day of
+office life can be simulated in seconds and two runs with the same seed produce
+the same text. It plugs in as an httpx transport (see set_transport_factory in
+llm.ollama_client), so none of the call sites need to know it exists.
+
+Supported endpoints: /api/generate, /api/chat and /api/tags. JSON-mode requests
+("format": "json") are answered with an object whose keys are taken from the
+JSON template embedded in the prompt, so callers parse it like a real reply.
+"""
+import hashlib
+import json
+import random
+import re
+from typing import Dict, Optional
+
+import httpx
+
+
+FIRST_NAMES = [
+    "Alexandra", "Benjamin", "Catherine", "Daniel", "Elena", "Felix", "Grace", "Hector",
+    "Isabel", "Julian", "Keiko", "Lucas", "Maya", "Nathan", "Olivia", "Priya",
+    "Quentin", "Rosa", "Samuel", "Tara", "Umar", "Vera", "Wesley", "Ximena", "Yusuf", "Zoe",
+]
+LAST_NAMES = [
+    "Bennett", "Chen", "Rodriguez", "Kim", "Okafor", "Novak", "Watson", "Silva",
+    "Tanaka", "Murphy", "Haddad", "Larsen", "Patel", "Moreau", "Schmidt", "Ivanova",
+    "Nguyen", "Costa", "Fischer", "Mendes", "Abara", "Lindqvist", "Romero", "Walsh",
+]
+SENTENCES = [
+    "I'll take a look at this and follow up shortly.",
+    "Sounds good, let's keep the momentum going on the current project.",
+    "I've made progress on my tasks and will share an update later today.",
+    "Thanks for the heads-up, I'll coordinate with the team.",
+    "Let's review the numbers together before the next meeting.",
+    "I'm focusing on the deliverables that are due this week.",
+    "Good idea - I'll add it to the plan.",
+    "I need a few more details before I can move forward with this.",
+]
+
+# "Generate 8 different names" - batch name requests get one name per line
+_NAME_COUNT = re.compile(r"Generate (\d+) different names")
+# Matches "key": <value> lines of the JSON templates embedded in prompts
+_TEMPLATE_FIELD = re.compile(r'"([A-Za-z_][A-Za-z0-9_]*)"\s*:\s*(.+?)\s*,?\s*$', re.MULTILINE)
+
+
+class DeterministicLLMTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that answers Ollama API calls locally and deterministically.
+
+    The reply for a request depends only on the seed and the request body, so
+    replies are stable across runs regardless of the order of concurrent calls.
+    """
+
+    def __init__(self, seed: int = 0, model: str = "mock"):
+        self.seed = seed
+        self.model = model
+        self.request_count = 0
+
+    def _rng(self, payload: Dict) -> random.Random:
+        body = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        digest = hashlib.sha256(body).digest()
+        return random.Random(self.seed ^ int.from_bytes(digest[:8], "little"))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.request_count += 1
+        path = request.url.path
+        if path.endswith("/api/tags"):
+            return httpx.Response(200, json={"models": [{"name": self.model}]}, request=request)
+
+        try:
+            payload = json.loads(await request.aread() or b"{}")
+        except ValueError:
+            payload = {}
+        rng = self._rng(payload)
+
+        if path.endswith("/api/chat"):
+            messages = payload.get("messages") or []
+            prompt = messages[-1].get("content", "") if messages else ""
+            text = self.complete(prompt, json_mode=payload.get("format") == "json", rng=rng)
+            body = {"model": self.model, "message": {"role": "assistant", "content": text}, "done": True}
+        elif path.endswith("/api/generate"):
+            prompt = payload.get("prompt", "")
+            text = self.complete(prompt, json_mode=payload.get("format") == "json", rng=rng)
+            body = {"model": self.model, "response": text, "done": True}
+        else:
+            return httpx.Response(404, json={"error": f"unsupported endpoint {path}"}, request=request)
+
+        body["prompt_eval_count"] = len(prompt.split()) + len(str(payload.get("system", "")).split())
+        body["eval_count"] = len(text.split())
+        return httpx.Response(200, json=body, request=request)
+
+    def complete(self, prompt: str, json_mode: bool = False, rng: Optional[random.Random] = None) -> str:
+        """
+        Produce the reply text for a prompt.
+
+        Args:
+            prompt: Prompt sent by the caller
+            json_mode: True if the caller asked for a JSON object
+            rng: Seeded random generator for this request
+
+        Returns:
+            Reply text
+        """
+        rng = rng or random.Random(self.seed)
+        if json_mode:
+            return json.dumps(self._fill_template(prompt, rng))
+        if "FirstName LastName" in prompt or "PERSON'S NAME" in prompt:
+            count = _NAME_COUNT.search(prompt)
+            return "\n".join(
+                f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+                for _ in range(int(count.group(1)) if count else 1)
+            )
+        return " ".join(rng.sample(SENTENCES, 2))
+
+    def _fill_template(self, prompt: str, rng: random.Random) -> Dict:
+        """Build an object with the keys of the last JSON template in the prompt."""
+        end = prompt.rfind("}")
+        start, depth = end, 0
+        while start >= 0:
+            if prompt[start] == "}":
+                depth += 1
+            elif prompt[start] == "{":
+                depth -= 1
+                if depth == 0:
+                    break
+            start -= 1
+        template = prompt[start:end + 1] if start >= 0 else ""
+        result = {}
+        for key, raw in _TEMPLATE_FIELD.findall(template):
+            result[key] = self._fill_value(raw, rng)
+        if not result:
+            result = {"response": rng.choice(SENTENCES)}
+        return result
+
+    def _fill_value(self, raw: str, rng: random.Random):
+        raw = raw.strip().rstrip(",")
+        if raw.startswith("["):
+            return [rng.choice(SENTENCES)]
+        if raw.startswith("{"):
+            return {}
+        if raw in ("true", "false"):
+            return raw == "true"
+        if re.match(r"^-?\d", raw):
+            return round(rng.uniform(0.5, 0.9), 2) if "." in raw else rng.randint(1, 5)
+        text = raw.strip('"')
+        if "one of:" in text:
+            options = [o.strip() for o in text.split("one of:", 1)[1].split(",") if o.strip()]
+            if options:
+                return rng.choice(options)
+        if "|" in text:
+            return rng.choice([o.strip() for o in text.split("|") if o.strip()])
+        return rng.choice(SENTENCES)
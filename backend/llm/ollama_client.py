@@ -1,18 +1,112 @@
 import httpx
 import json
+import time
 from typing import Dict, List, Optional
 import os
 import random
 
+from llm import metrics as llm_metrics
+from llm.circuit_breaker import SLOW_CALL_SECONDS, method_breaker
+from llm.endpoint_pool import EndpointPool, LLMEndpointsBusy, parse_endpoints
+from llm.prompts import SYSTEM_PREAMBLE, PromptLayout, business_summary, format_money, persona
+
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_FALLBACK_URL = os.getenv("OLLAMA_FALLBACK_URL", None)
 # Default to llama3.2 or gemma3, preferring llama3.2
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2")
 
+
+def _parse_keep_alive(value: str):
+    """Ollama accepts a duration string ("30m") or a number of seconds (-1 = forever)."""
+    value = value.strip()
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+# How long Ollama keeps the model loaded after a request (sent with every request)
+OLLAMA_KEEP_ALIVE = _parse_keep_alive(os.getenv("OLLAMA_KEEP_ALIVE", "30m"))
+# Load the model and evaluate the shared system prefix at startup
+OLLAMA_WARMUP = os.getenv("OLLAMA_WARMUP", "1").lower() not in ("0", "false", "no", "off")
+
+# Optional factory returning an httpx transport for every OllamaClient's HTTP client.
+# Used by the simulation journal to record/replay LLM responses without touching call sites.
+_transport_factory = None
+
+
+def set_transport_factory(factory):
+    """
+    Route all LLM HTTP traffic through a custom httpx transport.
+    
+    Args:
+        factory: Callable returning an httpx.AsyncBaseTransport, or None to use the network directly.
+                 Only affects clients created after the call.
+    """
+    global _transport_factory
+    _transport_factory = factory
+
+
+def get_transport_factory():
+    """Get the transport factory currently installed with set_transport_factory, or None."""
+    return _transport_factory
+
+
+def use_mock_backend(seed: int = 0):
+    """
+    Answer every LLM request with the deterministic local mock instead of Ollama.
+    
+    Args:
+        seed: Seed for the generated text; the same seed gives the same replies
+    """
+    from llm.mock_backend import DeterministicLLMTransport
+    transport = DeterministicLLMTransport(seed=seed)
+    set_transport_factory(lambda: transport)
+    return transport
+
+
+# Number of LLM requests currently waiting on a response, across all clients
+_requests_in_flight = 0
+
+
+def llm_requests_in_flight() -> int:
+    """Number of LLM requests currently in progress (used to find idle time for background generation)."""
+    return _requests_in_flight
+
+
+# OLLAMA_ENDPOINTS lists every Ollama server; without it, the base URL and the fallback URL
+OLLAMA_ENDPOINTS = os.getenv("OLLAMA_ENDPOINTS", "")
+LLM_ROUTING = os.getenv("LLM_ROUTING", "least_outstanding" if OLLAMA_ENDPOINTS else "primary")
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "3"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "3"))
+
+_endpoint_pool: Optional[EndpointPool] = None
+
+
+def get_endpoint_pool() -> EndpointPool:
+    """The Ollama server pool shared by every OllamaClient (created on first use)."""
+    global _endpoint_pool
+    if _endpoint_pool is None:
+        spec = OLLAMA_ENDPOINTS or ",".join(u for u in (OLLAMA_BASE_URL, OLLAMA_FALLBACK_URL) if u)
+        _endpoint_pool = EndpointPool(
+            parse_endpoints(spec),
+            model=OLLAMA_MODEL,
+            routing=LLM_ROUTING,
+            max_attempts=LLM_MAX_ATTEMPTS,
+            # Recorded/replayed/mock traffic never reaches a server, so there is nothing to probe
+            probing_allowed=lambda: _transport_factory is None,
+        )
+    return _endpoint_pool
+
+
+# LLM_BACKEND=mock runs the whole simulation against the deterministic mock (no Ollama needed)
+if os.getenv("LLM_BACKEND", "ollama").lower() == "mock":
+    use_mock_backend(int(os.getenv("SIMULATION_SEED", "0")))
+
 class OllamaClient:
     def __init__(self):
-        self.base_url = OLLAMA_BASE_URL
-        self.fallback_url = OLLAMA_FALLBACK_URL
+        pool = get_endpoint_pool()
+        self.base_url = pool.endpoints[0].url
         self.model = OLLAMA_MODEL
         self._client = None
     
@@ -22,54 +116,121 @@ class OllamaClient:
             # For HTTP connections, we can disable SSL verification
             # Since we're using localhost HTTP, SSL isn't needed
             self._client = httpx.AsyncClient(
-                timeout=60.0,
-                verify=False  # Disable SSL verification for localhost HTTP
+                # A short connect timeout so a dead server is skipped quickly
+                timeout=httpx.Timeout(60.0, connect=LLM_CONNECT_TIMEOUT),
+                verify=False,  # Disable SSL verification for localhost HTTP
+                transport=_transport_factory() if _transport_factory else None
             )
         return self._client
     
-    async def _make_request_with_fallback(self, endpoint: str, json_data: Dict) -> httpx.Response:
+    async def _make_request_with_fallback(
+        self,
+        endpoint: str,
+        json_data: Dict,
+        timeout=httpx.USE_CLIENT_DEFAULT,
+        kind: Optional[str] = None
+    ) -> httpx.Response:
         """
-        Make an HTTP request to Ollama with automatic fallback to fallback URL if main URL fails.
+        Make an HTTP request to Ollama through the endpoint pool (retried on another server if one fails).
+        
+        Fails at once with CircuitOpenError while the circuit of the call type (or of every
+        server) is open, so callers go straight to their fallback instead of waiting for a timeout.
         
         Args:
             endpoint: API endpoint (e.g., "/api/generate")
             json_data: JSON payload for the request
+            timeout: Per-request httpx timeout (defaults to the client's 60 s)
+            kind: Call type the reply's token counts and timings are recorded under
             
         Returns:
             httpx.Response object
             
         Raises:
-            Exception: If both main and fallback URLs fail
+            CircuitOpenError: If the call type's or every server's circuit is open
+            Exception: If every server tried failed
         """
+        global _requests_in_flight
+        breaker = method_breaker(kind)
+        breaker.check()
+        # Right after check(), a reserved half-open trial can only be this call's
+        is_trial = breaker.trial_in_flight
         client = await self._get_client()
-        
-        # Try main URL first
+        if endpoint in ("/api/generate", "/api/chat") and "keep_alive" not in json_data:
+            json_data = {**json_data, "keep_alive": OLLAMA_KEEP_ALIVE}
+        _requests_in_flight += 1
+        started = time.perf_counter()
         try:
-            response = await client.post(
-                f"{self.base_url}{endpoint}",
-                json=json_data
-            )
-            response.raise_for_status()
-            return response
-        except Exception as e:
-            # If main URL fails and we have a fallback URL, try it
-            if self.fallback_url:
-                print(f"⚠️  Main Ollama server ({self.base_url}) failed: {e}")
-                print(f"🔄 Attempting fallback to {self.fallback_url}")
-                try:
-                    response = await client.post(
-                        f"{self.fallback_url}{endpoint}",
-                        json=json_data
-                    )
-                    response.raise_for_status()
-                    print(f"✅ Successfully connected to fallback Ollama server")
-                    return response
-                except Exception as fallback_error:
-                    print(f"❌ Fallback Ollama server ({self.fallback_url}) also failed: {fallback_error}")
-                    raise fallback_error
-            else:
-                # No fallback URL configured, raise the original error
-                raise e
+            response = await get_endpoint_pool().post(client, endpoint, json_data, timeout)
+        except (httpx.HTTPError, LLMEndpointsBusy) as e:
+            breaker.record_failure(f"{type(e).__name__}: {e}")
+            raise
+        except BaseException:
+            # Servers unavailable, cancelled, or unexpected: no verdict on this call type
+            if is_trial:
+                breaker.release_trial()
+            raise
+        finally:
+            _requests_in_flight -= 1
+        elapsed = time.perf_counter() - started
+        if SLOW_CALL_SECONDS and elapsed > SLOW_CALL_SECONDS:
+            breaker.record_failure(f"slow call ({elapsed:.1f}s)")
+        else:
+            breaker.record_success()
+        if not json_data.get("stream", True):
+            try:
+                llm_metrics.record(kind, response.json(), elapsed * 1000)
+            except ValueError:
+                pass
+        return response
+    
+    async def _generate(self, kind: str, layout: PromptLayout, json_mode: bool = False) -> Dict:
+        """
+        Send a prompt built with PromptLayout to /api/generate.
+        
+        Args:
+            kind: Call type for the metrics
+            layout: Prompt parts; the stable parts go in "system", the rest in "prompt"
+            json_mode: Ask Ollama for a JSON object
+            
+        Returns:
+            Parsed reply body
+        """
+        payload = {
+            "model": self.model,
+            "system": layout.system,
+            "prompt": layout.prompt,
+            "stream": False,
+        }
+        if json_mode:
+            payload["format"] = "json"
+        response = await self._make_request_with_fallback("/api/generate", payload, kind=kind)
+        return response.json()
+    
+    async def warm_up(self) -> str:
+        """
+        Load the model and evaluate the shared system prefix so the first simulation
+        calls don't pay for either.
+        
+        Returns:
+            Short description of the result (for the startup progress view)
+        """
+        started = time.perf_counter()
+        # An empty prompt only loads the model
+        await self._make_request_with_fallback(
+            "/api/generate", {"model": self.model, "prompt": "", "stream": False}, kind="warmup"
+        )
+        await self._make_request_with_fallback(
+            "/api/generate",
+            {
+                "model": self.model,
+                "system": SYSTEM_PREAMBLE,
+                "prompt": "Reply with OK.",
+                "stream": False,
+                "options": {"num_predict": 1},
+            },
+            kind="warmup",
+        )
+        return f"{self.model} loaded in {time.perf_counter() - started:.1f}s (keep_alive={OLLAMA_KEEP_ALIVE})"
     
     async def generate_decision(
         self,
@@ -82,47 +243,24 @@ class OllamaClient:
         available_options: List[str]
     ) -> Dict:
         """Generate a decision for an employee based on their context."""
-        
-        personality_str = ", ".join(personality_traits) if personality_traits else "balanced"
-        
-        prompt = f"""You are {employee_name}, {employee_title} at a growing company.
-
-Your backstory: {employee_backstory}
-
-Your role: {employee_role}
-Your personality traits: {personality_str}
-
-Current business situation:
-- Revenue: ${business_context.get('revenue', 0):,.2f}
-- Profit: ${business_context.get('profit', 0):,.2f}
-- Active projects: {business_context.get('active_projects', 0)}
-- Employees: {business_context.get('employee_count', 0)}
-- Business goals: {business_context.get('goals', [])}
-
-Available actions you could take:
-{chr(10).join(f"- {opt}" for opt in available_options)}
-
-Based on your role, personality, backstory, and the current business situation, what decision would you make?
+        layout = (
+            PromptLayout(persona(employee_name, employee_title, employee_role, personality_traits, employee_backstory))
+            .instructions("Decide what to do next, based on your role, personality, backstory, and the current business situation and available actions below.")
+            .context(business_summary(business_context, ("revenue", "profit", "active_projects", "employee_count", "goals")))
+            .context("Available actions you could take:\n" + "\n".join(f"- {opt}" for opt in available_options))
+            .respond("""What decision would you make?
 
 Respond in JSON format with:
-{{
+{
     "decision": "brief description of your decision",
     "reasoning": "why you made this decision",
     "action_type": "one of: strategic, tactical, operational",
     "confidence": 0.0-1.0
-}}"""
+}""")
+        )
 
         try:
-            response = await self._make_request_with_fallback(
-                "/api/generate",
-                {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "format": "json"
-                }
-            )
-            result = response.json()
+            result = await self._generate("decision", layout, json_mode=True)
             
             # Extract JSON from response
             response_text = result.get("response", "")
@@ -178,7 +316,8 @@ Provide a brief analysis (2-3 sentences) of the situation."""
                     "model": self.model,
                     "prompt": prompt,
                     "stream": False
-                }
+                },
+                kind="analysis"
             )
             result = response.json()
             return result.get("response", "Situation analysis unavailable")
@@ -209,7 +348,8 @@ Provide a plan in JSON format:
                     "prompt": prompt,
                     "stream": False,
                     "format": "json"
-                }
+                },
+                kind="plan"
             )
             result = response.json()
             response_text = result.get("response", "")
@@ -238,8 +378,17 @@ Provide a plan in JSON format:
                 "resources_needed": []
             }
     
-    async def generate_response(self, prompt: str) -> str:
-        """Generate a text response from a prompt."""
+    async def generate_response(self, prompt: str, kind: str = "response") -> str:
+        """
+        Generate a text response from a prompt.
+        
+        Args:
+            prompt: Full prompt text
+            kind: Call type for the metrics and the circuit breaker
+            
+        Returns:
+            The response text, or "" if the call failed (callers use their fallback text)
+        """
         try:
             response = await self._make_request_with_fallback(
                 "/api/generate",
@@ -247,7 +396,8 @@ Provide a plan in JSON format:
                     "model": self.model,
                     "prompt": prompt,
                     "stream": False
-                }
+                },
+                kind=kind
             )
             result = response.json()
             return result.get("response", "").strip()
@@ -269,31 +419,9 @@ Provide a plan in JSON format:
         business_context: Dict = None
     ) -> str:
         """Generate an email response to any type of email (questions, updates, information, etc.)."""
-        personality_str = ", ".join(recipient_personality) if recipient_personality else "balanced"
-        business_info = ""
-        if business_context:
-            business_info = f"""
-Current business situation:
-- Revenue: ${business_context.get('revenue', 0):,.2f}
-- Profit: ${business_context.get('profit', 0):,.2f}
-- Active projects: {business_context.get('active_projects', 0)}
-"""
-        
-        project_info = f"\nYou are currently working on project: {project_context}" if project_context else ""
-        
-        prompt = f"""You are {recipient_name}, {recipient_title} at a company. You received an email from {sender_name} ({sender_title}).
-
-Your personality traits: {personality_str}
-Your role: {recipient_role}
-{project_info}
-{business_info}
-
-Original email from {sender_name}:
-Subject: {original_subject}
-
-{original_body}
-
-Write a professional, helpful email response. The response should:
+        layout = (
+            PromptLayout(persona(recipient_name, recipient_title, recipient_role, recipient_personality))
+            .instructions("""You received the email below. Write a professional, helpful email response. The response should:
 1. Always respond - acknowledge the email even if it's just an update or information sharing
 2. If there's a question or request, address it directly
 3. If it's an update or information, acknowledge it and add a brief relevant comment or follow-up
@@ -301,20 +429,18 @@ Write a professional, helpful email response. The response should:
 5. Be concise but complete (2-4 sentences)
 6. Use a professional but friendly tone
 7. Keep the conversation going naturally - show engagement with the content
-8. If you don't know something, offer to help find out or suggest next steps
+8. If you don't know something, offer to help find out or suggest next steps""")
+            .context(f"You are currently working on project: {project_context}" if project_context else None)
+            .context(business_summary(business_context, ("revenue", "profit", "active_projects")))
+            .context(f"""Original email from {sender_name} ({sender_title}):
+Subject: {original_subject}
 
-Write only the email body (no subject line, no signature - just the message content)."""
+{original_body}""")
+            .respond("Write only the email body (no subject line, no signature - just the message content).")
+        )
 
         try:
-            response = await self._make_request_with_fallback(
-                "/api/generate",
-                {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False
-                }
-            )
-            result = response.json()
+            result = await self._generate("email_response", layout)
             response_text = result.get("response", "").strip()
             
             # Clean up the response (remove markdown formatting if present)
@@ -343,55 +469,24 @@ Write only the email body (no subject line, no signature - just the message cont
         business_context: Dict = None
     ) -> str:
         """Generate a chat response to a question or request."""
-        personality_str = ", ".join(recipient_personality) if recipient_personality else "balanced"
-        
-        # Build work context section
-        work_context_section = ""
-        if project_context:
-            work_context_section = f"\nCurrent work context: {project_context}"
-        
-        # Build business context section
-        business_context_section = ""
-        if business_context:
-            business_parts = []
-            if business_context.get("revenue"):
-                business_parts.append(f"Company revenue: ${business_context['revenue']:,.2f}")
-            if business_context.get("profit"):
-                business_parts.append(f"Company profit: ${business_context['profit']:,.2f}")
-            if business_context.get("active_projects"):
-                business_parts.append(f"Active projects: {business_context['active_projects']}")
-            if business_parts:
-                business_context_section = f"\nCompany status: {', '.join(business_parts)}"
-        
-        prompt = f"""You are {recipient_name}, {recipient_title} at a company. You received a chat message from {sender_name} ({sender_title}).
-
-Your personality traits: {personality_str}
-Your role: {recipient_role}{work_context_section}{business_context_section}
-
-Message from {sender_name}:
-{original_message}
-
-Write a brief, friendly chat response (1-3 sentences). The response should:
+        layout = (
+            PromptLayout(persona(recipient_name, recipient_title, recipient_role, recipient_personality))
+            .instructions("""You received the chat message below. Write a brief, friendly chat response (1-3 sentences). The response should:
 1. Always respond - acknowledge the message even if it's just an update or statement
 2. Answer any questions or address requests directly
 3. Match your personality (e.g., if you're analytical, be precise; if creative, be enthusiastic)
 4. Be conversational and appropriate for a chat message
 5. Reference your current work if relevant
 6. If it's just an update or statement, acknowledge it and add a brief relevant comment
-7. Keep the conversation going naturally
-
-Write only the response message, nothing else."""
+7. Keep the conversation going naturally""")
+            .context(f"Current work context: {project_context}" if project_context else None)
+            .context(business_summary(business_context, ("revenue", "profit", "active_projects")))
+            .context(f"Message from {sender_name} ({sender_title}):\n{original_message}")
+            .respond("Write only the response message, nothing else.")
+        )
 
         try:
-            response = await self._make_request_with_fallback(
-                "/api/generate",
-                {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False
-                }
-            )
-            result = response.json()
+            result = await self._generate("chat_response", layout)
             response_text = result.get("response", "").strip()
             
             # Clean up the response (remove markdown formatting if present)
@@ -432,9 +527,9 @@ Write only the response message, nothing else."""
         if business_context:
             business_parts = []
             if business_context.get("revenue"):
-                business_parts.append(f"Company revenue: ${business_context['revenue']:,.2f}")
+                business_parts.append(f"Company revenue: {format_money(business_context['revenue'])}")
             if business_context.get("profit"):
-                business_parts.append(f"Company profit: ${business_context['profit']:,.2f}")
+                business_parts.append(f"Company profit: {format_money(business_context['profit'])}")
             if business_context.get("active_projects"):
                 business_parts.append(f"Active projects: {business_context['active_projects']}")
             if business_parts:
@@ -497,7 +592,8 @@ Keep each message to 1-2 sentences maximum."""
                     "model": self.model,
                     "prompt": prompt,
                     "stream": False
-                }
+                },
+                kind="conversation"
             )
             result = response.json()
             response_text = result.get("response", "").strip()
@@ -649,7 +745,8 @@ Keep each message to 1-2 sentences maximum. Make it feel like a real family conv
                     "model": self.model,
                     "prompt": prompt,
                     "stream": False
-                }
+                },
+                kind="home_conversation"
             )
             result = response.json()
             response_text = result.get("response", "").strip()
@@ -814,7 +911,8 @@ Keep each message to 1-2 sentences maximum. Make it feel like a real family conv
                     "model": self.model,
                     "prompt": prompt,
                     "stream": False
-                }
+                },
+                kind="family_conversation"
             )
             result = response.json()
             response_text = result.get("response", "").strip()
@@ -877,64 +975,32 @@ Keep each message to 1-2 sentences maximum. Make it feel like a real family conv
         business_context: Dict = None
     ) -> Dict[str, str]:
         """Generate an initial email from one employee to another based on their decision and context."""
-        personality_str = ", ".join(sender_personality) if sender_personality else "balanced"
-        
-        # Build work context section
-        work_context_section = ""
-        if project_context:
-            work_context_section = f"\nYou are currently working on project: {project_context}"
-        
-        # Build business context section
-        business_context_section = ""
-        if business_context:
-            business_parts = []
-            if business_context.get("revenue"):
-                business_parts.append(f"Company revenue: ${business_context['revenue']:,.2f}")
-            if business_context.get("profit"):
-                business_parts.append(f"Company profit: ${business_context['profit']:,.2f}")
-            if business_context.get("active_projects"):
-                business_parts.append(f"Active projects: {business_context['active_projects']}")
-            if business_parts:
-                business_context_section = f"\nCurrent business situation: {', '.join(business_parts)}"
-        
-        prompt = f"""You are {sender_name}, {sender_title} at a company. You want to send an email to {recipient_name} ({recipient_title}).
-
-Your personality traits: {personality_str}
-Your role: {sender_role}
-Recipient's role: {recipient_role}
-{work_context_section}
-{business_context_section}
-
-You recently made a decision: {decision}
-Your reasoning: {reasoning}
-
-Write a professional email to {recipient_name}. The email should:
+        layout = (
+            PromptLayout(persona(sender_name, sender_title, sender_role, sender_personality))
+            .instructions("""Write a professional email to the colleague named below about a decision you recently made. The email should:
 1. Have an appropriate subject line (brief and relevant)
 2. Have a professional but friendly body (2-4 sentences)
 3. Match your personality and role
 4. Reference your decision and reasoning naturally
 5. Be appropriate for the recipient's role
-6. Include a professional closing with your name
+6. Include a professional closing with your name""")
+            .context(f"You are currently working on project: {project_context}" if project_context else None)
+            .context(business_summary(business_context, ("revenue", "profit", "active_projects")))
+            .context(f"""Recipient: {recipient_name} ({recipient_title}), role: {recipient_role}
 
-Respond in JSON format with:
-{{
+You recently made a decision: {decision}
+Your reasoning: {reasoning}""")
+            .respond("""Respond in JSON format with:
+{
     "subject": "email subject line",
     "body": "email body content"
-}}
+}
 
-Write only the JSON, nothing else."""
+Write only the JSON, nothing else.""")
+        )
 
         try:
-            response = await self._make_request_with_fallback(
-                "/api/generate",
-                {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "format": "json"
-                }
-            )
-            result = response.json()
+            result = await self._generate("email", layout, json_mode=True)
             response_text = result.get("response", "").strip()
             
             # Try to parse JSON from the response
@@ -987,56 +1053,25 @@ Write only the JSON, nothing else."""
         business_context: Dict = None
     ) -> str:
         """Generate an initial chat message from one employee to another based on their decision and context."""
-        personality_str = ", ".join(sender_personality) if sender_personality else "balanced"
-        
-        # Build work context section
-        work_context_section = ""
-        if project_context:
-            work_context_section = f"\nYou are currently working on project: {project_context}"
-        
-        # Build business context section
-        business_context_section = ""
-        if business_context:
-            business_parts = []
-            if business_context.get("revenue"):
-                business_parts.append(f"Company revenue: ${business_context['revenue']:,.2f}")
-            if business_context.get("profit"):
-                business_parts.append(f"Company profit: ${business_context['profit']:,.2f}")
-            if business_context.get("active_projects"):
-                business_parts.append(f"Active projects: {business_context['active_projects']}")
-            if business_parts:
-                business_context_section = f"\nCurrent business situation: {', '.join(business_parts)}"
-        
-        prompt = f"""You are {sender_name}, {sender_title} at a company. You want to send a chat message to {recipient_name} ({recipient_title}).
-
-Your personality traits: {personality_str}
-Your role: {sender_role}
-Recipient's role: {recipient_role}
-{work_context_section}
-{business_context_section}
-
-You recently made a decision: {decision}
-Your reasoning: {reasoning}
-
-Write a brief, friendly chat message (1-3 sentences) to {recipient_name}. The message should:
+        layout = (
+            PromptLayout(persona(sender_name, sender_title, sender_role, sender_personality))
+            .instructions("""Write a brief, friendly chat message (1-3 sentences) to the colleague named below about a decision you recently made. The message should:
 1. Be conversational and appropriate for a chat message
 2. Match your personality (e.g., if you're analytical, be precise; if creative, be enthusiastic)
 3. Reference your decision and reasoning naturally
 4. Be appropriate for the recipient's role
-5. Feel like a natural, friendly message between colleagues
+5. Feel like a natural, friendly message between colleagues""")
+            .context(f"You are currently working on project: {project_context}" if project_context else None)
+            .context(business_summary(business_context, ("revenue", "profit", "active_projects")))
+            .context(f"""Recipient: {recipient_name} ({recipient_title}), role: {recipient_role}
 
-Write only the chat message, nothing else."""
+You recently made a decision: {decision}
+Your reasoning: {reasoning}""")
+            .respond("Write only the chat message, nothing else.")
+        )
 
         try:
-            response = await self._make_request_with_fallback(
-                "/api/generate",
-                {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False
-                }
-            )
-            result = response.json()
+            result = await self._generate("chat", layout)
             response_text = result.get("response", "").strip()
             
             # Clean up the response (remove markdown formatting if present)
@@ -1072,8 +1107,6 @@ Write only the chat message, nothing else."""
         business_context: Dict
     ) -> str:
         """Generate AI thoughts from the employee's perspective based on their context."""
-        personality_str = ", ".join(personality_traits) if personality_traits else "balanced"
-        
         # Build recent activities summary
         activities_summary = ""
         if recent_activities:
@@ -1107,51 +1140,29 @@ Write only the chat message, nothing else."""
                 for rev in recent_reviews[:2]
             ])
         
-        # Build business context
-        business_info = f"""
-Current business situation:
-- Revenue: ${business_context.get('revenue', 0):,.2f}
-- Profit: ${business_context.get('profit', 0):,.2f}
-- Active projects: {business_context.get('active_projects', 0)}
-- Total employees: {business_context.get('employee_count', 0)}
-"""
+        current_work = f"Current work: {current_task}" if current_task else "Current work: Available for new tasks"
         
-        current_work = f"\nCurrent work: {current_task}" if current_task else "\nCurrent work: Available for new tasks"
-        
-        prompt = f"""You are {employee_name}, {employee_title} at a company.
-
-Your personality traits: {personality_str}
-Your role: {employee_role}
-Your backstory: {backstory or "A dedicated team member"}
-Current status: {current_status}
-{current_work}
-{business_info}
-{activities_summary}
-{decisions_summary}
-{communications_summary}
-{reviews_summary}
-
-Based on your personality, role, recent activities, decisions, communications, and the current business situation, what are you thinking about right now? 
+        layout = (
+            PromptLayout(persona(employee_name, employee_title, employee_role, personality_traits, backstory or "A dedicated team member"))
+            .instructions("""Based on your personality, role, and the recent activities, decisions, communications, and business situation below, what are you thinking about right now?
 
 Write 2-3 sentences from your first-person perspective that capture:
 1. What's on your mind (work-related thoughts, concerns, ideas, or observations)
 2. How you're feeling about your current situation
 3. What you might be planning or considering
 
-Write as if you're thinking to yourself - be authentic to your personality and role. Use first-person ("I", "my", "me"). Keep it natural and realistic.
-
-Write only the thoughts, nothing else."""
+Write as if you're thinking to yourself - be authentic to your personality and role. Use first-person ("I", "my", "me"). Keep it natural and realistic.""")
+            .context(f"Current status: {current_status}\n{current_work}")
+            .context(business_summary(business_context))
+            .context(activities_summary)
+            .context(decisions_summary)
+            .context(communications_summary)
+            .context(reviews_summary)
+            .respond("Write only the thoughts, nothing else.")
+        )
 
         try:
-            response = await self._make_request_with_fallback(
-                "/api/generate",
-                {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False
-                }
-            )
-            result = response.json()
+            result = await self._generate("thoughts", layout)
             response_text = result.get("response", "").strip()
             
             # Clean up the response (remove markdown formatting if present)
@@ -1228,188 +1239,83 @@ Write only the thoughts, nothing else."""
         
         return True
     
-    async def generate_unique_employee_name(
+    async def generate_name_candidates(
         self,
-        existing_names: List[str],
         department: Optional[str] = None,
-        role: Optional[str] = None
-    ) -> str:
-        """Generate a unique employee name using AI, avoiding duplicates with existing names."""
-        existing_names_str = ", ".join(existing_names) if existing_names else "none"
+        role: Optional[str] = None,
+        count: int = 8
+    ) -> List[str]:
+        """
+        Generate a batch of candidate employee names. The prompt doesn't depend on
+        existing employees; callers check uniqueness locally (see business/name_service.py).
         
-        prompt = f"""You are generating a REAL PERSON'S NAME for an employee in a business simulation.
+        Returns:
+            Names that pass _is_valid_name (possibly fewer than count)
+        """
+        prompt = f"""You are generating REAL PERSON'S NAMES for employees in a business simulation.
+
+Generate {count} different names, ONE PER LINE, each in the format "FirstName LastName".
 
 CRITICAL REQUIREMENTS:
-1. Generate ONLY a proper first name and last name (e.g., "Sarah Chen", "Marcus Rodriguez", "Emily Watson")
-2. The name must be TWO WORDS ONLY - a first name and a last name
-3. Each name part must be a REAL, PROPER NAME (not a phrase, not a sentence, not a contraction)
-4. DO NOT use phrases like "I can't", "I will", "Here is", "My name is", etc.
-5. DO NOT use contractions like "can't", "won't", "don't"
-6. DO NOT use common words like "the", "a", "employee", "person"
-7. The name should be DISTINCT from these existing names: {existing_names_str}
-8. Make it diverse, professional, and realistic
-9. Return ONLY the name in format "FirstName LastName" with no other text
-
-EXAMPLES OF GOOD NAMES:
-- "Alexandra Bennett"
-- "Benjamin Chen"
-- "Catherine Rodriguez"
-- "Daniel Kim"
-
-EXAMPLES OF BAD NAMES (DO NOT GENERATE THESE):
-- "I can't" (this is a phrase, not a name)
-- "Here is John" (this is a sentence)
-- "My name is Sarah" (this is a sentence)
-- "Employee Smith" (contains common word)
+1. Each line is ONLY a proper first name and last name (e.g., "Sarah Chen", "Marcus Rodriguez")
+2. TWO WORDS ONLY per name - no numbering, no bullets, no other text
+3. DO NOT use phrases, sentences, contractions, or common words like "the", "employee", "person"
+4. Make them diverse (different cultures, different first letters), professional and realistic
 
 {f"Department: {department}" if department else ""}
 {f"Role: {role}" if role else ""}
 
-Generate the name now (ONLY the name, nothing else):"""
-
-        try:
-            response = await self._make_request_with_fallback(
-                "/api/generate",
-                {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False
-                }
-            )
-            result = response.json()
-            response_text = result.get("response", "").strip()
-            
-            # Clean up the response - extract just the name
-            import re
-            # Remove markdown code blocks if present
-            response_text = re.sub(r'```[^\n]*\n?', '', response_text)
-            response_text = re.sub(r'\n?```', '', response_text)
-            
-            # Try to extract name from JSON if present
-            json_match = re.search(r'"name"\s*:\s*"([^"]+)"', response_text)
-            if json_match:
-                response_text = json_match.group(1)
-            
-            # Extract first and last name (should be exactly two words)
-            name_parts = [part.strip() for part in response_text.split() if part.strip()]
-            
-            # Try to extract just the first two words (in case AI added extra text)
-            if len(name_parts) >= 2:
-                name = f"{name_parts[0]} {name_parts[1]}"
-            elif len(name_parts) == 1:
-                # If only one word, add a common last name
-                name = f"{name_parts[0]} {random.choice(['Smith', 'Johnson', 'Williams', 'Brown', 'Jones'])}"
-            else:
-                # Fallback if no valid name found
-                name = None
-            
-            # CRITICAL: Validate the name before using it
-            if name and self._is_valid_name(name):
-                name_lower = name.lower()
-                # Verify it's not in existing names (case-insensitive)
-                if any(existing.lower() == name_lower for existing in existing_names):
-                    # If duplicate, try once more with emphasis
-                    return await self._generate_name_retry(existing_names, department, role)
-                # Name is valid and unique - return it
-                return name
-            else:
-                # Invalid name generated - log and use fallback
-                print(f"⚠️  AI generated invalid name: '{response_text}' - using fallback")
-                return await self._generate_name_fallback(existing_names)
-                
-        except Exception as e:
-            print(f"Error generating employee name with AI: {e}")
-            return await self._generate_name_fallback(existing_names)
+Generate the names now (ONLY the names, one per line):"""
+
+        response = await self._make_request_with_fallback(
+            "/api/generate",
+            {
+                "model": self.model,
+                "prompt": prompt,
+                "stream": False
+            },
+            kind="names"
+        )
+        response_text = response.json().get("response", "")
+        
+        import re
+        names = []
+        for line in response_text.splitlines():
+            # Drop list markers ("1.", "-", "*") and quotes the model may add
+            line = re.sub(r'^\s*(?:\d+[.)]|[-*•])\s*', '', line).strip().strip('"\'')
+            parts = line.split()
+            if len(parts) >= 2:
+                name = f"{parts[0]} {parts[1]}"
+                if self._is_valid_name(name) and name not in names:
+                    names.append(name)
+        return names
     
-    async def _generate_name_retry(
+    async def generate_unique_employee_name(
         self,
         existing_names: List[str],
         department: Optional[str] = None,
         role: Optional[str] = None
     ) -> str:
-        """Retry name generation with stronger emphasis on uniqueness."""
-        existing_names_str = ", ".join(existing_names)
-        
-        prompt = f"""Generate a COMPLETELY DIFFERENT REAL PERSON'S NAME from these existing names: {existing_names_str}
-
-CRITICAL REQUIREMENTS:
-1. Generate ONLY a proper first name and last name (e.g., "Sarah Chen", "Marcus Rodriguez")
-2. The name must be TWO WORDS ONLY - a first name and a last name
-3. DO NOT use phrases, sentences, contractions, or common words
-4. The name must be VERY DIFFERENT - different first letter, different sound, completely unique
-5. Return ONLY the name in format "FirstName LastName" with no other text
-
-EXAMPLES OF GOOD NAMES: "Alexandra Bennett", "Benjamin Chen", "Catherine Rodriguez"
-BAD (DO NOT USE): "I can't", "Here is John", "My name is Sarah"
-
-Generate the name now (ONLY the name):"""
-
+        """
+        Generate a unique employee name using AI, avoiding duplicates with existing names.
+        The prompt has a fixed size; uniqueness is checked locally, and collisions or
+        invalid replies fall back to the combinatorial generator instead of another LLM call.
+        """
+        from business.name_service import NameIndex
+        taken = NameIndex(existing_names)
         try:
-            response = await self._make_request_with_fallback(
-                "/api/generate",
-                {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False
-                }
-            )
-            result = response.json()
-            response_text = result.get("response", "").strip()
-            
-            import re
-            response_text = re.sub(r'```[^\n]*\n?', '', response_text)
-            response_text = re.sub(r'\n?```', '', response_text)
-            
-            name_parts = [part.strip() for part in response_text.split() if part.strip()]
-            
-            if len(name_parts) >= 2:
-                name = f"{name_parts[0]} {name_parts[1]}"
-                # Validate the name
-                if self._is_valid_name(name):
-                    name_lower = name.lower()
-                    if not any(existing.lower() == name_lower for existing in existing_names):
-                        return name
-            
-            # Invalid or duplicate - use fallback
-            print(f"⚠️  Retry generated invalid/duplicate name: '{response_text}' - using fallback")
-            return await self._generate_name_fallback(existing_names)
-        except:
-            return await self._generate_name_fallback(existing_names)
+            for name in await self.generate_name_candidates(department, role, count=3):
+                if name not in taken:
+                    return name
+            print("⚠️  AI generated no new valid name - using fallback")
+        except Exception as e:
+            print(f"Error generating employee name with AI: {e}")
+        return await self._generate_name_fallback(existing_names)
     
     async def _generate_name_fallback(self, existing_names: List[str]) -> str:
-        """Fallback name generation using diverse name pools."""
-        
-        # Diverse first names
-        first_names = [
-            "Alexandra", "Benjamin", "Catherine", "Daniel", "Elena", "Felix", "Gabriela", "Hector",
-            "Isabella", "Julian", "Katherine", "Lucas", "Maya", "Nathan", "Olivia", "Parker",
-            "Quinn", "Rachel", "Samuel", "Tessa", "Victor", "Wendy", "Xavier", "Yara", "Zoe",
-            "Adrian", "Brianna", "Caleb", "Diana", "Ethan", "Fiona", "George", "Hannah",
-            "Ian", "Jasmine", "Kevin", "Lily", "Marcus", "Nora", "Oscar", "Penelope"
-        ]
-        
-        # Diverse last names
-        last_names = [
-            "Anderson", "Bennett", "Chen", "Davis", "Evans", "Foster", "Garcia", "Hughes",
-            "Ivanov", "Jackson", "Kim", "Lopez", "Martinez", "Nguyen", "O'Brien", "Patel",
-            "Quinn", "Rodriguez", "Singh", "Thompson", "Ueda", "Vargas", "Wang", "Xu",
-            "Yamamoto", "Zhang", "Adams", "Brown", "Clark", "Diaz", "Edwards", "Fisher",
-            "Green", "Hall", "Irwin", "Johnson", "Kumar", "Lee", "Moore", "Nelson"
-        ]
-        
-        # Try up to 20 times to find a unique name
-        for _ in range(20):
-            name = f"{random.choice(first_names)} {random.choice(last_names)}"
-            name_lower = name.lower()
-            if not any(existing.lower() == name_lower for existing in existing_names):
-                return name
-        
-        # If still duplicate, add a number
-        base_name = f"{random.choice(first_names)} {random.choice(last_names)}"
-        counter = 1
-        while f"{base_name} {counter}" in existing_names:
-            counter += 1
-        return f"{base_name} {counter}"
+        """Fallback name generation from first/last name lists."""
+        from business.name_service import NameIndex, combinatorial_name
+        return combinatorial_name(NameIndex(existing_names))
     
     async def generate_screen_activity(
         self,
@@ -1427,8 +1333,6 @@ Generate the name now (ONLY the name):"""
     ) -> Dict:
         """Generate realistic screen activity for an employee based on their work context."""
         
-        personality_str = ", ".join(personality_traits) if personality_traits else "balanced"
-        
         # Build work context
         work_context_parts = []
         if project_name:
@@ -1463,68 +1367,52 @@ Generate the name now (ONLY the name):"""
         if business_context:
             business_parts = []
             if business_context.get('revenue'):
-                business_parts.append(f"revenue: ${business_context.get('revenue', 0):,.2f}")
+                business_parts.append(f"revenue: {format_money(business_context.get('revenue', 0))}")
             if business_context.get('profit'):
-                business_parts.append(f"profit: ${business_context.get('profit', 0):,.2f}")
+                business_parts.append(f"profit: {format_money(business_context.get('profit', 0))}")
             if business_context.get('active_projects'):
                 business_parts.append(f"active projects: {business_context.get('active_projects', 0)}")
             if business_parts:
                 business_context_section = f"\nCompany status: {', '.join(business_parts)}"
         
-        prompt = f"""You are simulating what {employee_name} ({employee_title}) is currently doing on their computer screen.
+        layout = (
+            PromptLayout(persona(employee_name, employee_title, employee_role, personality_traits))
+            .instructions("""Simulate what you are currently doing on your computer screen. Based on your current work and the data below, determine what application you are actively using and what you are doing. Choose ONE of these applications:
+1. Outlook (email) - if you should be sending/reading emails
+2. Teams (chat) - if you should be messaging colleagues
+3. Browser (web) - if you should be researching or browsing
+4. ShareDrive (documents) - if you should be working on documents
 
-Employee context:
-- Name: {employee_name}
-- Title: {employee_title}
-- Role: {employee_role}
-- Personality: {personality_str}
-- Current work: {work_context}
-{activity_context}{business_context_section}
-
-Based on this context, determine what application they are actively using and what they are doing. Choose ONE of these applications:
-1. Outlook (email) - if they should be sending/reading emails
-2. Teams (chat) - if they should be messaging colleagues
-3. Browser (web) - if they should be researching or browsing
-4. ShareDrive (documents) - if they should be working on documents
-
-Generate realistic content for the chosen application that matches their current work context and personality.
-
-IMPORTANT: When generating content, use the actual data provided above when available:
+Generate realistic content for the chosen application that matches your current work context and personality.
+
+IMPORTANT: When generating content, use the actual data provided below when available:
 - For Outlook: Use actual email subjects, senders, and content from recent emails
 - For Teams: Use actual messages and sender names from recent chats
 - For ShareDrive: Use actual file names and content from available documents
-- For Browser: Generate realistic web content related to their work
+- For Browser: Generate realistic web content related to your work
 
-If viewing/reading, show actual content from the data above. If composing/editing, create new content that relates to the actual data.
-
-Return a JSON object with this exact structure:
-{{
+If viewing/reading, show actual content from the data below. If composing/editing, create new content that relates to the actual data.""")
+            .context(f"Current work: {work_context}{activity_context}{business_context_section}")
+            .respond("""Return a JSON object with this exact structure:
+{
     "application": "outlook|teams|browser|sharedrive",
     "action": "composing|reading|replying|browsing|viewing|editing",
-    "content": {{
+    "content": {
         // Application-specific content
         // For Outlook: subject, recipient, sender, body (use actual email data if viewing)
         // For Teams: conversation_with (colleague name), messages array (use actual messages if viewing)
         // For Browser: url, page_title, page_content (HTML content that will be rendered)
         // For ShareDrive: file_name, file_type, document_content (use actual file content if viewing)
-    }},
-    "mouse_position": {{"x": 0-100, "y": 0-100}},
+    },
+    "mouse_position": {"x": 0-100, "y": 0-100},
     "window_state": "active|minimized|maximized"
-}}
+}
 
-Make the content realistic and relevant to their current task and project. Use actual data when available."""
+Make the content realistic and relevant to your current task and project. Use actual data when available.""")
+        )
 
         try:
-            response = await self._make_request_with_fallback(
-                "/api/generate",
-                {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "format": "json"
-                }
-            )
-            result = response.json()
+            result = await self._generate("screen_activity", layout, json_mode=True)
             response_text = result.get("response", "").strip()
             
             # Parse JSON response
@@ -1608,7 +1496,7 @@ Make the content realistic and relevant to their current task and project. Use a
         if business_context:
             business_parts = []
             if business_context.get("revenue"):
-                business_parts.append(f"Company revenue: ${business_context['revenue']:,.2f}")
+                business_parts.append(f"Company revenue: {format_money(business_context['revenue'])}")
             if business_context.get("active_projects"):
                 business_parts.append(f"Active projects: {business_context['active_projects']}")
             if business_parts:
@@ -1640,7 +1528,8 @@ For email: Standard business email format, professional tone, 2-4 paragraphs.
                     "prompt": prompt,
                     "stream": False,
                     "format": "json"
-                }
+                },
+                kind="business_message"
             )
             result = response.json()
             response_text = result.get("response", "").strip()
@@ -1683,30 +1572,21 @@ For email: Standard business email format, professional tone, 2-4 paragraphs.
     ) -> str:
         """Generate a reply to a business message."""
         
-        prompt = f"""You are {sender_name}, {sender_title} ({sender_role}).
-You received a {communication_type} from {recipient_name} ({recipient_title}).
+        layout = (
+            PromptLayout(persona(sender_name, sender_title, sender_role))
+            .instructions("""Write a response to the message below.
+For chat: Brief (1-3 sentences), conversational.
+For email: Professional, clear, addressing the points raised.""")
+            .context(f"""You received a {communication_type} from {recipient_name} ({recipient_title}).
 
 Original Message:
 {f'Subject: {original_subject}' if original_subject else ''}
-{original_message}
-
-Write a response.
-For chat: Brief (1-3 sentences), conversational.
-For email: Professional, clear, addressing the points raised.
-
-Write ONLY the response body.
-"""
+{original_message}""")
+            .respond("Write ONLY the response body.")
+        )
 
         try:
-            response = await self._make_request_with_fallback(
-                "/api/generate",
-                {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False
-                }
-            )
-            result = response.json()
+            result = await self._generate("business_reply", layout)
             response_text = result.get("response", "").strip()
             
             if response_text.startswith("```"):
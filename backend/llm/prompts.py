@@ -0,0 +1,113 @@
+"""
+Prompt assembly with a cache-friendly layout.
+
+Ollama keeps the evaluated prompt of the previous request in each of its slots
+and only re-evaluates the part of a new prompt after the longest common prefix.
+Prompts that start with per-call numbers (revenue, profit, recent messages)
+therefore get evaluated from scratch every time. Prompts built here are laid
+out from most stable to most volatile:
+
+1. SYSTEM_PREAMBLE - identical for every request
+2. the persona of the employee the model speaks as - identical for every call
+   made as that employee (persona() returns byte-identical text for the same
+   employee, so repeated calls reuse it)
+3. the instructions of the call type - identical for every call of that type
+4. the volatile context (business numbers, messages, recent activity)
+5. the response format and closing line
+
+1 and 2 go in Ollama's "system" field, 3-5 in "prompt".
+"""
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+SYSTEM_PREAMBLE = (
+    "You are part of a simulation of a growing company's office. You write what its "
+    "employees say, write and think. Stay in character, keep to the requested length "
+    "and format, and never mention that this is a simulation."
+)
+
+
+@lru_cache(maxsize=512)
+def _persona(name: str, title: str, role: Optional[str], personality: Tuple[str, ...], backstory: Optional[str]) -> str:
+    lines = [f"You are {name}, {title} at the company."]
+    if role:
+        lines.append(f"Your role: {role}")
+    lines.append(f"Your personality traits: {', '.join(personality) if personality else 'balanced'}")
+    if backstory:
+        lines.append(f"Your backstory: {backstory}")
+    return "\n".join(lines)
+
+
+def persona(
+    name: str,
+    title: str,
+    role: Optional[str] = None,
+    personality: Optional[Sequence[str]] = None,
+    backstory: Optional[str] = None,
+) -> str:
+    """Stable persona block of an employee (same text for the same arguments)."""
+    return _persona(name, title, role, tuple(str(t) for t in personality or ()), backstory)
+
+
+def format_money(value) -> str:
+    """Format an amount as dollars; values that aren't numbers (e.g. "N/A") count as 0."""
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        amount = 0.0
+    return f"${amount:,.2f}"
+
+
+def business_summary(business_context: Optional[Dict], keys: Sequence[str] = ("revenue", "profit", "active_projects", "employee_count")) -> str:
+    """Current business numbers as "- Label: value" lines (volatile - goes after the instructions)."""
+    if not business_context:
+        return ""
+    labels = {
+        "revenue": ("Revenue", format_money),
+        "profit": ("Profit", format_money),
+        "active_projects": ("Active projects", str),
+        "employee_count": ("Employees", str),
+        "goals": ("Business goals", str),
+    }
+    lines = []
+    for key in keys:
+        label, fmt = labels[key]
+        value = business_context.get(key)
+        if value is None:
+            value = 0 if key != "goals" else []
+        lines.append(f"- {label}: {fmt(value)}")
+    return "Current business situation:\n" + "\n".join(lines)
+
+
+class PromptLayout:
+    """Collects the parts of a prompt and emits them stable-first."""
+
+    def __init__(self, persona_text: str = ""):
+        self.persona_text = persona_text
+        self._instructions: List[str] = []
+        self._context: List[str] = []
+        self._response: List[str] = []
+
+    def instructions(self, text: str) -> "PromptLayout":
+        """Task description that is the same for every call of this type."""
+        self._instructions.append(text.strip())
+        return self
+
+    def context(self, text: Optional[str]) -> "PromptLayout":
+        """Per-call data; empty values are skipped."""
+        if text and text.strip():
+            self._context.append(text.strip())
+        return self
+
+    def respond(self, text: str) -> "PromptLayout":
+        """Response format and closing line (kept last, right before the model answers)."""
+        self._response.append(text.strip())
+        return self
+
+    @property
+    def system(self) -> str:
+        return f"{SYSTEM_PREAMBLE}\n\n{self.persona_text}" if self.persona_text else SYSTEM_PREAMBLE
+
+    @property
+    def prompt(self) -> str:
+        return "\n\n".join(self._instructions + self._context + self._response)
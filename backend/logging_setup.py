@@ -0,0 +1,359 @@
+"""
+Logging pipeline that keeps disk and terminal I/O off the event loop.
+
+configure_logging() installs a single LocalQueueHandler on the root logger. Records
+are put on an in-memory queue and a QueueListener thread formats them and
+writes them to the rotating backend.log file and to stdout, so a log call on
+the asyncio loop costs a queue put instead of a write + flush. Tracebacks are
+formatted on the listener thread too and logged in their own "exc" field.
+
+- Output is one JSON object per line (LOG_FORMAT=text for the classic format).
+- LOG_LEVEL sets the root level (default INFO); LOG_LEVELS sets per-module
+  levels, e.g. "engine.office_simulator=WARNING,business.review_manager=DEBUG".
+- print() output is routed through the same pipeline. Each printed line is
+  logged at INFO on the logger of the module that printed it, so per-module
+  levels apply to prints as well.
+- Hot-path prints are rate limited per call site: each print line may emit
+  LOG_RATE_LIMIT records (default 20) per LOG_RATE_WINDOW seconds (default 10).
+  Suppressed records are counted and reported on the next record that gets
+  through. Regular logger calls and stderr output are never dropped.
+- Output produced while logging itself (a handler's handleError report, or a
+  print from inside the pipeline) goes straight to the real stdout/stderr, so
+  a failing handler can't feed its own error back into the queue.
+"""
+import atexit
+import copy
+import json
+import logging
+import os
+import platform
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional, Tuple
+
+# Rotating file: 5 MB per file, 9 backups + 1 current = 10 files total
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 9
+
+# Noisy third-party loggers; LOG_LEVELS overrides these
+DEFAULT_LEVELS = {
+    "uvicorn": "INFO",
+    "uvicorn.error": "INFO",
+    "uvicorn.access": "WARNING",
+    # INFO here makes SQLAlchemy log every statement
+    "sqlalchemy.engine": "WARNING",
+    "sqlalchemy.pool": "WARNING",
+    "httpx": "WARNING",
+    "httpcore": "WARNING",
+}
+
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+# Set while PrintToLogger is handing a line to logging on this thread
+_capture_state = threading.local()
+
+
+class WindowsRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that works on Windows by using copy+truncate instead of rename."""
+
+    def doRollover(self):
+        """Override doRollover to use copy+truncate method on Windows."""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        # Use copy+truncate method which works on Windows even with open files
+        try:
+            if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+                with open(self.baseFilename, 'r', encoding='utf-8') as f:
+                    content = f.read()
+
+                # Rotate backup files (delete oldest first)
+                for i in range(self.backupCount, 0, -1):
+                    sfn = f"{self.baseFilename}.{i}"
+                    dfn = f"{self.baseFilename}.{i + 1}"
+                    if not os.path.exists(sfn):
+                        continue
+                    try:
+                        if i == self.backupCount:
+                            os.remove(sfn)
+                        else:
+                            if os.path.exists(dfn):
+                                os.remove(dfn)
+                            os.rename(sfn, dfn)
+                    except (OSError, PermissionError):
+                        pass
+
+                try:
+                    with open(self.baseFilename + ".1", 'w', encoding='utf-8') as f:
+                        f.write(content)
+                    with open(self.baseFilename, 'w', encoding='utf-8') as f:
+                        f.write('')
+                except (OSError, PermissionError):
+                    pass
+        except Exception:
+            # If rotation fails, just continue - don't crash
+            pass
+
+        if not self.stream:
+            self.stream = self._open()
+
+    def emit(self, record):
+        """Override emit to catch any rotation errors."""
+        try:
+            return super().emit(record)
+        except (OSError, PermissionError):
+            if not self.stream:
+                try:
+                    self.stream = self._open()
+                except (OSError, PermissionError):
+                    pass
+
+
+class LocalQueueHandler(QueueHandler):
+    """
+    QueueHandler for an in-process queue. The stock prepare() formats the whole
+    record, traceback included, into msg on the calling (event loop) thread so it
+    can be pickled; here only the message is merged with its args and exc_info is
+    kept, so the listener's formatter renders the traceback into its own field.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as a single JSON line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+        }
+        if record.threadName != "MainThread":
+            entry["thread"] = record.threadName
+        # Anything passed via extra={...} (and the rate limiter's "suppressed" count)
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        # Cached on the record so the file and console handlers format a traceback once
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """The classic line format, plus the rate limiter's suppressed count."""
+
+    def __init__(self):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", None)
+        if suppressed:
+            text += f" [{suppressed} similar message(s) suppressed]"
+        return text
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Limits how many captured print() lines each call site (file + line) may emit
+    per window; other records pass untouched. Runs on the logging thread's
+    caller, before the record is queued, so a suppressed record costs only a
+    dict lookup.
+    """
+
+    def __init__(self, limit: int, window: float):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        # call site -> [window_start, emitted, suppressed]
+        self._sites: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Only captured stdout prints are limited; stderr carries tracebacks,
+        # which are useless once lines are dropped
+        if self.limit <= 0 or record.levelno >= logging.ERROR or getattr(record, "stream", None) != "stdout":
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.window:
+                suppressed = site[2] if site else 0
+                self._sites[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if site[1] < self.limit:
+                site[1] += 1
+                return True
+            site[2] += 1
+            return False
+
+
+class PrintToLogger:
+    """
+    File-like object that replaces sys.stdout/sys.stderr. Each complete line is
+    logged on the logger named after the printing module, so print() calls go
+    through the queue instead of writing to the terminal on the event loop.
+    """
+
+    def __init__(self, level: int, stream_name: str, fallback):
+        self.level = level
+        self.stream_name = stream_name
+        # Real stream for output produced by the logging pipeline itself
+        self.fallback = fallback
+        self._buffers: Dict[int, str] = {}
+
+    def _write_through(self, text: str) -> int:
+        if self.fallback is None:
+            return len(text)
+        self.fallback.write(text)
+        self.fallback.flush()
+        return len(text)
+
+    def write(self, text: str) -> int:
+        if not text:
+            return 0
+        # Handler errors (logging.Handler.handleError writes to sys.stderr) and anything
+        # printed by the listener thread or while logging a line must not re-enter the queue
+        if getattr(_capture_state, "active", False) or _is_listener_thread():
+            return self._write_through(text)
+        # print() writes the message and the newline separately; buffer per thread
+        thread_id = threading.get_ident()
+        buffered = self._buffers.pop(thread_id, "") + text
+        if "\n" not in buffered:
+            self._buffers[thread_id] = buffered
+            return len(text)
+        *lines, rest = buffered.split("\n")
+        if rest:
+            self._buffers[thread_id] = rest
+        # print is implemented in C, so frame 1 is the code that called print();
+        # traceback.print_exc() output is attributed to the code that called it
+        caller = sys._getframe(1)
+        stacklevel = 2
+        while caller.f_back is not None and caller.f_globals.get("__name__") == "traceback":
+            caller = caller.f_back
+            stacklevel += 1
+        module = caller.f_globals.get("__name__", "print")
+        logger = logging.getLogger(module if module != "__main__" else "main")
+        if logger.isEnabledFor(self.level):
+            _capture_state.active = True
+            try:
+                for line in lines:
+                    if line.strip():
+                        logger.log(self.level, line.rstrip(), stacklevel=stacklevel, extra={"stream": self.stream_name})
+            finally:
+                _capture_state.active = False
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+    @property
+    def encoding(self) -> str:
+        return "utf-8"
+
+
+def _is_listener_thread() -> bool:
+    listener = _listener
+    thread = getattr(listener, "_thread", None) if listener is not None else None
+    return thread is not None and thread is threading.current_thread()
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    """Parse "module=LEVEL,module2=LEVEL" into a dict (invalid entries are ignored)."""
+    levels = {}
+    for item in spec.split(","):
+        name, sep, level = item.partition("=")
+        if sep and name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(log_file: str, capture_prints: bool = True) -> logging.Logger:
+    """
+    Install the queue-based logging pipeline. Safe to call more than once.
+
+    Args:
+        log_file: Path of the rotating log file
+        capture_prints: Route print() output (stdout/stderr) through logging
+
+    Returns:
+        The root logger
+    """
+    global _listener
+    if _listener is not None:
+        return logging.getLogger()
+
+    file_cls = WindowsRotatingFileHandler if platform.system() == 'Windows' else RotatingFileHandler
+    file_handler = file_cls(log_file, maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT, encoding='utf-8')
+    # The console handler writes to the real stdout so captured prints don't loop back
+    console_handler = logging.StreamHandler(sys.__stdout__)
+
+    formatter = TextFormatter() if os.getenv("LOG_FORMAT", "json").lower() == "text" else JsonFormatter()
+    file_handler.setFormatter(formatter)
+    console_handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = LocalQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(
+        limit=int(os.getenv("LOG_RATE_LIMIT", "20")),
+        window=float(os.getenv("LOG_RATE_WINDOW", "10")),
+    ))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+    levels = dict(DEFAULT_LEVELS)
+    levels.update(_parse_levels(os.getenv("LOG_LEVELS", "")))
+    for name, level in levels.items():
+        try:
+            logging.getLogger(name).setLevel(level)
+        except ValueError:
+            root.warning(f"Ignoring invalid log level {level!r} for {name}")
+
+    _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    if capture_prints:
+        sys.stdout = PrintToLogger(logging.INFO, "stdout", sys.__stdout__)
+        sys.stderr = PrintToLogger(logging.WARNING, "stderr", sys.__stderr__)
+
+    return root
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread (restores stdout/stderr)."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    sys.stdout = sys.__stdout__
+    sys.stderr = sys.__stderr__
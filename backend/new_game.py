@@ -82,6 +82,9 @@ async def wipe_database():
             print("  Deleting notifications...")
             await db.execute(text("DELETE FROM notifications"))
             
+            print("  Deleting employee summaries...")
+            await db.execute(text("DELETE FROM employee_summaries"))
+            
             print("  Deleting employee reviews...")
             await db.execute(text("DELETE FROM employee_reviews"))
             
@@ -0,0 +1,24 @@
+"""
+Script to rebuild the employee_summaries projection from employee reviews and firing activities.
+Run this after editing reviews or activities by hand, bulk-loading data or restoring a backup.
+The simulator also repairs the projection once an hour (employee_summaries job).
+"""
+import asyncio
+from database.employee_summaries import repair_employee_summaries
+
+
+async def rebuild_employee_summaries():
+    """Recompute every employee summary row."""
+    print("Rebuilding employee summaries from the database...")
+
+    try:
+        rows = await repair_employee_summaries()
+        print(f"\n[SUCCESS] Wrote {rows} employee summary row(s).")
+    except Exception as e:
+        print(f"\n[ERROR] Error rebuilding employee summaries: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_employee_summaries())
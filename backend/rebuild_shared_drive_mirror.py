@@ -0,0 +1,26 @@
+"""
+Script to rebuild the on-disk shared drive mirror (backend/shared_drive/) from the database.
+Run this after restoring a database backup or when files on disk are missing or stale.
+Every document is rewritten atomically (temp file + rename).
+"""
+import asyncio
+from database.database import async_session_maker
+from business.shared_drive_sink import shared_drive_sink
+
+
+async def rebuild_shared_drive_mirror():
+    """Rewrite every shared drive file from its database content."""
+    print("Rebuilding shared drive mirror from the database...")
+    
+    try:
+        async with async_session_maker() as db:
+            written = await shared_drive_sink.rebuild_from_db(db)
+        print(f"\n[SUCCESS] Wrote {written} shared drive file(s).")
+    except Exception as e:
+        print(f"\n[ERROR] Error rebuilding shared drive mirror: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_shared_drive_mirror())
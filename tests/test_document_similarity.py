@@ -0,0 +1,92 @@
+import random
+
+from business.document_similarity import (
+    NUM_PERMUTATIONS,
+    DuplicateIndex,
+    _EmployeeBuckets,
+    is_similar,
+    minhash_signature,
+    normalize_document,
+)
+
+WORDS = [
+    "quarterly", "roadmap", "customer", "revenue", "pipeline", "engineering", "deadline",
+    "marketing", "analysis", "feedback", "priority", "milestone", "budget", "strategy",
+    "product", "release", "support", "training", "research", "planning", "delivery",
+]
+
+
+OTHER_WORDS = [
+    "holiday", "weather", "kitchen", "parking", "birthday", "coffee", "garden", "concert",
+    "weekend", "recipe", "travel", "picnic", "library", "hobby", "movie", "puzzle",
+]
+
+
+def document(seed: int, length: int = 120, vocabulary=WORDS) -> str:
+    rng = random.Random(seed)
+    return "<html><body><p>" + " ".join(rng.choice(vocabulary) for _ in range(length)) + "</p></body></html>"
+
+
+def estimated_similarity(a, b) -> float:
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERMUTATIONS
+
+
+def test_normalize_masks_dates_and_amounts():
+    text = "<h1>Budget Report</h1>\n<p>On 2026-01-15 we spent $1200.50 on the new office chairs</p>"
+    assert normalize_document(text) == "budget report [DATE] spent [AMOUNT] office chairs"
+
+
+def test_signature_is_deterministic_and_ignores_masked_values():
+    a = "<p>Invoice dated 2026-03-01 for $500 covering consulting services delivered this month</p>"
+    b = "<p>Invoice dated 2026-04-01 for $750 covering consulting services delivered this month</p>"
+    assert minhash_signature(a) == minhash_signature(a)
+    assert len(minhash_signature(a)) == NUM_PERMUTATIONS
+    assert minhash_signature(a) == minhash_signature(b)
+
+
+def test_signature_of_empty_document_is_empty():
+    assert minhash_signature("") == []
+    assert minhash_signature("<p>a an the</p>") == []
+
+
+def test_signature_similarity_tracks_document_overlap():
+    base = document(1)
+    words = base.split(" ")
+    near = " ".join(words[:-3] + ["appendix", "extra", "notes"])
+    assert estimated_similarity(minhash_signature(base), minhash_signature(near)) > 0.7
+    assert estimated_similarity(minhash_signature(base), minhash_signature(document(2))) < 0.3
+
+
+def test_buckets_find_near_duplicates_and_forget_removed_files():
+    buckets = _EmployeeBuckets()
+    base = document(1)
+    buckets.add(1, "report", minhash_signature(base))
+    buckets.add(2, "report", minhash_signature(document(2)))
+
+    near = base.replace("</p>", " appendix notes</p>")
+    assert buckets.candidates(minhash_signature(near)) == {1}
+
+    buckets.remove(1)
+    assert buckets.candidates(minhash_signature(near)) == set()
+    assert all(1 not in ids for ids in buckets.buckets.values())
+
+
+def test_buckets_ignore_malformed_signatures():
+    buckets = _EmployeeBuckets()
+    buckets.add(1, "report", [1, 2, 3])
+    assert buckets.files == {} and buckets.buckets == {}
+
+
+def test_is_similar_thresholds():
+    base = document(1, 200)
+    assert is_similar(base, base.replace("</p>", " one more line</p>"))
+    # Same vocabulary in a different order still counts (word overlap rule); a different topic doesn't
+    assert is_similar(base, document(3, 200))
+    assert not is_similar(base, document(3, 200, OTHER_WORDS))
+    assert not is_similar("", base)
+
+
+def test_index_add_is_ignored_until_loaded():
+    index = DuplicateIndex()
+    index.add(7, 1, "report", minhash_signature(document(1)))
+    assert index._employees == {}
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+import config
+from config import sleep as clock_sleep
+from engine.headless import VirtualClock
+from engine.job_scheduler import JobScheduler, parse_job_settings
+
+
+@pytest.fixture
+def virtual_clock():
+    clock = VirtualClock()
+    config.set_virtual_clock(clock)
+    yield clock
+    config.set_virtual_clock(None)
+
+
+def run_for(scheduler: JobScheduler, seconds: float):
+    """Start the scheduler, let `seconds` of virtual time pass, stop it."""
+    async def main():
+        scheduler.start()
+        await clock_sleep(seconds)
+        scheduler.stop()
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+
+
+def test_parse_job_settings_ignores_malformed_entries():
+    assert parse_job_settings("a=5, b=1.5,broken,c=x,=3") == {"a": 5.0, "b": 1.5}
+
+
+def test_fixed_rate_runs(virtual_clock):
+    scheduler = JobScheduler()
+    calls = []
+
+    async def job():
+        calls.append(virtual_clock.now())
+
+    scheduler.register("tick", job, interval=10)
+    run_for(scheduler, 95)
+    assert len(calls) == 10
+    assert all((b - a).total_seconds() == 10 for a, b in zip(calls, calls[1:]))
+
+
+def test_overrunning_job_skips_slots_instead_of_bursting(virtual_clock):
+    scheduler = JobScheduler()
+
+    async def slow():
+        await clock_sleep(25)
+
+    job = scheduler.register("slow", slow, interval=10)
+    run_for(scheduler, 95)
+    # Starts at 0, 30, 60, 90 (the last one cut short by stop()); the slots in between are skipped
+    assert job.runs == 4
+    assert job.skipped == 6
+    assert job.overruns == 3
+    assert job.failures == 0
+
+
+def test_failed_run_is_retried_after_retry_interval(virtual_clock):
+    scheduler = JobScheduler()
+    calls = []
+
+    async def flaky():
+        calls.append(virtual_clock.now())
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+
+    job = scheduler.register("flaky", flaky, interval=100, retry_interval=5)
+    run_for(scheduler, 50)
+    assert len(calls) == 2
+    assert (calls[1] - calls[0]).total_seconds() == 5
+    assert job.failures == 1
+    assert job.last_error == "RuntimeError: boom"
+
+
+def test_callable_interval_and_initial_delay(virtual_clock):
+    scheduler = JobScheduler()
+    calls = []
+
+    async def job():
+        calls.append(virtual_clock.now())
+
+    start = virtual_clock.now()
+    scheduler.register("daily", job, interval=lambda: 30, initial_delay=7)
+    run_for(scheduler, 70)
+    assert [(c - start).total_seconds() for c in calls] == [7, 37, 67]
+
+
+def test_concurrent_runs_capped_and_cancelled_on_stop(virtual_clock):
+    scheduler = JobScheduler()
+    cancelled = []
+
+    async def long_run():
+        try:
+            await clock_sleep(1000)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    job = scheduler.register("parallel", long_run, interval=10, max_concurrency=2)
+
+    async def main():
+        scheduler.start()
+        await clock_sleep(35)
+        assert job.running == 2
+        scheduler.stop()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    # Slots at 0 and 10 run; 20 and 30 find both slots busy
+    assert job.skipped == 2
+    assert len(cancelled) == 2
+    assert job.running == 0
+
+
+def test_stats_lists_jobs_by_name():
+    scheduler = JobScheduler()
+
+    async def noop():
+        pass
+
+    scheduler.register("b", noop, interval=5)
+    scheduler.register("a", noop, interval=lambda: 5)
+    stats = scheduler.stats()
+    assert [j["name"] for j in stats["jobs"]] == ["a", "b"]
+    assert stats["jobs"][0]["interval_seconds"] is None
+    assert stats["jobs"][1]["deadline_seconds"] == 5
@@ -0,0 +1,89 @@
+import pytest
+
+from llm import circuit_breaker
+from llm.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", fake.monotonic)
+    return fake
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_seconds=30)
+    breaker.record_failure("timeout")
+    breaker.record_failure("timeout")
+    assert breaker.state == CLOSED
+    breaker.record_success()
+    breaker.record_failure("timeout")
+    breaker.record_failure("timeout")
+    assert breaker.state == CLOSED
+    breaker.record_failure("timeout")
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 1
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    assert breaker.rejected == 1
+
+
+def test_half_open_allows_a_single_trial(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_seconds=30)
+    breaker.record_failure("down")
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    assert breaker.available()
+    assert breaker.acquire() is True
+    assert not breaker.available()
+    assert breaker.acquire() is False
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.acquire() is True
+
+
+def test_failed_trial_doubles_the_reset_time_up_to_the_cap(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_seconds=30, max_reset_seconds=100)
+    breaker.record_failure("down")
+    for expected in (60, 100, 100):
+        clock.now += breaker.open_for
+        assert breaker.acquire()
+        breaker.record_failure("still down")
+        assert breaker.open_for == expected
+        assert breaker.state == OPEN
+        clock.now += expected - 1
+        assert breaker.state == OPEN
+        clock.now += 1
+        assert breaker.state == HALF_OPEN
+        clock.now -= expected  # Back to the moment it reopened
+    breaker.record_success()
+    assert breaker.open_for == 30
+
+
+def test_release_trial_gives_the_slot_back(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_seconds=5)
+    breaker.trip("probe failed")
+    assert breaker.state == OPEN
+    clock.now += 5
+    assert breaker.acquire()
+    breaker.release_trial()
+    assert breaker.acquire()
+
+
+def test_method_breakers_are_created_per_kind():
+    circuit_breaker.reset_methods()
+    try:
+        assert circuit_breaker.method_breaker("chat") is circuit_breaker.method_breaker("chat")
+        assert circuit_breaker.method_breaker(None) is circuit_breaker.method_breaker("other")
+        assert set(circuit_breaker.method_report()) == {"chat", "other"}
+    finally:
+        circuit_breaker.reset_methods()
@@ -0,0 +1,91 @@
+import asyncio
+
+import httpx
+
+from llm.endpoint_pool import EndpointPool, parse_endpoints
+
+MODEL = "llama3.2"
+
+
+def make_pool(spec: str, **options) -> EndpointPool:
+    # health_interval=0: no background probes against the stub servers
+    return EndpointPool(parse_endpoints(spec), MODEL, health_interval=0, **options)
+
+
+def test_parse_endpoints_caps():
+    assert parse_endpoints("http://a:11434/, http://b:11434=2", default_max_concurrency=4) == [
+        ("http://a:11434", 4),
+        ("http://b:11434", 2),
+    ]
+
+
+def test_server_error_fails_over_to_next_server():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.host)
+        if request.url.host == "down":
+            return httpx.Response(500, json={"error": "boom"})
+        return httpx.Response(200, json={"response": "hi", "done": True})
+
+    pool = make_pool("http://down:11434,http://up:11434", routing="primary")
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await pool.post(client, "/api/generate", {"model": MODEL, "prompt": "x"})
+
+    response = asyncio.run(run())
+    assert response.json()["response"] == "hi"
+    assert seen == ["down", "up"]
+    down, up = pool.endpoints
+    assert down.failures == 1 and down.retried_elsewhere == 1
+    assert up.successes == 1
+
+
+def test_failed_server_is_skipped_once_its_circuit_opens():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.host)
+        if request.url.host == "down":
+            return httpx.Response(503)
+        return httpx.Response(200, json={"response": "ok", "done": True})
+
+    pool = make_pool("http://down:11434,http://up:11434", routing="primary")
+    threshold = pool.endpoints[0].breaker.failure_threshold
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            for _ in range(threshold + 2):
+                await pool.post(client, "/api/generate", {"model": MODEL, "prompt": "x"})
+
+    asyncio.run(run())
+    assert seen.count("down") == threshold
+    assert seen.count("up") == threshold + 2
+
+
+def test_concurrency_stays_at_per_endpoint_cap():
+    active = {"one": 0, "two": 0}
+    peak = {"one": 0, "two": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        active[host] += 1
+        peak[host] = max(peak[host], active[host])
+        await asyncio.sleep(0.01)
+        active[host] -= 1
+        return httpx.Response(200, json={"response": "ok", "done": True})
+
+    pool = make_pool("http://one:11434=2,http://two:11434=1", queue_timeout=5)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await asyncio.gather(*(
+                pool.post(client, "/api/generate", {"model": MODEL, "prompt": str(i)}) for i in range(12)
+            ))
+
+    asyncio.run(run())
+    assert peak == {"one": 2, "two": 1}
+    assert [e.peak_in_flight for e in pool.endpoints] == [2, 1]
+    assert sum(e.successes for e in pool.endpoints) == 12
+    assert pool.queued > 0
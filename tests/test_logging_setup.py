@@ -0,0 +1,72 @@
+import json
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueListener
+
+from logging_setup import JsonFormatter, LocalQueueHandler
+
+
+class ListHandler(logging.Handler):
+    """Collects formatted lines and the thread each record was formatted on."""
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.threads = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+        self.threads.append(threading.current_thread())
+
+
+def log_through_queue(log):
+    log_queue = queue.SimpleQueue()
+    sink = ListHandler()
+    sink.setFormatter(JsonFormatter())
+    listener = QueueListener(log_queue, sink)
+    logger = logging.getLogger("tests.logging_setup")
+    logger.propagate = False
+    handler = LocalQueueHandler(log_queue)
+    logger.addHandler(handler)
+    listener.start()
+    try:
+        log(logger)
+    finally:
+        listener.stop()
+        logger.removeHandler(handler)
+    return sink
+
+
+def test_exception_traceback_goes_to_exc_field():
+    def log(logger):
+        try:
+            raise ValueError("bad value")
+        except ValueError:
+            logger.exception("boom %s", 42)
+
+    sink = log_through_queue(log)
+
+    entry = json.loads(sink.lines[0])
+    assert entry["msg"] == "boom 42"
+    assert "Traceback" in entry["exc"]
+    assert "ValueError: bad value" in entry["exc"]
+    # Formatted by the listener, not by the thread that logged
+    assert sink.threads[0] is not threading.main_thread()
+
+
+def test_prepare_keeps_exc_info_unformatted():
+    handler = LocalQueueHandler(queue.SimpleQueue())
+    try:
+        raise KeyError("missing")
+    except KeyError:
+        record = logging.getLogger("tests").makeRecord(
+            "tests", logging.ERROR, __file__, 1, "failed for %s", ("job",), exc_info=sys.exc_info()
+        )
+
+    prepared = handler.prepare(record)
+
+    assert prepared.msg == "failed for job" and prepared.args is None
+    assert prepared.exc_info is not None and prepared.exc_text is None
+    assert record.args == ("job",)
@@ -0,0 +1,147 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+import config
+from business import meeting_scheduler as scheduler_module
+from business.meeting_manager import MeetingManager
+from business.meeting_scheduler import MeetingScheduler
+from config import sleep as clock_sleep
+from engine.headless import VirtualClock
+
+
+@pytest.fixture
+def virtual_clock():
+    clock = VirtualClock()
+    config.set_virtual_clock(clock)
+    yield clock
+    config.set_virtual_clock(None)
+
+
+@pytest.fixture
+def transitions(monkeypatch, virtual_clock):
+    """Records (seconds since start, start_ids, end_ids) for every batch; set fail to make the next batch raise."""
+    calls = []
+    state = {"fail": 0}
+    start = virtual_clock.now()
+
+    async def run_transitions(self, start_ids, end_ids):
+        calls.append(((virtual_clock.now() - start).total_seconds(), start_ids, end_ids))
+        if state["fail"]:
+            state["fail"] -= 1
+            raise RuntimeError("database unavailable")
+        return {"started": len(start_ids), "completed": len(end_ids)}
+
+    monkeypatch.setattr(MeetingManager, "run_transitions", run_transitions)
+    return calls, state
+
+
+def make_scheduler() -> MeetingScheduler:
+    scheduler = MeetingScheduler()
+
+    async def load(db=None):
+        scheduler.loads += 1
+
+    scheduler.load = load
+    return scheduler
+
+
+def run_for(scheduler: MeetingScheduler, seconds: float, during=None):
+    """Run the scheduler for `seconds` of virtual time; `during` runs alongside it in the test task."""
+    async def main():
+        task = asyncio.create_task(scheduler.run())
+        if during is not None:
+            await during()
+        await clock_sleep(seconds)
+        scheduler.stop()
+        await task
+
+    asyncio.run(main())
+
+
+def at(clock: VirtualClock, seconds: float):
+    return clock.now() + timedelta(seconds=seconds)
+
+
+def test_start_and_end_fire_when_due(virtual_clock, transitions):
+    calls, _ = transitions
+    scheduler = make_scheduler()
+    scheduler.add(1, at(virtual_clock, 60), at(virtual_clock, 120))
+    scheduler.add(2, at(virtual_clock, 60), at(virtual_clock, 90), status="in_progress")
+
+    run_for(scheduler, 200)
+
+    assert calls == [(60.0, [1], []), (90.0, [], [2]), (120.0, [], [1])]
+    assert scheduler.started == 1 and scheduler.completed == 2
+    # Completed meetings are no longer tracked
+    assert scheduler.stats()["meetings"] == 0
+
+
+def test_moved_meeting_drops_its_old_entries(virtual_clock, transitions):
+    calls, _ = transitions
+    scheduler = make_scheduler()
+    scheduler.add(1, at(virtual_clock, 60), at(virtual_clock, 120))
+    scheduler.add(1, at(virtual_clock, 90), at(virtual_clock, 150))
+
+    run_for(scheduler, 200)
+
+    assert calls == [(90.0, [1], []), (150.0, [], [1])]
+    assert scheduler.stale == 2
+
+
+def test_forgotten_meeting_never_fires(virtual_clock, transitions):
+    calls, _ = transitions
+    scheduler = make_scheduler()
+    scheduler.add(1, at(virtual_clock, 60), at(virtual_clock, 120))
+    scheduler.add(2, at(virtual_clock, 60), at(virtual_clock, 120))
+    scheduler.forget(2)
+
+    run_for(scheduler, 200)
+
+    assert calls == [(60.0, [1], []), (120.0, [], [1])]
+    assert scheduler.stale == 2
+
+
+def test_earlier_add_wakes_a_sleeping_scheduler(virtual_clock, transitions):
+    calls, _ = transitions
+    scheduler = make_scheduler()
+    scheduler.add(1, at(virtual_clock, 250), at(virtual_clock, 280))
+
+    async def add_later():
+        await clock_sleep(10)
+        # The scheduler is asleep until 250 s; this meeting is due long before that
+        scheduler.add(2, at(virtual_clock, 30), at(virtual_clock, 60))
+
+    run_for(scheduler, 100, during=add_later)
+
+    assert calls == [(40.0, [2], []), (70.0, [], [2])]
+
+
+def test_failed_batch_is_retried(virtual_clock, transitions):
+    calls, state = transitions
+    scheduler = make_scheduler()
+    scheduler.add(1, at(virtual_clock, 60), at(virtual_clock, 120))
+    state["fail"] = 1
+
+    run_for(scheduler, 100)
+
+    assert calls == [(60.0, [1], []), (60.0 + scheduler_module.RETRY_SECONDS, [1], [])]
+    assert scheduler.failed_batches == 1
+    assert scheduler.started == 1
+
+
+def test_stop_wakes_the_scheduler(virtual_clock, transitions):
+    scheduler = make_scheduler()
+    scheduler.add(1, at(virtual_clock, 3600), at(virtual_clock, 7200))
+
+    async def main():
+        task = asyncio.create_task(scheduler.run())
+        await clock_sleep(1)
+        scheduler.stop()
+        await asyncio.wait_for(task, timeout=1)
+        return virtual_clock.now()
+
+    start = virtual_clock.now()
+    stopped_at = asyncio.run(main())
+    assert (stopped_at - start).total_seconds() == 1.0
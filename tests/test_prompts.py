@@ -0,0 +1,9 @@
+from llm.prompts import business_summary, format_money
+
+
+def test_business_summary_tolerates_non_numeric_amounts():
+    text = business_summary({"revenue": "N/A", "profit": "1234.5", "active_projects": 3})
+    assert "- Revenue: $0.00" in text
+    assert "- Profit: $1,234.50" in text
+    assert "- Active projects: 3" in text
+    assert format_money(None) == "$0.00"
@@ -0,0 +1,38 @@
+from types import SimpleNamespace
+
+from business.shared_drive_versions import _rebuild_chain, _tokens, apply_reverse_delta, encode_reverse_delta
+
+V1 = "<html><body><h1>Plan</h1><p>Draft one.</p></body></html>"
+V2 = "<html><body><h1>Plan</h1><p>Draft two.</p><ul><li>Ship</li></ul></body></html>"
+V3 = "<html><body><h1>Q3 Plan</h1><p>Draft two.</p><ul><li>Ship</li><li>Test</li></ul></body></html>"
+
+
+def test_tokens_split_after_tags_and_newlines():
+    assert _tokens("<p>a</p>\nb<br>") == ["<p>", "a</p>", "\n", "b<br>"]
+    assert "".join(_tokens(V3)) == V3
+    assert _tokens("") == []
+
+
+def test_reverse_delta_round_trip():
+    for old, new in [(V1, V2), (V2, V3), (V3, V1), ("", V1), (V1, ""), (V1, V1)]:
+        assert apply_reverse_delta(new, encode_reverse_delta(old, new)) == old
+
+
+def test_reverse_delta_copies_shared_tokens_instead_of_storing_them():
+    big = "".join(f"<p>paragraph {i}</p>\n" for i in range(500))
+    edited = big.replace("paragraph 250<", "paragraph 250 (edited)<")
+    delta = encode_reverse_delta(big, edited)
+    assert apply_reverse_delta(edited, delta) == big
+    assert len(delta) < 200
+
+
+def test_rebuild_chain_walks_newest_to_oldest():
+    # Newest row holds V2 as a delta against the current V3; the oldest is a legacy full-text row
+    rows = [
+        SimpleNamespace(content_html=None, content_delta=encode_reverse_delta(V2, V3)),
+        SimpleNamespace(content_html=V1, content_delta=None),
+    ]
+    assert _rebuild_chain(V3, rows) == [V2, V1]
+
+    rows[1] = SimpleNamespace(content_html=None, content_delta=encode_reverse_delta(V1, V2))
+    assert _rebuild_chain(V3, rows) == [V2, V1]
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+import database.admission
+from engine import startup
+
+
+class FakeSimulator:
+    async def run(self):
+        pass
+
+
+@pytest.fixture
+def no_backfills(monkeypatch):
+    monkeypatch.setattr(startup, "BACKGROUND_JOBS", [])
+    monkeypatch.setattr(database.admission, "set_db_subsystem", lambda name: None)
+
+    async def compact():
+        return "nothing to compact"
+
+    monkeypatch.setattr(startup, "compact_version_history", compact)
+
+
+def test_background_stages_wait_for_warmup(monkeypatch, no_backfills):
+    finished = []
+
+    async def warm_up():
+        await asyncio.sleep(0.01)
+        finished.append(True)
+        return "warm"
+
+    monkeypatch.setattr(startup, "warm_up_llm", warm_up)
+    asyncio.run(startup.run_background_stages(FakeSimulator(), freshly_seeded=True))
+    assert finished == [True]
+    assert startup.startup_progress.stages["llm_warmup"].status == "done"
+
+
+def test_cancelling_background_stages_cancels_warmup(monkeypatch, no_backfills):
+    cancelled = []
+
+    async def warm_up():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    monkeypatch.setattr(startup, "warm_up_llm", warm_up)
+
+    async def main():
+        task = asyncio.create_task(startup.run_background_stages(FakeSimulator(), freshly_seeded=True))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert cancelled == [True]
+